@@ -5,13 +5,11 @@ Param(
 
 $ErrorActionPreference = "Stop"
 
-$shareDir = Join-Path -Path "runs" -ChildPath (Join-Path $RunId "share")
-if (-not (Test-Path $shareDir)) {
-  throw "Missing share dir: $shareDir"
+# Thin wrapper around `detectlab share zip` (deterministic, parallel, content-addressed).
+$runDir = Join-Path -Path "runs" -ChildPath $RunId
+if (-not (Test-Path $runDir)) {
+  throw "Missing run dir: $runDir"
 }
 
-$outZip = "${RunId}__share.zip"
-if (Test-Path $outZip) { Remove-Item $outZip -Force }
-
-Compress-Archive -Path (Join-Path $shareDir "*") -DestinationPath $outZip -Force
-Write-Host "OK: wrote $outZip"
+python -m inkswarm_detectlab share zip --run-id $RunId --out "${RunId}__share.zip"
+if ($LASTEXITCODE -ne 0) { throw "share zip failed (exit $LASTEXITCODE)" }
@@ -1,19 +1,17 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
+# Thin wrapper around `detectlab share zip` (deterministic, parallel, content-addressed).
 RUN_ID="${1:-}"
 if [[ -z "$RUN_ID" ]]; then
   echo "Usage: ./scripts/make_share_zip.sh <run_id>"
   exit 2
 fi
 
-SHARE_DIR="runs/${RUN_ID}/share"
-if [[ ! -d "$SHARE_DIR" ]]; then
-  echo "Missing share dir: $SHARE_DIR"
+RUN_DIR="runs/${RUN_ID}"
+if [[ ! -d "$RUN_DIR" ]]; then
+  echo "Missing run dir: $RUN_DIR"
   exit 2
 fi
 
-OUT_ZIP="${RUN_ID}__share.zip"
-rm -f "$OUT_ZIP"
-(cd "$SHARE_DIR" && zip -qr "../../$OUT_ZIP" .)
-echo "OK: wrote $OUT_ZIP"
+python -m inkswarm_detectlab share zip --run-id "$RUN_ID" --out "${RUN_ID}__share.zip"
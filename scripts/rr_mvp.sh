@@ -4,6 +4,9 @@ set -euo pipefail
 CONFIG="${1:-configs/skynet_mvp.yaml}"
 BASE_RUN_ID="${2:-RR_MVP_$(date +%Y%m%d)_001}"
 
+# Signature mode: fast (manifest hashes + row-group hashes) or full (pandas canonical hashes).
+RR_SIGNATURE_MODE="${RR_SIGNATURE_MODE:-fast}"
+
 RUN_A="${BASE_RUN_ID}_A"
 RUN_B="${BASE_RUN_ID}_B"
 
@@ -43,10 +46,10 @@ run_one() {
   echo "---"
 
   run_one "$RUN_A"
-  python -m inkswarm_detectlab.tools.rr_signature --run-id "$RUN_A" --out "$EVIDENCE_DIR/signature_A.json"
+  python -m inkswarm_detectlab.tools.rr_signature --run-id "$RUN_A" --out "$EVIDENCE_DIR/signature_A.json" --mode "$RR_SIGNATURE_MODE"
 
   run_one "$RUN_B"
-  python -m inkswarm_detectlab.tools.rr_signature --run-id "$RUN_B" --out "$EVIDENCE_DIR/signature_B.json"
+  python -m inkswarm_detectlab.tools.rr_signature --run-id "$RUN_B" --out "$EVIDENCE_DIR/signature_B.json" --mode "$RR_SIGNATURE_MODE"
 
   # v2 rr_signature emits a stable signature_digest (normalized against run_id).
   python - <<'PY'
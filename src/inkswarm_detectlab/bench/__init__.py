@@ -0,0 +1,22 @@
+"""Benchmarks for FeatureLab kernels/builders and the end-to-end MVP run (`detectlab bench`).
+
+Kernel inputs are generated in-process (no SKYNET run needed); the e2e suite runs
+the `configs/skynet_*.yaml` presets. Both write JSON that `compare_results` can gate
+against a stored baseline.
+"""
+
+from .baseline import Comparison, compare_results
+from .e2e import E2E_PRESETS, load_results, run_e2e_benchmark
+from .suite import BENCHMARKS, PRESETS, run_benchmarks, write_results
+
+__all__ = [
+    "BENCHMARKS",
+    "PRESETS",
+    "E2E_PRESETS",
+    "Comparison",
+    "compare_results",
+    "load_results",
+    "run_benchmarks",
+    "run_e2e_benchmark",
+    "write_results",
+]
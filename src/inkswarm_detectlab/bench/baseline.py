@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+"""Regression gating of benchmark results against a stored baseline JSON.
+
+Both suites are reduced to comparable entries `{key: {"time_s", "mem_mb"}}`:
+- kernels: key `<benchmark>@rows=<n>,entities=<e>`, median_s / peak_traced_mb
+- e2e:     key `<stage>` (top-level perf.json stages), wall_s / rss_growth_mb, plus
+           `total`, total_wall_s / peak_rss_mb (the process-wide high-water mark,
+           which would blame every stage after a heavy one)
+
+An entry regresses when current > baseline * (1 + tolerance) AND the absolute
+increase exceeds the floor (`min_delta_s` / `min_delta_mb`), so sub-second stages
+do not fail the gate on scheduler noise. Entries present on only one side are
+reported, not failed.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Absolute noise floors per suite: (seconds, MB).
+DEFAULT_FLOORS: Dict[str, tuple[float, float]] = {"kernels": (0.01, 4.0), "e2e": (0.5, 32.0)}
+
+
+@dataclass
+class Regression:
+    key: str
+    metric: str  # time_s | mem_mb
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"key": self.key, "metric": self.metric, "baseline": self.baseline, "current": self.current, "ratio": round(self.ratio, 3)}
+
+
+@dataclass
+class Comparison:
+    regressions: List[Regression] = field(default_factory=list)
+    compared: int = 0
+    only_in_baseline: List[str] = field(default_factory=list)
+    only_in_current: List[str] = field(default_factory=list)
+    config_mismatch: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.regressions
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "compared": self.compared,
+            "regressions": [r.to_json() for r in self.regressions],
+            "only_in_baseline": self.only_in_baseline,
+            "only_in_current": self.only_in_current,
+            "config_mismatch": self.config_mismatch,
+        }
+
+
+def comparable(payload: Dict[str, Any]) -> Dict[str, Dict[str, Optional[float]]]:
+    suite = payload.get("suite")
+    if suite == "kernels":
+        return {
+            f"{r['benchmark']}@rows={r['rows']},entities={r['entities']}": {"time_s": r.get("median_s"), "mem_mb": r.get("peak_traced_mb")}
+            for r in payload.get("results", [])
+            if r.get("status") == "ok"
+        }
+    if suite == "e2e":
+        out = {
+            name: {"time_s": s.get("wall_s"), "mem_mb": s.get("rss_growth_mb")}
+            for name, s in (payload.get("stages") or {}).items()
+            if s.get("status") == "ok"
+        }
+        out["total"] = {"time_s": payload.get("total_wall_s"), "mem_mb": payload.get("peak_rss_mb")}
+        return out
+    raise ValueError(f"Unknown benchmark suite {suite!r}")
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    *,
+    tolerance: float = 0.25,
+    mem_tolerance: Optional[float] = None,
+    min_delta_s: Optional[float] = None,
+    min_delta_mb: Optional[float] = None,
+) -> Comparison:
+    """Regressions of `current` vs `baseline` (same suite).
+
+    `mem_tolerance` defaults to `tolerance`; the floors default to DEFAULT_FLOORS[suite].
+    """
+    suite = current.get("suite")
+    if suite != baseline.get("suite"):
+        raise ValueError(f"Cannot compare suite {suite!r} against baseline suite {baseline.get('suite')!r}")
+    mem_tolerance = tolerance if mem_tolerance is None else mem_tolerance
+    floor_s, floor_mb = DEFAULT_FLOORS.get(str(suite), (0.0, 0.0))
+    min_delta_s = floor_s if min_delta_s is None else min_delta_s
+    min_delta_mb = floor_mb if min_delta_mb is None else min_delta_mb
+    cur, base = comparable(current), comparable(baseline)
+    cmp = Comparison(
+        only_in_baseline=sorted(set(base) - set(cur)),
+        only_in_current=sorted(set(cur) - set(base)),
+        config_mismatch=current.get("config_hash") != baseline.get("config_hash"),
+    )
+    for key in [k for k in base if k in cur]:
+        cmp.compared += 1
+        for metric, tol, floor in (("time_s", tolerance, min_delta_s), ("mem_mb", mem_tolerance, min_delta_mb)):
+            b, c = base[key].get(metric), cur[key].get(metric)
+            if b is None or c is None:
+                continue
+            if c > b * (1.0 + tol) and c - b > floor:
+                cmp.regressions.append(Regression(key, metric, float(b), float(c)))
+    return cmp
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+"""Synthetic event frames for benchmarks.
+
+Columns match what the feature builders read from raw login/checkout tables; values
+are uniform draws (no fraud structure), which is all the kernels care about. Entity
+ids are shared Python strings (`<prefix>_<code>`), so a 10M-row frame stays a few
+hundred MB.
+"""
+
+import numpy as np
+import pandas as pd
+
+_START = pd.Timestamp("2026-01-01", tz="UTC")
+_LOGIN_RESULTS = np.array(["success", "failure", "challenge", "lockout"], dtype=object)
+_LOGIN_P = [0.80, 0.14, 0.05, 0.01]
+_CHECKOUT_RESULTS = np.array(["success", "failure", "review"], dtype=object)
+_CHECKOUT_P = [0.90, 0.07, 0.03]
+
+
+def _ids(prefix: str, codes: np.ndarray, n: int) -> np.ndarray:
+    width = len(str(max(n - 1, 0)))
+    pool = np.array([f"{prefix}_{i:0{width}d}" for i in range(n)], dtype=object)
+    return pool[codes]
+
+
+def _base_frame(rng: np.random.Generator, prefix: str, n_rows: int, n_entities: int, span_days: float) -> pd.DataFrame:
+    n_entities = max(1, int(n_entities))
+    offsets = np.sort(rng.integers(0, int(span_days * 86_400), size=n_rows)).astype("timedelta64[s]")
+    return pd.DataFrame(
+        {
+            "event_id": _ids(prefix, np.arange(n_rows), n_rows),
+            "event_ts": _START + pd.to_timedelta(offsets),
+            "user_id": _ids("user", rng.integers(0, n_entities, size=n_rows), n_entities),
+            "ip_hash": _ids("ip", rng.integers(0, n_entities, size=n_rows), n_entities),
+            "device_fingerprint_hash": _ids("dev", rng.integers(0, n_entities, size=n_rows), n_entities),
+        }
+    )
+
+
+def synthetic_login_frame(n_rows: int, n_entities: int, *, seed: int = 0, span_days: float = 30.0) -> pd.DataFrame:
+    """login_attempt-shaped frame with `n_entities` distinct users/IPs/devices, sorted by event_ts."""
+    rng = np.random.default_rng(seed)
+    df = _base_frame(rng, "login", n_rows, n_entities, span_days)
+    df["login_result"] = rng.choice(_LOGIN_RESULTS, size=n_rows, p=_LOGIN_P)
+    support = rng.random(n_rows) < 0.02
+    df["support_contacted"] = support
+    df["support_cost_usd"] = np.where(support, rng.gamma(2.0, 4.0, size=n_rows), np.nan)
+    df["support_wait_seconds"] = np.where(support, rng.exponential(300.0, size=n_rows), np.nan)
+    df["support_handle_seconds"] = np.where(support, rng.exponential(600.0, size=n_rows), np.nan)
+    return df
+
+
+def synthetic_checkout_frame(n_rows: int, n_entities: int, *, seed: int = 1, span_days: float = 30.0) -> pd.DataFrame:
+    """checkout_attempt-shaped frame (same entity id space as `synthetic_login_frame`)."""
+    rng = np.random.default_rng(seed)
+    df = _base_frame(rng, "checkout", n_rows, n_entities, span_days)
+    df["credit_card_hash"] = _ids("cc", rng.integers(0, max(1, int(n_entities)), size=n_rows), max(1, int(n_entities)))
+    df["payment_value"] = rng.lognormal(3.0, 1.0, size=n_rows)
+    df["basket_size"] = rng.integers(1, 10, size=n_rows)
+    df["checkout_result"] = rng.choice(_CHECKOUT_RESULTS, size=n_rows, p=_CHECKOUT_P)
+    return df
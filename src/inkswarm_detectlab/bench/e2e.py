@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+"""End-to-end MVP benchmark at fixed scale presets.
+
+Each repetition runs the production entry point (`detectlab run mvp --force`) in a
+fresh interpreter against a `configs/skynet_*.yaml` preset, with `paths.runs_dir`
+pointed at a scratch directory, the shared feature cache disabled (every run is
+cold) and `run.stage_workers=1`, so per-stage times and resource deltas cover only
+that stage instead of whatever ran alongside it. Per-stage wall/CPU time and memory come from the run's own
+`logs/perf.json`, so stage names and numbers are exactly what production runs
+record. A fresh process per repetition keeps peak RSS comparable across runs.
+"""
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from ..config import load_config
+from ..utils.hashing import stable_hash_dict
+from ..utils.perf import read_perf
+from .suite import SCHEMA_VERSION, environment
+
+E2E_PRESETS: Dict[str, str] = {
+    "smoke": "configs/skynet_smoke.yaml",
+    "mvp": "configs/skynet_mvp.yaml",
+    "heavy": "configs/skynet_mvp_heavy.yaml",
+}
+
+_RUN_ID = "BENCH_E2E"
+
+
+def _bench_config(cfg_path: Path, runs_dir: Path) -> tuple[Path, str]:
+    """Write the preset with scratch runs_dir, cache off, serial stages; returns (path, config_hash)."""
+    cfg = load_config(cfg_path)
+    cfg.paths.runs_dir = runs_dir
+    cfg.features.use_cache = False
+    cfg.features.write_cache = False
+    cfg.run.stage_workers = 1
+    cfg.run.run_id = None
+    d = cfg.model_dump(mode="json")
+    config_hash = stable_hash_dict({k: v for k, v in d.items() if k != "paths"})
+    out = runs_dir.parent / "bench_config.yaml"
+    out.write_text(yaml.safe_dump(d, sort_keys=False), encoding="utf-8")
+    return out, config_hash
+
+
+def _run_once(cfg_path: Path, run_dir: Path, *, timeout_s: Optional[float]) -> Dict[str, Any]:
+    if run_dir.exists():
+        shutil.rmtree(run_dir)
+    src = str(Path(__file__).resolve().parents[2])
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in (src, os.environ.get("PYTHONPATH", "")) if p)}
+    cmd = [sys.executable, "-m", "inkswarm_detectlab", "run", "mvp", "--config", str(cfg_path), "--run-id", run_dir.name, "--force"]
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True, timeout=timeout_s)
+    wall = time.perf_counter() - t0
+    stages = {s["name"]: s for s in read_perf(run_dir).get("stages", [])}
+    return {
+        "status": "ok" if proc.returncode == 0 else "fail",
+        "returncode": proc.returncode,
+        "wall_s": round(wall, 4),
+        "stderr_tail": proc.stderr[-2000:] if proc.returncode != 0 else None,
+        "stages": stages,
+    }
+
+
+def _median(vals: List[Optional[float]]) -> Optional[float]:
+    vals = [v for v in vals if v is not None]
+    return round(statistics.median(vals), 4) if vals else None
+
+
+def run_e2e_benchmark(
+    preset: Optional[str] = "smoke",
+    *,
+    cfg_path: Optional[Path] = None,
+    repeat: int = 1,
+    work_dir: Optional[Path] = None,
+    timeout_s: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Benchmark `run mvp` for a preset (or an explicit config); medians over `repeat` runs."""
+    if cfg_path is None:
+        if preset not in E2E_PRESETS:
+            raise ValueError(f"Unknown e2e preset {preset!r}; expected one of {list(E2E_PRESETS)}")
+        cfg_path = Path(E2E_PRESETS[preset])
+    cfg_path = Path(cfg_path)
+    if not cfg_path.exists():
+        raise FileNotFoundError(f"Config not found: {cfg_path} (run from the repo root or pass a config path)")
+
+    tmp = None
+    if work_dir is None:
+        tmp = tempfile.TemporaryDirectory(prefix="detectlab_bench_")
+        work_dir = Path(tmp.name)
+    try:
+        runs_dir = Path(work_dir) / "runs"
+        runs_dir.mkdir(parents=True, exist_ok=True)
+        bench_cfg, config_hash = _bench_config(cfg_path, runs_dir)
+        reps = [_run_once(bench_cfg, runs_dir / _RUN_ID, timeout_s=timeout_s) for _ in range(max(1, int(repeat)))]
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+    names: List[str] = []
+    for r in reps:
+        names += [n for n in r["stages"] if n not in names]
+    stages: Dict[str, Dict[str, Any]] = {}
+    for n in names:
+        recs = [r["stages"].get(n) or {} for r in reps]
+        stages[n] = {
+            "status": "ok" if all(x.get("status") == "ok" for x in recs) else "fail",
+            "wall_s": _median([x.get("wall_s") for x in recs]),
+            "cpu_s": _median([x.get("cpu_s") for x in recs]),
+            "peak_rss_mb": _median([x.get("peak_rss_mb") for x in recs]),
+            "rss_growth_mb": _median([x.get("rss_growth_mb") for x in recs]),
+            "rows_out": next((x.get("rows_out") for x in recs if x.get("rows_out") is not None), None),
+            "wall_s_runs": [x.get("wall_s") for x in recs],
+        }
+    peaks = [s["peak_rss_mb"] for s in stages.values() if s["peak_rss_mb"] is not None]
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "suite": "e2e",
+        "created_at_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "params": {"preset": preset, "config": str(cfg_path), "repeat": repeat},
+        "config_hash": config_hash,
+        "status": "ok" if all(r["status"] == "ok" for r in reps) else "fail",
+        "total_wall_s": _median([r["wall_s"] for r in reps]),
+        "peak_rss_mb": max(peaks) if peaks else None,
+        "stages": stages,
+        "failures": [r["stderr_tail"] for r in reps if r["status"] != "ok"],
+    }
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+"""FeatureLab benchmark suite.
+
+Each benchmark has a `setup` (build inputs from synthetic frames; untimed) and a `run`
+(the timed call). `run_benchmarks` sweeps a rows x entities grid and reports, per case:
+
+- times_s / best_s / median_s over `repeat` timed calls (after one untimed warm-up
+  call, so numba JIT compilation and first-touch allocations are excluded)
+- rows_per_s = rows / median_s
+- peak_traced_mb: peak Python/NumPy allocation of one extra call under tracemalloc
+  (numba-internal allocations are not traced)
+- accuracy (approximate benchmarks only): mean/p99/max relative error vs the exact
+  reference benchmark on the same inputs
+
+and a per (benchmark, entities) scaling curve: rows_per_s by rows plus the fitted
+log-log exponent of time vs rows (1.0 = linear).
+
+Large grids are bounded by `budget_s`: once a case's median time extrapolated
+linearly to the next row count exceeds the budget, the larger cases of that curve
+are recorded as skipped instead of run.
+"""
+
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .._compat_numba import NUMBA_AVAILABLE
+from ..features.builder import (
+    _cross_event_window_sums,
+    _group_codes,
+    _group_sorted,
+    _rolling_sum_by_time,
+    _ts_ns,
+    build_checkout_features,
+    build_login_features,
+)
+from ..kernels import (
+    HLL_DEFAULT_PRECISION,
+    decayed_sums,
+    kernel_backend,
+    sliding_unique_counts,
+    sliding_unique_counts_hll,
+)
+from .data import synthetic_checkout_frame, synthetic_login_frame
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+WINDOW = "24h"
+WINDOW_NS = np.int64(24 * 3600 * 1_000_000_000)
+BUILDER_WINDOWS = ["1h", "24h", "7d"]
+BUILDER_ENTITIES = ["user", "ip", "device"]
+
+PRESETS: Dict[str, Dict[str, tuple[int, ...]]] = {
+    "quick": {"rows": (10_000, 100_000), "entities": (10, 1_000)},
+    "full": {"rows": (10_000, 100_000, 1_000_000, 10_000_000), "entities": (10, 1_000, 100_000)},
+}
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    description: str
+    setup: Callable[["_Inputs"], Any]
+    run: Callable[[Any], Any]
+    # Exact benchmark (same setup) whose output this approximate one is scored against.
+    reference: Optional[str] = None
+
+
+class _Inputs:
+    """Synthetic frames for one (rows, entities) case, built on first use."""
+
+    def __init__(self, rows: int, entities: int, seed: int) -> None:
+        self.rows, self.entities, self.seed = rows, entities, seed
+        self._login: Optional[pd.DataFrame] = None
+        self._checkout: Optional[pd.DataFrame] = None
+
+    @property
+    def login(self) -> pd.DataFrame:
+        if self._login is None:
+            self._login = synthetic_login_frame(self.rows, self.entities, seed=self.seed)
+        return self._login
+
+    @property
+    def checkout(self) -> pd.DataFrame:
+        if self._checkout is None:
+            self._checkout = synthetic_checkout_frame(self.rows, self.entities, seed=self.seed + 1)
+        return self._checkout
+
+
+def _setup_rolling_sum(inp: _Inputs) -> pd.DataFrame:
+    d = inp.login[["user_id", "event_ts", "login_result"]].copy()
+    d["_v"] = (d["login_result"] == "failure").astype(np.int64)
+    return d
+
+
+def _setup_sliding_unique(inp: _Inputs) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    d = inp.login
+    group_codes, ts_ns = _group_codes(d["user_id"]), _ts_ns(d["event_ts"])
+    order = _group_sorted(group_codes, ts_ns)
+    return group_codes[order], ts_ns[order], _group_codes(d["ip_hash"])[order]
+
+
+def _setup_decayed(inp: _Inputs) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    d = inp.login
+    group_codes, ts_ns = _group_codes(d["user_id"]), _ts_ns(d["event_ts"])
+    order = _group_sorted(group_codes, ts_ns)
+    values = np.column_stack([np.ones(len(d)), (d["login_result"] == "success").to_numpy(dtype=np.float64)])
+    return group_codes[order], ts_ns[order], values[order]
+
+
+def _setup_cross_event(inp: _Inputs) -> tuple[pd.DataFrame, pd.DataFrame]:
+    other = inp.checkout[["user_id", "event_ts", "payment_value"]].copy()
+    other["_one"] = 1.0
+    return inp.login[["user_id", "event_ts", "event_id"]], other
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    b.name: b
+    for b in (
+        Benchmark(
+            "rolling_sum_by_time",
+            f"_rolling_sum_by_time: per-user {WINDOW} strict past-only sum of one indicator",
+            _setup_rolling_sum,
+            lambda d: _rolling_sum_by_time(d, group_key="user_id", value_col="_v", window=WINDOW, strict_past_only=True),
+        ),
+        Benchmark(
+            "sliding_unique_counts",
+            f"kernels.sliding_unique_counts: per-user {WINDOW} distinct IPs (pre-sorted, pre-factorized codes), serial",
+            _setup_sliding_unique,
+            lambda a: sliding_unique_counts(a[0], a[1], a[2], WINDOW_NS, parallel=False),
+        ),
+        Benchmark(
+            "sliding_unique_counts_parallel",
+            "kernels.sliding_unique_counts: as sliding_unique_counts, chunked at group boundaries across numba threads",
+            _setup_sliding_unique,
+            lambda a: sliding_unique_counts(a[0], a[1], a[2], WINDOW_NS, parallel=True),
+        ),
+        Benchmark(
+            "sliding_unique_counts_hll",
+            f"kernels.sliding_unique_counts_hll: as sliding_unique_counts, HyperLogLog precision {HLL_DEFAULT_PRECISION}; "
+            "reports relative error vs the exact kernel",
+            _setup_sliding_unique,
+            lambda a: sliding_unique_counts_hll(a[0], a[1], a[2], WINDOW_NS),
+            reference="sliding_unique_counts",
+        ),
+        Benchmark(
+            "decayed_sums",
+            f"kernels.decayed_sums: per-user decayed count + success count, half-lives {BUILDER_WINDOWS} in one scan",
+            _setup_decayed,
+            lambda a: decayed_sums(
+                a[0], a[1], a[2], [pd.Timedelta(w).value for w in BUILDER_WINDOWS], include_current=False
+            ),
+        ),
+        Benchmark(
+            "cross_event_window_sums",
+            f"_cross_event_window_sums: per-user {WINDOW} checkout count + payment sum for each login",
+            _setup_cross_event,
+            lambda a: _cross_event_window_sums(a[0], a[1], group_key="user_id", value_cols=["_one", "payment_value"], window_td=pd.Timedelta(WINDOW)),
+        ),
+        Benchmark(
+            "build_login_features",
+            f"build_login_features: windows={BUILDER_WINDOWS} entities={BUILDER_ENTITIES}, support features",
+            lambda inp: inp.login,
+            lambda df: build_login_features(
+                df, windows=BUILDER_WINDOWS, entities=BUILDER_ENTITIES, strict_past_only=True, include_support=True
+            ),
+        ),
+        Benchmark(
+            "build_checkout_features",
+            f"build_checkout_features: windows={BUILDER_WINDOWS} entities={BUILDER_ENTITIES}, login cross-event context",
+            lambda inp: (inp.checkout, inp.login),
+            lambda a: build_checkout_features(
+                a[0],
+                windows=BUILDER_WINDOWS,
+                entities=BUILDER_ENTITIES,
+                strict_past_only=True,
+                include_cross_event=True,
+                login_df=a[1],
+            ),
+        ),
+    )
+}
+
+
+def _version(package: str) -> Optional[str]:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _numba_threads() -> Optional[int]:
+    if not NUMBA_AVAILABLE:
+        return None
+    import numba
+
+    return int(numba.get_num_threads())
+
+
+def environment() -> Dict[str, Any]:
+    """Interpreter/library/machine facts needed to compare results across runs."""
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "numba": _version("numba") if NUMBA_AVAILABLE else None,
+        "kernels": kernel_backend(),
+        "numba_threads": _numba_threads(),
+        "detectlab": _version("inkswarm-detectlab"),
+    }
+
+
+def _measure(bench: Benchmark, ctx: Any, *, repeat: int, memory: bool) -> Dict[str, Any]:
+    bench.run(ctx)  # warm-up (JIT compile, caches)
+    times: List[float] = []
+    for _ in range(max(1, int(repeat))):
+        t0 = time.perf_counter()
+        bench.run(ctx)
+        times.append(time.perf_counter() - t0)
+    out: Dict[str, Any] = {
+        "times_s": [round(t, 6) for t in times],
+        "best_s": round(min(times), 6),
+        "median_s": round(statistics.median(times), 6),
+        "peak_traced_mb": None,
+    }
+    if memory:
+        tracemalloc.start()
+        try:
+            bench.run(ctx)
+            out["peak_traced_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        finally:
+            tracemalloc.stop()
+    return out
+
+
+def _accuracy(approx: np.ndarray, exact: np.ndarray) -> Dict[str, Any]:
+    """Relative error |approx - exact| / max(exact, 1) over all rows."""
+    rel = np.abs(np.asarray(approx, dtype=np.float64) - exact) / np.maximum(exact, 1)
+    if not len(rel):
+        return {"mean_rel_error": 0.0, "p99_rel_error": 0.0, "max_rel_error": 0.0}
+    return {
+        "mean_rel_error": round(float(rel.mean()), 6),
+        "p99_rel_error": round(float(np.quantile(rel, 0.99)), 6),
+        "max_rel_error": round(float(rel.max()), 6),
+    }
+
+
+def _scaling(results: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    curves: Dict[tuple[str, int], List[Dict[str, Any]]] = {}
+    for r in results:
+        if r["status"] == "ok":
+            curves.setdefault((r["benchmark"], r["entities"]), []).append(r)
+    out = []
+    for (name, ents), pts in curves.items():
+        pts = sorted(pts, key=lambda r: r["rows"])
+        exponent = None
+        if len(pts) >= 2:
+            x = np.log([p["rows"] for p in pts])
+            y = np.log([max(p["median_s"], 1e-9) for p in pts])
+            exponent = round(float(np.polyfit(x, y, 1)[0]), 3)
+        out.append(
+            {
+                "benchmark": name,
+                "entities": ents,
+                "time_vs_rows_exponent": exponent,
+                "points": [{"rows": p["rows"], "rows_per_s": p["rows_per_s"], "median_s": p["median_s"]} for p in pts],
+            }
+        )
+    return out
+
+
+def run_benchmarks(
+    names: Optional[Sequence[str]] = None,
+    *,
+    rows: Sequence[int] = PRESETS["quick"]["rows"],
+    entities: Sequence[int] = PRESETS["quick"]["entities"],
+    repeat: int = 3,
+    seed: int = 0,
+    budget_s: float = 120.0,
+    memory: bool = True,
+) -> Dict[str, Any]:
+    """Run the selected benchmarks (default: all) over the rows x entities grid."""
+    names = list(names or BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s) {unknown}; expected some of {list(BENCHMARKS)}")
+    rows, entities = sorted({int(r) for r in rows}), sorted({int(e) for e in entities})
+
+    results: List[Dict[str, Any]] = []
+    over_budget: Dict[tuple[str, int], int] = {}  # (bench, entities) -> first row count skipped
+    for ents in entities:
+        for i, n in enumerate(rows):
+            inp = _Inputs(n, ents, seed)
+            next_n = rows[i + 1] if i + 1 < len(rows) else None
+            for name in names:
+                case: Dict[str, Any] = {"benchmark": name, "rows": n, "entities": ents}
+                if ents > n:
+                    results.append({**case, "status": "skipped", "reason": "entities exceed rows"})
+                    continue
+                if over_budget.get((name, ents), n + 1) <= n:
+                    results.append({**case, "status": "skipped", "reason": f"over budget_s={budget_s:g}"})
+                    continue
+                bench = BENCHMARKS[name]
+                try:
+                    t0 = time.perf_counter()
+                    ctx = bench.setup(inp)
+                    setup_s = time.perf_counter() - t0
+                    m = _measure(bench, ctx, repeat=repeat, memory=memory)
+                    if bench.reference is not None:
+                        m["accuracy"] = _accuracy(bench.run(ctx), BENCHMARKS[bench.reference].run(ctx))
+                except Exception as e:  # noqa: BLE001 - one broken case must not lose the rest of the sweep
+                    logger.warning("[bench] %s rows=%d entities=%d failed: %s", name, n, ents, e)
+                    results.append({**case, "status": "fail", "reason": f"{type(e).__name__}: {e}"})
+                    continue
+                del ctx
+                rps = n / m["median_s"] if m["median_s"] > 0 else None
+                results.append({**case, "status": "ok", "setup_s": round(setup_s, 4), **m, "rows_per_s": None if rps is None else round(rps, 1)})
+                logger.info("[bench] %s rows=%d entities=%d median=%.4fs (%.0f rows/s)", name, n, ents, m["median_s"], rps or 0.0)
+                if next_n is not None and m["median_s"] * next_n / n > budget_s:
+                    over_budget[(name, ents)] = next_n
+            del inp
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "suite": "kernels",
+        "created_at_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "params": {"benchmarks": names, "rows": rows, "entities": entities, "repeat": repeat, "seed": seed, "budget_s": budget_s},
+        "benchmarks": {n: BENCHMARKS[n].description for n in names},
+        "results": results,
+        "scaling": _scaling(results),
+    }
+
+
+def write_results(payload: Dict[str, Any], out: Path) -> Path:
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    return out
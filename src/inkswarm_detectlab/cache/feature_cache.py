@@ -11,7 +11,8 @@ from ..config import AppConfig
 from ..utils.hashing import stable_hash_dict
 
 
-CACHE_VERSION = 1
+# Bump whenever feature values change for an unchanged config (2: rolling features realigned to row order).
+CACHE_VERSION = 2
 
 # These are the run subtrees required to reuse the expensive data/feature build work cross-run.
 RUN_CACHE_REQUIRED_RELS: tuple[str, ...] = (
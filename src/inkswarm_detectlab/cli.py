@@ -6,19 +6,11 @@ from typing import Optional
 import typer
 import yaml
 
+# Only stdlib-light modules at import time: commands import pandas/sklearn/pyarrow-backed
+# modules (and pydantic config models) locally, so `detectlab --help`, `schemas list`,
+# `cache list --cache-dir ...` or `runs list` start fast (budget: tests/test_cli_import_time.py).
 from .diagnostics import collect_diagnostics, render_diagnostics
 from .schemas import list_schemas, get_schema
-from .config import load_config
-from .pipeline import generate_raw, build_dataset, run_all
-from .features import build_login_features_for_run, build_checkout_features_for_run
-from .models import run_login_baselines_for_run
-from .quality.cluster import compute_cluster_quality, write_cluster_quality_artifacts
-from .ui.summarize import write_ui_summary
-from .ui.bundle import export_ui_bundle
-from .mvp.orchestrator import run_mvp
-from .utils.parquetify import parquetify_run
-from .io.manifest import read_manifest
-from .io.paths import manifest_path
 
 app = typer.Typer(
     add_completion=False,
@@ -60,6 +52,8 @@ ui_app = typer.Typer(add_completion=False, help="Shareable UI bundles (static HT
 eval_app = typer.Typer(add_completion=False, help="Evaluation diagnostics (slices + stability)")
 quality_app = typer.Typer(add_completion=False, help="Quality scorecards (cluster + dataset)")
 cache_app = typer.Typer(add_completion=False, help="Inspect and maintain local caches")
+share_app = typer.Typer(add_completion=False, help="Share package (zip) utilities")
+runs_app = typer.Typer(add_completion=False, help="Query the run index (runs/.run_index.sqlite)")
 
 
 app.add_typer(schemas_app, name="schemas")
@@ -73,8 +67,27 @@ app.add_typer(ui_app, name="ui")
 app.add_typer(eval_app, name="eval")
 app.add_typer(quality_app, name="quality")
 app.add_typer(cache_app, name="cache")
+app.add_typer(share_app, name="share")
+app.add_typer(runs_app, name="runs")
 
 
+@app.callback()
+def _global_options(
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Profile each pipeline stage; writes runs/<run_id>/logs/profile/<stage>.* (MVP stages then run sequentially).",
+    ),
+    profiler: str = typer.Option("cprofile", "--profiler", help="Profiler for --profile: cprofile | pyinstrument."),
+):
+    """Per-stage timings/resources are always recorded in runs/<run_id>/logs/perf.json."""
+    from .utils.perf import set_profiler
+
+    try:
+        set_profiler(profiler if profile else None)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--profiler")
+
 
 @app.command("doctor")
 def doctor():
@@ -179,7 +192,16 @@ def _resolve_config(arg: Optional[Path], opt: Optional[Path]) -> Path:
     raise typer.BadParameter("Missing config path. Provide as positional arg or via --config.")
 
 
+def _load_config(path: Path):
+    from .config import load_config
+
+    return load_config(path)
+
+
 def _print_artifacts(rdir: Path) -> None:
+    from .io.manifest import read_manifest
+    from .io.paths import manifest_path
+
     m = read_manifest(manifest_path(rdir))
     artifacts = m.get("artifacts", {}) or {}
     if not artifacts:
@@ -212,14 +234,14 @@ def schemas_show(name: str):
 @config_app.command("validate")
 def config_validate(path: Path):
     """Validate a YAML config via Pydantic (prints OK on success)."""
-    _ = load_config(path)
+    _ = _load_config(path)
     typer.echo("OK")
 
 
 @config_app.command("show")
 def config_show(path: Path):
     """Print the fully-resolved config (defaults applied) as YAML."""
-    cfg = load_config(path)
+    cfg = _load_config(path)
     d = cfg.model_dump()
     typer.echo(yaml.safe_dump(d, sort_keys=False))
 
@@ -244,7 +266,9 @@ def synthetic_skynet(
     """Generate raw SKYNET tables (login_attempt + checkout_attempt) and write a partial manifest."""
     _require_pyarrow()
     cfg_path = _resolve_config(config, config_opt)
-    cfg = load_config(cfg_path)
+    cfg = _load_config(cfg_path)
+    from .pipeline import generate_raw
+
     rdir, _ = generate_raw(cfg, run_id=run_id)
     typer.echo(str(rdir))
     _print_artifacts(rdir)
@@ -260,7 +284,9 @@ def dataset_build(
     """Build leakage-aware datasets for an existing run_id and update manifest + summary."""
     _require_pyarrow()
     cfg_path = _resolve_config(config, config_opt)
-    cfg = load_config(cfg_path)
+    cfg = _load_config(cfg_path)
+    from .pipeline import build_dataset
+
     rdir, _ = build_dataset(cfg, run_id=run_id)
     typer.echo(str(rdir))
     _print_artifacts(rdir)
@@ -276,7 +302,9 @@ def dataset_parquetify(
     """Explicit conversion to Parquet (ramping toward Parquet-mandatory milestone)."""
     _require_pyarrow()
     cfg_path = _resolve_config(config, config_opt)
-    cfg = load_config(cfg_path)
+    cfg = _load_config(cfg_path)
+    from .utils.parquetify import parquetify_run
+
     rdir = parquetify_run(cfg, run_id=run_id, force=force)
     typer.echo(str(rdir))
     _print_artifacts(rdir)
@@ -300,11 +328,12 @@ def features_build(
     """Build feature tables for an existing run_id."""
     _require_pyarrow()
     cfg_path = _resolve_config(config, config_opt)
-    cfg = load_config(cfg_path)
+    cfg = _load_config(cfg_path)
 
     event = event.strip().lower()
     if event not in {"login", "checkout", "all"}:
         raise typer.BadParameter("event must be one of: login, checkout, all")
+    from .features import build_login_features_for_run, build_checkout_features_for_run
 
     rdir = None
     if event in {"login", "all"}:
@@ -328,7 +357,9 @@ def baselines_run(
     """Train baseline models for login_attempt (writes under runs/<run_id>/models/...)."""
     _require_pyarrow()
     cfg_path = _resolve_config(config, config_opt)
-    cfg = load_config(cfg_path)
+    cfg = _load_config(cfg_path)
+    from .models import run_login_baselines_for_run
+
     rdir, results = run_login_baselines_for_run(cfg, run_id=run_id, force=force, cfg_path=cfg_path)
     if results.get("status") == "partial":
         typer.echo(
@@ -347,7 +378,9 @@ def run_skynet(
     """End-to-end: generate raw SKYNET tables + build datasets + write manifest + summary."""
     _require_pyarrow()
     cfg_path = _resolve_config(config, config_opt)
-    cfg = load_config(cfg_path)
+    cfg = _load_config(cfg_path)
+    from .pipeline import run_all
+
     rdir, _ = run_all(cfg, run_id=run_id)
     typer.echo(str(rdir))
     _print_artifacts(rdir)
@@ -367,6 +400,8 @@ def run_quick_cmd(
     Equivalent to `detectlab run mvp -c configs/skynet_smoke.yaml`.
     """
     _require_pyarrow()
+    from .mvp.orchestrator import run_mvp
+
     rdir, summary = run_mvp(cfg_path=config, run_id=run_id, force=force)
 
     typer.echo(str(rdir))
@@ -408,6 +443,8 @@ def run_mvp_cmd(
     """
     _require_pyarrow()
     cfg_path = _resolve_config(config, config_opt)
+    from .mvp.orchestrator import run_mvp
+
     rdir, summary = run_mvp(cfg_path=cfg_path, run_id=run_id, force=force)
 
     # Console summary (stakeholder-friendly).
@@ -437,7 +474,9 @@ def ui_summarize(
     force: bool = typer.Option(False, "--force", help="Overwrite existing ui_summary.json."),
 ):
     """Write runs/<run_id>/ui/ui_summary.json for stable UI consumption."""
-    cfg = load_config(config)
+    cfg = _load_config(config)
+    from .ui.summarize import write_ui_summary
+
     out = write_ui_summary(cfg, run_id=run_id, force=force)
     typer.echo(str(out))
 
@@ -445,16 +484,18 @@ def ui_summarize(
 @ui_app.command("export")
 def ui_export(
     config: Path = typer.Option(..., "--config", "-c", help="Path to YAML config."),
-    run_ids: str = typer.Option(..., "--run-ids", help="Comma-separated list of run ids (nmax=5)."),
+    run_ids: str = typer.Option(..., "--run-ids", help="Comma-separated list of run ids (any number; shards load on demand)."),
     out_dir: Path = typer.Option(Path("ui_bundle"), "--out-dir", help="Output folder for static HTML bundle."),
     force: bool = typer.Option(False, "--force", help="Overwrite existing ui_summary.json and bundle files."),
 ):
-    """Export a self-contained static HTML viewer for up to 5 runs.
+    """Export a self-contained static HTML viewer for one or many runs.
 
     Open the resulting index.html directly in a browser (no server required).
     """
-    cfg = load_config(config)
+    cfg = _load_config(config)
     rids = [r.strip() for r in run_ids.split(",") if r.strip()]
+    from .ui.bundle import export_ui_bundle
+
     export_ui_bundle(cfg, run_ids=rids, out_dir=out_dir, force=force)
     typer.echo(str(out_dir))
 
@@ -472,6 +513,17 @@ def quality_cluster(
     label_col: Optional[str] = typer.Option(None, "--label-col", help="Optional ground-truth label column (enables ARI/NMI)"),
     feature_cols: list[str] = typer.Option([], "--feature-col", help="Feature column to include (repeatable). If omitted, auto-select numeric-like columns."),
     sample_n: Optional[int] = typer.Option(None, "--sample-n", help="Optional sample size for speed"),
+    silhouette_mode: str = typer.Option(
+        "auto",
+        "--silhouette-mode",
+        help="auto|exact|sampled|centroid. auto picks from row count and --memory-budget-mb.",
+    ),
+    memory_budget_mb: float = typer.Option(512.0, "--memory-budget-mb", help="Memory budget for silhouette distance blocks (MB)"),
+    streaming: Optional[bool] = typer.Option(
+        None,
+        "--streaming/--in-memory",
+        help="Stream parquet record batches instead of loading the table. Default: stream when the feature matrix exceeds --memory-budget-mb.",
+    ),
 ):
     """Compute a lightweight cluster-quality scorecard.
 
@@ -480,25 +532,46 @@ def quality_cluster(
       - cluster_quality.json
       - cluster_quality.md
     """
+    if silhouette_mode not in ("auto", "exact", "sampled", "centroid"):
+        raise typer.BadParameter("silhouette-mode must be one of: auto, exact, sampled, centroid")
     _require_pyarrow()
     from .io.tables import read_auto  # local import keeps CLI import time small
+    from .quality.cluster import compute_cluster_quality, write_cluster_quality_artifacts
+    from .quality.streaming import compute_cluster_quality_streaming, should_stream
 
-    df = read_auto(data_path)
     fcols = feature_cols if feature_cols else None
-    res = compute_cluster_quality(
-        df,
-        cluster_col=cluster_col,
-        label_col=label_col,
-        feature_cols=fcols,
-        sample_n=sample_n,
-    )
+    explicit_streaming = streaming is not None
+    if streaming is None:
+        streaming = should_stream(data_path, memory_budget_mb=memory_budget_mb, cluster_col=cluster_col, label_col=label_col)
+    # Streaming always computes the centroid silhouette over every row.
+    in_memory_only = [
+        opt for opt, given in (("--sample-n", sample_n is not None), ("--silhouette-mode", silhouette_mode in ("exact", "sampled"))) if given
+    ]
+    if streaming and in_memory_only:
+        msg = (
+            f"{' and '.join(in_memory_only)} {'has' if len(in_memory_only) == 1 else 'have'} no effect when streaming "
+            "(the centroid silhouette is computed on all rows)"
+        )
+        if explicit_streaming:
+            raise typer.BadParameter(f"{msg}. Drop them or pass --in-memory.")
+        typer.echo(f"WARNING: {msg}. Ignoring them (pass --in-memory to apply them).", err=True)
+    if streaming:
+        res = compute_cluster_quality_streaming(data_path, cluster_col=cluster_col, label_col=label_col, feature_cols=fcols)
+    else:
+        df = read_auto(data_path)
+        res = compute_cluster_quality(
+            df,
+            cluster_col=cluster_col,
+            label_col=label_col,
+            feature_cols=fcols,
+            sample_n=sample_n,
+            silhouette_mode=silhouette_mode,  # type: ignore[arg-type]
+            memory_budget_mb=memory_budget_mb,
+        )
     p_json, p_md = write_cluster_quality_artifacts(out_dir, res)
     typer.echo(f"Wrote: {p_json}")
     typer.echo(f"Wrote: {p_md}")
 
-if __name__ == "__main__":
-    main()
-
 
 @eval_app.command("run")
 def eval_run(
@@ -510,7 +583,9 @@ def eval_run(
     _require_pyarrow()
     if cfg_path is None:
         raise typer.BadParameter("--config is required for eval (needs run paths + thresholds)")
-    cfg = load_config(cfg_path)
+    cfg = _load_config(cfg_path)
+    from .eval import run_login_eval_for_run
+
     out = run_login_eval_for_run(cfg, run_id=run_id, force=force)
     typer.echo(f"Eval status: {out.status}")
     if out.slices_md: typer.echo(f"- slices: {out.slices_md}")
@@ -531,7 +606,7 @@ def cache_list(
     if cache_dir is None:
         if cfg_path is None:
             raise typer.BadParameter("Provide --cache-dir or --config")
-        cfg = load_config(cfg_path)
+        cfg = _load_config(cfg_path)
         cache_dir = Path(cfg.paths.cache_dir)
 
     entries = iter_feature_cache_entries(Path(cache_dir))
@@ -561,7 +636,7 @@ def cache_prune(
     if cache_dir is None:
         if cfg_path is None:
             raise typer.BadParameter("Provide --cache-dir or --config")
-        cfg = load_config(cfg_path)
+        cfg = _load_config(cfg_path)
         cache_dir = Path(cfg.paths.cache_dir)
 
     res = prune_feature_cache(
@@ -579,3 +654,220 @@ def cache_prune(
     typer.echo(f"{mode}: {len(res.deleted)} entries")
     for p in res.deleted:
         typer.echo(f"- {p}")
+
+
+@share_app.command("zip")
+def share_zip(
+    run_id: str = typer.Option(..., "--run-id", help="Run id to package."),
+    runs_dir: Path = typer.Option(Path("runs"), "--runs-dir", help="Runs root (contains <run_id>/)."),
+    out: Optional[Path] = typer.Option(None, "--out", help="Output zip (default: <run_id>__share.zip)."),
+    workers: Optional[int] = typer.Option(None, "--workers", help="Hash/compress threads (default: min(8, cpu_count))."),
+    level: int = typer.Option(6, "--level", min=1, max=9, help="Deflate level."),
+    dedup: bool = typer.Option(True, "--dedup/--no-dedup", help="Store identical files once; other paths go to share_aliases.json."),
+):
+    """Write a deterministic share zip straight from run artifacts (replaces scripts/make_share_zip.*)."""
+    from .share.zipper import write_share_zip
+
+    rdir = runs_dir / run_id
+    if not rdir.exists():
+        raise typer.BadParameter(f"Missing run dir: {rdir}")
+    res = write_share_zip(run_dir=rdir, out_path=out, workers=workers, level=level, dedup=dedup)
+    typer.echo(
+        f"OK: wrote {res.path} ({res.entries} entries, {res.deduplicated} deduplicated, "
+        f"{res.bytes_in / (1024 * 1024):.2f} MB -> {res.bytes_out / (1024 * 1024):.2f} MB)"
+    )
+
+
+def _resolve_runs_dir(runs_dir: Optional[Path], cfg_path: Optional[Path]) -> Path:
+    if runs_dir is not None:
+        return runs_dir
+    if cfg_path is not None:
+        return Path(_load_config(cfg_path).paths.runs_dir)
+    return Path("runs")
+
+
+@runs_app.command("reindex")
+def runs_reindex(
+    runs_dir: Optional[Path] = typer.Option(None, "--runs-dir", help="Runs root (default: runs, or paths.runs_dir of --config)."),
+    cfg_path: Optional[Path] = typer.Option(None, "--config", help="Config path (to resolve runs_dir)."),
+):
+    """Rebuild the run index from every runs/<run_id>/manifest.json."""
+    from .io.run_index import rebuild_run_index, run_index_path
+
+    rdir = _resolve_runs_dir(runs_dir, cfg_path)
+    n = rebuild_run_index(rdir)
+    typer.echo(f"Indexed {n} runs into {run_index_path(rdir)}")
+
+
+@runs_app.command("list")
+def runs_list(
+    runs_dir: Optional[Path] = typer.Option(None, "--runs-dir", help="Runs root (default: runs, or paths.runs_dir of --config)."),
+    cfg_path: Optional[Path] = typer.Option(None, "--config", help="Config path (to resolve runs_dir)."),
+    last: int = typer.Option(20, "--last", help="Show the N most recently indexed runs (0 = all)."),
+):
+    """List indexed runs (newest first) with config hash and step statuses."""
+    from .io.run_index import list_indexed_runs
+
+    rows = list_indexed_runs(_resolve_runs_dir(runs_dir, cfg_path), last_n=last or None)
+    if not rows:
+        typer.echo("No indexed runs (try: detectlab runs reindex).")
+        return
+    typer.echo("run_id\tconfig_hash\tsteps")
+    for r in rows:
+        steps = ",".join(f"{k}={v}" for k, v in r["steps"].items())
+        typer.echo(f"{r['run_id']}\t{(r['config_hash'] or '')[:12]}\t{steps}")
+
+
+@runs_app.command("best")
+def runs_best(
+    metric: str = typer.Option("recall", "--metric", help="pr_auc | roc_auc | recall | precision | fpr | threshold_used | threshold_for_fpr"),
+    model: str = typer.Option("rf", "--model", help="Model name (e.g. rf, logreg)."),
+    split: str = typer.Option("user_holdout", "--split", help="Split (e.g. user_holdout, time_eval, train)."),
+    label: Optional[str] = typer.Option(None, "--label", help="Restrict to one label."),
+    event: str = typer.Option("login_attempt", "--event", help="Event table."),
+    last: int = typer.Option(100, "--last", help="Consider the N most recently indexed runs (0 = all)."),
+    limit: int = typer.Option(10, "--limit", help="Rows to show."),
+    ascending: bool = typer.Option(False, "--ascending", help="Lowest first (e.g. for fpr)."),
+    runs_dir: Optional[Path] = typer.Option(None, "--runs-dir", help="Runs root (default: runs, or paths.runs_dir of --config)."),
+    cfg_path: Optional[Path] = typer.Option(None, "--config", help="Config path (to resolve runs_dir)."),
+):
+    """Top runs by one metric, e.g. best RF user_holdout recall in the last 100 runs."""
+    from .io.run_index import INDEXED_METRICS, best_runs
+
+    if metric not in INDEXED_METRICS:
+        raise typer.BadParameter(f"--metric must be one of {', '.join(INDEXED_METRICS)}")
+    rows = best_runs(
+        _resolve_runs_dir(runs_dir, cfg_path),
+        metric=metric,
+        model=model,
+        split=split,
+        label=label,
+        event=event,
+        last_n=last or None,
+        limit=limit,
+        descending=not ascending,
+    )
+    if not rows:
+        typer.echo("No matching metrics in the run index.")
+        return
+    typer.echo(f"run_id\tlabel\t{metric}")
+    for r in rows:
+        typer.echo(f"{r['run_id']}\t{r['label']}\t{r['value']:.4f}")
+
+
+@app.command("bench")
+def bench(
+    suite: str = typer.Option("kernels", "--suite", help="kernels (FeatureLab kernels/builders) | e2e (`run mvp` per stage)."),
+    benchmarks: list[str] = typer.Option([], "--bench", "-b", help="Kernel benchmark to run (repeatable; default: all). See --list."),
+    preset: Optional[str] = typer.Option(
+        None,
+        "--preset",
+        help="kernels: quick (default; 10k-100k rows) | full (10k-10M rows, 10-100k entities). e2e: smoke (default) | mvp | heavy.",
+    ),
+    config: Optional[Path] = typer.Option(None, "--config", "-c", help="e2e: benchmark this config instead of a preset."),
+    rows: list[int] = typer.Option([], "--rows", help="Row count (repeatable; overrides the preset)."),
+    entities: list[int] = typer.Option([], "--entities", help="Distinct users/IPs/devices (repeatable; overrides the preset)."),
+    repeat: Optional[int] = typer.Option(None, "--repeat", min=1, help="kernels: timed calls per case (default 3); e2e: runs (default 1)."),
+    budget_s: float = typer.Option(120.0, "--budget-s", help="Skip larger cases once one is projected to exceed this many seconds."),
+    memory: bool = typer.Option(True, "--memory/--no-memory", help="Measure peak traced allocation (one extra call per case)."),
+    seed: int = typer.Option(0, "--seed", help="Synthetic data seed."),
+    out: Optional[Path] = typer.Option(None, "--out", help="Results JSON (default: runs/bench/<suite>_<utc>.json)."),
+    baseline: Optional[Path] = typer.Option(None, "--baseline", help="Baseline results JSON; exit 1 if anything regresses."),
+    tolerance: float = typer.Option(0.25, "--tolerance", help="Allowed relative slowdown vs --baseline (0.25 = +25%)."),
+    mem_tolerance: Optional[float] = typer.Option(None, "--mem-tolerance", help="Allowed relative memory growth (default: --tolerance)."),
+    list_only: bool = typer.Option(False, "--list", help="List benchmarks and presets, then exit."),
+):
+    """Benchmark FeatureLab kernels or the end-to-end MVP run; writes JSON and optionally gates on a baseline."""
+    from datetime import datetime, timezone
+
+    from .bench import BENCHMARKS, E2E_PRESETS, PRESETS, compare_results, load_results, run_benchmarks, run_e2e_benchmark, write_results
+
+    if list_only:
+        for name, b in BENCHMARKS.items():
+            typer.echo(f"{name}\t{b.description}")
+        for name, grid in PRESETS.items():
+            typer.echo(f"preset {name}\trows={list(grid['rows'])} entities={list(grid['entities'])}")
+        for name, path in E2E_PRESETS.items():
+            typer.echo(f"e2e preset {name}\t{path}")
+        return
+
+    if suite == "kernels":
+        preset = preset or "quick"
+        if preset not in PRESETS:
+            raise typer.BadParameter(f"--preset must be one of {', '.join(PRESETS)}")
+        try:
+            payload = run_benchmarks(
+                benchmarks or None,
+                rows=rows or PRESETS[preset]["rows"],
+                entities=entities or PRESETS[preset]["entities"],
+                repeat=repeat or 3,
+                seed=seed,
+                budget_s=budget_s,
+                memory=memory,
+            )
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--bench")
+        typer.echo("benchmark\trows\tentities\tmedian_s\trows_per_s\tpeak_traced_mb\tstatus")
+        for r in payload["results"]:
+            if r["status"] == "ok":
+                typer.echo(f"{r['benchmark']}\t{r['rows']}\t{r['entities']}\t{r['median_s']:.4f}\t{r['rows_per_s']:.0f}\t{r['peak_traced_mb']}\tok")
+            else:
+                typer.echo(f"{r['benchmark']}\t{r['rows']}\t{r['entities']}\t\t\t\t{r['status']}: {r['reason']}")
+    elif suite == "e2e":
+        preset = None if config is not None else (preset or "smoke")
+        if preset is not None and preset not in E2E_PRESETS:
+            raise typer.BadParameter(f"--preset must be one of {', '.join(E2E_PRESETS)} for --suite e2e")
+        _require_pyarrow()
+        payload = run_e2e_benchmark(preset, cfg_path=config, repeat=repeat or 1)
+        typer.echo("stage\twall_s\tcpu_s\tpeak_rss_mb\tstatus")
+        for name, s in payload["stages"].items():
+            typer.echo(f"{name}\t{s['wall_s']}\t{s['cpu_s']}\t{s['peak_rss_mb']}\t{s['status']}")
+        typer.echo(f"total\t{payload['total_wall_s']}\t\t{payload['peak_rss_mb']}\t{payload['status']}")
+        for tail in payload["failures"]:
+            typer.echo(f"[run mvp failed]\n{tail}")
+    else:
+        raise typer.BadParameter("--suite must be one of: kernels, e2e")
+
+    if out is None:
+        out = Path("runs") / "bench" / f"{suite}_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    typer.echo(f"Wrote: {write_results(payload, out)}")
+
+    if baseline is not None:
+        cmp = compare_results(payload, load_results(baseline), tolerance=tolerance, mem_tolerance=mem_tolerance)
+        if cmp.config_mismatch:
+            typer.echo("WARNING: baseline was recorded with a different config; comparison may not be like-for-like.")
+        for key in cmp.only_in_baseline:
+            typer.echo(f"MISSING - {key} (in baseline, not measured now)")
+        for r in cmp.regressions:
+            typer.echo(f"REGRESSION - {r.key} {r.metric}: {r.baseline:g} -> {r.current:g} (x{r.ratio:.2f})")
+        typer.echo(f"Baseline check: {'OK' if cmp.ok else 'FAIL'} ({cmp.compared} compared, {len(cmp.regressions)} regressions)")
+        if not cmp.ok:
+            raise typer.Exit(code=1)
+    if payload.get("status", "ok") != "ok":
+        raise typer.Exit(code=1)
+
+
+@app.command("warmup")
+def warmup():
+    """Precompile the numba kernels into the on-disk JIT cache (no-op on the NumPy fallback)."""
+    import time
+
+    t0 = time.perf_counter()
+    from . import kernels
+
+    load_s = time.perf_counter() - t0
+    if not kernels.NUMBA_AVAILABLE:
+        typer.echo("numba is not installed; kernels use the NumPy fallback (nothing to compile).")
+        return
+    import numba
+
+    cache_dir = numba.config.CACHE_DIR or str(Path(kernels.__file__).parent / "__pycache__")
+    typer.echo(f"numba {numba.__version__}; kernels compiled/loaded in {load_s:.2f}s (cache: {cache_dir})")
+    if kernels.kernel_backend() != "numba":
+        typer.echo("Note: DETECTLAB_KERNELS selects the NumPy backend; compiled kernels are unused.")
+    for name, seconds in kernels.warmup().items():
+        typer.echo(f"{name}\t{seconds:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
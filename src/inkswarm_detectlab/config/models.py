@@ -25,6 +25,8 @@ class RunConfig(BaseModel):
     # This replaces the older date-based ids and matches the RR2 operator convention.
     run_id_prefix: str = Field(default="RUN")
     run_id_width: int = Field(default=4, ge=3, le=8)
+    # MVP stage graph: how many independent stages may run at once (1 = strictly sequential).
+    stage_workers: int = Field(default=4, ge=1, le=32)
 
 
 class SkynetSeasonalityConfig(BaseModel):
@@ -114,6 +116,9 @@ class LoginFeatureConfig(BaseModel):
     # Time windows for rolling aggregates.
     windows: list[str] = Field(default_factory=lambda: ["1h", "6h", "24h", "7d"])
 
+    # Half-lives for exponentially decayed count/sum/rate features (one scan for all); empty: off.
+    half_lives: list[str] = Field(default_factory=list)
+
     # Entities to aggregate by (safe aggregates only).
     entities: list[Literal["user", "ip", "device"]] = Field(default_factory=lambda: ["user", "ip", "device"])
 
@@ -144,6 +149,9 @@ class CheckoutFeatureConfig(BaseModel):
     # Time windows for rolling aggregates.
     windows: list[str] = Field(default_factory=lambda: ["1h", "6h", "24h", "7d"])
 
+    # Half-lives for exponentially decayed count/sum/rate features (one scan for all); empty: off.
+    half_lives: list[str] = Field(default_factory=list)
+
     # Entities to aggregate by (safe aggregates only).
     entities: list[Literal["user", "ip", "device"]] = Field(default_factory=lambda: ["user", "ip", "device"])
 
@@ -157,9 +165,42 @@ class CheckoutFeatureConfig(BaseModel):
     # is_adverse = checkout_result in {failure, review}
     include_is_adverse: bool = Field(default=True)
 
+class FeatureDtypePolicyConfig(BaseModel):
+    """Storage dtypes for feature columns, chosen by column-name suffix.
+
+    counts: `*_cnt`; rates: `*_rate` and `*_mean`; sums: `*_sum`. Columns with any
+    other suffix stay float64. Set everything to float64 to reproduce the legacy tables.
+    """
+
+    counts: Literal["int32", "int64", "float64"] = Field(default="int32")
+    rates: Literal["float32", "float64"] = Field(default="float32")
+    sums: Literal["float32", "float64"] = Field(default="float32")
+
+
+class UniqueCountConfig(BaseModel):
+    """How `*_uniq_*_cnt` features are computed.
+
+    exact: per-group hash map of every distinct value in the window (default).
+    hll: sliding-window HyperLogLog for windows >= `hll_min_window` (shorter windows stay
+    exact); bounded state per group at a relative standard error of 1.04 / sqrt(2**hll_precision).
+    """
+
+    mode: Literal["exact", "hll"] = Field(default="exact")
+    hll_precision: int = Field(default=12, ge=4, le=16, description="log2 of the register count (12 -> ~1.6% error).")
+    hll_min_window: str = Field(default="7d", description="Smallest window (e.g. 24h, 7d) that uses the approximation.")
+
+
 class FeaturesConfig(BaseModel):
     login_attempt: LoginFeatureConfig = Field(default_factory=LoginFeatureConfig)
     checkout_attempt: CheckoutFeatureConfig = Field(default_factory=CheckoutFeatureConfig)
+    dtype_policy: FeatureDtypePolicyConfig = Field(
+        default_factory=FeatureDtypePolicyConfig,
+        description="Per-kind storage dtypes written by the feature builders and honored by model/eval loaders.",
+    )
+    unique_counts: UniqueCountConfig = Field(
+        default_factory=UniqueCountConfig,
+        description="Exact or approximate (HyperLogLog) unique-count features; recorded in feature_spec.json.",
+    )
     use_cache: bool = Field(default=True, description="If true, attempt to restore feature artifacts from the shared cache (cross-run).")
     write_cache: bool = Field(default=True, description="If true, write freshly-built feature artifacts into the shared cache for reuse.")
 
@@ -15,8 +15,10 @@ from ..io.paths import run_dir as run_dir_for, manifest_path
 from ..io.manifest import read_manifest, write_manifest
 from ..io.tables import read_auto
 from ..utils.hashing import stable_hash_dict
+from ..utils.perf import profiled, stage_note
 from ..models.metrics import choose_threshold_for_fpr
-from ..models.runner import LABEL_COLS, _select_X_y  # reuse exact feature selection logic
+from ..models.runner import LABEL_COLS, SCORES_BASENAME, SPLITS, _select_X_y, score_column  # reuse exact feature selection logic
+from .slices import SliceIndex, build_slice_index, compute_slice_metrics
 
 import joblib
 
@@ -179,35 +181,51 @@ def _slice_defs(df: pd.DataFrame) -> list[tuple[str, pd.Series]]:
     return out
 
 
-def _slice_metrics(y: np.ndarray, s: np.ndarray, thr: float) -> dict[str, Any]:
-    n = int(len(y))
-    pos = int(np.sum(y))
-    pos_rate = float(pos / n) if n else 0.0
-    # PR-AUC
+@dataclass(frozen=True)
+class _PreparedSplit:
+    """One dataset split aligned to its scored rows (built once per split)."""
+
+    rows: pd.DataFrame  # persisted score rows, or feature rows when re-scoring
+    X: pd.DataFrame | None  # feature matrix (re-scoring only)
+    frame: pd.DataFrame  # dataset rows aligned 1:1 with `rows` (covariates + labels)
+    slices: SliceIndex
+
+    def y(self, label: str) -> np.ndarray:
+        if label not in self.frame.columns:
+            return np.zeros(len(self.frame), dtype=int)
+        return self.frame[label].fillna(0).astype(int).to_numpy()
+
+    def scores(self, label: str, model_name: str, model: Any) -> np.ndarray:
+        if self.X is None:
+            return self.rows[score_column(label, model_name)].to_numpy(dtype=np.float64)
+        return _predict_scores(model, self.X)
+
+
+def _prepare_split(sdf: pd.DataFrame | None, rows: pd.DataFrame | None, *, rescoring: bool) -> _PreparedSplit | None:
+    """Align one split's scored rows (already selected by split) to its dataset rows."""
+    if sdf is None or sdf.empty or rows is None or rows.empty or "event_id" not in sdf.columns:
+        return None
+    # Vectorized event_id join: integer positions of each scored row in the dataset split.
+    pos = pd.Index(sdf["event_id"].astype(str)).get_indexer(rows["event_id"].astype(str))
+    hit = pos >= 0
+    if not hit.any():
+        return None
+    if not hit.all():
+        rows = rows[hit]
+    frame = sdf.iloc[pos[hit]].reset_index(drop=True)
+    rows = rows.reset_index(drop=True)
+    X = _select_X_y(rows)[0] if rescoring else None  # exact numeric selection logic
+    return _PreparedSplit(rows=rows, X=X, frame=frame, slices=build_slice_index(_slice_defs(frame)))
+
+
+def _read_feature_split(feat_path: Path, split: str) -> tuple[pd.DataFrame | None, str | None]:
+    """Read one split of the (split-partitioned) feature table via predicate pushdown."""
     try:
-        from sklearn.metrics import average_precision_score
-
-        pr_auc = float(average_precision_score(y, s)) if len(np.unique(y)) > 1 else 0.0
-    except Exception:
-        pr_auc = 0.0
-
-    # At threshold
-    pred = s >= float(thr)
-    fp = int(np.sum((pred == 1) & (y == 0)))
-    tp = int(np.sum((pred == 1) & (y == 1)))
-    tn = int(np.sum((pred == 0) & (y == 0)))
-    fn = int(np.sum((pred == 0) & (y == 1)))
-
-    fpr = float(fp / (fp + tn)) if (fp + tn) else 0.0
-    recall = float(tp / (tp + fn)) if (tp + fn) else 0.0
-    precision = float(tp / (tp + fp)) if (tp + fp) else 0.0
-    return {
-        "rows": n,
-        "positives": pos,
-        "pos_rate": pos_rate,
-        "pr_auc": pr_auc,
-        "at_train_threshold": {"threshold": float(thr), "fpr": fpr, "recall": recall, "precision": precision},
-    }
+        df = pd.read_parquet(feat_path, filters=[("split", "=", split)])
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    stage_note(rows_in=len(df))
+    return df, None
 
 
 def _render_md_slices(payload: dict[str, Any]) -> str:
@@ -310,6 +328,7 @@ def _render_md_stability(payload: dict[str, Any]) -> str:
     return "\n".join(lines).rstrip() + "\n"
 
 
+@profiled("run_login_eval_for_run")
 def run_login_eval_for_run(cfg: AppConfig, *, run_id: str, force: bool = False) -> EvalOutputs:
     """Compute slice + stability diagnostics for login_attempt.
 
@@ -317,6 +336,7 @@ def run_login_eval_for_run(cfg: AppConfig, *, run_id: str, force: bool = False)
     - If required parquet artifacts or models are missing, we still write reports with Notes and status=partial.
     """
     rdir = run_dir_for(cfg.paths.runs_dir, run_id)
+    stage_note(run_dir=rdir)
     mpath = manifest_path(rdir)
     manifest = read_manifest(mpath) if mpath.exists() else {"run_id": run_id, "artifacts": {}}
 
@@ -354,39 +374,72 @@ def run_login_eval_for_run(cfg: AppConfig, *, run_id: str, force: bool = False)
         else:
             splits[k] = df
 
-    # Load feature table for scoring (must contain numeric features)
-    feat_path = rdir / "features" / "login_attempt" / "features.parquet"
-    feat_df, err = _safe_read_auto(feat_path)
-    if feat_df is None:
-        status = "partial"
-        notes.append(f"Missing features table for scoring: {feat_path} ({err})")
-
-    # Load trained models (logreg + rf)
-    model_dir = rdir / "models" / "login_attempt" / "baselines"
+    model_dir = rdir / "models" / "login_attempt"  # discovery looks under <model_dir>/baselines
     expected_models = list(cfg.baselines.login_attempt.models)
 
-    model_artifacts, disc_notes = _discover_baseline_artifacts(model_dir, expected_models)
-    notes.extend(disc_notes)
-
-    # Load models into a nested mapping: model_name -> label -> model_object
+    # Prefer the score vectors persisted by BaselineLab: no model loading, no feature
+    # join and no re-prediction. Runs without them fall back to re-scoring features.
+    scores_df, scores_err = _safe_read_auto(model_dir / "baselines" / SCORES_BASENAME)
+    # Scored rows per split, selected once via the `split` column and reused across models x labels.
+    split_rows: dict[str, pd.DataFrame] = {}
+    rescoring = scores_df is None or "event_id" not in scores_df.columns
     models: dict[str, dict[str, Any]] = {}
-    for model_name, label_map in model_artifacts.items():
-        loaded_labels: dict[str, Any] = {}
-        for label, p in label_map.items():
-            mobj, err = _safe_load_model(p)
-            if mobj is None:
-                status = "partial"
-                notes.append(f"Failed to load model artifact '{label}__{model_name}' at {p}: {err}")
-                continue
-            loaded_labels[label] = mobj
 
-        if loaded_labels:
-            models[model_name] = loaded_labels
-
-    if not models:
-        status = "partial"
-        notes.append(f"No loadable baseline model artifacts found under: {model_dir}")
+    if not rescoring:
+        meta["scores_source"] = "persisted"
+        if "split" in scores_df.columns:
+            for split_name, rows in scores_df.groupby("split", sort=False, observed=True):
+                split_rows[str(split_name)] = rows
+        for model_name in expected_models:
+            # model_name -> label -> None (scores are read from the table, not a model object)
+            labels: dict[str, Any] = {
+                label: None for label in LABEL_COLS if score_column(label, model_name) in scores_df.columns
+            }
+            if labels:
+                models[model_name] = labels
+        if not models:
+            status = "partial"
+            notes.append(f"No baseline score columns found in {model_dir / 'baselines' / SCORES_BASENAME}.parquet")
     else:
+        meta["scores_source"] = "rescored"
+        notes.append(f"Persisted baseline scores unavailable ({scores_err}); re-scoring from model artifacts")
+
+        # Load feature rows for scoring (must contain numeric features), one split at a time.
+        feat_path = rdir / "features" / "login_attempt" / "features.parquet"
+        if not feat_path.exists():
+            status = "partial"
+            notes.append(f"Missing features table for scoring: {feat_path}")
+        else:
+            for split_name in SPLITS:
+                rows, err = _read_feature_split(feat_path, split_name)
+                if rows is None:
+                    status = "partial"
+                    notes.append(f"Failed to read features for split {split_name} at {feat_path} ({err})")
+                    continue
+                split_rows[split_name] = rows
+
+        model_artifacts, disc_notes = _discover_baseline_artifacts(model_dir, expected_models)
+        notes.extend(disc_notes)
+
+        # Load models into a nested mapping: model_name -> label -> model_object
+        for model_name, label_map in model_artifacts.items():
+            loaded_labels: dict[str, Any] = {}
+            for label, p in label_map.items():
+                mobj, err = _safe_load_model(p)
+                if mobj is None:
+                    status = "partial"
+                    notes.append(f"Failed to load model artifact '{label}__{model_name}' at {p}: {err}")
+                    continue
+                loaded_labels[label] = mobj
+
+            if loaded_labels:
+                models[model_name] = loaded_labels
+
+        if not models:
+            status = "partial"
+            notes.append(f"No loadable baseline model artifacts found under: {model_dir}")
+
+    if models:
         missing_models = [m for m in expected_models if m not in models]
         if missing_models:
             status = "partial"
@@ -396,18 +449,27 @@ def run_login_eval_for_run(cfg: AppConfig, *, run_id: str, force: bool = False)
 
     stability_payload: dict[str, Any] = {"status": status, "meta": meta, "models": {}, "notes": notes[:]}
 
-    if feat_df is not None and splits and models:
+    if split_rows and splits and models:
         # Prepare lookup for slice columns: use dataset split df (has covariates)
-        # Scoring will be done using features df filtered by event_id in each split.
+        # Scores come from the persisted table or from the features of each split.
         # This avoids any accidental look-ahead: features are already rolled past-only.
-        feat_df = feat_df.copy()
-        if "event_id" not in feat_df.columns:
+        if any("event_id" not in rows.columns for rows in split_rows.values()):
             status = "partial"
             notes.append("features table missing event_id; cannot join to splits")
-        else:
-            feat_df.set_index("event_id", inplace=True, drop=False)
 
-        # Compute per split scored matrices
+        # Align every split to its scored rows (and build slice masks) once;
+        # reused across all models x labels.
+        prepared: dict[str, _PreparedSplit] = {}
+        for split_name in SPLITS:
+            rows = split_rows.get(split_name)
+            if rows is None or "event_id" not in rows.columns:
+                continue
+            prep = _prepare_split(splits.get(split_name), rows, rescoring=rescoring)
+            if prep is not None:
+                prepared[split_name] = prep
+
+        target_fpr = float(cfg.baselines.login_attempt.target_fpr)
+
         for model_name, label_models in models.items():
             slices_payload["models"].setdefault(model_name, {"labels": {}})
             stability_payload["models"].setdefault(model_name, {"labels": {}})
@@ -418,83 +480,56 @@ def run_login_eval_for_run(cfg: AppConfig, *, run_id: str, force: bool = False)
                     notes.append(f"Label column missing in dataset for {label}; skipping")
                     continue
 
-                model = label_models.get(label)
-                if model is None:
+                if label not in label_models:
                     status = "partial"
                     notes.append(f"Missing baseline artifact for model='{model_name}', label='{label}' in {model_dir}")
                     continue
+                model = label_models[label]
+
+                scored = {
+                    split_name: (prep.y(label), prep.scores(label, model_name, model))
+                    for split_name, prep in prepared.items()
+                }
 
-                # Get train threshold for target fpr
-                # Build X/y from FEATURES joined with train split event_ids
-                def _prep(split_name: str) -> tuple[np.ndarray, np.ndarray, pd.DataFrame] | None:
-                    sdf = splits.get(split_name)
-                    if sdf is None or sdf.empty:
-                        return None
-                    ids = sdf["event_id"].astype(str).tolist() if "event_id" in sdf.columns else []
-                    fsub = feat_df.loc[feat_df.index.intersection(ids)].copy() if feat_df is not None else None
-                    if fsub is None or fsub.empty:
-                        return None
-                    # Align y with fsub rows via merge on event_id
-                    y = sdf.set_index("event_id")[label].reindex(fsub["event_id"]).fillna(0).astype(int).to_numpy()
-                    X, _ys = _select_X_y(fsub)  # exact numeric selection logic
-                    s = _predict_scores(model, X)
-                    return y, s, sdf.set_index("event_id").reindex(fsub["event_id"]).reset_index(drop=False)
-
-                train_p = _prep("train")
-                time_p = _prep("time_eval")
-                hold_p = _prep("user_holdout")
-
-                if train_p is None:
+                if "train" not in scored:
                     status = "partial"
                     notes.append(f"Could not score train split for {model_name}/{label} (missing features?)")
                     continue
-                y_tr, s_tr, df_tr = train_p
-                thr_tr = choose_threshold_for_fpr(y_tr, s_tr, target_fpr=float(cfg.baselines.login_attempt.target_fpr))
+                y_tr, s_tr = scored["train"]
+                thr_tr = choose_threshold_for_fpr(y_tr, s_tr, target_fpr=target_fpr)
                 train_thr = float(thr_tr.threshold)
 
-                # Stability core metrics
-                def _core(y: np.ndarray, s: np.ndarray) -> dict[str, Any]:
-                    try:
-                        from sklearn.metrics import average_precision_score
+                # Slices per split (one batched pass per scored vector)
+                l_slices: dict[str, Any] = {"train_threshold": train_thr, "splits": {}}
+                for split_name, (y, s) in scored.items():
+                    slice_rows = compute_slice_metrics(prepared[split_name].slices, y, s, train_thr)
+                    l_slices["splits"][split_name] = {"slices": slice_rows}
+                slices_payload["models"][model_name]["labels"][label] = l_slices
 
-                        pr_auc = float(average_precision_score(y, s)) if len(np.unique(y)) > 1 else 0.0
-                    except Exception:
-                        pr_auc = 0.0
-                    at = _slice_metrics(y, s, train_thr)["at_train_threshold"]
+                # Stability core metrics (the "All" slice already holds PR-AUC + metrics at train thr)
+                def _core(split_name: str) -> dict[str, Any]:
+                    if split_name not in scored:
+                        return {}
+                    y, s = scored[split_name]
+                    everything = l_slices["splits"][split_name]["slices"].get("All", {})
+                    at = everything.get("at_train_threshold", {}) or {}
                     # threshold needed at same target fpr on this split
-                    thr = choose_threshold_for_fpr(y, s, target_fpr=float(cfg.baselines.login_attempt.target_fpr))
+                    thr = choose_threshold_for_fpr(y, s, target_fpr=target_fpr)
                     return {
-                        "pr_auc": pr_auc,
-                        "recall_at_train_thr": float(at["recall"]),
-                        "fpr_at_train_thr": float(at["fpr"]),
-                        "precision_at_train_thr": float(at["precision"]),
+                        "pr_auc": float(everything.get("pr_auc", 0.0)),
+                        "recall_at_train_thr": float(at.get("recall", 0.0)),
+                        "fpr_at_train_thr": float(at.get("fpr", 0.0)),
+                        "precision_at_train_thr": float(at.get("precision", 0.0)),
                         "threshold_for_fpr": float(thr.threshold),
                     }
 
                 l_stab = {
                     "train_threshold": train_thr,
-                    "time_eval": _core(*time_p[:2]) if time_p is not None else {},
-                    "user_holdout": _core(*hold_p[:2]) if hold_p is not None else {},
+                    "time_eval": _core("time_eval"),
+                    "user_holdout": _core("user_holdout"),
                 }
                 stability_payload["models"][model_name]["labels"][label] = l_stab
 
-                # Slices per split
-                l_slices: dict[str, Any] = {"train_threshold": train_thr, "splits": {}}
-                for split_name, prep in [("train", train_p), ("time_eval", time_p), ("user_holdout", hold_p)]:
-                    if prep is None:
-                        continue
-                    y, s, sdf_aligned = prep
-                    # compute slice masks on sdf_aligned (dataset rows aligned to scored events)
-                    slice_rows = {}
-                    for sname, mask in _slice_defs(sdf_aligned):
-                        mask = mask.fillna(False)
-                        if int(mask.sum()) == 0:
-                            continue
-                        sm = _slice_metrics(y[mask.to_numpy()], s[mask.to_numpy()], train_thr)
-                        slice_rows[sname] = sm
-                    l_slices["splits"][split_name] = {"slices": slice_rows}
-                slices_payload["models"][model_name]["labels"][label] = l_slices
-
     # Write outputs
     slices_json.write_text(json.dumps(slices_payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
     stability_json.write_text(json.dumps(stability_payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
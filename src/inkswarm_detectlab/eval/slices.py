@@ -0,0 +1,109 @@
+"""Batched slice metrics for eval.
+
+Slice masks are materialized once per split into a `SliceIndex`. Rows are encoded
+by their membership pattern (which slices they belong to), so confusion counts for
+every slice come from a single `np.bincount` over (pattern, outcome) codes per
+scored vector. Slices may overlap (e.g. "All" vs. playbook flags); the pattern
+table maps pattern counts back onto each slice.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class SliceIndex:
+    names: list[str]
+    masks: np.ndarray  # bool (n_rows, n_slices)
+    codes: np.ndarray  # int64 (n_rows,) membership-pattern code per row
+    patterns: np.ndarray  # bool (n_patterns, n_slices)
+
+    @property
+    def rows(self) -> np.ndarray:
+        return self.masks.sum(axis=0).astype(np.int64)
+
+
+def build_slice_index(defs: list[tuple[str, pd.Series]]) -> SliceIndex:
+    """Materialize (name, mask) slice definitions for one split.
+
+    Zero-sized slices are dropped here, once, instead of per scored vector.
+    """
+    names: list[str] = []
+    cols: list[np.ndarray] = []
+    for name, mask in defs:
+        m = mask.fillna(False).to_numpy(dtype=bool)
+        if not m.any():
+            continue
+        names.append(name)
+        cols.append(m)
+
+    n_rows = len(defs[0][1]) if defs else 0
+    masks = np.column_stack(cols) if cols else np.zeros((n_rows, 0), dtype=bool)
+    if masks.shape[0] == 0:
+        return SliceIndex(names, masks, np.zeros(0, dtype=np.int64), np.zeros((0, len(names)), dtype=bool))
+    patterns, codes = np.unique(masks, axis=0, return_inverse=True)
+    return SliceIndex(names, masks, np.asarray(codes, dtype=np.int64).reshape(-1), patterns)
+
+
+def _average_precision_sorted(pos_sorted: np.ndarray, s_sorted: np.ndarray) -> float:
+    """Average precision for rows already sorted by descending score.
+
+    Same step-wise definition as sklearn's `average_precision_score` (one
+    operating point per distinct score).
+    """
+    n_pos = int(pos_sorted.sum())
+    if n_pos == 0 or n_pos == len(pos_sorted):
+        return 0.0
+    ends = np.flatnonzero(np.r_[s_sorted[1:] != s_sorted[:-1], True])
+    tps = np.cumsum(pos_sorted, dtype=np.int64)[ends]
+    precision = tps / (ends + 1)
+    recall_step = np.diff(tps, prepend=0) / n_pos
+    return float(np.sum(recall_step * precision))
+
+
+def compute_slice_metrics(index: SliceIndex, y: np.ndarray, s: np.ndarray, thr: float) -> dict[str, dict[str, Any]]:
+    """Metrics for every slice of `index` for one scored vector.
+
+    Output per slice matches the eval slices payload: rows, positives, pos_rate,
+    pr_auc and `at_train_threshold` (fpr/recall/precision at `thr`).
+    """
+    y = np.asarray(y).astype(int)
+    s = np.asarray(s).astype(float)
+    pos = y == 1
+    pred = s >= float(thr)
+
+    # Outcome cell: 0=tn, 1=fp, 2=fn, 3=tp
+    cell = 2 * pos.astype(np.int64) + pred.astype(np.int64)
+    n_pat = int(index.patterns.shape[0])
+    counts = np.bincount(index.codes * 4 + cell, minlength=n_pat * 4).reshape(n_pat, 4)
+    per_slice = index.patterns.T.astype(np.int64) @ counts
+
+    order = np.argsort(-s, kind="mergesort")
+    s_sorted = s[order]
+    pos_sorted = pos[order]
+    masks_sorted = index.masks[order]
+
+    out: dict[str, dict[str, Any]] = {}
+    for j, name in enumerate(index.names):
+        tn, fp, fn, tp = (int(v) for v in per_slice[j])
+        n = tn + fp + fn + tp
+        positives = fn + tp
+        m = masks_sorted[:, j]
+        out[name] = {
+            "rows": n,
+            "positives": positives,
+            "pos_rate": float(positives / n) if n else 0.0,
+            "pr_auc": _average_precision_sorted(pos_sorted[m], s_sorted[m]),
+            "at_train_threshold": {
+                "threshold": float(thr),
+                "fpr": float(fp / (fp + tn)) if (fp + tn) else 0.0,
+                "recall": float(tp / (tp + fn)) if (tp + fn) else 0.0,
+                "precision": float(tp / (tp + fp)) if (tp + fp) else 0.0,
+            },
+        }
+    return out
@@ -2,13 +2,24 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import timedelta
-from typing import Tuple
-from weakref import WeakKeyDictionary
+from typing import Any, Mapping
 
 import numpy as np
 import pandas as pd
 
-from .._compat_numba import njit, typed_dict_empty
+from ..kernels import (
+    HLL_DEFAULT_PRECISION,
+    cross_window_sums,
+    decayed_sums,
+    hll_relative_error,
+    prefix_sums,
+    sliding_unique_counts,
+    sliding_unique_counts_hll,
+    window_sums,
+    window_sums_from_prefix,
+)
+from .catalog import checkout_feature_set, login_feature_set
+from .spec import AggregateSpec, FeatureSetSpec
 
 
 @dataclass(frozen=True)
@@ -39,129 +50,100 @@ def _ensure_dt(df: pd.DataFrame) -> pd.Series:
     return pd.to_datetime(ts, errors="raise")
 
 
-def _bool_int(s: pd.Series) -> pd.Series:
-    return s.astype(bool).astype(np.int64)
+# Feature-column kinds by name suffix (see FeatureDtypePolicyConfig).
+_DTYPE_KIND_SUFFIXES: tuple[tuple[str, str], ...] = (
+    ("_dcnt", "sums"),  # decayed counts are not integers
+    ("_cnt", "counts"),
+    ("_rate", "rates"),
+    ("_mean", "rates"),
+    ("_sum", "sums"),
+)
 
 
-def _rolling_sum_by_time(
+def feature_dtype_kind(col: str) -> str | None:
+    for suffix, kind in _DTYPE_KIND_SUFFIXES:
+        if col.endswith(suffix):
+            return kind
+    return None
+
+
+def _finalize_feature_columns(
+    df: pd.DataFrame,
+    feature_cols: list[str],
+    dtype_policy: Mapping[str, str] | None,
+) -> None:
+    """Coerce features to numeric (NaN -> 0) and cast them to their policy dtype.
+
+    Counts are produced as exact float64 integers by the rolling kernels, so the
+    integer cast rounds rather than truncates. Without a policy everything is float64.
+    """
+    policy = dict(dtype_policy or {})
+    for c in feature_cols:
+        if c not in df.columns:
+            continue
+        v = pd.to_numeric(df[c], errors="coerce").fillna(0.0)
+        dtype = np.dtype(policy.get(feature_dtype_kind(c) or "", "float64"))
+        if dtype.kind in "iu":
+            v = np.rint(v)
+        df[c] = v.astype(dtype)
+
+
+def _ts_ns(s: pd.Series) -> np.ndarray:
+    """Epoch nanoseconds (UTC for tz-aware input) as int64."""
+    return pd.DatetimeIndex(s).as_unit("ns").asi8
+
+
+def _window_ns(window: str | timedelta) -> int:
+    return int(pd.Timedelta(window).value)
+
+
+def _group_sorted(codes: np.ndarray, ts_ns: np.ndarray) -> np.ndarray:
+    """Stable (group code, ts) order; ties keep the frame's own order."""
+    return np.lexsort((ts_ns, codes))
+
+
+def _group_codes(s: pd.Series) -> np.ndarray:
+    return pd.factorize(s, sort=False, use_na_sentinel=False)[0].astype(np.int64)
+
+
+def _rolling_sums_by_time(
     df: pd.DataFrame,
     *,
     group_key: str,
-    value_col: str,
+    value_cols: list[str],
     window: str,
     strict_past_only: bool,
-) -> np.ndarray:
-    """Time-based rolling sum per group, aligned to df row order.
+) -> dict[str, np.ndarray]:
+    """Time-based rolling sums per group for several columns at once, aligned to df row order.
 
     Requirement: df must already be globally sorted by event_ts (and stable tie-breakers).
-    closed='left' enforces strict past-only (excludes current timestamp).
+    strict_past_only: window [t-window, t), same-timestamp rows excluded (pandas closed='left');
+    otherwise [t-window, t] up to and including the current row (closed='both').
     """
-    d = df[[group_key, "event_ts", value_col]].copy()
-    d["event_ts"] = _ensure_dt(d).values
-    d = d.set_index("event_ts")
-    closed = "left" if strict_past_only else "both"
-    s = (
-        d.groupby(group_key, sort=False)[value_col]
-        .rolling(window, closed=closed)
-        .sum()
-        .reset_index(level=0, drop=True)
+    codes = _group_codes(df[group_key])
+    ts = _ts_ns(_ensure_dt(df))
+    order = _group_sorted(codes, ts)
+    values = np.column_stack(
+        [pd.to_numeric(df[c], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64) for c in value_cols]
     )
-    return s.fillna(0.0).to_numpy()
+    sums = window_sums(codes[order], ts[order], values[order], _window_ns(window), include_current=not strict_past_only)
+    out = np.empty_like(sums)
+    out[order] = sums
+    return {c: out[:, i] for i, c in enumerate(value_cols)}
 
 
-def _rolling_cnt_by_time(
+def _rolling_sum_by_time(
     df: pd.DataFrame,
     *,
     group_key: str,
+    value_col: str,
     window: str,
     strict_past_only: bool,
 ) -> np.ndarray:
-    d = df[[group_key, "event_ts"]].copy()
-    d["event_ts"] = _ensure_dt(d).values
-    d = d.set_index("event_ts")
-    closed = "left" if strict_past_only else "both"
-    s = (
-        d.groupby(group_key, sort=False)[group_key]
-        .rolling(window, closed=closed)
-        .count()
-        .reset_index(level=0, drop=True)
-    )
-    return s.fillna(0.0).to_numpy()
-
-
-_SORTED_VIEW_CACHE: WeakKeyDictionary[pd.DataFrame, dict[tuple[str, str], pd.DataFrame]] = WeakKeyDictionary()
-
-
-def _get_sorted_unique_view(df: pd.DataFrame, group_key: str, value_key: str) -> pd.DataFrame:
-    key = (group_key, value_key)
-    cached = _SORTED_VIEW_CACHE.get(df)
-    if cached is not None and key in cached:
-        return cached[key]
-
-    d = df[[group_key, "event_ts", "event_id", value_key]].copy()
-    d["event_ts"] = _ensure_dt(d).values
-    d[group_key] = d[group_key].astype("string")
-    d[value_key] = d[value_key].astype("string").fillna("<NA>")
-    d = d.sort_values([group_key, "event_ts", "event_id"], kind="mergesort").reset_index(drop=True)
-
-    if cached is None:
-        cached = {}
-        _SORTED_VIEW_CACHE[df] = cached
-    cached[key] = d
-    return d
-
-
-@njit
-def _sliding_unique_counts(
-    group_codes: np.ndarray, ts_ns: np.ndarray, value_codes: np.ndarray, window_ns: np.int64
-) -> np.ndarray:
-    n = len(ts_ns)
-    out = np.zeros(n, dtype=np.int64)
-
-    counts = typed_dict_empty()
-
-    last_group = -1
-    left = 0
-    i = 0
-
-    while i < n:
-        g = group_codes[i]
-        if g != last_group:
-            counts.clear()
-            left = i
-            last_group = g
-
-        t = ts_ns[i]
-        expire_before = t - window_ns
-
-        while left < i and group_codes[left] == g and ts_ns[left] <= expire_before:
-            v = value_codes[left]
-            c = counts.get(v, 0) - 1
-            if c == 0:
-                counts.pop(v)
-            else:
-                counts[v] = c
-            left += 1
-
-        j = i + 1
-        while j < n and group_codes[j] == g and ts_ns[j] == t:
-            j += 1
-
-        current_unique = len(counts)
-        k = i
-        while k < j:
-            out[k] = current_unique
-            k += 1
-
-        k = i
-        while k < j:
-            v = value_codes[k]
-            counts[v] = counts.get(v, 0) + 1
-            k += 1
-
-        i = j
-
-    return out
+    """Time-based rolling sum per group, aligned to df row order (see `_rolling_sums_by_time`)."""
+    return _rolling_sums_by_time(
+        df, group_key=group_key, value_cols=[value_col], window=window, strict_past_only=strict_past_only
+    )[value_col]
 
 
 def _rolling_unique_count_strict(
@@ -170,37 +152,267 @@ def _rolling_unique_count_strict(
     group_key: str,
     value_key: str,
     window_td: timedelta,
-) -> Tuple[np.ndarray, pd.DataFrame]:
-    """Strict past-only unique count per group using a vectorized sliding window.
+    hll_precision: int | None = None,
+) -> np.ndarray:
+    """Strict past-only unique count per group, aligned to df row order.
 
     Deterministic and treats same-timestamp events as not visible to each other.
-    Returns (counts_aligned_to_sorted_df, sorted_df_used_for_computation).
+    Missing values count as one distinct value. With `hll_precision` the counts are
+    sliding-window HyperLogLog estimates (see `kernels.sliding_unique_counts_hll`).
     """
+    codes = _group_codes(df[group_key])
+    ts = _ts_ns(_ensure_dt(df))
+    order = _group_sorted(codes, ts)
+    value_codes = _group_codes(df[value_key])
+    args = (codes[order], ts[order], value_codes[order], _window_ns(window_td))
+    if hll_precision is None:
+        counts = sliding_unique_counts(*args)
+    else:
+        counts = sliding_unique_counts_hll(*args, precision=hll_precision)
+    out = np.empty(len(df), dtype=np.int64)
+    out[order] = counts
+    return out
 
-    d = _get_sorted_unique_view(df, group_key=group_key, value_key=value_key)
 
-    group_codes = pd.factorize(d[group_key], sort=False)[0].astype(np.int64)
-    value_codes = pd.factorize(d[value_key], sort=False)[0].astype(np.int64)
-    ts_ns = d["event_ts"].view("int64")
+def _hll_precision_for(window: Window, unique_counts: Mapping[str, Any] | None) -> int | None:
+    """HyperLogLog precision for this window's unique counts, or None for exact counts."""
+    uc = dict(unique_counts or {})
+    if uc.get("mode", "exact") != "hll":
+        return None
+    if window.td < _parse_windows([str(uc.get("hll_min_window", "7d"))])[0].td:
+        return None
+    return int(uc.get("hll_precision", HLL_DEFAULT_PRECISION))
 
-    win_ns = np.int64(window_td.total_seconds() * 1_000_000_000)
-    out = _sliding_unique_counts(group_codes, ts_ns, value_codes, win_ns)
 
-    return out, d
+def describe_unique_counts(unique_counts: Mapping[str, Any] | None, windows: list[str]) -> dict[str, Any]:
+    """FeatureSpec record of how unique counts were computed (incl. the approximation error)."""
+    uc = dict(unique_counts or {})
+    if uc.get("mode", "exact") != "hll":
+        return {"mode": "exact"}
+    precision = int(uc.get("hll_precision", HLL_DEFAULT_PRECISION))
+    approx = [w.label for w in _parse_windows(windows) if _hll_precision_for(w, uc) is not None]
+    return {
+        "mode": "hll",
+        "hll_precision": precision,
+        "hll_min_window": str(uc.get("hll_min_window", "7d")),
+        "approx_windows": approx,
+        "relative_std_error": round(hll_relative_error(precision), 6),
+    }
 
 
-def build_login_features(
-    login_df: pd.DataFrame,
+# A column of a pass's value matrix: (agg, summed column or None for counts, (filter column, values) or None).
+SourceKey = tuple[str, str | None, tuple[str, tuple[str, ...] | None] | None]
+
+
+@dataclass(frozen=True)
+class PlannedFeature:
+    name: str
+    agg: str
+    # count/sum: column of the pass's value matrix; nunique: the counted column.
+    source: int | str | None = None
+    numerator: str | None = None
+    denominator: str | None = None
+
+
+@dataclass(frozen=True)
+class EntityPass:
+    """Everything computed from one (group key, ts) sort: one prefix sum serves every window,
+    one decayed-sum scan serves every half-life."""
+
+    entity: str
+    group_key: str
+    sources: tuple[SourceKey, ...]
+    windows: tuple[tuple[Window, tuple[PlannedFeature, ...]], ...]
+    decayed: tuple[tuple[Window, tuple[PlannedFeature, ...]], ...] = ()
+
+
+@dataclass(frozen=True)
+class FeaturePlan:
+    event_type: str
+    strict_past_only: bool
+    passes: tuple[EntityPass, ...]
+
+    @property
+    def feature_columns(self) -> list[str]:
+        return [f.name for p in self.passes for _, feats in p.windows + p.decayed for f in feats]
+
+    def explain(self) -> list[str]:
+        """One line per entity pass: sorts, prefix sums and kernel calls it performs."""
+        lines = []
+        for p in self.passes:
+            n_unique = sum(f.agg == "nunique" for _, feats in p.windows for f in feats)
+            n_features = sum(len(feats) for _, feats in p.windows + p.decayed)
+            decayed = f", 1 decayed scan over {len(p.decayed)} half-lives" if p.decayed and p.sources else ""
+            lines.append(
+                f"{p.entity} ({p.group_key}): 1 sort, {1 if p.sources else 0} prefix sum over {len(p.sources)} sources, "
+                f"{len(p.windows) if p.sources else 0} window sums, {n_unique} unique counts{decayed} -> {n_features} features"
+            )
+        return lines
+
+
+def _source_key(agg: AggregateSpec) -> SourceKey:
+    where = None
+    if agg.where is not None:
+        where = (agg.where.column, None if agg.where.values is None else tuple(agg.where.values))
+    return (agg.agg, agg.column if agg.agg == "sum" else None, where)
+
+
+def compile_feature_plan(
+    feature_set: FeatureSetSpec,
     *,
     windows: list[str],
     entities: list[str],
     strict_past_only: bool,
-    include_support: bool,
-    include_cross_event: bool = False,
-    checkout_df: pd.DataFrame | None = None,
-) -> tuple[pd.DataFrame, list[str]]:
-    """Build safe, leakage-aware rolling features for login_attempt."""
-    df = login_df.copy()
+    columns: list[str] | pd.Index,
+    half_lives: list[str] | None = None,
+) -> FeaturePlan:
+    """Compile a declarative feature set into one fused pass per entity.
+
+    Count and sum aggregates that read the same (column, filter) share one value-matrix
+    column; ratios become post-processing of already-computed features. Each half-life
+    adds exponentially decayed versions of the count/sum/ratio aggregates that are not
+    window-restricted, named `<entity>_ewm<half-life>__<name>` (`*_cnt` -> `*_dcnt`).
+    """
+    cols = set(columns)
+    by_name = {e.name: e for e in feature_set.entities}
+    ws = _parse_windows(windows)
+    hls = _parse_windows(list(half_lives or []))
+    passes: list[EntityPass] = []
+    for ent in entities:
+        if ent not in by_name:
+            raise ValueError(f"Unknown entity: {ent}")
+        spec = by_name[ent]
+        if spec.group_key not in cols:
+            continue
+
+        sources: list[SourceKey] = []
+
+        def plan_horizon(prefix: str, w: Window | None) -> tuple[PlannedFeature, ...]:
+            # w is None for a decayed horizon: no unique counts, no window-restricted aggregates.
+            planned: dict[str, PlannedFeature] = {}
+            for agg in feature_set.aggregates:
+                if agg.entities is not None and ent not in agg.entities:
+                    continue
+                if agg.windows is not None and (w is None or w.label not in {x.label for x in _parse_windows(agg.windows)}):
+                    continue
+                needed = list(agg.requires) + [c for c in (agg.column, agg.where.column if agg.where else None) if c]
+                if any(c not in cols for c in needed):
+                    continue
+                if agg.agg == "ratio":
+                    if agg.numerator in planned and agg.denominator in planned:
+                        planned[agg.name] = PlannedFeature(
+                            prefix + agg.name, "ratio",
+                            numerator=planned[agg.numerator].name, denominator=planned[agg.denominator].name,
+                        )
+                elif agg.agg == "nunique":
+                    if not strict_past_only or w is None:
+                        continue
+                    for c in [agg.column] if agg.column else [c for c in spec.distinct if c in cols]:
+                        name = agg.name.format(column=c)
+                        planned[name] = PlannedFeature(prefix + name, "nunique", source=c)
+                else:
+                    key = _source_key(agg)
+                    if key not in sources:
+                        sources.append(key)
+                    name = agg.name.format(column=agg.column)
+                    column = name[: -len("_cnt")] + "_dcnt" if w is None and name.endswith("_cnt") else name
+                    planned[name] = PlannedFeature(prefix + column, agg.agg, source=sources.index(key))
+            return tuple(planned.values())
+
+        per_window = tuple((w, plan_horizon(f"{ent}_{w.label}__", w)) for w in ws)
+        decayed = tuple((h, plan_horizon(f"{ent}_ewm{h.label}__", None)) for h in hls)
+        passes.append(EntityPass(ent, spec.group_key, tuple(sources), per_window, decayed))
+    return FeaturePlan(feature_set.event_type, strict_past_only, tuple(passes))
+
+
+def _source_vector(df: pd.DataFrame, key: SourceKey) -> np.ndarray:
+    _, column, where = key
+    if column is None:
+        v = np.ones(len(df), dtype=np.float64)
+    else:
+        v = pd.to_numeric(df[column], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+    if where is not None:
+        wcol, values = where
+        mask = df[wcol].astype(bool) if values is None else df[wcol].isin(values)
+        v = v * mask.to_numpy(dtype=np.float64)
+    return v
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """num / den, 0 where den is 0."""
+    return np.divide(num, den, out=np.zeros(len(num), dtype=np.float64), where=den != 0)
+
+
+def execute_feature_plan(
+    df: pd.DataFrame,
+    plan: FeaturePlan,
+    *,
+    unique_counts: Mapping[str, Any] | None = None,
+) -> dict[str, np.ndarray]:
+    """Run a compiled plan; returns feature arrays aligned to df row order.
+
+    df must be globally time-sorted; its group-key columns are normalized to strings
+    in place ("<NA>" for missing), as the cross-event context expects.
+    """
+    n = len(df)
+    ts = _ts_ns(_ensure_dt(df))
+    vectors: dict[SourceKey, np.ndarray] = {}
+    value_codes: dict[str, np.ndarray] = {}
+    out: dict[str, np.ndarray] = {}
+    for p in plan.passes:
+        df[p.group_key] = df[p.group_key].astype("string").fillna("<NA>")
+        codes = _group_codes(df[p.group_key])
+        order = _group_sorted(codes, ts)
+        g, t = codes[order], ts[order]
+        csum = None
+        if p.sources:
+            for key in p.sources:
+                if key not in vectors:
+                    vectors[key] = _source_vector(df, key)
+            values = np.column_stack([vectors[k] for k in p.sources])[order]
+            csum = prefix_sums(values)
+
+        for w, feats in p.windows:
+            sums = None
+            for f in feats:
+                if f.agg in ("count", "sum"):
+                    if sums is None:
+                        sums = np.empty((n, len(p.sources)), dtype=np.float64)
+                        sums[order] = window_sums_from_prefix(
+                            g, t, csum, _window_ns(w.td), include_current=not plan.strict_past_only
+                        )
+                    out[f.name] = sums[:, f.source]
+                elif f.agg == "ratio":
+                    out[f.name] = _ratio(out[f.numerator], out[f.denominator])
+                else:
+                    if f.source not in value_codes:
+                        value_codes[f.source] = _group_codes(df[f.source])
+                    args = (g, t, value_codes[f.source][order], _window_ns(w.td))
+                    precision = _hll_precision_for(w, unique_counts)
+                    if precision is None:
+                        counts = sliding_unique_counts(*args)
+                    else:
+                        counts = sliding_unique_counts_hll(*args, precision=precision)
+                    col = np.empty(n, dtype=np.int64)
+                    col[order] = counts
+                    out[f.name] = col
+
+        if p.decayed and p.sources:
+            decayed = np.empty((n, len(p.decayed), len(p.sources)), dtype=np.float64)
+            decayed[order] = decayed_sums(
+                g, t, values, [_window_ns(h.td) for h, _ in p.decayed], include_current=not plan.strict_past_only
+            )
+            for j, (_, feats) in enumerate(p.decayed):
+                for f in feats:
+                    if f.agg == "ratio":
+                        out[f.name] = _ratio(out[f.numerator], out[f.denominator])
+                    else:
+                        out[f.name] = decayed[:, j, f.source]
+    return out
+
+
+def _prepare_events(events_df: pd.DataFrame) -> pd.DataFrame:
+    df = events_df.copy()
     df["event_ts"] = _ensure_dt(df)
     df["event_id"] = df["event_id"].astype("string")
     df["user_id"] = df["user_id"].astype("string")
@@ -208,108 +420,62 @@ def build_login_features(
         df["session_id"] = df["session_id"].astype("string")
 
     # Global stable order (required for determinism)
-    df = df.sort_values(["event_ts", "user_id", "event_id"], kind="mergesort").reset_index(drop=True)
+    return df.sort_values(["event_ts", "user_id", "event_id"], kind="mergesort").reset_index(drop=True)
 
-    # Outcome indicators
-    df["_is_success"] = (df["login_result"] == "success").astype(np.int64)
-    df["_is_failure"] = (df["login_result"] == "failure").astype(np.int64)
-    df["_is_challenge"] = (df["login_result"] == "challenge").astype(np.int64)
-    df["_is_lockout"] = (df["login_result"] == "lockout").astype(np.int64)
 
-    if "support_contacted" in df.columns:
-        df["_support_contacted"] = _bool_int(df["support_contacted"])
-    else:
-        df["_support_contacted"] = 0
-
-    for c in ["support_cost_usd", "support_wait_seconds", "support_handle_seconds"]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0.0)
-
-    ws = _parse_windows(windows)
-    feature_cols: list[str] = []
-
-    def add_rates(prefix: str, cnt_col: str, s_col: str, f_col: str, c_col: str, l_col: str):
-        denom = df[cnt_col].replace(0, np.nan)
-        df[f"{prefix}success_rate"] = (df[s_col] / denom).fillna(0.0)
-        df[f"{prefix}failure_rate"] = (df[f_col] / denom).fillna(0.0)
-        df[f"{prefix}challenge_rate"] = (df[c_col] / denom).fillna(0.0)
-        df[f"{prefix}lockout_rate"] = (df[l_col] / denom).fillna(0.0)
-        feature_cols.extend(
-            [f"{prefix}success_rate", f"{prefix}failure_rate", f"{prefix}challenge_rate", f"{prefix}lockout_rate"]
-        )
-
-    for ent in entities:
-        if ent == "user":
-            gkey = "user_id"
-            uniq_a = "ip_hash"
-            uniq_b = "device_fingerprint_hash"
-        elif ent == "ip":
-            gkey = "ip_hash"
-            uniq_a = "user_id"
-            uniq_b = "device_fingerprint_hash"
-        elif ent == "device":
-            gkey = "device_fingerprint_hash"
-            uniq_a = "user_id"
-            uniq_b = "ip_hash"
-        else:
-            raise ValueError(f"Unknown entity: {ent}")
+def build_feature_set(
+    df: pd.DataFrame,
+    feature_set: FeatureSetSpec,
+    *,
+    windows: list[str],
+    entities: list[str],
+    strict_past_only: bool,
+    unique_counts: Mapping[str, Any] | None = None,
+    half_lives: list[str] | None = None,
+) -> tuple[pd.DataFrame, list[str]]:
+    """Compile and execute `feature_set` on a prepared frame; returns (df + features, feature columns)."""
+    plan = compile_feature_plan(
+        feature_set,
+        windows=windows,
+        entities=entities,
+        strict_past_only=strict_past_only,
+        columns=df.columns,
+        half_lives=half_lives,
+    )
+    features = execute_feature_plan(df, plan, unique_counts=unique_counts)
+    df = pd.concat([df, pd.DataFrame(features, index=df.index)], axis=1)
+    return df, plan.feature_columns
 
-        if gkey not in df.columns:
-            continue
 
-        df[gkey] = df[gkey].astype("string").fillna("<NA>")
+def build_login_features(
+    login_df: pd.DataFrame,
+    *,
+    windows: list[str],
+    entities: list[str],
+    strict_past_only: bool,
+    include_support: bool,
+    include_cross_event: bool = False,
+    checkout_df: pd.DataFrame | None = None,
+    dtype_policy: Mapping[str, str] | None = None,
+    unique_counts: Mapping[str, Any] | None = None,
+    half_lives: list[str] | None = None,
+) -> tuple[pd.DataFrame, list[str]]:
+    """Build safe, leakage-aware rolling features for login_attempt.
 
-        for w in ws:
-            prefix = f"{ent}_{w.label}__"
-
-            cnt_name = f"{prefix}attempt_cnt"
-            df[cnt_name] = _rolling_cnt_by_time(df, group_key=gkey, window=w.label, strict_past_only=strict_past_only)
-            feature_cols.append(cnt_name)
-
-            s_name = f"{prefix}success_cnt"
-            f_name = f"{prefix}failure_cnt"
-            c_name = f"{prefix}challenge_cnt"
-            l_name = f"{prefix}lockout_cnt"
-
-            df[s_name] = _rolling_sum_by_time(df, group_key=gkey, value_col="_is_success", window=w.label, strict_past_only=strict_past_only)
-            df[f_name] = _rolling_sum_by_time(df, group_key=gkey, value_col="_is_failure", window=w.label, strict_past_only=strict_past_only)
-            df[c_name] = _rolling_sum_by_time(df, group_key=gkey, value_col="_is_challenge", window=w.label, strict_past_only=strict_past_only)
-            df[l_name] = _rolling_sum_by_time(df, group_key=gkey, value_col="_is_lockout", window=w.label, strict_past_only=strict_past_only)
-            feature_cols.extend([s_name, f_name, c_name, l_name])
-
-            add_rates(prefix, cnt_name, s_name, f_name, c_name, l_name)
-
-            if strict_past_only:
-                if uniq_a in df.columns:
-                    arr, d_sorted = _rolling_unique_count_strict(df, group_key=gkey, value_key=uniq_a, window_td=w.td)
-                    tmp = pd.DataFrame({"event_id": d_sorted["event_id"], f"{prefix}uniq_{uniq_a}_cnt": arr})
-                    df = df.merge(tmp, on="event_id", how="left", validate="one_to_one")
-                    feature_cols.append(f"{prefix}uniq_{uniq_a}_cnt")
-                if uniq_b in df.columns:
-                    arr, d_sorted = _rolling_unique_count_strict(df, group_key=gkey, value_key=uniq_b, window_td=w.td)
-                    tmp = pd.DataFrame({"event_id": d_sorted["event_id"], f"{prefix}uniq_{uniq_b}_cnt": arr})
-                    df = df.merge(tmp, on="event_id", how="left", validate="one_to_one")
-                    feature_cols.append(f"{prefix}uniq_{uniq_b}_cnt")
-
-            if include_support and "support_contacted" in df.columns:
-                sc = f"{prefix}support_contacted_cnt"
-                df[sc] = _rolling_sum_by_time(df, group_key=gkey, value_col="_support_contacted", window=w.label, strict_past_only=strict_past_only)
-                feature_cols.append(sc)
-
-                if "support_cost_usd" in df.columns:
-                    ssum = f"{prefix}support_cost_usd_sum"
-                    df[ssum] = _rolling_sum_by_time(df, group_key=gkey, value_col="support_cost_usd", window=w.label, strict_past_only=strict_past_only)
-                    feature_cols.append(ssum)
-
-                if "support_wait_seconds" in df.columns:
-                    wsum = f"{prefix}support_wait_seconds_sum"
-                    df[wsum] = _rolling_sum_by_time(df, group_key=gkey, value_col="support_wait_seconds", window=w.label, strict_past_only=strict_past_only)
-                    feature_cols.append(wsum)
-
-                if "support_handle_seconds" in df.columns:
-                    hsum = f"{prefix}support_handle_seconds_sum"
-                    df[hsum] = _rolling_sum_by_time(df, group_key=gkey, value_col="support_handle_seconds", window=w.label, strict_past_only=strict_past_only)
-                    feature_cols.append(hsum)
+    The feature families are declared in `catalog.login_feature_set`.
+    `dtype_policy` maps feature kinds ("counts", "rates", "sums") to storage dtypes.
+    `unique_counts` selects exact or HyperLogLog unique counts (see UniqueCountConfig).
+    `half_lives` adds exponentially decayed count/sum/rate features (e.g. ["1h", "1d"]).
+    """
+    df, feature_cols = build_feature_set(
+        _prepare_events(login_df),
+        login_feature_set(include_support=include_support),
+        windows=windows,
+        entities=entities,
+        strict_past_only=strict_past_only,
+        unique_counts=unique_counts,
+        half_lives=half_lives,
+    )
 
     # Cross-event context (checkout history as context for login)
     if include_cross_event and (checkout_df is not None) and (len(checkout_df) > 0):
@@ -323,12 +489,7 @@ def build_login_features(
         )
         feature_cols.extend(extra_cols)
 
-    # Cleanup temp columns and ensure numeric features are numeric.
-    df.drop(columns=["_is_success", "_is_failure", "_is_challenge", "_is_lockout", "_support_contacted"], inplace=True, errors="ignore")
-    for c in feature_cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0.0)
-
+    _finalize_feature_columns(df, feature_cols, dtype_policy)
     return df, feature_cols
 
 
@@ -346,50 +507,24 @@ def _cross_event_window_sums(
 ) -> dict[str, np.ndarray]:
     """Windowed sums of `value_cols` from `other`, aligned to rows of `base`.
 
-    Interval is [t-window, t) (strict past-only) via searchsorted(..., side='left').
+    Interval is [t-window, t) (strict past-only).
     Both frames must contain: group_key, event_ts.
     Returns numpy arrays aligned to the original base row order.
     """
-    b = base[[group_key, "event_ts", "event_id"]].copy()
-    b["event_ts"] = _ensure_dt(b).values
-    b = b.reset_index().rename(columns={"index": "_base_idx"})
-    b[group_key] = b[group_key].astype("string").fillna("<NA>")
-    b = b.sort_values([group_key, "event_ts", "event_id"], kind="mergesort").reset_index(drop=True)
-
-    o = other[[group_key, "event_ts"] + value_cols].copy()
-    o["event_ts"] = _ensure_dt(o).values
-    o[group_key] = o[group_key].astype("string").fillna("<NA>")
-    o = o.sort_values([group_key, "event_ts"], kind="mergesort").reset_index(drop=True)
-
-    out_sorted = {c: np.zeros(len(b), dtype=np.float64) for c in value_cols}
-
-    ogroups = {k: g for k, g in o.groupby(group_key, sort=False)}
-    win_ns = np.timedelta64(int(window_td.total_seconds() * 1_000_000_000), "ns")
-
-    for k, bg in b.groupby(group_key, sort=False):
-        idxs = bg.index.to_numpy()
-        ts = bg["event_ts"].to_numpy()
-        og = ogroups.get(k)
-        if og is None or len(og) == 0:
-            continue
-        ots = og["event_ts"].to_numpy()
-
-        right = np.searchsorted(ots, ts, side="left")  # exclude >= t
-        left = np.searchsorted(ots, ts - win_ns, side="left")  # include == t-window
-
-        for col in value_cols:
-            arr = pd.to_numeric(og[col], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
-            csum = np.concatenate(([0.0], np.cumsum(arr)))
-            out_sorted[col][idxs] = csum[right] - csum[left]
-
-    # Align back to original base row order
-    base_idx_sorted_to_orig = b["_base_idx"].to_numpy()
-    aligned: dict[str, np.ndarray] = {}
-    for col, arr in out_sorted.items():
-        a2 = np.zeros(len(base), dtype=np.float64)
-        a2[base_idx_sorted_to_orig] = arr
-        aligned[col] = a2
-    return aligned
+    keys = pd.concat([base[group_key], other[group_key]], ignore_index=True).astype("string").fillna("<NA>")
+    codes = _group_codes(keys)
+    b_codes, o_codes = codes[: len(base)], codes[len(base):]
+    b_ts, o_ts = _ts_ns(_ensure_dt(base)), _ts_ns(_ensure_dt(other))
+    b_order, o_order = _group_sorted(b_codes, b_ts), _group_sorted(o_codes, o_ts)
+    values = np.column_stack(
+        [pd.to_numeric(other[c], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64) for c in value_cols]
+    )
+    sums = cross_window_sums(
+        b_codes[b_order], b_ts[b_order], o_codes[o_order], o_ts[o_order], values[o_order], _window_ns(window_td)
+    )
+    out = np.empty_like(sums)
+    out[b_order] = sums
+    return {c: out[:, i] for i, c in enumerate(value_cols)}
 
 
 def add_cross_event_context(
@@ -444,7 +579,7 @@ def add_cross_event_context(
         raise ValueError(f"Unsupported other_event={other_event!r}")
 
     ws = _parse_windows(windows)
-    added: list[str] = []
+    added: dict[str, np.ndarray] = {}
 
     for ent in entities:
         if ent == "user":
@@ -466,27 +601,19 @@ def add_cross_event_context(
             prefix = f"cross__{other_event}__{ent}_{w.label}__"
             sums = _cross_event_window_sums(df, other, group_key=gkey, value_cols=value_cols, window_td=w.td)
 
-            cnt_name = f"{prefix}event_cnt"
-            df[cnt_name] = sums["_one"]
-            added.append(cnt_name)
-
-            denom = df[cnt_name].replace(0, np.nan)
+            cnt = sums["_one"]
+            added[f"{prefix}event_cnt"] = cnt
             for oc in outcome_cols:
-                name = f"{prefix}{oc.lstrip('_')}_cnt"
-                df[name] = sums[oc]
-                added.append(name)
-                rname = f"{prefix}{oc.lstrip('_')}_rate"
-                df[rname] = (df[name] / denom).fillna(0.0)
-                added.append(rname)
+                added[f"{prefix}{oc.lstrip('_')}_cnt"] = sums[oc]
+                added[f"{prefix}{oc.lstrip('_')}_rate"] = _ratio(sums[oc], cnt)
 
             if payment_col:
-                ps = f"{prefix}payment_value_sum"
-                pm = f"{prefix}payment_value_mean"
-                df[ps] = sums[payment_col]
-                df[pm] = (df[ps] / denom).fillna(0.0)
-                added.extend([ps, pm])
+                added[f"{prefix}payment_value_sum"] = sums[payment_col]
+                added[f"{prefix}payment_value_mean"] = _ratio(sums[payment_col], cnt)
 
-    return df, added
+    # One concat instead of per-column inserts (the base frame is already wide).
+    df = pd.concat([df, pd.DataFrame(added, index=df.index)], axis=1)
+    return df, list(added)
 
 
 def build_checkout_features(
@@ -497,108 +624,26 @@ def build_checkout_features(
     strict_past_only: bool,
     include_cross_event: bool,
     login_df: pd.DataFrame | None = None,
+    dtype_policy: Mapping[str, str] | None = None,
+    unique_counts: Mapping[str, Any] | None = None,
+    half_lives: list[str] | None = None,
 ) -> tuple[pd.DataFrame, list[str]]:
-    """Build safe, leakage-aware rolling features for checkout_attempt."""
-    df = checkout_df.copy()
-    df["event_ts"] = _ensure_dt(df)
-    df["event_id"] = df["event_id"].astype("string")
-    df["user_id"] = df["user_id"].astype("string")
-    if "session_id" in df.columns:
-        df["session_id"] = df["session_id"].astype("string")
-
-    # Global stable order
-    df = df.sort_values(["event_ts", "user_id", "event_id"], kind="mergesort").reset_index(drop=True)
-
-    # Outcome indicators
-    df["_is_success"] = (df["checkout_result"] == "success").astype(np.int64)
-    df["_is_failure"] = (df["checkout_result"] == "failure").astype(np.int64)
-    df["_is_review"] = (df["checkout_result"] == "review").astype(np.int64)
-    df["_is_adverse"] = ((df["_is_failure"] == 1) | (df["_is_review"] == 1)).astype(np.int64)
-
-    # Numeric signals
-    for c in ["payment_value", "basket_size"]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0.0)
-
-    ws = _parse_windows(windows)
-    feature_cols: list[str] = []
-
-    def add_rates(prefix: str, cnt_col: str, s_col: str, f_col: str, r_col: str):
-        denom = df[cnt_col].replace(0, np.nan)
-        df[f"{prefix}success_rate"] = (df[s_col] / denom).fillna(0.0)
-        df[f"{prefix}failure_rate"] = (df[f_col] / denom).fillna(0.0)
-        df[f"{prefix}review_rate"] = (df[r_col] / denom).fillna(0.0)
-        feature_cols.extend([f"{prefix}success_rate", f"{prefix}failure_rate", f"{prefix}review_rate"])
+    """Build safe, leakage-aware rolling features for checkout_attempt.
 
-    for ent in entities:
-        if ent == "user":
-            gkey = "user_id"
-            uniq_a = "ip_hash"
-            uniq_b = "device_fingerprint_hash"
-            uniq_c = "credit_card_hash"
-        elif ent == "ip":
-            gkey = "ip_hash"
-            uniq_a = "user_id"
-            uniq_b = "device_fingerprint_hash"
-            uniq_c = None
-        elif ent == "device":
-            gkey = "device_fingerprint_hash"
-            uniq_a = "user_id"
-            uniq_b = "ip_hash"
-            uniq_c = None
-        else:
-            raise ValueError(f"Unknown entity: {ent}")
-
-        if gkey not in df.columns:
-            continue
-
-        df[gkey] = df[gkey].astype("string").fillna("<NA>")
-
-        for w in ws:
-            prefix = f"{ent}_{w.label}__"
-
-            cnt_name = f"{prefix}attempt_cnt"
-            df[cnt_name] = _rolling_cnt_by_time(df, group_key=gkey, window=w.label, strict_past_only=strict_past_only)
-            feature_cols.append(cnt_name)
-
-            s_name = f"{prefix}success_cnt"
-            f_name = f"{prefix}failure_cnt"
-            r_name = f"{prefix}review_cnt"
-            a_name = f"{prefix}adverse_cnt"
-
-            df[s_name] = _rolling_sum_by_time(df, group_key=gkey, value_col="_is_success", window=w.label, strict_past_only=strict_past_only)
-            df[f_name] = _rolling_sum_by_time(df, group_key=gkey, value_col="_is_failure", window=w.label, strict_past_only=strict_past_only)
-            df[r_name] = _rolling_sum_by_time(df, group_key=gkey, value_col="_is_review", window=w.label, strict_past_only=strict_past_only)
-            df[a_name] = _rolling_sum_by_time(df, group_key=gkey, value_col="_is_adverse", window=w.label, strict_past_only=strict_past_only)
-            feature_cols.extend([s_name, f_name, r_name, a_name])
-
-            add_rates(prefix, cnt_name, s_name, f_name, r_name)
-
-            # Payment / basket aggregates (sum + mean)
-            if "payment_value" in df.columns:
-                pv_sum = f"{prefix}payment_value_sum"
-                df[pv_sum] = _rolling_sum_by_time(df, group_key=gkey, value_col="payment_value", window=w.label, strict_past_only=strict_past_only)
-                feature_cols.append(pv_sum)
-                pv_mean = f"{prefix}payment_value_mean"
-                df[pv_mean] = (df[pv_sum] / df[cnt_name].replace(0, np.nan)).fillna(0.0)
-                feature_cols.append(pv_mean)
-
-            if "basket_size" in df.columns:
-                bs_sum = f"{prefix}basket_size_sum"
-                df[bs_sum] = _rolling_sum_by_time(df, group_key=gkey, value_col="basket_size", window=w.label, strict_past_only=strict_past_only)
-                feature_cols.append(bs_sum)
-                bs_mean = f"{prefix}basket_size_mean"
-                df[bs_mean] = (df[bs_sum] / df[cnt_name].replace(0, np.nan)).fillna(0.0)
-                feature_cols.append(bs_mean)
-
-            # Unique counts (strict only)
-            if strict_past_only:
-                for uniq in [uniq_a, uniq_b, uniq_c]:
-                    if uniq and uniq in df.columns:
-                        arr, d_sorted = _rolling_unique_count_strict(df, group_key=gkey, value_key=uniq, window_td=w.td)
-                        tmp = pd.DataFrame({"event_id": d_sorted["event_id"], f"{prefix}uniq_{uniq}_cnt": arr})
-                        df = df.merge(tmp, on="event_id", how="left", validate="one_to_one")
-                        feature_cols.append(f"{prefix}uniq_{uniq}_cnt")
+    The feature families are declared in `catalog.checkout_feature_set`.
+    `dtype_policy` maps feature kinds ("counts", "rates", "sums") to storage dtypes.
+    `unique_counts` selects exact or HyperLogLog unique counts (see UniqueCountConfig).
+    `half_lives` adds exponentially decayed count/sum/rate features (e.g. ["1h", "1d"]).
+    """
+    df, feature_cols = build_feature_set(
+        _prepare_events(checkout_df),
+        checkout_feature_set(),
+        windows=windows,
+        entities=entities,
+        strict_past_only=strict_past_only,
+        unique_counts=unique_counts,
+        half_lives=half_lives,
+    )
 
     # Cross-event context (login history as context for checkout)
     if include_cross_event and (login_df is not None) and (len(login_df) > 0):
@@ -612,9 +657,5 @@ def build_checkout_features(
         )
         feature_cols.extend(extra_cols)
 
-    # Cleanup temp
-    df.drop(columns=["_is_success", "_is_failure", "_is_review", "_is_adverse"], inplace=True, errors="ignore")
-    for c in feature_cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0.0)
+    _finalize_feature_columns(df, feature_cols, dtype_policy)
     return df, feature_cols
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+"""Declarative rolling-feature sets for login_attempt and checkout_attempt.
+
+Both event types are compiled and executed by the same engine
+(`builder.compile_feature_plan` / `builder.build_feature_set`); adding a feature
+is a catalog entry, not another hand-written loop.
+"""
+
+from .spec import AggregateSpec, EntitySpec, FeatureSetSpec, RowFilter
+
+ENTITY_GROUP_KEYS: dict[str, str] = {
+    "user": "user_id",
+    "ip": "ip_hash",
+    "device": "device_fingerprint_hash",
+}
+
+_SUPPORT_SUMS = ["support_cost_usd", "support_wait_seconds", "support_handle_seconds"]
+
+
+def _entities(extra_user_distinct: list[str] | None = None) -> list[EntitySpec]:
+    distinct = {
+        "user": ["ip_hash", "device_fingerprint_hash", *(extra_user_distinct or [])],
+        "ip": ["user_id", "device_fingerprint_hash"],
+        "device": ["user_id", "ip_hash"],
+    }
+    return [EntitySpec(name=e, group_key=k, distinct=distinct[e]) for e, k in ENTITY_GROUP_KEYS.items()]
+
+
+def _outcome_counts(result_col: str, outcomes: list[str]) -> list[AggregateSpec]:
+    return [
+        AggregateSpec(name=f"{o}_cnt", agg="count", where=RowFilter(column=result_col, values=[o])) for o in outcomes
+    ]
+
+
+def _rates(outcomes: list[str]) -> list[AggregateSpec]:
+    return [
+        AggregateSpec(name=f"{o}_rate", agg="ratio", numerator=f"{o}_cnt", denominator="attempt_cnt") for o in outcomes
+    ]
+
+
+def login_feature_set(*, include_support: bool) -> FeatureSetSpec:
+    outcomes = ["success", "failure", "challenge", "lockout"]
+    aggregates = [
+        AggregateSpec(name="attempt_cnt", agg="count"),
+        *_outcome_counts("login_result", outcomes),
+        *_rates(outcomes),
+        AggregateSpec(name="uniq_{column}_cnt", agg="nunique"),
+    ]
+    if include_support:
+        aggregates.append(
+            AggregateSpec(name="support_contacted_cnt", agg="count", where=RowFilter(column="support_contacted"))
+        )
+        aggregates += [
+            AggregateSpec(name="{column}_sum", agg="sum", column=c, requires=["support_contacted"]) for c in _SUPPORT_SUMS
+        ]
+    return FeatureSetSpec(event_type="login_attempt", entities=_entities(), aggregates=aggregates)
+
+
+def checkout_feature_set() -> FeatureSetSpec:
+    outcomes = ["success", "failure", "review"]
+    aggregates = [
+        AggregateSpec(name="attempt_cnt", agg="count"),
+        *_outcome_counts("checkout_result", outcomes),
+        AggregateSpec(name="adverse_cnt", agg="count", where=RowFilter(column="checkout_result", values=["failure", "review"])),
+        *_rates(outcomes),
+    ]
+    for c in ["payment_value", "basket_size"]:
+        aggregates += [
+            AggregateSpec(name=f"{c}_sum", agg="sum", column=c),
+            AggregateSpec(name=f"{c}_mean", agg="ratio", numerator=f"{c}_sum", denominator="attempt_cnt"),
+        ]
+    aggregates.append(AggregateSpec(name="uniq_{column}_cnt", agg="nunique"))
+    return FeatureSetSpec(
+        event_type="checkout_attempt", entities=_entities(["credit_card_hash"]), aggregates=aggregates
+    )
@@ -18,10 +18,12 @@ from ..io.tables import read_auto, write_auto
 from ..io.manifest import read_manifest, write_manifest
 from ..utils.hashing import stable_hash_df, stable_hash_dict
 from ..utils.canonical import canonicalize_df
+from ..utils.perf import perf_stage, profiled, stage_note
 from ..schemas import get_schema
-from ..pipeline import _write_summary  # internal helper (used to keep summary consistent)
+from ..pipeline import _summary_stats, _write_summary  # internal helpers (used to keep summary consistent)
 from .spec import FeatureSpec, FeatureManifest
-from .builder import build_login_features, build_checkout_features
+from .builder import build_login_features, build_checkout_features, describe_unique_counts
+from .catalog import checkout_feature_set, login_feature_set
 
 
 def _artifact_entry(
@@ -43,6 +45,7 @@ def _artifact_entry(
     }
 
 
+@profiled("build_login_features_for_run")
 def build_login_features_for_run(cfg: AppConfig, *, run_id: str, force: bool = False) -> Path:
     """Build login_attempt feature table for an existing run_id and update run manifest + summary."""
     rdir = run_dir_for(cfg.paths.runs_dir, run_id)
@@ -60,19 +63,27 @@ def build_login_features_for_run(cfg: AppConfig, *, run_id: str, force: bool = F
         raise ValueError("features.login_attempt.enabled is false; nothing to do")
 
     # Inputs
-    login_df = read_auto(raw_table_basepath(rdir, "login_attempt"))
-    checkout_df = read_auto(raw_table_basepath(rdir, "checkout_attempt"))
+    stage_note(run_dir=rdir)
+    with perf_stage("read_raw"):
+        login_df = read_auto(raw_table_basepath(rdir, "login_attempt"))
+        checkout_df = read_auto(raw_table_basepath(rdir, "checkout_attempt"))
+        stage_note(rows_out=len(login_df) + len(checkout_df))
+    stage_note(rows_in=len(login_df) + len(checkout_df))
 
     # Build features
-    df, feature_cols = build_login_features(
-        login_df,
-        windows=fcfg.windows,
-        entities=fcfg.entities,
-        strict_past_only=fcfg.strict_past_only,
-        include_support=fcfg.include_support,
-        include_cross_event=getattr(fcfg, 'include_cross_event', True),
-        checkout_df=checkout_df,
-    )
+    with perf_stage("build"):
+        df, feature_cols = build_login_features(
+            login_df,
+            windows=fcfg.windows,
+            entities=fcfg.entities,
+            strict_past_only=fcfg.strict_past_only,
+            include_support=fcfg.include_support,
+            include_cross_event=getattr(fcfg, 'include_cross_event', True),
+            checkout_df=checkout_df,
+            dtype_policy=cfg.features.dtype_policy.model_dump(),
+            unique_counts=cfg.features.unique_counts.model_dump(),
+            half_lives=fcfg.half_lives,
+        )
 
     # Select output columns (minimal keys + labels + derived + features)
     keys = ["event_id", "event_ts", "user_id"]
@@ -130,7 +141,9 @@ def build_login_features_for_run(cfg: AppConfig, *, run_id: str, force: bool = F
     if base_no_ext.with_suffix(".parquet").exists() and not force:
         raise FileExistsError("Feature table already exists. Re-run with --force to overwrite.")
 
-    p, fmt, note = write_auto(out_df, base_no_ext, partition_cols=["split"])
+    stage_note(rows_out=len(out_df))
+    with perf_stage("write"):
+        p, fmt, note = write_auto(out_df, base_no_ext, partition_cols=["split"])
 
     # Write spec + run-local manifest
     spec = FeatureSpec(
@@ -144,6 +157,10 @@ def build_login_features_for_run(cfg: AppConfig, *, run_id: str, force: bool = F
         split_column="split",
         partition_columns=["split"],
         feature_columns=sorted([c for c in feature_cols if c in out_df.columns]),
+        dtype_policy=cfg.features.dtype_policy.model_dump(),
+        unique_counts=describe_unique_counts(cfg.features.unique_counts.model_dump(), fcfg.windows),
+        half_lives=list(fcfg.half_lives),
+        feature_set=login_feature_set(include_support=fcfg.include_support),
     )
 
     feat_manifest = FeatureManifest(
@@ -194,29 +211,19 @@ def build_login_features_for_run(cfg: AppConfig, *, run_id: str, force: bool = F
 
     write_manifest(mpath, manifest)
 
-    # Refresh run summary to include new outputs list
-    # boundary + holdout users derived from dataset split files
-    boundary_ts = None
-    holdout_users: set[str] = set()
-    try:
-        boundary_ts = pd.Timestamp(manifest.get("dataset", {}).get("login_attempt", {}).get("boundary_ts_ba"))
-    except Exception:
-        boundary_ts = pd.Timestamp.utcnow().tz_localize("UTC")
-
-    try:
-        user_holdout = read_auto(dataset_split_basepath(rdir, "login_attempt", "user_holdout"))
-        if "user_id" in user_holdout.columns:
-            holdout_users = set(user_holdout["user_id"].astype(str).unique().tolist())
-    except Exception:
-        holdout_users = set()
-
-    _write_summary(rdir, manifest, login_df, checkout_df, boundary_ts, holdout_users)
+    # Refresh run summary to include new outputs list (rendered from manifest stats; no table scans)
+    if not manifest.get("summary_stats"):
+        # Runs generated before stats were stored: backfill once from the frames already loaded.
+        manifest["summary_stats"] = _summary_stats(login_df, checkout_df)
+        write_manifest(mpath, manifest)
+    _write_summary(rdir, manifest)
 
     return rdir
 
 
 
 
+@profiled("build_checkout_features_for_run")
 def build_checkout_features_for_run(cfg: AppConfig, *, run_id: str, force: bool = False) -> Path:
     """Build checkout_attempt feature table for an existing run_id and update run manifest + summary."""
     rdir = run_dir_for(cfg.paths.runs_dir, run_id)
@@ -234,18 +241,26 @@ def build_checkout_features_for_run(cfg: AppConfig, *, run_id: str, force: bool
         raise ValueError("features.checkout_attempt.enabled is false; nothing to do")
 
     # Inputs
-    login_df = read_auto(raw_table_basepath(rdir, "login_attempt"))
-    checkout_df = read_auto(raw_table_basepath(rdir, "checkout_attempt"))
+    stage_note(run_dir=rdir)
+    with perf_stage("read_raw"):
+        login_df = read_auto(raw_table_basepath(rdir, "login_attempt"))
+        checkout_df = read_auto(raw_table_basepath(rdir, "checkout_attempt"))
+        stage_note(rows_out=len(login_df) + len(checkout_df))
+    stage_note(rows_in=len(login_df) + len(checkout_df))
 
     # Build features
-    df, feature_cols = build_checkout_features(
-        checkout_df,
-        windows=fcfg.windows,
-        entities=fcfg.entities,
-        strict_past_only=fcfg.strict_past_only,
-        include_cross_event=getattr(fcfg, "include_cross_event", True),
-        login_df=login_df,
-    )
+    with perf_stage("build"):
+        df, feature_cols = build_checkout_features(
+            checkout_df,
+            windows=fcfg.windows,
+            entities=fcfg.entities,
+            strict_past_only=fcfg.strict_past_only,
+            include_cross_event=getattr(fcfg, "include_cross_event", True),
+            login_df=login_df,
+            dtype_policy=cfg.features.dtype_policy.model_dump(),
+            unique_counts=cfg.features.unique_counts.model_dump(),
+            half_lives=fcfg.half_lives,
+        )
 
     # Select output columns
     keys = ["event_id", "event_ts", "user_id"]
@@ -268,7 +283,9 @@ def build_checkout_features_for_run(cfg: AppConfig, *, run_id: str, force: bool
     if base_no_ext.with_suffix(".parquet").exists() and not force:
         raise FileExistsError("Feature table already exists. Re-run with --force to overwrite.")
 
-    p, fmt, note = write_auto(out_df, base_no_ext)
+    stage_note(rows_out=len(out_df))
+    with perf_stage("write"):
+        p, fmt, note = write_auto(out_df, base_no_ext)
 
     spec = FeatureSpec(
         windows=fcfg.windows,
@@ -279,6 +296,10 @@ def build_checkout_features_for_run(cfg: AppConfig, *, run_id: str, force: bool
         include_is_fraud=False,
         keys=["event_id", "event_ts", "user_id"] + (["session_id"] if "session_id" in out_df.columns else []),
         feature_columns=sorted([c for c in feature_cols if c in out_df.columns]),
+        dtype_policy=cfg.features.dtype_policy.model_dump(),
+        unique_counts=describe_unique_counts(cfg.features.unique_counts.model_dump(), fcfg.windows),
+        half_lives=list(fcfg.half_lives),
+        feature_set=checkout_feature_set(),
     )
 
     feat_manifest = FeatureManifest(
@@ -326,21 +347,10 @@ def build_checkout_features_for_run(cfg: AppConfig, *, run_id: str, force: bool
 
     write_manifest(mpath, manifest)
 
-    # Refresh run summary to include new outputs list (reuse existing helper)
-    boundary_ts = None
-    holdout_users: set[str] = set()
-    try:
-        boundary_ts = pd.Timestamp(manifest.get("dataset", {}).get("login_attempt", {}).get("boundary_ts_ba"))
-    except Exception:
-        boundary_ts = pd.Timestamp.utcnow().tz_localize("UTC")
-
-    try:
-        user_holdout = read_auto(dataset_split_basepath(rdir, "login_attempt", "user_holdout"))
-        if "user_id" in user_holdout.columns:
-            holdout_users = set(user_holdout["user_id"].astype(str).unique().tolist())
-    except Exception:
-        holdout_users = set()
-
-    _write_summary(rdir, manifest, login_df, checkout_df, boundary_ts, holdout_users)
+    # Refresh run summary to include new outputs list (rendered from manifest stats; no table scans)
+    if not manifest.get("summary_stats"):
+        manifest["summary_stats"] = _summary_stats(login_df, checkout_df)
+        write_manifest(mpath, manifest)
+    _write_summary(rdir, manifest)
 
     return rdir
@@ -1,11 +1,59 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
 
+class RowFilter(BaseModel):
+    """Rows an aggregate sees: `column` in `values`, or truthy `column` when `values` is None."""
+
+    column: str
+    values: list[str] | None = None
+
+
+class AggregateSpec(BaseModel):
+    """One rolling feature family, evaluated for every (entity, window) it applies to.
+
+    - count: rows in the window (optionally `where`-filtered)
+    - sum: sum of `column` in the window (optionally `where`-filtered)
+    - nunique: distinct values of `column`; with `column=None`, one feature per entity
+      `distinct` column (strict past-only windows only)
+    - ratio: `numerator` / `denominator` (aggregate names in the same entity/window), 0 when empty
+
+    `name` may use `{column}`. Aggregates whose `requires` (or `column`) are missing from the
+    frame are skipped, as are ratios whose operands were skipped.
+    """
+
+    name: str
+    agg: Literal["count", "sum", "nunique", "ratio"]
+    column: str | None = None
+    where: RowFilter | None = None
+    numerator: str | None = None
+    denominator: str | None = None
+    requires: list[str] = Field(default_factory=list)
+    # Restrict to these entities / windows (None: all configured).
+    entities: list[str] | None = None
+    windows: list[str] | None = None
+
+
+class EntitySpec(BaseModel):
+    """Entity a feature family is rolled up by: its group key and its distinct-count columns."""
+
+    name: str
+    group_key: str
+    distinct: list[str] = Field(default_factory=list)
+
+
+class FeatureSetSpec(BaseModel):
+    """Declarative rolling features for one event type (compiled by `builder.compile_feature_plan`)."""
+
+    event_type: str
+    entities: list[EntitySpec]
+    aggregates: list[AggregateSpec]
+
+
 class FeatureSpec(BaseModel):
     """Spec describing how a feature table was produced."""
 
@@ -14,6 +62,7 @@ class FeatureSpec(BaseModel):
     created_at: str = Field(default_factory=lambda: datetime.utcnow().replace(microsecond=0).isoformat() + "Z")
 
     windows: list[str]
+    half_lives: list[str] = Field(default_factory=list)
     entities: list[str]
     strict_past_only: bool = True
 
@@ -28,6 +77,13 @@ class FeatureSpec(BaseModel):
     partition_columns: list[str] = Field(default_factory=list)
 
     feature_columns: list[str] = Field(default_factory=list)
+    # Storage dtype per feature kind (counts/rates/sums); empty for legacy float64 tables.
+    dtype_policy: dict[str, str] = Field(default_factory=dict)
+    # Unique-count mode; for "hll" also the precision, the approximated windows and the
+    # relative standard error of those features.
+    unique_counts: dict[str, Any] = Field(default_factory=lambda: {"mode": "exact"})
+    # Entity/aggregate definitions the rolling features were compiled from.
+    feature_set: FeatureSetSpec | None = None
 
     def to_json(self) -> dict[str, Any]:
         return self.model_dump()
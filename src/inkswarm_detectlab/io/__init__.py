@@ -10,9 +10,20 @@ from .paths import (
     reports_dir,
     summary_path,
 )
-from .tables import read_auto, read_auto_legacy, write_auto, read_parquet, write_parquet, read_csv, write_csv
 from .manifest import read_manifest, write_manifest
 
+# Table readers/writers pull in pandas + pyarrow; resolve them on first use so that
+# importing io.paths / io.manifest (e.g. from light CLI commands) stays cheap.
+_TABLE_EXPORTS = frozenset({"read_auto", "read_auto_legacy", "write_auto", "read_parquet", "write_parquet", "read_csv", "write_csv"})
+
+
+def __getattr__(name: str):
+    if name in _TABLE_EXPORTS:
+        from . import tables
+
+        return getattr(tables, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     "run_dir",
     "raw_dir",
@@ -4,6 +4,8 @@ import json
 from pathlib import Path
 from typing import Any, Dict
 
+from .run_index import update_run_index
+
 
 def _normalize_manifest_path(path: Path) -> Path:
     """Accept either a run directory or an explicit manifest.json path."""
@@ -17,6 +19,8 @@ def write_manifest(path: Path, manifest: Dict[str, Any]) -> None:
     mpath = _normalize_manifest_path(path)
     mpath.parent.mkdir(parents=True, exist_ok=True)
     mpath.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    # Keep runs/.run_index.sqlite in sync (best-effort, see io/run_index.py).
+    update_run_index(mpath, manifest)
 
 
 def read_manifest(path: Path) -> Dict[str, Any]:
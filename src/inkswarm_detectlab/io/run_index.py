@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+"""SQLite run index for fast cross-run queries.
+
+`runs/.run_index.sqlite` mirrors the parts of each run's manifest.json (plus baseline
+metrics.json) that cross-run questions need, so "best RF user_holdout recall in the
+last 100 runs" does not walk the filesystem:
+
+- runs:      run_id, run_dir, config_hash, seed, schema_version, timezone, github_sha,
+             first_indexed_at / updated_at (UTC epoch seconds)
+- steps:     latest status per step (manifest["steps"])
+- artifacts: manifest["artifacts"] (path, format, rows, content_hash)
+- metrics:   long format (event, label, model, split, metric, value) from
+             models/<event>/baselines/metrics.json; re-read only when the manifest
+             content_hash of that artifact changes
+
+`write_manifest` keeps it current (best-effort: indexing never fails a pipeline step);
+`rebuild_run_index` backfills from disk. Set DETECTLAB_RUN_INDEX=0 to disable updates.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RUN_INDEX_NAME = ".run_index.sqlite"
+_SCHEMA_VERSION = 1
+
+# Per-split numbers copied from baseline metrics.json entries.
+INDEXED_METRICS = ("pr_auc", "roc_auc", "recall", "precision", "fpr", "threshold_used", "threshold_for_fpr")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    run_dir TEXT NOT NULL,
+    config_hash TEXT,
+    seed INTEGER,
+    schema_version TEXT,
+    timezone TEXT,
+    github_sha TEXT,
+    first_indexed_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    status TEXT,
+    PRIMARY KEY (run_id, step)
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    run_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    path TEXT,
+    format TEXT,
+    rows INTEGER,
+    content_hash TEXT,
+    PRIMARY KEY (run_id, key)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL,
+    event TEXT NOT NULL,
+    label TEXT NOT NULL,
+    model TEXT NOT NULL,
+    split TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, event, label, model, split, metric)
+);
+CREATE INDEX IF NOT EXISTS metrics_lookup ON metrics (metric, model, split, label);
+CREATE INDEX IF NOT EXISTS runs_recent ON runs (first_indexed_at);
+"""
+
+
+def run_index_enabled() -> bool:
+    return os.getenv("DETECTLAB_RUN_INDEX", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def run_index_path(runs_dir: Path) -> Path:
+    return Path(runs_dir) / RUN_INDEX_NAME
+
+
+def connect_run_index(runs_dir: Path) -> sqlite3.Connection:
+    """Open (and create if needed) the run index for runs_dir."""
+    path = run_index_path(runs_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30.0)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_SCHEMA)
+    conn.execute("INSERT OR IGNORE INTO meta(key, value) VALUES ('schema_version', ?)", (str(_SCHEMA_VERSION),))
+    return conn
+
+
+def _metrics_rows(event: str, payload: Dict[str, Any]) -> Iterator[Tuple[str, str, str, str, str, float]]:
+    for label, by_model in (payload.get("labels") or {}).items():
+        if not isinstance(by_model, dict):
+            continue
+        for model, entry in by_model.items():
+            if not isinstance(entry, dict) or entry.get("status") != "ok":
+                continue
+            for split, vals in entry.items():
+                if not isinstance(vals, dict):
+                    continue
+                for metric in INDEXED_METRICS:
+                    v = vals.get(metric)
+                    if isinstance(v, (int, float)) and not isinstance(v, bool):
+                        yield (event, str(label), str(model), str(split), metric, float(v))
+
+
+def _index_manifest(conn: sqlite3.Connection, run_dir: Path, manifest: Dict[str, Any]) -> None:
+    run_id = run_dir.name  # runs/<run_id>/ is the identity (copied runs may carry a stale manifest run_id)
+    now = time.time()
+    conn.execute(
+        """
+        INSERT INTO runs (run_id, run_dir, config_hash, seed, schema_version, timezone, github_sha, first_indexed_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(run_id) DO UPDATE SET
+            run_dir=excluded.run_dir, config_hash=excluded.config_hash, seed=excluded.seed,
+            schema_version=excluded.schema_version, timezone=excluded.timezone,
+            github_sha=excluded.github_sha, updated_at=excluded.updated_at
+        """,
+        (
+            run_id,
+            str(run_dir),
+            manifest.get("config_hash"),
+            manifest.get("seed") if isinstance(manifest.get("seed"), int) else None,
+            None if manifest.get("schema_version") is None else str(manifest.get("schema_version")),
+            manifest.get("timezone"),
+            (manifest.get("code") or {}).get("github_sha"),
+            now,
+            now,
+        ),
+    )
+
+    steps = manifest.get("steps") if isinstance(manifest.get("steps"), dict) else {}
+    conn.execute("DELETE FROM steps WHERE run_id = ?", (run_id,))
+    conn.executemany(
+        "INSERT INTO steps (run_id, step, status) VALUES (?, ?, ?)",
+        [(run_id, str(name), (s or {}).get("status") if isinstance(s, dict) else None) for name, s in steps.items()],
+    )
+
+    artifacts = manifest.get("artifacts") if isinstance(manifest.get("artifacts"), dict) else {}
+    old_hashes = dict(conn.execute("SELECT key, content_hash FROM artifacts WHERE run_id = ?", (run_id,)).fetchall())
+    conn.execute("DELETE FROM artifacts WHERE run_id = ?", (run_id,))
+    conn.executemany(
+        "INSERT INTO artifacts (run_id, key, path, format, rows, content_hash) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (run_id, str(k), a.get("path"), a.get("format"), a.get("rows") if isinstance(a.get("rows"), int) else None, a.get("content_hash"))
+            for k, a in artifacts.items()
+            if isinstance(a, dict)
+        ],
+    )
+
+    # Baseline metrics: models/<event>/baselines/metrics -> metrics rows.
+    indexed_events = {r[0] for r in conn.execute("SELECT DISTINCT event FROM metrics WHERE run_id = ?", (run_id,))}
+    current_events = set()
+    for key, art in artifacts.items():
+        parts = str(key).split("/")
+        if len(parts) != 4 or parts[0] != "models" or parts[2:] != ["baselines", "metrics"] or not isinstance(art, dict):
+            continue
+        event = parts[1]
+        current_events.add(event)
+        h = art.get("content_hash")
+        if h is not None and old_hashes.get(key) == h and event in indexed_events:
+            continue  # unchanged since last index: skip reading metrics.json
+        mpath = run_dir / "models" / event / "baselines" / "metrics.json"
+        try:
+            payload = json.loads(mpath.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        conn.execute("DELETE FROM metrics WHERE run_id = ? AND event = ?", (run_id, event))
+        conn.executemany(
+            "INSERT OR REPLACE INTO metrics (run_id, event, label, model, split, metric, value) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(run_id, *row) for row in _metrics_rows(event, payload)],
+        )
+    for event in indexed_events - current_events:
+        conn.execute("DELETE FROM metrics WHERE run_id = ? AND event = ?", (run_id, event))
+
+
+def update_run_index(manifest_path: Path, manifest: Dict[str, Any]) -> None:
+    """Upsert one run (runs/<run_id>/manifest.json) into runs/.run_index.sqlite.
+
+    Best-effort: errors are logged, never raised (called from `write_manifest`).
+    """
+    if not run_index_enabled():
+        return
+    run_dir = Path(manifest_path).parent
+    if manifest.get("run_id") != run_dir.name:
+        return  # not a runs/<run_id>/manifest.json layout; nothing to index into
+    try:
+        with closing(connect_run_index(run_dir.parent)) as conn, conn:
+            _index_manifest(conn, run_dir, manifest)
+    except Exception as e:  # noqa: BLE001
+        logger.warning("run index update failed for %s: %s", run_dir, e)
+
+
+def rebuild_run_index(runs_dir: Path) -> int:
+    """(Re)index every runs_dir/<run_id>/manifest.json; drops rows for runs no longer on disk."""
+    runs_dir = Path(runs_dir)
+    n = 0
+    with closing(connect_run_index(runs_dir)) as conn, conn:
+        seen = []
+        for mpath in sorted(runs_dir.glob("*/manifest.json")):
+            try:
+                manifest = json.loads(mpath.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            _index_manifest(conn, mpath.parent, manifest)
+            seen.append(mpath.parent.name)
+            n += 1
+        keep = set(seen)
+        stale = [r[0] for r in conn.execute("SELECT run_id FROM runs") if r[0] not in keep]
+        for table in ("runs", "steps", "artifacts", "metrics"):
+            conn.executemany(f"DELETE FROM {table} WHERE run_id = ?", [(r,) for r in stale])
+    return n
+
+
+def list_indexed_runs(runs_dir: Path, *, last_n: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Indexed runs, most recently first-indexed first, with step statuses."""
+    with closing(connect_run_index(runs_dir)) as conn:
+        sql = "SELECT * FROM runs ORDER BY first_indexed_at DESC, run_id DESC"
+        rows = conn.execute(sql + (" LIMIT ?" if last_n else ""), (last_n,) if last_n else ()).fetchall()
+        out = []
+        for r in rows:
+            d = dict(r)
+            d["steps"] = dict(conn.execute("SELECT step, status FROM steps WHERE run_id = ? ORDER BY step", (r["run_id"],)).fetchall())
+            out.append(d)
+    return out
+
+
+def best_runs(
+    runs_dir: Path,
+    *,
+    metric: str = "recall",
+    model: str = "rf",
+    split: str = "user_holdout",
+    label: Optional[str] = None,
+    event: str = "login_attempt",
+    last_n: Optional[int] = 100,
+    limit: int = 10,
+    descending: bool = True,
+) -> List[Dict[str, Any]]:
+    """Top runs by one metric, e.g. best RF user_holdout recall among the last 100 runs.
+
+    Only the `last_n` most recently indexed runs are considered (None = all). One row
+    per (run, label); filter with `label`.
+    """
+    if metric not in INDEXED_METRICS:
+        raise ValueError(f"Unknown metric {metric!r}; expected one of {INDEXED_METRICS}")
+    where = ["m.metric = ?", "m.model = ?", "m.split = ?", "m.event = ?"]
+    params: List[Any] = [metric, model, split, event]
+    if label is not None:
+        where.append("m.label = ?")
+        params.append(label)
+    recent = "SELECT run_id FROM runs ORDER BY first_indexed_at DESC, run_id DESC" + (" LIMIT ?" if last_n else "")
+    if last_n:
+        params.append(int(last_n))
+    sql = f"""
+        SELECT m.run_id, m.label, m.model, m.split, m.metric, m.value, r.config_hash, r.run_dir
+        FROM metrics m JOIN runs r ON r.run_id = m.run_id
+        WHERE {' AND '.join(where)} AND m.run_id IN ({recent})
+        ORDER BY m.value {'DESC' if descending else 'ASC'}, m.run_id
+        LIMIT ?
+    """
+    params.append(int(limit))
+    with closing(connect_run_index(runs_dir)) as conn:
+        return [dict(r) for r in conn.execute(sql, params).fetchall()]
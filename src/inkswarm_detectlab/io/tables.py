@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import shutil
 from pathlib import Path
 
 import pandas as pd
@@ -12,6 +13,12 @@ import pandas as pd
 def write_parquet(df: pd.DataFrame, path: Path, *, partition_cols: list[str] | None = None) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     if partition_cols:
+        # Partitioned writes add new part files next to existing ones; clear the
+        # dataset first so an overwrite (--force) does not duplicate rows.
+        if path.is_dir():
+            shutil.rmtree(path)
+        elif path.exists():
+            path.unlink()
         df.to_parquet(path, index=False, partition_cols=partition_cols)
     else:
         df.to_parquet(path, index=False)
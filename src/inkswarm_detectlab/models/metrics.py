@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterable, Tuple
 
 import numpy as np
 
+from ..kernels import sweep_runs
+
 
 @dataclass(frozen=True)
 class ThresholdResult:
@@ -14,46 +16,135 @@ class ThresholdResult:
     precision: float
 
 
-def choose_threshold_for_fpr(y_true: np.ndarray, scores: np.ndarray, target_fpr: float) -> ThresholdResult:
-    """Choose a score threshold that achieves FPR <= target_fpr and is as close as possible to it.
+_NONE_RESULT = ThresholdResult(threshold=float("inf"), fpr=0.0, recall=0.0, precision=0.0)
+
+
+@dataclass(frozen=True)
+class ThresholdSweep:
+    """Confusion counts for every distinct score threshold (ROC-style sweep).
 
-    Deterministic: iterates unique thresholds in descending score order.
+    Built from a single descending sort of the scores. Entry ``i`` describes the
+    rule ``score >= thresholds[i]``; thresholds are strictly descending, so the
+    cumulative counts (and therefore ``fpr``) are non-decreasing.
+
+    A NaN score never satisfies ``score >= thr``; when NaNs are present, NaN itself
+    is the first candidate (predicting nothing), mirroring ``np.unique`` ordering.
     """
-    y = y_true.astype(int)
-    s = scores.astype(float)
 
-    neg = (y == 0)
-    pos = (y == 1)
-    n_neg = int(neg.sum())
+    thresholds: np.ndarray
+    tp: np.ndarray
+    fp: np.ndarray
+    n_pred: np.ndarray
+    n_pos: int
+    n_neg: int
+
+    @property
+    def fpr(self) -> np.ndarray:
+        return self.fp / self.n_neg if self.n_neg else np.zeros(len(self.fp), dtype=float)
+
+    @property
+    def recall(self) -> np.ndarray:
+        return self.tp / self.n_pos if self.n_pos else np.zeros(len(self.tp), dtype=float)
+
+    @property
+    def precision(self) -> np.ndarray:
+        out = np.zeros(len(self.tp), dtype=float)
+        nz = self.n_pred > 0
+        out[nz] = self.tp[nz] / self.n_pred[nz]
+        return out
+
+    def _result(self, i: int, fpr: np.ndarray, recall: np.ndarray, precision: np.ndarray) -> ThresholdResult:
+        return ThresholdResult(
+            threshold=float(self.thresholds[i]),
+            fpr=float(fpr[i]),
+            recall=float(recall[i]),
+            precision=float(precision[i]),
+        )
+
+    def _n_feasible(self, fpr: np.ndarray, target_fpr: float) -> int:
+        # fpr is non-decreasing along the sweep, so feasible thresholds form a prefix.
+        return int(np.searchsorted(fpr, target_fpr + 1e-12, side="right"))
+
+    def for_fprs(self, target_fprs: Iterable[float]) -> list[ThresholdResult]:
+        """Resolve many target FPRs against this sweep (see `choose_threshold_for_fpr`)."""
+        targets = [float(t) for t in target_fprs]
+        if self.n_neg == 0:
+            return [_NONE_RESULT for _ in targets]
+        fpr, recall, precision = self.fpr, self.recall, self.precision
+        out: list[ThresholdResult] = []
+        for t in targets:
+            n = self._n_feasible(fpr, t)
+            if n == 0:
+                out.append(_NONE_RESULT)
+                continue
+            # Highest threshold reaching the largest feasible FPR.
+            i = int(np.searchsorted(fpr, fpr[n - 1], side="left"))
+            out.append(self._result(i, fpr, recall, precision))
+        return out
+
+    def top_for_fpr(self, target_fpr: float, *, k: int = 3) -> list[ThresholdResult]:
+        """Up to k feasible thresholds ranked by (recall, fpr, precision), descending."""
+        if self.n_neg == 0:
+            return [_NONE_RESULT]
+        fpr, recall, precision = self.fpr, self.recall, self.precision
+        n = self._n_feasible(fpr, float(target_fpr))
+        if n == 0:
+            return []
+        # Stable descending sort: ties keep descending-threshold order.
+        order = np.lexsort((np.arange(n), -precision[:n], -fpr[:n], -recall[:n]))
+        return [self._result(int(i), fpr, recall, precision) for i in order[: max(1, int(k))]]
+
+
+def threshold_sweep(y_true: np.ndarray, scores: np.ndarray) -> ThresholdSweep:
+    """Sort scores once and accumulate TP/FP counts per distinct threshold. O(n log n)."""
+    y = np.asarray(y_true).astype(int)
+    s = np.asarray(scores).astype(float)
+
+    pos = y == 1
+    neg = y == 0
     n_pos = int(pos.sum())
+    n_neg = int(neg.sum())
+
+    nan = np.isnan(s)
+    has_nan = bool(nan.any())
+    if has_nan:
+        keep = ~nan
+        s, pos, neg = s[keep], pos[keep], neg[keep]
+
+    order = np.argsort(-s, kind="mergesort")
+    s_sorted = s[order]
+
+    # Last index of each run of equal scores -> counts for `score >= thr`.
+    ends, tp, fp = sweep_runs(s_sorted, pos[order], neg[order])
 
-    if n_neg == 0:
-        # degenerate: no negatives, allow threshold=+inf (predict none) for safety.
-        return ThresholdResult(threshold=float("inf"), fpr=0.0, recall=0.0, precision=0.0)
+    thresholds = s_sorted[ends]
+    n_pred = ends + 1
 
-    # Candidate thresholds = unique scores (descending)
-    uniq = np.unique(s)
-    uniq = uniq[::-1]  # descending
+    if has_nan:
+        thresholds = np.r_[np.nan, thresholds]
+        tp = np.r_[0, tp].astype(np.int64)
+        fp = np.r_[0, fp].astype(np.int64)
+        n_pred = np.r_[0, n_pred].astype(np.int64)
 
-    best: ThresholdResult | None = None
+    return ThresholdSweep(thresholds=thresholds, tp=tp, fp=fp, n_pred=n_pred, n_pos=n_pos, n_neg=n_neg)
 
-    for thr in uniq:
-        preds = (s >= thr)
-        fp = int((preds & neg).sum())
-        tp = int((preds & pos).sum())
-        fpr = fp / n_neg if n_neg else 0.0
-        if fpr <= target_fpr + 1e-12:
-            recall = tp / n_pos if n_pos else 0.0
-            precision = (tp / int(preds.sum())) if int(preds.sum()) else 0.0
-            cand = ThresholdResult(threshold=float(thr), fpr=float(fpr), recall=float(recall), precision=float(precision))
-            if best is None or cand.fpr > best.fpr + 1e-12:
-                best = cand
 
-    if best is not None:
-        return best
+def choose_threshold_for_fpr(y_true: np.ndarray, scores: np.ndarray, target_fpr: float) -> ThresholdResult:
+    """Choose a score threshold that achieves FPR <= target_fpr and is as close as possible to it.
+
+    Deterministic: considers unique thresholds in descending score order and keeps the
+    highest threshold reaching the largest feasible FPR.
+    """
+    return threshold_sweep(y_true, scores).for_fprs([target_fpr])[0]
+
 
-    # If no threshold can satisfy target (e.g., one score ties), use +inf -> predict none.
-    return ThresholdResult(threshold=float("inf"), fpr=0.0, recall=0.0, precision=0.0)
+def choose_thresholds_for_fprs(
+    y_true: np.ndarray,
+    scores: np.ndarray,
+    target_fprs: Iterable[float],
+) -> list[ThresholdResult]:
+    """Batched `choose_threshold_for_fpr`: one sort, many target FPRs (results in input order)."""
+    return threshold_sweep(y_true, scores).for_fprs(target_fprs)
 
 
 def top_thresholds_for_fpr(
@@ -69,28 +160,4 @@ def top_thresholds_for_fpr(
 
     Ranking (descending): recall, fpr, precision.
     """
-    y = y_true.astype(int)
-    s = scores.astype(float)
-
-    neg = (y == 0)
-    pos = (y == 1)
-    n_neg = int(neg.sum())
-    n_pos = int(pos.sum())
-
-    if n_neg == 0:
-        return [ThresholdResult(threshold=float("inf"), fpr=0.0, recall=0.0, precision=0.0)]
-
-    uniq = np.unique(s)[::-1]
-    cands: list[ThresholdResult] = []
-    for thr in uniq:
-        preds = (s >= thr)
-        fp = int((preds & neg).sum())
-        tp = int((preds & pos).sum())
-        fpr = fp / n_neg if n_neg else 0.0
-        if fpr <= target_fpr + 1e-12:
-            recall = tp / n_pos if n_pos else 0.0
-            precision = (tp / int(preds.sum())) if int(preds.sum()) else 0.0
-            cands.append(ThresholdResult(threshold=float(thr), fpr=float(fpr), recall=float(recall), precision=float(precision)))
-
-    cands.sort(key=lambda r: (r.recall, r.fpr, r.precision), reverse=True)
-    return cands[: max(1, int(k))]
+    return threshold_sweep(y_true, scores).top_for_fpr(target_fpr, k=k)
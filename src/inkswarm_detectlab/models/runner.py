@@ -20,9 +20,11 @@ from ..config.models import HGBBaselineConfig, LogRegBaselineConfig, RFBaselineC
 from ..features.runner import build_login_features_for_run
 from ..io.manifest import read_manifest, write_manifest
 from ..io.paths import manifest_path, run_dir as run_dir_for
+from ..io.tables import write_parquet
 from ..synthetic.label_defs import as_markdown_table as _labels_markdown_table
 from ..utils.canonical import canonicalize_df
-from ..utils.hashing import stable_hash_dict
+from ..utils.hashing import stable_hash_df, stable_hash_dict
+from ..utils.perf import perf_stage, profiled, stage_note
 from .metrics import choose_threshold_for_fpr, top_thresholds_for_fpr
 
 # sklearn is an MVP dependency (D-0004)
@@ -80,6 +82,16 @@ def _env_diagnostics() -> dict[str, Any]:
 
 LABEL_COLS = ["label_replicators", "label_the_mule", "label_the_chameleon"]
 
+SPLITS = ("train", "time_eval", "user_holdout")
+
+# Persisted score vectors (one column per label x model, one row per event per split).
+SCORES_BASENAME = "scores"
+
+
+def score_column(label: str, model_name: str) -> str:
+    """Column name of a persisted score vector (mirrors legacy `<label>__<model>.joblib`)."""
+    return f"{label}__{model_name}"
+
 
 def _load_features(cfg: AppConfig, rdir: Path, *, split: str | None = None) -> pd.DataFrame:
     # Always use FeatureLab output path
@@ -94,11 +106,38 @@ def _select_X_y(df: pd.DataFrame) -> tuple[pd.DataFrame, dict[str, np.ndarray]]:
     # Feature columns: numeric only, exclude keys + labels
     exclude = {"event_id", "event_ts", "user_id", "session_id", "is_fraud", "label_benign"} | set(LABEL_COLS)
     feat_cols = [c for c in df.columns if c not in exclude and pd.api.types.is_numeric_dtype(df[c])]
-    X = df[feat_cols].copy()
+    X = df[feat_cols].astype(_matrix_dtype(df[feat_cols]))
     ys = {lab: df[lab].astype(int).to_numpy() for lab in LABEL_COLS if lab in df.columns}
     return X, ys
 
 
+def _matrix_dtype(X: pd.DataFrame) -> np.dtype:
+    """Float dtype for the model matrix that honors `features.dtype_policy`.
+
+    When every feature column is stored in 32 bits or less (int32 counts, float32
+    rates/sums) the matrix is float32, so the imputer/scaler/RF keep float32
+    instead of upcasting each split to float64. Legacy float64 tables stay float64.
+    """
+    if len(X.columns) and all(getattr(t, "itemsize", 8) <= 4 for t in X.dtypes):
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+def _set_pipeline_feature_meta(pipe: Pipeline, model: Any, feature_names: list[str] | None) -> None:
+    """Attach n_features_in_/feature_names_in_ to a hand-assembled Pipeline.
+
+    Newer sklearn exposes these as read-only properties derived from the steps;
+    in that case the derived values already apply and we leave them alone.
+    """
+    try:
+        if hasattr(model, "n_features_in_"):
+            pipe.n_features_in_ = model.n_features_in_  # type: ignore[attr-defined]
+        if feature_names is not None:
+            pipe.feature_names_in_ = np.array(feature_names)  # type: ignore[attr-defined]
+    except AttributeError:
+        pass
+
+
 def _fit_logreg(
     cfg: AppConfig,
     X: np.ndarray,
@@ -129,10 +168,7 @@ def _fit_logreg(
     steps.append(("model", model))
 
     pipe = Pipeline(steps=steps)
-    if hasattr(model, "n_features_in_"):
-        pipe.n_features_in_ = model.n_features_in_  # type: ignore[attr-defined]
-    if feature_names is not None:
-        pipe.feature_names_in_ = np.array(feature_names)  # type: ignore[attr-defined]
+    _set_pipeline_feature_meta(pipe, model, feature_names)
     return pipe
 
 
@@ -164,10 +200,7 @@ def _fit_rf(
     steps.append(("model", model))
 
     pipe = Pipeline(steps=steps)
-    if hasattr(model, "n_features_in_"):
-        pipe.n_features_in_ = model.n_features_in_  # type: ignore[attr-defined]
-    if feature_names is not None:
-        pipe.feature_names_in_ = np.array(feature_names)  # type: ignore[attr-defined]
+    _set_pipeline_feature_meta(pipe, model, feature_names)
     return pipe
 
 
@@ -227,6 +260,22 @@ def _score_model(model: Pipeline, X: pd.DataFrame | np.ndarray) -> np.ndarray:
     return model.predict(X).astype(float)
 
 
+def _scores_frame(
+    frames: dict[str, pd.DataFrame],
+    score_vectors: dict[tuple[str, str], dict[str, np.ndarray]],
+) -> pd.DataFrame:
+    """Score table: event_id, split, one float column per (label, model)."""
+    parts: list[pd.DataFrame] = []
+    for split in SPLITS:
+        df = frames[split]
+        part = pd.DataFrame({"event_id": df["event_id"].astype(str).to_numpy(), "split": split})
+        for label, model_name in sorted(score_vectors):
+            part[score_column(label, model_name)] = np.asarray(score_vectors[(label, model_name)][split], dtype=np.float64)
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True)
+
+
+@profiled("run_login_baselines_for_run")
 def run_login_baselines_for_run(
     cfg: AppConfig,
     *,
@@ -244,9 +293,13 @@ def run_login_baselines_for_run(
     if not feat_base.with_suffix(".parquet").exists():
         build_login_features_for_run(cfg, run_id=run_id, force=False)
 
-    df_train = _load_features(cfg, rdir, split="train")
-    df_time = _load_features(cfg, rdir, split="time_eval")
-    df_hold = _load_features(cfg, rdir, split="user_holdout")
+    stage_note(run_dir=rdir)
+    with perf_stage("load_features"):
+        df_train = _load_features(cfg, rdir, split="train")
+        df_time = _load_features(cfg, rdir, split="time_eval")
+        df_hold = _load_features(cfg, rdir, split="user_holdout")
+        stage_note(rows_out=len(df_train) + len(df_time) + len(df_hold))
+    stage_note(rows_in=len(df_train) + len(df_time) + len(df_hold))
 
     X_train, ys_train = _select_X_y(df_train)
     X_time, ys_time = _select_X_y(df_time)
@@ -398,6 +451,9 @@ def run_login_baselines_for_run(
                     rows.append({"feature": feature_names[int(i)], "importance": float(w[int(i)])})
         return rows
 
+    # Filled by _fit_and_score (one entry per successful fit); written once as the scores artifact.
+    score_vectors: dict[tuple[str, str], dict[str, np.ndarray]] = {}
+
     jobs = [(label, model_name) for label in ys_train.keys() for model_name in bcfg.models]
     seeds = np.random.SeedSequence(int(cfg.run.seed)).spawn(len(jobs))
     actual_n_jobs = min(requested_n_jobs, len(jobs) or 1)
@@ -475,9 +531,13 @@ def run_login_baselines_for_run(
                     local_logs,
                 )
 
-            s_train = _score_model(model, X_train_for_model)
-            s_time = _score_model(model, X_time_for_model)
-            s_hold = _score_model(model, X_hold_for_model)
+            # logreg/rf matrices are already imputed (+ scaled), so score with the fitted
+            # estimator directly; the saved pipeline would re-apply those transforms.
+            scorer = model.steps[-1][1] if model_name in ("logreg", "rf") else model
+            s_train = _score_model(scorer, X_train_for_model)
+            s_time = _score_model(scorer, X_time_for_model)
+            s_hold = _score_model(scorer, X_hold_for_model)
+            score_vectors[(label, model_name)] = {"train": s_train, "time_eval": s_time, "user_holdout": s_hold}
 
             y_tr = ys_train[label]
             y_time = ys_time[label]
@@ -554,9 +614,10 @@ def run_login_baselines_for_run(
     n_ok = 0
     n_failed = 0
 
-    job_results = Parallel(n_jobs=actual_n_jobs, prefer="threads")(
-        delayed(_fit_and_score)(label, model_name, seed) for (label, model_name), seed in zip(jobs, seeds)
-    )
+    with perf_stage("fit_and_score"):
+        job_results = Parallel(n_jobs=actual_n_jobs, prefer="threads")(
+            delayed(_fit_and_score)(label, model_name, seed) for (label, model_name), seed in zip(jobs, seeds)
+        )
 
     for label, model_name, entry, logs in job_results:
         log_messages.extend(logs)
@@ -585,6 +646,10 @@ def run_login_baselines_for_run(
     metrics_path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
     report_path = out_dir / "report.md"
     report_path.write_text(_render_report(results), encoding="utf-8")
+    scores_df = _scores_frame({"train": df_train, "time_eval": df_time, "user_holdout": df_hold}, score_vectors)
+    scores_path = out_dir / f"{SCORES_BASENAME}.parquet"
+    stage_note(rows_out=len(scores_df))
+    write_parquet(scores_df, scores_path)
 
     # Also copy a user-friendly report under runs/<run_id>/reports/
     try:
@@ -666,6 +731,13 @@ def run_login_baselines_for_run(
         "rows": None,
         "content_hash": stable_hash_dict({"report": report_path.read_text(encoding="utf-8")}),
     }
+    artifacts["models/login_attempt/baselines/scores"] = {
+        "path": str(scores_path.relative_to(cfg.paths.runs_dir)),
+        "format": "parquet",
+        "note": "UNCOMMITTED",
+        "rows": int(len(scores_df)),
+        "content_hash": stable_hash_df(scores_df, sort_keys=["split", "event_id"], column_order=list(scores_df.columns)),
+    }
     artifacts["logs/baselines"] = {
         "path": str(log_path.relative_to(cfg.paths.runs_dir)),
         "format": "text",
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+"""Declarative stage graph + parallel scheduler for the MVP pipeline.
+
+A pipeline is a list of `Stage`s in declaration order. Each stage names the stages
+it depends on (`deps`) and the run-relative paths it reads (`inputs`) and writes
+(`outputs`; `*` globs allowed). `run_stages` starts every stage whose deps have
+finished on a thread pool, so independent stages (e.g. the shared-cache copy and
+baseline training) overlap.
+
+Determinism:
+- `validate_stages` rejects graphs where two stages that may run concurrently
+  (neither is an ancestor of the other) write overlapping paths, or one writes
+  what the other reads. Run outputs therefore do not depend on completion order.
+- Results are returned in declaration order, and each stage receives only the
+  results of its ancestors (never of a concurrently running sibling).
+
+Failure semantics (best-effort, as before the graph existed):
+- a failing stage does not stop its dependents; they run and report on their own
+- a failing `required` stage stops scheduling; stages already running finish,
+  stages not yet started are left out of the results
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set
+
+from ..utils.perf import perf_stage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StageResult:
+    name: str
+    status: str  # ok | fail
+    message: Optional[str] = None
+    value: Any = None
+    seconds: float = 0.0
+
+    def as_step(self) -> dict[str, Any]:
+        """The `summary["steps"]` record for this result."""
+        step: dict[str, Any] = {"name": self.name, "status": self.status}
+        if self.message:
+            step["message"] = self.message
+        return step
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline stage.
+
+    `fn` is called with the results of the stage's ancestors (declaration order).
+    `message`, if given, maps the return value of a successful call to a step
+    message (e.g. "partial (see logs/baselines.log)").
+    `record=False` marks fail-soft extras (cache writes, report renders): they are
+    scheduled like any other stage but are not listed in summary["steps"].
+    """
+
+    name: str
+    fn: Callable[[Mapping[str, StageResult]], Any]
+    deps: tuple[str, ...] = ()
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    required: bool = False
+    record: bool = True
+    message: Optional[Callable[[Any], Optional[str]]] = None
+
+
+@dataclass
+class StageRun:
+    results: Dict[str, StageResult] = field(default_factory=dict)
+    aborted_by: Optional[str] = None
+
+    def steps(self, stages: Sequence[Stage]) -> List[dict[str, Any]]:
+        """summary["steps"] records of the recorded stages that ran, in declaration order."""
+        return [self.results[s.name].as_step() for s in stages if s.record and s.name in self.results]
+
+
+def _overlaps(a: str, b: str) -> bool:
+    a, b = a.strip("/"), b.strip("/")
+    if "*" in a or "*" in b:
+        return fnmatch(a, b) or fnmatch(b, a)
+    return a == b or a.startswith(b + "/") or b.startswith(a + "/")
+
+
+def _ancestors(stages: Sequence[Stage]) -> Dict[str, Set[str]]:
+    anc: Dict[str, Set[str]] = {}
+    for s in stages:
+        acc: Set[str] = set()
+        for d in s.deps:
+            acc.add(d)
+            acc |= anc[d]
+        anc[s.name] = acc
+    return anc
+
+
+def validate_stages(stages: Sequence[Stage]) -> Dict[str, Set[str]]:
+    """Check names/deps/path conflicts; returns the ancestor set of every stage.
+
+    Deps must refer to stages declared earlier, so declaration order is a
+    topological order and cycles cannot be expressed.
+    """
+    seen: Set[str] = set()
+    for s in stages:
+        if s.name in seen:
+            raise ValueError(f"Duplicate stage name: {s.name!r}")
+        for d in s.deps:
+            if d not in seen:
+                raise ValueError(f"Stage {s.name!r} depends on {d!r}, which is not declared before it")
+        seen.add(s.name)
+
+    anc = _ancestors(stages)
+    for i, a in enumerate(stages):
+        for b in stages[i + 1 :]:
+            if a.name in anc[b.name] or b.name in anc[a.name]:
+                continue  # ordered: no race
+            for x, y in ((a, b), (b, a)):
+                for out in x.outputs:
+                    hit = next((p for p in (*y.outputs, *y.inputs) if _overlaps(out, p)), None)
+                    if hit is not None:
+                        raise ValueError(
+                            f"Stages {x.name!r} and {y.name!r} may run concurrently but {x.name!r} writes "
+                            f"{out!r} which overlaps {hit!r}; add a dependency between them"
+                        )
+    return anc
+
+
+def _call(stage: Stage, upstream: Mapping[str, StageResult], run_dir: Optional[Path]) -> StageResult:
+    t0 = time.perf_counter()
+    try:
+        with perf_stage(stage.name, run_dir=run_dir):  # -> <run_dir>/logs/perf.json
+            value = stage.fn(upstream)
+        msg = stage.message(value) if stage.message is not None else None
+        return StageResult(stage.name, "ok", msg, value, time.perf_counter() - t0)
+    except Exception as e:
+        return StageResult(stage.name, "fail", str(e), None, time.perf_counter() - t0)
+
+
+def run_stages(stages: Sequence[Stage], *, workers: int = 4, run_dir: Optional[Path] = None) -> StageRun:
+    """Run `stages` respecting deps, up to `workers` at a time.
+
+    `workers=1` runs them one by one in declaration order. With `run_dir`, every
+    stage is recorded in its logs/perf.json (otherwise only stages whose entry
+    points report a run dir are).
+    """
+    anc = validate_stages(stages)
+    order = {s.name: i for i, s in enumerate(stages)}
+    run = StageRun()
+    pending = list(stages)
+    running: Dict[Future, Stage] = {}
+
+    def _upstream(s: Stage) -> Dict[str, StageResult]:
+        return {n: run.results[n] for n in sorted(anc[s.name], key=order.__getitem__)}
+
+    with ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="stage") as pool:
+        while pending or running:
+            if run.aborted_by is None:
+                # Ready stages start in declaration order (workers=1: strictly sequential).
+                for s in [s for s in pending if all(d in run.results for d in s.deps)]:
+                    if len(running) >= max(1, int(workers)):
+                        break
+                    pending.remove(s)
+                    running[pool.submit(_call, s, _upstream(s), run_dir)] = s
+            else:
+                pending.clear()
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in sorted(done, key=lambda f: order[running[f].name]):
+                s = running.pop(fut)
+                res = fut.result()
+                run.results[s.name] = res
+                level = logging.WARNING if res.status == "fail" else logging.INFO
+                logger.log(level, "[stage] %s %s in %.2fs%s", s.name, res.status, res.seconds, f": {res.message}" if res.message else "")
+                if res.status == "fail" and s.required and run.aborted_by is None:
+                    run.aborted_by = s.name
+
+    run.results = {s.name: run.results[s.name] for s in stages if s.name in run.results}
+    return run
@@ -4,7 +4,7 @@ from pathlib import Path
 import logging
 from typing import Any, Optional
 
-from ..config import load_config
+from ..config import AppConfig, load_config
 from ..pipeline import run_all, _config_fingerprint
 from ..utils.run_id import make_run_id
 from ..cache.feature_cache import try_restore_feature_artifacts, save_feature_artifacts_to_cache
@@ -18,6 +18,8 @@ from ..share.evidence import export_evidence_bundle
 logger = logging.getLogger(__name__)
 from ..io.paths import run_dir as run_dir_for
 
+from ..utils.perf import profiler_mode
+from .dag import Stage, run_stages
 from .handover import write_mvp_handover
 from inkswarm_detectlab.reports.exec_summary import write_exec_summary
 
@@ -34,6 +36,7 @@ def run_mvp(
     - fastest default: build features for login only
     - stakeholder output: always export a static HTML bundle and a handover md
     - best effort: continue when possible and report failures clearly
+    - independent stages run concurrently (`run.stage_workers`, see `mvp_stages`)
     """
     cfg = load_config(cfg_path)
 
@@ -55,16 +58,6 @@ def run_mvp(
         "steps": [],
     }
 
-    def _step(name: str, fn):
-        try:
-            out = fn()
-            summary["steps"].append({"name": name, "status": "ok"})
-            return out
-        except Exception as e:
-            summary["steps"].append({"name": name, "status": "fail", "message": str(e)})
-            return None
-
-    # 1) Raw + dataset (required; if this fails we can't proceed).
     # Pre-create run dir so we can attempt a shared-cache restore before doing heavy work.
     rdir = run_dir_for(cfg.paths.runs_dir, run_id)
     rdir.mkdir(parents=True, exist_ok=True)
@@ -79,83 +72,174 @@ def run_mvp(
         else:
             logger.info(f"[feature-cache] MISS key={cache_info.cache_key} (dir will be {cache_info.cache_dir})")
 
-    out = (rdir, {"cached": True}) if cache_hit else _step("skynet+dataset", lambda: run_all(cfg, run_id=run_id))
-    if out is None:
+    stages = mvp_stages(cfg, cfg_path=cfg_path, run_id=run_id, rdir=rdir, force=force, cache_hit=cache_hit, summary=summary)
+    # Profiling attributes process-wide counters to one stage at a time: run sequentially.
+    run = run_stages(stages, workers=1 if profiler_mode() else cfg.run.stage_workers, run_dir=rdir)
+    summary["steps"] = run.steps(stages)
+
+    if run.aborted_by is not None:
         summary["status"] = "fail"
-        # best guess: run_dir can't be known if generation failed.
-        rdir = run_dir_for(cfg.paths.runs_dir, run_id or "RUN_UNKNOWN")
         return rdir, summary
 
-    rdir, _ = out
-    rid = rdir.name
-    summary["run_id"] = rid
+    # Overall status
+    fails = [s for s in summary["steps"] if s.get("status") == "fail"]
+    summary["status"] = "ok" if not fails else "partial"
 
-    # 2) Features (login only; fastest)
-    _step("features(login)", lambda: build_login_features_for_run(cfg, run_id=rid, force=force))
+    for extra in ("feature_cache", "exec_summary"):
+        res = run.results.get(extra)
+        if res is not None and res.status == "fail":
+            # Fail-soft extras; core pipeline should remain usable
+            logger.warning(f"{extra} failed: {res.message}")
 
-    if (not cache_hit) and getattr(cfg.features, "write_cache", True) and not force:
-        try:
-            save_feature_artifacts_to_cache(cfg, rdir)
-            logger.info("[feature-cache] Saved dataset/features into shared cache.")
-        except Exception as e:  # best-effort; cache never blocks a run
-            logger.warning(f"[feature-cache] Failed to write cache: {e}")
+    return rdir, summary
 
 
-    # 3) Baselines (logreg + rf)
-    try:
-        _, results = run_login_baselines_for_run(cfg, run_id=rid, force=force, cfg_path=cfg_path)
-        if results.get("status") == "partial":
-            summary["steps"].append(
-                {"name": "baselines(login)", "status": "ok", "message": "partial (see logs/baselines.log)"}
+def mvp_stages(
+    cfg: AppConfig,
+    *,
+    cfg_path: Path,
+    run_id: str,
+    rdir: Path,
+    force: bool,
+    cache_hit: bool,
+    summary: dict[str, Any],
+) -> list[Stage]:
+    """The MVP stage graph (declaration order = summary["steps"] order).
+
+    Independent branches: the shared-cache write overlaps baselines/eval, and the
+    exec summary render overlaps the UI export + handover.
+    """
+    rid = run_id
+    share_dir = rdir / "share" / "ui_bundle"
+
+    def _steps_view(upstream) -> dict[str, Any]:
+        # Handover digests only the steps it depends on, so its text does not depend on timing.
+        return {**summary, "steps": [r.as_step() for n, r in upstream.items() if n in recorded]}
+
+    stages: list[Stage] = []
+    if not cache_hit:
+        stages.append(
+            Stage(
+                "skynet+dataset",
+                lambda _: run_all(cfg, run_id=rid),
+                outputs=("raw", "dataset", "reports/summary.md", "manifest.json"),
+                required=True,
             )
-        else:
-            summary["steps"].append({"name": "baselines(login)", "status": "ok"})
-    except Exception as e:
-        summary["steps"].append({"name": "baselines(login)", "status": "fail", "message": str(e)})
+        )
+    first = tuple(s.name for s in stages)
 
+    # 2) Features (login only; fastest)
+    stages.append(
+        Stage(
+            "features(login)",
+            lambda _: build_login_features_for_run(cfg, run_id=rid, force=force),
+            deps=first,
+            inputs=("dataset",),
+            outputs=("features/login_attempt", "manifest.json"),
+        )
+    )
 
-    # 4) Evaluation diagnostics (slices + stability; stakeholder-first)
-    try:
-        ev = run_login_eval_for_run(cfg, run_id=rid, force=force)
-        if ev.status == "partial":
-            summary["steps"].append({"name": "eval(login)", "status": "ok", "message": "partial (see reports/eval_*.md)"})
-        else:
-            summary["steps"].append({"name": "eval(login)", "status": "ok"})
-    except Exception as e:
-        summary["steps"].append({"name": "eval(login)", "status": "fail", "message": str(e)})
+    if (not cache_hit) and getattr(cfg.features, "write_cache", True) and not force:
+        # Best-effort; cache never blocks a run. Copies dataset/features out of the run dir.
+        stages.append(
+            Stage(
+                "feature_cache",
+                lambda _: save_feature_artifacts_to_cache(cfg, rdir),
+                deps=("features(login)",),
+                inputs=("raw", "dataset", "features"),
+                record=False,
+            )
+        )
 
-    # 4) ui_summary.json (even if baselines failed, summary can still be produced)
-    _step("ui_summarize", lambda: write_ui_summary(cfg, run_id=rid, force=True))
+    # 3) Baselines (logreg + rf)
+    stages.append(
+        Stage(
+            "baselines(login)",
+            lambda _: run_login_baselines_for_run(cfg, run_id=rid, force=force, cfg_path=cfg_path)[1],
+            deps=("features(login)",),
+            inputs=("features/login_attempt",),
+            outputs=(
+                "models/login_attempt/baselines",
+                "reports/baselines_login_attempt.md",
+                "reports/summary.md",
+                "logs/baselines.log",
+                "manifest.json",
+            ),
+            message=lambda results: "partial (see logs/baselines.log)" if results.get("status") == "partial" else None,
+        )
+    )
 
-    # 5) Export HTML bundle (single run, but supports up to 5)
-    share_dir = rdir / "share" / "ui_bundle"
-    _step("ui_export", lambda: export_ui_bundle(cfg, run_ids=[rid], out_dir=share_dir, force=True))
+    # 4) Evaluation diagnostics (slices + stability; stakeholder-first)
+    stages.append(
+        Stage(
+            "eval(login)",
+            lambda _: run_login_eval_for_run(cfg, run_id=rid, force=force),
+            deps=("baselines(login)",),
+            inputs=("features/login_attempt", "models/login_attempt/baselines"),
+            outputs=("reports/eval_*_login_attempt.json", "reports/eval_*_login_attempt.md", "manifest.json"),
+            message=lambda ev: "partial (see reports/eval_*.md)" if ev.status == "partial" else None,
+        )
+    )
 
-    # 6) Stakeholder handover
-    _step(
-        "handover",
-        lambda: write_mvp_handover(
-            runs_dir=cfg.paths.runs_dir,
-            run_id=rid,
-            ui_bundle_dir=share_dir,
-            summary=summary,
-        ),
+    # 5) ui_summary.json (even if baselines failed, summary can still be produced)
+    stages.append(
+        Stage(
+            "ui_summarize",
+            lambda _: write_ui_summary(cfg, run_id=rid, force=True),
+            deps=("eval(login)",),
+            inputs=("manifest.json", "models/login_attempt/baselines", "reports", "logs/baselines.log"),
+            outputs=("ui",),
+        )
     )
 
-    
+    # 6) D-0016: stakeholder-friendly executive summary (MD + HTML) and HTML render of summary.md
+    stages.append(
+        Stage(
+            "exec_summary",
+            lambda _: write_exec_summary(run_dir=rdir, rr_provisional=True, d0004_deferred=True),
+            deps=("ui_summarize",),
+            inputs=("reports/summary.md", "reports/*.json"),
+            outputs=("reports/EXEC_SUMMARY.md", "reports/EXEC_SUMMARY.html", "reports/summary.md", "reports/summary.html"),
+            record=False,
+        )
+    )
 
-    # 7) Tidy share package (evidence bundle layout)
-    _step("evidence_bundle", lambda: export_evidence_bundle(run_dir=rdir))
+    # 7) Export HTML bundle (single run; reuses the ui_summary.json written above)
+    stages.append(
+        Stage(
+            "ui_export",
+            lambda _: export_ui_bundle(cfg, run_ids=[rid], out_dir=share_dir, force=True, refresh_summaries=False),
+            deps=("ui_summarize",),
+            inputs=("ui",),
+            outputs=("share/ui_bundle",),
+        )
+    )
 
-    # Overall status
-    fails = [s for s in summary["steps"] if s.get("status") == "fail"]
-    summary["status"] = "ok" if not fails else "partial"
+    # 8) Stakeholder handover
+    stages.append(
+        Stage(
+            "handover",
+            lambda up: write_mvp_handover(
+                runs_dir=cfg.paths.runs_dir,
+                run_id=rid,
+                ui_bundle_dir=share_dir,
+                summary=_steps_view(up),
+            ),
+            deps=("ui_export",),
+            outputs=("reports/mvp_handover.md",),
+        )
+    )
 
-    # D-0016: generate stakeholder-friendly executive summary (MD + HTML) and HTML render of summary.md
-    try:
-        write_exec_summary(run_dir=rdir, rr_provisional=True, d0004_deferred=True)
-    except Exception as e:
-        # Fail-soft for reporting extras; core pipeline should remain usable
-        logger.warning(f"Exec summary generation failed: {e}")
+    # 9) Tidy share package (evidence bundle layout)
+    stages.append(
+        Stage(
+            "evidence_bundle",
+            lambda _: export_evidence_bundle(run_dir=rdir),
+            deps=("handover", "exec_summary"),
+            inputs=("reports", "models", "ui", "manifest.json"),
+            outputs=("share",),
+        )
+    )
 
-    return rdir, summary
+    recorded = {s.name for s in stages if s.record}
+    return stages
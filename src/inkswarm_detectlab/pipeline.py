@@ -31,6 +31,7 @@ from .synthetic import generate_skynet
 from .utils.hashing import stable_hash_dict, stable_hash_df
 from .utils.run_id import make_run_id
 from .utils.canonical import canonicalize_df
+from .utils.perf import perf_stage, profiled, stage_note
 from .schemas import get_schema
 
 
@@ -53,15 +54,53 @@ def _config_fingerprint(cfg: AppConfig) -> tuple[str, str]:
     return h, h[:8]
 
 
-def _write_summary(
-    run_dir: Path,
-    manifest: dict[str, Any],
-    login_df: pd.DataFrame,
-    checkout_df: pd.DataFrame,
-    split_boundary: pd.Timestamp,
-    holdout_users: set[str],
-) -> None:
+_OVERLAP_LABELS = ("label_replicators", "label_the_mule", "label_the_chameleon")
+
+
+def _summary_stats(login_df: pd.DataFrame, checkout_df: pd.DataFrame) -> dict[str, Any]:
+    """Raw-table statistics rendered into summary.md (computed once, stored in manifest["summary_stats"])."""
+    stats: dict[str, Any] = {
+        "login_attempt_rows": int(len(login_df)),
+        "checkout_attempt_rows": int(len(checkout_df)),
+        "unique_users": int(pd.Series(login_df["user_id"]).astype(str).nunique()) if (not login_df.empty and "user_id" in login_df.columns) else 0,
+        "labels": None,
+        "overlaps": None,
+        "checkout_adverse_rate": None,
+    }
+
+    if not login_df.empty and "label_benign" in login_df.columns:
+        attack_any = ~login_df["label_benign"].astype(bool)
+        labels: dict[str, float] = {"attack_prevalence": float(attack_any.mean()) if len(login_df) else 0.0}
+        for col in _OVERLAP_LABELS:
+            if col in login_df.columns:
+                labels[col] = float(login_df[col].mean())
+        stats["labels"] = labels
+        if all(c in login_df.columns for c in _OVERLAP_LABELS):
+            r = login_df["label_replicators"].astype(bool)
+            m = login_df["label_the_mule"].astype(bool)
+            c = login_df["label_the_chameleon"].astype(bool)
+            stats["overlaps"] = {
+                "replicators_mule": int((r & m).sum()),
+                "replicators_chameleon": int((r & c).sum()),
+                "mule_chameleon": int((m & c).sum()),
+                "triple": int((r & m & c).sum()),
+            }
+
+    if not checkout_df.empty and "checkout_result" in checkout_df.columns:
+        stats["checkout_adverse_rate"] = float((checkout_df["checkout_result"] != "success").mean())
+    return stats
+
+
+def _write_summary(run_dir: Path, manifest: dict[str, Any]) -> None:
+    """Render reports/summary.md from the manifest alone.
+
+    Table statistics come from manifest["summary_stats"] (written by generate_raw) and
+    split facts from manifest["dataset"] (written by build_dataset), so refreshing the
+    summary after later stages never re-reads raw tables.
+    """
     reports_dir(run_dir).mkdir(parents=True, exist_ok=True)
+    stats: dict[str, Any] = manifest.get("summary_stats") or {}
+    split: dict[str, Any] = (manifest.get("dataset") or {}).get("login_attempt") or {}
 
     lines: list[str] = []
     lines.append("# Inkswarm DetectLab — Run Summary")
@@ -73,41 +112,38 @@ def _write_summary(
     lines.append("")
 
     lines.append("## Raw tables")
-    lines.append(f"- login_attempt rows: {len(login_df):,}")
-    lines.append(f"- checkout_attempt rows: {len(checkout_df):,}")
+    lines.append(f"- login_attempt rows: {int(stats.get('login_attempt_rows') or 0):,}")
+    lines.append(f"- checkout_attempt rows: {int(stats.get('checkout_attempt_rows') or 0):,}")
     lines.append("")
 
-    if not login_df.empty and "label_benign" in login_df.columns:
-        attack_any = ~login_df["label_benign"].astype(bool)
-        attack_rate = float(attack_any.mean()) if len(login_df) else 0.0
+    labels = stats.get("labels")
+    if labels:
         lines.append("## Labels (login_attempt)")
-        lines.append(f"- overall attack prevalence (any label): {attack_rate:.4f}")
-        for col in ["label_replicators", "label_the_mule", "label_the_chameleon"]:
-            if col in login_df.columns:
-                lines.append(f"- {col}: {float(login_df[col].mean()):.4f}")
-        if all(c in login_df.columns for c in ["label_replicators", "label_the_mule", "label_the_chameleon"]):
-            r = login_df["label_replicators"].astype(bool)
-            m = login_df["label_the_mule"].astype(bool)
-            c = login_df["label_the_chameleon"].astype(bool)
+        lines.append(f"- overall attack prevalence (any label): {labels['attack_prevalence']:.4f}")
+        for col in _OVERLAP_LABELS:
+            if col in labels:
+                lines.append(f"- {col}: {labels[col]:.4f}")
+        overlaps = stats.get("overlaps")
+        if overlaps:
             lines.append("")
             lines.append("### Overlaps")
-            lines.append(f"- REPLICATORS & THE_MULE: {int((r & m).sum()):,}")
-            lines.append(f"- REPLICATORS & THE_CHAMELEON: {int((r & c).sum()):,}")
-            lines.append(f"- THE_MULE & THE_CHAMELEON: {int((m & c).sum()):,}")
-            lines.append(f"- triple overlap: {int((r & m & c).sum()):,}")
+            lines.append(f"- REPLICATORS & THE_MULE: {overlaps['replicators_mule']:,}")
+            lines.append(f"- REPLICATORS & THE_CHAMELEON: {overlaps['replicators_chameleon']:,}")
+            lines.append(f"- THE_MULE & THE_CHAMELEON: {overlaps['mule_chameleon']:,}")
+            lines.append(f"- triple overlap: {overlaps['triple']:,}")
         lines.append("")
 
-    if not checkout_df.empty and "checkout_result" in checkout_df.columns:
-        adverse = (checkout_df["checkout_result"] != "success")
+    if stats.get("checkout_adverse_rate") is not None:
         lines.append("## Checkout (checkout_attempt)")
-        lines.append(f"- adverse rate (failure or review): {float(adverse.mean()):.4f}")
+        lines.append(f"- adverse rate (failure or review): {stats['checkout_adverse_rate']:.4f}")
         lines.append("")
 
     lines.append("## Dataset splits")
-    lines.append(f"- time boundary (America/Argentina/Buenos_Aires): {split_boundary.isoformat()}")
-    total_users = int(pd.Series(login_df["user_id"]).astype(str).nunique()) if (not login_df.empty and "user_id" in login_df.columns) else 0
-    holdout_pct = (len(holdout_users) / total_users) if total_users else 0.0
-    lines.append(f"- holdout users: {len(holdout_users):,} ({holdout_pct:.1%} of {total_users:,} unique users)")
+    lines.append(f"- time boundary (America/Argentina/Buenos_Aires): {split.get('boundary_ts_ba', 'NaT')}")
+    total_users = int(stats.get("unique_users") or 0)
+    n_holdout = int(split.get("holdout_users") or 0)
+    holdout_pct = (n_holdout / total_users) if total_users else 0.0
+    lines.append(f"- holdout users: {n_holdout:,} ({holdout_pct:.1%} of {total_users:,} unique users)")
     lines.append("")
 
     # Outputs written / formats
@@ -155,23 +191,30 @@ def _artifact_entry(
     }
 
 
+@profiled("generate_raw")
 def generate_raw(cfg: AppConfig, run_id: str | None = None) -> tuple[Path, dict[str, Any]]:
     """Generate raw SKYNET tables and write a partial manifest."""
     cfg_hash, cfg_hash8 = _config_fingerprint(cfg)
     rid = run_id or cfg.run.run_id or make_run_id(cfg_hash8, runs_dir=cfg.paths.runs_dir, prefix=cfg.run.run_id_prefix, width=cfg.run.run_id_width)
     rdir = run_dir_for(cfg.paths.runs_dir, rid)
     raw_dir(rdir).mkdir(parents=True, exist_ok=True)
+    stage_note(run_dir=rdir)
 
-    login_df, checkout_df, meta = generate_skynet(cfg, run_id=rid)
+    with perf_stage("skynet"):
+        login_df, checkout_df, meta = generate_skynet(cfg, run_id=rid)
 
-    # Canonicalize before write (tight determinism).
-    login_df = canonicalize_df(login_df, sort_keys=cfg.dataset.build.canonical_sort_keys, schema=get_schema("login_attempt"))
-    checkout_df = canonicalize_df(checkout_df, sort_keys=cfg.dataset.build.canonical_sort_keys, schema=get_schema("checkout_attempt"))
+        # Canonicalize before write (tight determinism).
+        login_df = canonicalize_df(login_df, sort_keys=cfg.dataset.build.canonical_sort_keys, schema=get_schema("login_attempt"))
+        checkout_df = canonicalize_df(checkout_df, sort_keys=cfg.dataset.build.canonical_sort_keys, schema=get_schema("checkout_attempt"))
+        stage_note(rows_out=len(login_df) + len(checkout_df))
+    stage_note(rows_out=len(login_df) + len(checkout_df))
 
     artifacts: dict[str, Any] = {}
 
-    lp, lfmt, lnote = write_auto(login_df, raw_table_basepath(rdir, "login_attempt"))
-    cp, cfmt, cnote = write_auto(checkout_df, raw_table_basepath(rdir, "checkout_attempt"))
+    with perf_stage("write_raw"):
+        lp, lfmt, lnote = write_auto(login_df, raw_table_basepath(rdir, "login_attempt"))
+        cp, cfmt, cnote = write_auto(checkout_df, raw_table_basepath(rdir, "checkout_attempt"))
+        stage_note(rows_in=len(login_df) + len(checkout_df))
 
     artifacts["raw/login_attempt"] = _artifact_entry(
         cfg=cfg,
@@ -207,6 +250,7 @@ def generate_raw(cfg: AppConfig, run_id: str | None = None) -> tuple[Path, dict[
         "seed": cfg.run.seed,
         "config_hash": cfg_hash,
         "artifacts": artifacts,
+        "summary_stats": _summary_stats(login_df, checkout_df),
         "generator_meta": meta,
         "code": {"github_sha": os.environ.get("GITHUB_SHA")},
     }
@@ -217,6 +261,7 @@ def generate_raw(cfg: AppConfig, run_id: str | None = None) -> tuple[Path, dict[
     return rdir, manifest
 
 
+@profiled("build_dataset")
 def build_dataset(cfg: AppConfig, run_id: str) -> tuple[Path, dict[str, Any]]:
     """Build datasets for an existing run_id and update manifest + summary."""
     rdir = run_dir_for(cfg.paths.runs_dir, run_id)
@@ -230,22 +275,28 @@ def build_dataset(cfg: AppConfig, run_id: str) -> tuple[Path, dict[str, Any]]:
         "artifacts": {},
     }
 
-    login_df = read_auto(raw_table_basepath(rdir, "login_attempt"))
-    checkout_df = read_auto(raw_table_basepath(rdir, "checkout_attempt"))
+    stage_note(run_dir=rdir)
+    with perf_stage("read_raw"):
+        login_df = read_auto(raw_table_basepath(rdir, "login_attempt"))
+        checkout_df = read_auto(raw_table_basepath(rdir, "checkout_attempt"))
 
-    # Canonicalize raw tables for determinism.
-    login_df = canonicalize_df(login_df, sort_keys=cfg.dataset.build.canonical_sort_keys, schema=get_schema("login_attempt"))
-    checkout_df = canonicalize_df(checkout_df, sort_keys=cfg.dataset.build.canonical_sort_keys, schema=get_schema("checkout_attempt"))
+        # Canonicalize raw tables for determinism.
+        login_df = canonicalize_df(login_df, sort_keys=cfg.dataset.build.canonical_sort_keys, schema=get_schema("login_attempt"))
+        checkout_df = canonicalize_df(checkout_df, sort_keys=cfg.dataset.build.canonical_sort_keys, schema=get_schema("checkout_attempt"))
+        stage_note(rows_out=len(login_df) + len(checkout_df))
+    stage_note(rows_in=len(login_df) + len(checkout_df))
 
     rng = np.random.default_rng(cfg.run.seed + 12345)
     split_cfg = cfg.dataset.build
 
-    splits_login = build_splits(login_df, split_cfg, rng)
-    splits_checkout = build_splits(checkout_df, split_cfg, rng)
+    with perf_stage("splits"):
+        splits_login = build_splits(login_df, split_cfg, rng)
+        splits_checkout = build_splits(checkout_df, split_cfg, rng)
 
     artifacts = manifest.get("artifacts", {}) or {}
 
     def _write_split(event: str, split_name: str, sdf: pd.DataFrame):
+        stage_note(rows_out=len(sdf))
         schema = get_schema(event)
         sdf2 = canonicalize_df(sdf, sort_keys=split_cfg.canonical_sort_keys, schema=schema)
         p, fmt, note = write_auto(sdf2, dataset_split_basepath(rdir, event, split_name))
@@ -258,12 +309,16 @@ def build_dataset(cfg: AppConfig, run_id: str) -> tuple[Path, dict[str, Any]]:
             schema_name=event,
         )
 
-    for split_name, sdf in [("train", splits_login.train), ("time_eval", splits_login.time_eval), ("user_holdout", splits_login.user_holdout)]:
-        _write_split("login_attempt", split_name, sdf)
-    for split_name, sdf in [("train", splits_checkout.train), ("time_eval", splits_checkout.time_eval), ("user_holdout", splits_checkout.user_holdout)]:
-        _write_split("checkout_attempt", split_name, sdf)
+    with perf_stage("write_splits"):
+        for split_name, sdf in [("train", splits_login.train), ("time_eval", splits_login.time_eval), ("user_holdout", splits_login.user_holdout)]:
+            _write_split("login_attempt", split_name, sdf)
+        for split_name, sdf in [("train", splits_checkout.train), ("time_eval", splits_checkout.time_eval), ("user_holdout", splits_checkout.user_holdout)]:
+            _write_split("checkout_attempt", split_name, sdf)
+    stage_note(rows_out=sum(len(x) for sp in (splits_login, splits_checkout) for x in (sp.train, sp.time_eval, sp.user_holdout)))
 
     manifest["artifacts"] = artifacts
+    if not manifest.get("summary_stats"):
+        manifest["summary_stats"] = _summary_stats(login_df, checkout_df)  # runs generated before stats were stored
     manifest["dataset"] = {
         "time_split": split_cfg.time_split,
         "user_holdout": split_cfg.user_holdout,
@@ -279,7 +334,7 @@ def build_dataset(cfg: AppConfig, run_id: str) -> tuple[Path, dict[str, Any]]:
     }
 
     write_manifest(mpath, manifest)
-    _write_summary(rdir, manifest, login_df, checkout_df, splits_login.boundary_ts, splits_login.holdout_users)
+    _write_summary(rdir, manifest)
 
     return rdir, manifest
 
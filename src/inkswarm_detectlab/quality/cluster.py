@@ -9,13 +9,14 @@ import json
 import numpy as np
 import pandas as pd
 from sklearn.metrics import (
-    silhouette_score,
     calinski_harabasz_score,
     davies_bouldin_score,
     adjusted_rand_score,
     normalized_mutual_info_score,
 )
 
+from .silhouette import DEFAULT_MEMORY_BUDGET_MB, SilhouetteMode, estimate_silhouette
+
 
 @dataclass
 class ClusterQualityResult:
@@ -24,15 +25,19 @@ class ClusterQualityResult:
     n_clusters: int
     metrics: dict[str, float]
     notes: list[str]
+    silhouette: Optional[dict[str, Any]] = None
 
     def to_json(self) -> dict[str, Any]:
-        return {
+        out = {
             "n_rows": self.n_rows,
             "n_features": self.n_features,
             "n_clusters": self.n_clusters,
             "metrics": self.metrics,
             "notes": self.notes,
         }
+        if self.silhouette is not None:
+            out["silhouette"] = self.silhouette
+        return out
 
 
 def _as_numeric_matrix(df: pd.DataFrame, feature_cols: Optional[list[str]]) -> tuple[np.ndarray, list[str], list[str]]:
@@ -61,6 +66,8 @@ def compute_cluster_quality(
     feature_cols: Optional[list[str]] = None,
     sample_n: Optional[int] = None,
     random_state: int = 42,
+    silhouette_mode: SilhouetteMode = "auto",
+    memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
 ) -> ClusterQualityResult:
     """Compute lightweight cluster-quality metrics.
 
@@ -69,7 +76,9 @@ def compute_cluster_quality(
     - any dataset where you have features + a cluster assignment
 
     Metrics:
-    - Silhouette (requires >=2 clusters and numeric features)
+    - Silhouette (requires >=2 clusters and numeric features). `silhouette_mode`
+      selects exact (blocked), sampled (stratified, with CI) or centroid
+      (simplified) computation; "auto" picks from row count and memory budget.
     - Calinski-Harabasz
     - Davies-Bouldin
     - If label_col provided: ARI + NMI between clusters and labels
@@ -110,12 +119,24 @@ def compute_cluster_quality(
     n_features = int(X.shape[1])
 
     metrics: dict[str, float] = {}
+    silhouette: Optional[dict[str, Any]] = None
 
     if n_rows == 0 or n_clusters < 2:
         notes.append("insufficient_data_for_internal_metrics")
     else:
-        # silhouette can be expensive; guard a bit
-        metrics["silhouette"] = float(silhouette_score(X, clusters, metric="euclidean"))
+        est = estimate_silhouette(
+            X,
+            clusters,
+            mode=silhouette_mode,
+            memory_budget_mb=memory_budget_mb,
+            random_state=random_state,
+        )
+        silhouette = est.to_json()
+        metrics["silhouette"] = est.value
+        if est.ci_low is not None and est.ci_high is not None:
+            metrics["silhouette_ci95_low"] = est.ci_low
+            metrics["silhouette_ci95_high"] = est.ci_high
+        notes.append(f"silhouette_mode={est.mode}")
         metrics["calinski_harabasz"] = float(calinski_harabasz_score(X, clusters))
         metrics["davies_bouldin"] = float(davies_bouldin_score(X, clusters))
 
@@ -137,6 +158,7 @@ def compute_cluster_quality(
         n_clusters=n_clusters,
         metrics=metrics,
         notes=notes,
+        silhouette=silhouette,
     )
 
 
@@ -171,11 +193,11 @@ def write_cluster_quality_artifacts(
         lines.append("")
     lines.append("## Interpretation (quick)")
     lines.append("- **Silhouette**: closer to 1 is cleaner separation; near 0 means overlap; negative indicates possible misassignment.")
+    lines.append("  Mode `sampled` reports a 95% CI; mode `centroid` is the simplified (centroid-distance) silhouette.")
     lines.append("- **Davies-Bouldin**: lower is better (tighter / better separated).")
     lines.append("- **Calinski-Harabasz**: higher is better (but scale depends on dataset).")
     lines.append("- **ARI/NMI**: only meaningful if you provided a ground-truth `label_col`.")
     lines.append("")
 
-    p_md.write_text("
-".join(lines), encoding="utf-8")
+    p_md.write_text("\n".join(lines), encoding="utf-8")
     return p_json, p_md
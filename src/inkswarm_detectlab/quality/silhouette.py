@@ -0,0 +1,256 @@
+"""Scalable silhouette estimators.
+
+sklearn's `silhouette_score` is O(n^2) in time and, for large inputs, in practice
+also in memory. This module offers three modes with the same output shape:
+
+- ``exact``: full pairwise silhouette computed in row blocks; memory per block is
+  bounded by ``memory_budget_mb``.
+- ``sampled``: stratified-per-cluster sample of rows, each scored exactly against
+  all rows; the mean is a stratified estimator with a normal-approximation CI.
+- ``centroid``: simplified silhouette (distance to own vs. nearest other centroid),
+  O(n * k) and suitable for very large inputs. It is a different statistic than
+  the classic silhouette and is labelled as such.
+
+Labels must be integer codes 0..k-1 (see `compute_cluster_quality`).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Literal, Optional
+
+import numpy as np
+
+SilhouetteMode = Literal["auto", "exact", "sampled", "centroid"]
+
+# Auto-mode thresholds (rows). Exact work is n^2 distances; sampled work is m * n.
+EXACT_MAX_ROWS = 20_000
+SAMPLED_MAX_ROWS = 500_000
+DEFAULT_SAMPLE_ROWS = 5_000
+DEFAULT_MEMORY_BUDGET_MB = 512
+
+_Z95 = 1.959963984540054
+
+
+@dataclass(frozen=True)
+class SilhouetteEstimate:
+    value: float
+    mode: str
+    n_evaluated: int
+    ci_low: Optional[float] = None
+    ci_high: Optional[float] = None
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "value": self.value,
+            "mode": self.mode,
+            "n_evaluated": self.n_evaluated,
+            "ci_low": self.ci_low,
+            "ci_high": self.ci_high,
+        }
+
+
+def choose_silhouette_mode(
+    n_rows: int,
+    n_features: int,
+    *,
+    memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+) -> str:
+    """Pick a silhouette mode from row count and memory budget.
+
+    Exact up to EXACT_MAX_ROWS; sampled up to SAMPLED_MAX_ROWS while the float64
+    feature matrix fits the budget (sampled scoring needs random access to every
+    row); centroid otherwise.
+    """
+    if n_rows <= EXACT_MAX_ROWS:
+        return "exact"
+    matrix_mb = n_rows * max(1, n_features) * 8 / 1e6
+    if n_rows <= SAMPLED_MAX_ROWS and matrix_mb <= memory_budget_mb:
+        return "sampled"
+    return "centroid"
+
+
+def _block_rows(n_cols: int, memory_budget_mb: float) -> int:
+    # One float64 distance block plus one temporary of the same size.
+    return max(1, int(memory_budget_mb * 1e6 // (16 * max(1, n_cols))))
+
+
+def _silhouette_values(
+    X: np.ndarray,
+    labels: np.ndarray,
+    rows: np.ndarray,
+    *,
+    memory_budget_mb: float,
+) -> np.ndarray:
+    """Silhouette s(i) for `rows` of X against all rows of X, computed in blocks.
+
+    X/labels must be sorted by label so per-cluster distance sums are contiguous
+    column ranges (`np.add.reduceat`).
+    """
+    counts = np.bincount(labels)
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+    nonempty = counts > 0
+    sq = np.einsum("ij,ij->i", X, X)
+    out = np.empty(len(rows), dtype=np.float64)
+    step = _block_rows(X.shape[0], memory_budget_mb)
+
+    for lo in range(0, len(rows), step):
+        idx = rows[lo : lo + step]
+        d2 = sq[idx, None] + sq[None, :] - 2.0 * (X[idx] @ X.T)
+        np.maximum(d2, 0.0, out=d2)
+        d = np.sqrt(d2, out=d2)
+        d[np.arange(len(idx)), idx] = 0.0
+
+        sums = np.zeros((len(idx), len(counts)), dtype=np.float64)
+        sums[:, nonempty] = np.add.reduceat(d, starts[nonempty], axis=1)
+        own = labels[idx]
+        own_n = counts[own]
+
+        a = sums[np.arange(len(idx)), own] / np.maximum(own_n - 1, 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = sums / counts
+        means[:, ~nonempty] = np.inf
+        means[np.arange(len(idx)), own] = np.inf
+        b = means.min(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s = (b - a) / np.maximum(a, b)
+        s[own_n <= 1] = 0.0  # sklearn convention for singleton clusters
+        out[lo : lo + len(idx)] = np.nan_to_num(s)
+    return out
+
+
+def _sorted_by_label(X: np.ndarray, labels: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(labels, kind="mergesort")
+    return np.ascontiguousarray(X[order], dtype=np.float64), labels[order]
+
+
+def silhouette_exact(
+    X: np.ndarray,
+    labels: np.ndarray,
+    *,
+    memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+) -> SilhouetteEstimate:
+    """Exact mean silhouette (matches sklearn), O(n^2) time, bounded-memory blocks."""
+    Xs, ls = _sorted_by_label(X, labels)
+    s = _silhouette_values(Xs, ls, np.arange(len(ls)), memory_budget_mb=memory_budget_mb)
+    return SilhouetteEstimate(value=float(s.mean()), mode="exact", n_evaluated=int(len(s)))
+
+
+def silhouette_sampled(
+    X: np.ndarray,
+    labels: np.ndarray,
+    *,
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    min_per_cluster: int = 20,
+    random_state: int = 42,
+    memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+) -> SilhouetteEstimate:
+    """Stratified-per-cluster estimate of the mean silhouette with a 95% CI.
+
+    Each cluster gets a proportional share of `sample_rows` (at least
+    `min_per_cluster`, at most its size). Sampled rows are scored exactly against
+    all rows, so the only error is sampling error:
+
+        mean = sum_c w_c * mean_c,   var = sum_c w_c^2 * (1 - m_c/n_c) * s_c^2 / m_c
+
+    with w_c = n_c / n (finite-population corrected).
+    """
+    Xs, ls = _sorted_by_label(X, labels)
+    n = len(ls)
+    counts = np.bincount(ls)
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+    rng = np.random.default_rng(random_state)
+
+    alloc = np.minimum(counts, np.maximum(min_per_cluster, np.round(sample_rows * counts / max(n, 1)).astype(np.int64)))
+    picks = [
+        starts[c] + np.sort(rng.choice(counts[c], size=int(alloc[c]), replace=False))
+        for c in range(len(counts))
+        if alloc[c] > 0
+    ]
+    rows = np.concatenate(picks) if picks else np.zeros(0, dtype=np.int64)
+    s = _silhouette_values(Xs, ls, rows, memory_budget_mb=memory_budget_mb)
+
+    mean = 0.0
+    var = 0.0
+    for c in np.flatnonzero(alloc > 0):
+        sc = s[ls[rows] == c]
+        w = counts[c] / n
+        mean += w * float(sc.mean())
+        if len(sc) > 1:
+            var += w * w * (1.0 - len(sc) / counts[c]) * float(sc.var(ddof=1)) / len(sc)
+    half = _Z95 * float(np.sqrt(var))
+    return SilhouetteEstimate(
+        value=float(mean),
+        mode="sampled",
+        n_evaluated=int(len(rows)),
+        ci_low=float(mean - half),
+        ci_high=float(mean + half),
+    )
+
+
+def cluster_centroids(X: np.ndarray, labels: np.ndarray, n_clusters: int) -> np.ndarray:
+    counts = np.bincount(labels, minlength=n_clusters).astype(np.float64)
+    sums = np.zeros((n_clusters, X.shape[1]), dtype=np.float64)
+    np.add.at(sums, labels, X)
+    return sums / np.maximum(counts, 1.0)[:, None]
+
+
+def centroid_silhouette_values(X: np.ndarray, labels: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Simplified silhouette per row: a = dist to own centroid, b = nearest other centroid."""
+    # Shift both sides to the centroid mean: distances are unchanged, but the
+    # |x|^2 + |c|^2 - 2xc expansion no longer cancels large common offsets.
+    origin = centroids.mean(axis=0)
+    X = np.asarray(X, dtype=np.float64) - origin
+    centroids = centroids - origin
+    d2 = (
+        np.einsum("ij,ij->i", X, X)[:, None]
+        + np.einsum("ij,ij->i", centroids, centroids)[None, :]
+        - 2.0 * (X @ centroids.T)
+    )
+    d = np.sqrt(np.maximum(d2, 0.0))
+    rr = np.arange(len(labels))
+    a = d[rr, labels].copy()
+    d[rr, labels] = np.inf
+    b = d.min(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = (b - a) / np.maximum(a, b)
+    return np.nan_to_num(s)
+
+
+def silhouette_centroid(
+    X: np.ndarray,
+    labels: np.ndarray,
+    *,
+    memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+) -> SilhouetteEstimate:
+    """Simplified (centroid-based) silhouette, O(n * k), processed in row blocks."""
+    k = int(labels.max()) + 1 if len(labels) else 0
+    centroids = cluster_centroids(X, labels, k)
+    step = _block_rows(k, memory_budget_mb)
+    total = 0.0
+    for lo in range(0, len(labels), step):
+        total += float(centroid_silhouette_values(X[lo : lo + step], labels[lo : lo + step], centroids).sum())
+    return SilhouetteEstimate(value=total / max(len(labels), 1), mode="centroid", n_evaluated=int(len(labels)))
+
+
+def estimate_silhouette(
+    X: np.ndarray,
+    labels: np.ndarray,
+    *,
+    mode: SilhouetteMode = "auto",
+    memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    random_state: int = 42,
+) -> SilhouetteEstimate:
+    if mode == "auto":
+        mode = choose_silhouette_mode(X.shape[0], X.shape[1], memory_budget_mb=memory_budget_mb)  # type: ignore[assignment]
+    if mode == "exact":
+        return silhouette_exact(X, labels, memory_budget_mb=memory_budget_mb)
+    if mode == "sampled":
+        return silhouette_sampled(
+            X, labels, sample_rows=sample_rows, random_state=random_state, memory_budget_mb=memory_budget_mb
+        )
+    if mode == "centroid":
+        return silhouette_centroid(X, labels, memory_budget_mb=memory_budget_mb)
+    raise ValueError(f"Unknown silhouette mode: {mode!r}")
@@ -0,0 +1,309 @@
+"""Streaming cluster-quality statistics over parquet inputs.
+
+The in-memory scorecard (`compute_cluster_quality`) materializes the whole table as
+a float64 matrix. Here the table is consumed in Arrow record batches and only
+per-cluster accumulators are kept:
+
+- pass 1: counts, means and within-cluster sum of squared deviations (merged per
+  batch with Chan's parallel update, so no sum-of-squares cancellation), plus the
+  (label x cluster) contingency table -> Calinski-Harabasz, ARI, NMI;
+- pass 2: per-cluster mean distance to the centroid -> Davies-Bouldin (it needs
+  mean *distances*, which sums of squares alone cannot give), and the simplified
+  (centroid) silhouette at no extra cost.
+
+Memory is O(batch_rows * n_features + n_clusters * n_features + n_labels * n_clusters).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import numpy as np
+
+from .cluster import ClusterQualityResult
+from .silhouette import centroid_silhouette_values
+
+DEFAULT_BATCH_ROWS = 65_536
+
+_EXCLUDED_DEFAULT = ("cluster", "label", "y", "y_true", "target")
+
+
+class _Codebook:
+    """Stable value -> dense integer code mapping across batches."""
+
+    def __init__(self) -> None:
+        self.codes: dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def encode(self, arr: Any) -> np.ndarray:
+        """Codes for an Arrow array; nulls map to -1."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        enc = arr if pa.types.is_dictionary(arr.type) else pc.dictionary_encode(arr)
+        lut = np.array([self.codes.setdefault(v, len(self.codes)) for v in enc.dictionary.to_pylist()], dtype=np.int64)
+        idx = enc.indices.fill_null(0).to_numpy(zero_copy_only=False).astype(np.int64)
+        out = lut[idx] if len(lut) else np.full(len(idx), -1, dtype=np.int64)
+        if enc.indices.null_count:
+            out[enc.indices.is_null().to_numpy(zero_copy_only=False)] = -1
+        return out
+
+
+def _grow(a: np.ndarray, n: int) -> np.ndarray:
+    if a.shape[0] >= n:
+        return a
+    pad = np.zeros((n - a.shape[0],) + a.shape[1:], dtype=a.dtype)
+    return np.concatenate([a, pad], axis=0)
+
+
+def _open_dataset(path: Path):
+    import pyarrow.dataset as ds
+
+    return ds.dataset(str(path), format="parquet", partitioning="hive")
+
+
+def _default_feature_cols(schema: Any, cluster_col: str, label_col: Optional[str]) -> list[str]:
+    import pyarrow.types as pat
+
+    skip = set(_EXCLUDED_DEFAULT) | {cluster_col} | ({label_col} if label_col else set())
+    return [
+        f.name
+        for f in schema
+        if f.name not in skip and (pat.is_integer(f.type) or pat.is_floating(f.type) or pat.is_boolean(f.type))
+    ]
+
+
+def _batches(
+    dataset: Any,
+    *,
+    cluster_col: str,
+    label_col: Optional[str],
+    feature_cols: list[str],
+    clusters: _Codebook,
+    labels: _Codebook,
+    batch_rows: int,
+    stats: dict[str, int],
+) -> Iterator[tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]]:
+    """Yield (X float64, cluster codes, label codes) with unusable rows removed."""
+    cols = [cluster_col] + ([label_col] if label_col else []) + feature_cols
+    for rb in dataset.to_batches(columns=cols, batch_size=batch_rows):
+        if rb.num_rows == 0:
+            continue
+        c = clusters.encode(rb.column(cluster_col))
+        y = labels.encode(rb.column(label_col)) if label_col else None
+        X = np.column_stack(
+            [rb.column(f).to_numpy(zero_copy_only=False).astype(np.float64) for f in feature_cols]
+        ) if feature_cols else np.zeros((rb.num_rows, 0))
+        has_cluster = c >= 0
+        finite = np.isfinite(X).all(axis=1)
+        stats["missing_cluster"] += int((~has_cluster).sum())
+        stats["nonfinite"] += int((has_cluster & ~finite).sum())
+        keep = has_cluster & finite
+        yield X[keep], c[keep], (y[keep] if y is not None else None)
+
+
+def _ari_from_contingency(C: np.ndarray) -> float:
+    """Adjusted Rand index from a (labels x clusters) contingency table (sklearn-equivalent)."""
+    n = int(C.sum())
+    n_c = C.sum(axis=1)
+    n_k = C.sum(axis=0)
+    sum_squares = int((C.astype(np.int64) ** 2).sum())
+    tp = sum_squares - n
+    fp = int((C @ n_k).sum()) - sum_squares
+    fn = int((C.T @ n_c).sum()) - sum_squares
+    tn = n * n - fp - fn - sum_squares
+    if fn == 0 and fp == 0:
+        return 1.0
+    return float(2.0 * (tp * tn - fn * fp) / ((tp + fn) * (fn + tn) + (tp + fp) * (fp + tn)))
+
+
+def _entropy(counts: np.ndarray) -> float:
+    counts = counts[counts > 0].astype(np.float64)
+    if counts.size <= 1:
+        return 0.0
+    p = counts / counts.sum()
+    return float(-(p * np.log(p)).sum())
+
+
+def _nmi_from_contingency(C: np.ndarray) -> float:
+    """Normalized mutual information (arithmetic mean normalizer, sklearn default)."""
+    n_c = C.sum(axis=1)
+    n_k = C.sum(axis=0)
+    n_classes = int((n_c > 0).sum())
+    n_clusters = int((n_k > 0).sum())
+    if n_classes == n_clusters == 1 or n_classes == n_clusters == 0:
+        return 1.0
+    n = float(C.sum())
+    nz_i, nz_j = np.nonzero(C)
+    nij = C[nz_i, nz_j].astype(np.float64)
+    mi = float(np.sum(nij / n * (np.log(nij) + np.log(n) - np.log(n_c[nz_i].astype(np.float64)) - np.log(n_k[nz_j].astype(np.float64)))))
+    mi = max(mi, 0.0)
+    if mi == 0.0:
+        return 0.0
+    normalizer = (_entropy(n_c) + _entropy(n_k)) / 2.0
+    return float(mi / max(normalizer, np.finfo("float64").eps))
+
+
+def _davies_bouldin(intra: np.ndarray, centroids: np.ndarray) -> float:
+    dist = np.sqrt(((centroids[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2))
+    if np.allclose(intra, 0) or np.allclose(dist, 0):
+        return 0.0
+    dist[dist == 0] = np.inf
+    combined = intra[:, None] + intra[None, :]
+    return float(np.mean(np.max(combined / dist, axis=1)))
+
+
+def should_stream(
+    path: Path,
+    *,
+    memory_budget_mb: float,
+    cluster_col: str = "cluster",
+    label_col: Optional[str] = None,
+) -> bool:
+    """True for parquet inputs whose numeric matrix (rows x feature cols x 8B) exceeds the budget."""
+    path = Path(path)
+    if not (path.is_dir() or path.suffix == ".parquet"):
+        return False
+    dataset = _open_dataset(path)
+    n_cols = len(_default_feature_cols(dataset.schema, cluster_col, label_col))
+    return dataset.count_rows() * max(1, n_cols) * 8 / 1e6 > memory_budget_mb
+
+
+def compute_cluster_quality_streaming(
+    path: Path,
+    cluster_col: str = "cluster",
+    label_col: Optional[str] = None,
+    feature_cols: Optional[list[str]] = None,
+    *,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> ClusterQualityResult:
+    """Cluster-quality scorecard for a parquet file or (hive-partitioned) directory.
+
+    Same output shape as `compute_cluster_quality`. Silhouette is the simplified
+    (centroid) variant, since pairwise silhouette cannot be streamed.
+    """
+    dataset = _open_dataset(Path(path))
+    names = set(dataset.schema.names)
+    if cluster_col not in names:
+        raise ValueError(f"Missing cluster column: {cluster_col!r}")
+
+    notes: list[str] = [f"streaming=record_batches(batch_rows={batch_rows})"]
+    if feature_cols is None:
+        feature_cols = _default_feature_cols(dataset.schema, cluster_col, label_col)
+    missing = [c for c in feature_cols if c not in names]
+    if missing:
+        notes.append("missing_feature_cols=" + ",".join(missing))
+    used = [c for c in feature_cols if c in names]
+    if not used:
+        raise ValueError("No usable feature columns found. Provide --feature-col multiple times.")
+    if label_col is not None and label_col not in names:
+        notes.append(f"label_col_missing={label_col}")
+        label_col = None
+
+    d = len(used)
+    clusters = _Codebook()
+    labels = _Codebook()
+    stats = {"missing_cluster": 0, "nonfinite": 0}
+
+    # Pass 1: per-cluster count / mean / M2 (Chan merge) + contingency.
+    cnt = np.zeros(0, dtype=np.int64)
+    mean = np.zeros((0, d), dtype=np.float64)
+    m2 = np.zeros(0, dtype=np.float64)
+    cont = np.zeros((0, 0), dtype=np.int64)
+    for X, c, y in _batches(
+        dataset,
+        cluster_col=cluster_col,
+        label_col=label_col,
+        feature_cols=used,
+        clusters=clusters,
+        labels=labels,
+        batch_rows=batch_rows,
+        stats=stats,
+    ):
+        k = len(clusters)
+        cnt, mean, m2 = _grow(cnt, k), _grow(mean, k), _grow(m2, k)
+        if len(c) == 0:
+            continue
+        nb = np.bincount(c, minlength=k)
+        sb = np.column_stack([np.bincount(c, weights=X[:, j], minlength=k) for j in range(d)]) if d else np.zeros((k, 0))
+        present = nb > 0
+        mb = np.zeros_like(sb)
+        mb[present] = sb[present] / nb[present, None]
+        m2b = np.bincount(c, weights=((X - mb[c]) ** 2).sum(axis=1), minlength=k)
+
+        na = cnt.astype(np.float64)
+        tot = na + nb
+        delta = mb - mean
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = np.where(tot > 0, nb / tot, 0.0)
+            m2 = m2 + m2b + np.where(tot > 0, (delta**2).sum(axis=1) * na * nb / tot, 0.0)
+        mean = mean + delta * frac[:, None]
+        cnt = cnt + nb
+
+        if y is not None:
+            cont = _grow(_grow(cont, len(labels)).T, k).T
+            # Null labels (and clusters) are -1; negative indices would wrap to the last row.
+            keep = (y >= 0) & (c >= 0)
+            np.add.at(cont, (y[keep], c[keep]), 1)
+
+    if stats["missing_cluster"]:
+        notes.append(f"dropped_rows_missing_cluster={stats['missing_cluster']}")
+    if stats["nonfinite"]:
+        notes.append(f"dropped_rows_nonfinite_features={stats['nonfinite']}")
+
+    n = int(cnt.sum())
+    k = int((cnt > 0).sum())
+    metrics: dict[str, float] = {}
+    silhouette: Optional[dict[str, Any]] = None
+
+    if n == 0 or k < 2:
+        notes.append("insufficient_data_for_internal_metrics")
+    else:
+        live = cnt > 0
+        mu = mean[live]
+        nk = cnt[live].astype(np.float64)
+        overall = (mu * nk[:, None]).sum(axis=0) / n
+        extra = float((nk * ((mu - overall) ** 2).sum(axis=1)).sum())
+        intra = float(m2[live].sum())
+        metrics["calinski_harabasz"] = 1.0 if intra == 0.0 else extra * (n - k) / (intra * (k - 1))
+
+        # Pass 2: mean distance to centroid (DB) + simplified silhouette.
+        dist_sum = np.zeros(len(cnt), dtype=np.float64)
+        sil_sum = 0.0
+        remap = np.cumsum(live) - 1  # dense codes over live clusters
+        for X, c, _ in _batches(
+            dataset,
+            cluster_col=cluster_col,
+            label_col=None,
+            feature_cols=used,
+            clusters=clusters,
+            labels=labels,
+            batch_rows=batch_rows,
+            stats={"missing_cluster": 0, "nonfinite": 0},
+        ):
+            if len(c) == 0:
+                continue
+            dist_sum += np.bincount(c, weights=np.sqrt(((X - mean[c]) ** 2).sum(axis=1)), minlength=len(cnt))
+            sil_sum += float(centroid_silhouette_values(X, remap[c], mu).sum())
+        metrics["davies_bouldin"] = _davies_bouldin(dist_sum[live] / nk, mu)
+        metrics["silhouette"] = sil_sum / n
+        silhouette = {"value": metrics["silhouette"], "mode": "centroid", "n_evaluated": n, "ci_low": None, "ci_high": None}
+        notes.append("silhouette_mode=centroid")
+
+    if label_col is not None and n > 0:
+        C = cont[:, cnt > 0]
+        C = C[C.sum(axis=1) > 0]
+        metrics["ari"] = _ari_from_contingency(C)
+        metrics["nmi"] = _nmi_from_contingency(C)
+
+    return ClusterQualityResult(
+        n_rows=n,
+        n_features=d,
+        n_clusters=k,
+        metrics=metrics,
+        notes=notes,
+        silhouette=silhouette,
+    )
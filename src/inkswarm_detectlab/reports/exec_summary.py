@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Any, Optional
 
 from inkswarm_detectlab.utils.md_to_html import md_to_html_document
+from inkswarm_detectlab.utils.perf import profiled, stage_note
 
 EXEC_START = "<!-- EXEC_SUMMARY:START -->"
 EXEC_END = "<!-- EXEC_SUMMARY:END -->"
@@ -179,6 +180,7 @@ def _heuristic_flags(reports_dir: Path) -> list[str]:
     return flags
 
 
+@profiled("write_exec_summary")
 def write_exec_summary(
     *,
     run_dir: Path,
@@ -193,6 +195,7 @@ def write_exec_summary(
     """
     reports_dir = run_dir / "reports"
     reports_dir.mkdir(parents=True, exist_ok=True)
+    stage_note(run_dir=run_dir)
 
     summary_md = reports_dir / "summary.md"
     summary_text = _safe_read_text(summary_md)
@@ -26,80 +26,75 @@ Notes
 - The UI bundle is normally produced by `inkswarm_detectlab.ui.bundle.export_ui_bundle`
   into runs/<run_id>/share/ui_bundle/. This module does not generate the UI; it only
   packages and fingerprints evidence.
+- Copies are hashed while they stream (no second read for the manifest) and run on
+  a thread pool. Re-exports hardlink unchanged files from the previous export
+  (tracked in runs/<run_id>/.share_export_cache.json) instead of copying them.
 """
 
 import hashlib
 import json
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.perf import profiled, stage_note
+
+_CHUNK = 1024 * 1024
+
+# Per-file stat/hash cache of the previous export (outside share/ so it is never shipped).
+EXPORT_CACHE_NAME = ".share_export_cache.json"
+_PREV_DIR_NAME = ".prev_export"
 
 
 def _sha256(path: Path) -> str:
     h = hashlib.sha256()
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
             h.update(chunk)
     return h.hexdigest()
 
 
-def _copy_tree(src: Path, dst: Path) -> int:
-    """Copy a directory tree into dst (dst will be created). Returns file count."""
-    if not src.exists():
-        return 0
-    count = 0
-    for p in sorted([x for x in src.rglob("*") if x.is_file()]):
-        rel = p.relative_to(src)
-        out = dst / rel
-        out.parent.mkdir(parents=True, exist_ok=True)
-        out.write_bytes(p.read_bytes())
-        count += 1
-    return count
-
-
-def _copy_file(src: Path, dst: Path) -> bool:
-    if not src.exists():
-        return False
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    dst.write_bytes(src.read_bytes())
-    return True
+def _copy_and_hash(src: Path, dst: Path) -> str:
+    """Stream src -> dst in chunks, hashing on the way (one read of src, bounded memory).
 
+    Writes to a temp name and renames, so a hardlinked previous file is never
+    modified in place.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(dst.name + ".part")
+    h = hashlib.sha256()
+    with src.open("rb") as fi, tmp.open("wb") as fo:
+        for chunk in iter(lambda: fi.read(_CHUNK), b""):
+            h.update(chunk)
+            fo.write(chunk)
+    os.replace(tmp, dst)
+    return h.hexdigest()
 
-def _clear_share_dir(share_root: Path) -> None:
-    """Remove previous share artifacts but keep ui_bundle/ if present."""
-    if not share_root.exists():
-        return
-    for child in share_root.iterdir():
-        if child.name == "ui_bundle":
-            continue
-        if child.is_dir():
-            shutil.rmtree(child)
-        else:
-            child.unlink(missing_ok=True)
 
+def _link_or_copy(prev: Path, dst: Path) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(dst.name + ".part")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(prev, tmp)
+    except OSError:  # cross-device, unsupported FS, ...
+        shutil.copyfile(prev, tmp)
+    os.replace(tmp, dst)
 
-def export_evidence_bundle(*, run_dir: Path, force: bool = True) -> Path:
-    """Create/refresh runs/<run_id>/share evidence bundle.
 
-    Parameters
-    ----------
-    run_dir:
-        Path to runs/<run_id>.
-    force:
-        If True, refresh share/ (keeps ui_bundle/).
-    """
-    run_dir = Path(run_dir)
-    if not run_dir.exists():
-        raise FileNotFoundError(f"run_dir not found: {run_dir}")
+def _tree_tasks(src: Path, dst_rel: str) -> List[Tuple[Path, str]]:
+    """(source file, share-relative destination) for every file under src."""
+    if not src.exists():
+        return []
+    out = []
+    for p in sorted(x for x in src.rglob("*") if x.is_file()):
+        out.append((p, f"{dst_rel}/{p.relative_to(src).as_posix()}"))
+    return out
 
-    share_root = run_dir / "share"
-    share_root.mkdir(parents=True, exist_ok=True)
-    if force:
-        _clear_share_dir(share_root)
 
-    # 1) README_SHARE.md
-    readme = share_root / "README_SHARE.md"
-    readme_text = """# Inkswarm DetectLab — Share Package
+README_SHARE_TEXT = """# Inkswarm DetectLab — Share Package
 
 This folder is meant to be sent as-is.
 
@@ -116,42 +111,158 @@ This folder is meant to be sent as-is.
 
 If anything is missing, it usually means that step failed upstream — see `logs/`.
 """
-    readme.write_text(readme_text, encoding="utf-8")
 
-    # 2) UI bundle (expected at share/ui_bundle)
-    ui_dst = share_root / "ui_bundle"
-    if not ui_dst.exists():
-        # Fallback: allow a bundle sitting at runs/<run_id>/ui_bundle
-        ui_src = run_dir / "ui_bundle"
-        _copy_tree(ui_src, ui_dst)
 
-    # 3) Reports
-    reports_dst = share_root / "reports"
-    reports_src = run_dir / "reports"
-    _copy_tree(reports_src, reports_dst)
+def share_plan(run_dir: Path) -> List[Tuple[Path, str]]:
+    """(source file, share-relative path) for every run artifact in the share package.
 
-    # 3b) Models under reports/models (matches RR evidence samples)
-    models_src = run_dir / "models"
-    models_dst = reports_dst / "models"
-    _copy_tree(models_src, models_dst)
+    README_SHARE.md and evidence_manifest.json are generated, not listed here.
+    """
+    run_dir = Path(run_dir)
+    # 2) UI bundle (expected at share/ui_bundle; used in place)
+    ui_dst = run_dir / "share" / "ui_bundle"
+    if ui_dst.exists():
+        tasks = _tree_tasks(ui_dst, "ui_bundle")
+    else:
+        # Fallback: allow a bundle sitting at runs/<run_id>/ui_bundle
+        tasks = _tree_tasks(run_dir / "ui_bundle", "ui_bundle")
 
-    # 4) Logs
-    logs_src = run_dir / "logs"
-    logs_dst = share_root / "logs"
-    _copy_tree(logs_src, logs_dst)
+    # 3) Reports, 3b) models under reports/models (matches RR evidence samples), 4) logs
+    tasks += _tree_tasks(run_dir / "reports", "reports")
+    tasks += _tree_tasks(run_dir / "models", "reports/models")
+    # logs/profile/ holds opt-in profiler dumps (--profile): developer-only and large.
+    # logs/perf.json is rewritten by every stage, including ones still running
+    # alongside evidence_bundle, so copying it would make the bundle racy.
+    tasks += [
+        (src, rel)
+        for src, rel in _tree_tasks(run_dir / "logs", "logs")
+        if not rel.startswith("logs/profile/") and rel != "logs/perf.json"
+    ]
 
     # 5) Meta: manifest + ui summary
-    meta_dst = share_root / "meta"
-    _copy_file(run_dir / "manifest.json", meta_dst / "manifest.json")
-    _copy_file(run_dir / "ui" / "ui_summary.json", meta_dst / "ui_summary.json")
-
-    # 6) Evidence manifest
-    files: List[Dict[str, Any]] = []
-    for p in sorted([x for x in share_root.rglob("*") if x.is_file()]):
-        rel = p.relative_to(share_root).as_posix()
-        if rel == "evidence_manifest.json":
-            continue
-        files.append({"path": rel, "sha256": _sha256(p), "bytes": p.stat().st_size})
+    for src, rel in ((run_dir / "manifest.json", "meta/manifest.json"), (run_dir / "ui" / "ui_summary.json", "meta/ui_summary.json")):
+        if src.exists():
+            tasks.append((src, rel))
+    return tasks
+
+
+def _load_export_cache(run_dir: Path) -> Dict[str, Dict[str, Any]]:
+    p = run_dir / EXPORT_CACHE_NAME
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+        return data.get("files", {}) if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _export_one(
+    src: Path,
+    rel: str,
+    *,
+    share_root: Path,
+    prev_root: Optional[Path],
+    cache: Dict[str, Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Materialize share/<rel> from src; returns its evidence + cache record.
+
+    Unchanged sources (same path, size and mtime as recorded by the previous
+    export) are hardlinked from the previous export and keep their recorded hash.
+    """
+    dst = share_root / rel
+    st = src.stat()
+    rec = {"src": str(src), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    hit = cache.get(rel)
+    unchanged = bool(hit) and all(hit.get(k) == rec[k] for k in ("src", "size", "mtime_ns")) and bool(hit.get("sha256"))
+
+    if src == dst:
+        # Already in place (ui_bundle/): only the hash is needed.
+        sha = hit["sha256"] if unchanged else _sha256(src)
+        return {**rec, "path": rel, "sha256": sha, "bytes": st.st_size, "reused": unchanged}
+
+    prev = (prev_root / rel) if prev_root is not None else dst
+    if unchanged and prev.exists() and prev.stat().st_size == st.st_size:
+        if prev != dst:
+            _link_or_copy(prev, dst)
+        return {**rec, "path": rel, "sha256": hit["sha256"], "bytes": st.st_size, "reused": True}
+
+    sha = _copy_and_hash(src, dst)
+    return {**rec, "path": rel, "sha256": sha, "bytes": st.st_size, "reused": False}
+
+
+@profiled("export_evidence_bundle")
+def export_evidence_bundle(*, run_dir: Path, force: bool = True, workers: Optional[int] = None) -> Path:
+    """Create/refresh runs/<run_id>/share evidence bundle.
+
+    Files are copied and sha256-hashed in a single streaming pass on a thread
+    pool. Sources unchanged since the previous export (per runs/<run_id>/
+    .share_export_cache.json) are hardlinked from that export instead of copied.
+
+    Parameters
+    ----------
+    run_dir:
+        Path to runs/<run_id>.
+    force:
+        If True, refresh share/ (keeps ui_bundle/).
+    workers:
+        Copy/hash threads (default: min(8, cpu_count)).
+    """
+    run_dir = Path(run_dir)
+    if not run_dir.exists():
+        raise FileNotFoundError(f"run_dir not found: {run_dir}")
+    stage_note(run_dir=run_dir)
+
+    share_root = run_dir / "share"
+    share_root.mkdir(parents=True, exist_ok=True)
+    cache = _load_export_cache(run_dir)
+    prev_root: Optional[Path] = None
+    if force:
+        # Park the previous export instead of deleting it: unchanged files are
+        # hardlinked back from here, then it is removed.
+        prev_root = share_root / _PREV_DIR_NAME
+        if prev_root.exists():
+            shutil.rmtree(prev_root)
+        prev_root.mkdir()
+        for child in list(share_root.iterdir()):
+            if child.name not in ("ui_bundle", _PREV_DIR_NAME):
+                child.rename(prev_root / child.name)
+
+    # 1) README_SHARE.md
+    readme = share_root / "README_SHARE.md"
+    # Write bytes, not text: newline translation would make the file differ from its recorded hash.
+    readme_data = README_SHARE_TEXT.encode("utf-8")
+    readme.write_bytes(readme_data)
+
+    # 2) UI bundle, reports, models, logs, meta (see share_plan)
+    tasks = share_plan(run_dir)
+
+    # Copy + hash in one streaming pass per file, in parallel.
+    n_workers = max(1, min(len(tasks), workers or min(8, os.cpu_count() or 1)))
+    records: Dict[str, Dict[str, Any]] = {}
+    if tasks:
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            futs = [pool.submit(_export_one, src, rel, share_root=share_root, prev_root=prev_root, cache=cache) for src, rel in tasks]
+            for fut in futs:
+                r = fut.result()
+                records[r["path"]] = r
+    if prev_root is not None:
+        shutil.rmtree(prev_root, ignore_errors=True)
+
+    # 6) Evidence manifest (hashes come from the copy pass; README hashed from memory)
+    records["README_SHARE.md"] = {
+        "path": "README_SHARE.md",
+        "sha256": hashlib.sha256(readme_data).hexdigest(),
+        "bytes": len(readme_data),
+    }
+    if not force:
+        # Keep files left over from earlier exports in the evidence listing.
+        for p in share_root.rglob("*"):
+            rel = p.relative_to(share_root).as_posix()
+            if p.is_file() and rel not in records and rel != "evidence_manifest.json" and not rel.endswith(".part"):
+                records[rel] = {"path": rel, "sha256": _sha256(p), "bytes": p.stat().st_size}
+
+    files: List[Dict[str, Any]] = [
+        {"path": rel, "sha256": records[rel]["sha256"], "bytes": records[rel]["bytes"]} for rel in sorted(records)
+    ]
 
     manifest: Dict[str, Any] = {
         "schema_version": 1,
@@ -162,4 +273,17 @@ If anything is missing, it usually means that step failed upstream — see `logs
         json.dumps(manifest, indent=2, sort_keys=True) + "\n",
         encoding="utf-8",
     )
+    (run_dir / EXPORT_CACHE_NAME).write_text(
+        json.dumps(
+            {
+                "files": {
+                    rel: {k: r[k] for k in ("src", "size", "mtime_ns", "sha256")}
+                    for rel, r in records.items()
+                    if "src" in r
+                }
+            },
+            sort_keys=True,
+        ),
+        encoding="utf-8",
+    )
     return share_root
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+"""Deterministic share zip writer.
+
+Builds `<run_id>__share.zip` straight from run artifacts (the same layout as
+`export_evidence_bundle`, see `share_plan`) without materializing share/ first.
+
+- Parallel: pass 1 hashes every source (sha256 + crc32) on a thread pool; pass 2
+  deflates unique contents on the pool, a bounded window ahead of the writer.
+- Streaming: sources are read in chunks, deflated into per-content spool files
+  next to the output and copied into the zip in chunks; no file is held in memory.
+- Content-addressed: identical files (e.g. the legacy and by-model joblib copies)
+  are compressed and stored once; the other paths are listed in
+  ``share_aliases.json``. ``dedup=False`` stores every path in full.
+- Already-compressed formats (parquet, images, archives) are stored, not deflated.
+- Byte-reproducible: sorted entry names, fixed timestamps/attributes, fixed
+  compression level and a relative ``root`` in the embedded evidence manifest.
+
+Zip64 extra fields / end records are written only for entries and archives past
+the 4 GiB / 65535-entry limits, so ordinary bundles stay plain zip.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+
+from ..utils.perf import profiled
+from .evidence import README_SHARE_TEXT, share_plan
+
+_CHUNK = 1024 * 1024
+
+# Formats that are already compressed; deflating them again costs CPU for ~0 gain.
+STORED_SUFFIXES = frozenset({".parquet", ".zip", ".gz", ".bz2", ".xz", ".zst", ".png", ".jpg", ".jpeg", ".gif", ".webp"})
+
+ALIASES_NAME = "share_aliases.json"
+
+_METHOD_STORED = 0
+_METHOD_DEFLATED = 8
+_FLAG_UTF8 = 0x0800
+_DOS_DATE = (1 << 5) | 1  # 1980-01-01
+_DOS_TIME = 0
+_EXTERNAL_ATTR = (0o100644 << 16)
+_VERSION = 20
+_VERSION_ZIP64 = 45
+_MADE_BY_UNIX = 3 << 8
+_ZIP32_MAX = 0xFFFFFFFF
+_ZIP32_MAX_ENTRIES = 0xFFFF
+
+
+@dataclass(frozen=True)
+class ShareZipResult:
+    path: Path
+    entries: int
+    unique_contents: int
+    deduplicated: int
+    bytes_in: int
+    bytes_out: int
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "entries": self.entries,
+            "unique_contents": self.unique_contents,
+            "deduplicated": self.deduplicated,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+        }
+
+
+@dataclass
+class _Entry:
+    name: str
+    source: Union[Path, bytes]
+    sha256: str = ""
+    crc: int = 0
+    size: int = 0
+    method: int = _METHOD_DEFLATED
+
+
+def _digest(path: Path) -> Tuple[str, int, int]:
+    h = hashlib.sha256()
+    crc = 0
+    size = 0
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+    return h.hexdigest(), crc, size
+
+
+def _deflate(source: Union[Path, bytes], level: int, dst: Path) -> Tuple[Path, int]:
+    """Raw-deflate `source` into the spool file `dst`; returns (dst, compressed size)."""
+    co = zlib.compressobj(level, zlib.DEFLATED, -15)
+    with dst.open("wb") as out:
+        if isinstance(source, bytes):
+            out.write(co.compress(source))
+        else:
+            with source.open("rb") as f:
+                for chunk in iter(lambda: f.read(_CHUNK), b""):
+                    out.write(co.compress(chunk))
+        out.write(co.flush())
+        return dst, out.tell()
+
+
+def _copy_into(out: BinaryIO, source: Union[Path, bytes]) -> None:
+    if isinstance(source, bytes):
+        out.write(source)
+        return
+    with source.open("rb") as f:
+        shutil.copyfileobj(f, out, _CHUNK)
+
+
+def _bytes_entry(name: str, data: bytes) -> _Entry:
+    return _Entry(name=name, source=data, sha256=hashlib.sha256(data).hexdigest(), crc=zlib.crc32(data), size=len(data))
+
+
+def _zip64_extra(values: List[int]) -> bytes:
+    return struct.pack(f"<HH{len(values)}Q", 0x0001, 8 * len(values), *values) if values else b""
+
+
+def _local_header(e: _Entry, csize: int, method: int) -> bytes:
+    name = e.name.encode("utf-8")
+    # The local zip64 extra must carry both sizes whenever either overflows.
+    big = e.size > _ZIP32_MAX or csize > _ZIP32_MAX
+    extra = _zip64_extra([e.size, csize] if big else [])
+    size32, csize32 = (0xFFFFFFFF, 0xFFFFFFFF) if big else (e.size, csize)
+    version = _VERSION_ZIP64 if big else _VERSION
+    return struct.pack(
+        "<IHHHHHIIIHH", 0x04034B50, version, _FLAG_UTF8, method, _DOS_TIME, _DOS_DATE, e.crc, csize32, size32, len(name), len(extra)
+    ) + name + extra
+
+
+def _central_header(e: _Entry, csize: int, method: int, offset: int) -> bytes:
+    name = e.name.encode("utf-8")
+    # The central zip64 extra carries only the overflowing fields, in this order.
+    fields = [v for v in (e.size, csize, offset) if v > _ZIP32_MAX]
+    extra = _zip64_extra(fields)
+    size32, csize32, offset32 = (0xFFFFFFFF if v > _ZIP32_MAX else v for v in (e.size, csize, offset))
+    version = _VERSION_ZIP64 if fields else _VERSION
+    return struct.pack(
+        "<IHHHHHHIIIHHHHHII",
+        0x02014B50,
+        _MADE_BY_UNIX | version,
+        version,
+        _FLAG_UTF8,
+        method,
+        _DOS_TIME,
+        _DOS_DATE,
+        e.crc,
+        csize32,
+        size32,
+        len(name),
+        len(extra),
+        0,
+        0,
+        0,
+        _EXTERNAL_ATTR,
+        offset32,
+    ) + name + extra
+
+
+def _end_records(n: int, cd_size: int, cd_offset: int, eocd_offset: int) -> bytes:
+    """End of central directory, preceded by the zip64 record + locator when a field overflows."""
+    head = b""
+    if n > _ZIP32_MAX_ENTRIES or cd_size > _ZIP32_MAX or cd_offset > _ZIP32_MAX:
+        head = struct.pack(
+            "<IQHHIIQQQQ", 0x06064B50, 44, _MADE_BY_UNIX | _VERSION_ZIP64, _VERSION_ZIP64, 0, 0, n, n, cd_size, cd_offset
+        ) + struct.pack("<IIQI", 0x07064B50, 0, eocd_offset, 1)
+    n16 = n if n <= _ZIP32_MAX_ENTRIES else 0xFFFF
+    size32, offset32 = (0xFFFFFFFF if v > _ZIP32_MAX else v for v in (cd_size, cd_offset))
+    return head + struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, n16, n16, size32, offset32, 0)
+
+
+@profiled("write_share_zip")  # no run_dir: recording into logs/ would change the next zip
+def write_share_zip(
+    *,
+    run_dir: Path,
+    out_path: Optional[Path] = None,
+    workers: Optional[int] = None,
+    level: int = 6,
+    dedup: bool = True,
+) -> ShareZipResult:
+    """Write a deterministic share zip for runs/<run_id> (default: `<run_id>__share.zip` in cwd).
+
+    The archive holds README_SHARE.md, evidence_manifest.json and every file of
+    `share_plan(run_dir)`. Identical contents are compressed once and, with `dedup`
+    (the default), stored once with the remaining paths in share_aliases.json.
+    """
+    run_dir = Path(run_dir)
+    if not run_dir.exists():
+        raise FileNotFoundError(f"run_dir not found: {run_dir}")
+    out_path = Path(out_path) if out_path is not None else Path(f"{run_dir.name}__share.zip")
+    n_workers = max(1, workers or min(8, os.cpu_count() or 1))
+
+    tmp = out_path.with_name(out_path.name + ".part")
+    tmp.parent.mkdir(parents=True, exist_ok=True)
+
+    entries = [_Entry(name=rel, source=src) for src, rel in share_plan(run_dir)]
+    # The pool is shut down (running deflates finished) before the spool dir is removed.
+    with (
+        tempfile.TemporaryDirectory(prefix=out_path.name + ".", dir=tmp.parent) as spool,
+        ThreadPoolExecutor(max_workers=n_workers) as pool,
+    ):
+        # Pass 1: content fingerprints (sha256 for the manifest/dedup, crc32 for zip).
+        for e, (sha, crc, size) in zip(entries, pool.map(_digest, [e.source for e in entries])):
+            e.sha256, e.crc, e.size = sha, crc, size
+            if Path(e.name).suffix.lower() in STORED_SUFFIXES:
+                e.method = _METHOD_STORED
+
+        readme = _bytes_entry("README_SHARE.md", README_SHARE_TEXT.encode("utf-8"))
+        listed = sorted(entries + [readme], key=lambda e: e.name)
+        manifest = {
+            "schema_version": 1,
+            "root": "share",
+            "files": [{"path": e.name, "sha256": e.sha256, "bytes": e.size} for e in listed],
+        }
+        entries = listed + [_bytes_entry("evidence_manifest.json", (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode("utf-8"))]
+
+        canonical: Dict[Tuple[str, int], str] = {}
+        aliases: Dict[str, str] = {}
+        refs: Dict[str, int] = {}
+        for e in entries:
+            key = (e.sha256, e.method)
+            if key in canonical and dedup:
+                aliases[e.name] = canonical[key]
+                continue
+            canonical.setdefault(key, e.name)
+            if e.method == _METHOD_DEFLATED:
+                refs[e.sha256] = refs.get(e.sha256, 0) + 1
+        if aliases:
+            entries.append(
+                _bytes_entry(ALIASES_NAME, (json.dumps({"schema_version": 1, "aliases": aliases}, indent=2, sort_keys=True) + "\n").encode("utf-8"))
+            )
+            refs[entries[-1].sha256] = refs.get(entries[-1].sha256, 0) + 1
+        # refs: remaining writes per deflated content, so spooled payloads are removed after the last one.
+        entries = sorted((e for e in entries if e.name not in aliases), key=lambda e: e.name)
+
+        # Pass 2: deflate each unique content once, a bounded window ahead of the writer.
+        jobs: List[_Entry] = []
+        seen: set[str] = set()
+        for e in entries:
+            if e.method == _METHOD_DEFLATED and e.sha256 not in seen:
+                seen.add(e.sha256)
+                jobs.append(e)
+        window = 2 * n_workers
+        futures: Dict[str, Future] = {}
+        payloads: Dict[str, Tuple[Path, int]] = {}
+        next_job = 0
+
+        central: List[bytes] = []
+        bytes_in = 0
+        try:
+            with tmp.open("wb") as out:
+                for e in entries:
+                    while next_job < len(jobs) and len(futures) < window:
+                        j = jobs[next_job]
+                        futures[j.sha256] = pool.submit(_deflate, j.source, level, Path(spool) / f"{next_job}.deflate")
+                        next_job += 1
+
+                    offset = out.tell()
+                    bytes_in += e.size
+                    method, csize, payload = _METHOD_STORED, e.size, None
+                    if e.method == _METHOD_DEFLATED:
+                        if e.sha256 not in payloads:
+                            payloads[e.sha256] = futures.pop(e.sha256).result()
+                        payload, deflated_size = payloads[e.sha256]
+                        refs[e.sha256] -= 1
+                        # Incompressible: store as-is (deterministic: depends only on content).
+                        if deflated_size < e.size:
+                            method, csize = _METHOD_DEFLATED, deflated_size
+
+                    out.write(_local_header(e, csize, method))
+                    _copy_into(out, payload if method == _METHOD_DEFLATED else e.source)
+                    if payload is not None and refs[e.sha256] == 0:
+                        payloads.pop(e.sha256)[0].unlink()
+                    central.append(_central_header(e, csize, method, offset))
+
+                cd_offset = out.tell()
+                for c in central:
+                    out.write(c)
+                cd_size = out.tell() - cd_offset
+                out.write(_end_records(len(central), cd_size, cd_offset, out.tell()))
+                bytes_out = out.tell()
+            os.replace(tmp, out_path)
+        finally:
+            tmp.unlink(missing_ok=True)
+            for f in futures.values():
+                f.cancel()
+
+    return ShareZipResult(
+        path=out_path,
+        entries=len(entries),
+        unique_contents=len({e.sha256 for e in entries}),
+        deduplicated=len(aliases),
+        bytes_in=bytes_in,
+        bytes_out=bytes_out,
+    )
@@ -10,13 +10,24 @@ Key behavior
   after dropping the `run_id` column.
 - Parses BaselineLab metrics from the current metrics.json structure.
 
+Modes
+- ``full`` (default): reads each parquet into pandas and canonicalizes before hashing.
+- ``fast``: reuses manifest ``content_hash`` values for artifacts without a
+  ``run_id`` column, hashes the remaining parquet files per row group in a thread
+  pool, and computes the features numeric summary with Arrow compute (no pandas).
+  Fast and full signatures are not comparable with each other; the mode is part of
+  the fast signature digest.
+
 Fail-closed
 - Missing required artifacts -> raises and exits non-zero.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -81,23 +92,144 @@ def _norm_parquet_hash(
     return stable_hash_df(df, sort_keys=keys, column_order=col_order)
 
 
+# Identifier columns excluded from the features numeric summary.
+_SUMMARY_DROP_COLS = [
+    "run_id",
+    "event_id",
+    "event_ts",
+    "user_id",
+    "ip_hash",
+    "device_fingerprint_hash",
+    "session_id",
+    "metadata_json",
+    "country",
+]
+
+
+def _parquet_parts(path: Path) -> list[tuple[str, Path]]:
+    """(partition dir relative to `path`, file) for a parquet file or hive-partitioned directory."""
+    if path.is_file():
+        return [("", path)]
+    return sorted(
+        (f.parent.relative_to(path).as_posix(), f)
+        for f in path.rglob("*.parquet")
+        if f.is_file()
+    )
+
+
+def _row_group_digest(path: Path, row_group: int, columns: list[str]) -> str:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pq.ParquetFile(path).read_row_group(row_group, columns=columns).replace_schema_metadata(None)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return hashlib.sha256(sink.getvalue().to_pybytes()).hexdigest()
+
+
+def _fast_parquet_hash(*, parquet_path: Path, drop_cols: list[str] | None = None, workers: int | None = None) -> str:
+    """Hash a parquet file/dataset per row group (parallel), without pandas.
+
+    Columns in `drop_cols` are never read. Within one partition directory the part
+    files are combined order-independently (their names are random UUIDs).
+    """
+    import pyarrow.parquet as pq
+
+    drop = set(drop_cols or [])
+    tasks: list[tuple[str, Path, int, list[str]]] = []
+    for part, f in _parquet_parts(parquet_path):
+        meta = pq.ParquetFile(f).metadata
+        cols = [n for n in meta.schema.to_arrow_schema().names if n not in drop]
+        tasks.extend((part, f, rg, cols) for rg in range(meta.num_row_groups))
+
+    n_workers = workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max(1, n_workers)) as pool:
+        digests = list(pool.map(lambda t: _row_group_digest(t[1], t[2], t[3]), tasks))
+
+    by_file: dict[tuple[str, Path], list[str]] = {}
+    for (part, f, _rg, _cols), d in zip(tasks, digests):
+        by_file.setdefault((part, f), []).append(d)
+    by_part: dict[str, list[str]] = {}
+    for (part, _f), ds in by_file.items():
+        by_part.setdefault(part, []).append(stable_hash_dict({"row_groups": ds}))
+    return stable_hash_dict({p: sorted(v) for p, v in sorted(by_part.items())})
+
+
+def _parquet_has_columns(path: Path, cols: list[str]) -> bool:
+    import pyarrow.parquet as pq
+
+    parts = _parquet_parts(path)
+    if not parts:
+        return False
+    names = set(pq.read_schema(parts[0][1]).names)
+    return any(c in names for c in cols)
+
+
+def _fast_artifact_hash(
+    *,
+    manifest: dict[str, Any],
+    artifact_key: str,
+    parquet_path: Path,
+    drop_cols: list[str],
+    workers: int | None,
+) -> str:
+    """Manifest content_hash when it is run-invariant, else a row-group hash.
+
+    Manifest hashes cover every written column, so they are only reused when none
+    of `drop_cols` (run_id) is stored in the file.
+    """
+    entry = (manifest.get("artifacts") or {}).get(artifact_key) or {}
+    content_hash = entry.get("content_hash")
+    if content_hash and not _parquet_has_columns(parquet_path, drop_cols):
+        return f"manifest:{content_hash}"
+    return "rowgroups:" + _fast_parquet_hash(parquet_path=parquet_path, drop_cols=drop_cols, workers=workers)
+
+
+def _features_numeric_summary_arrow(features_path: Path) -> dict[str, Any]:
+    """Arrow-compute twin of `_features_numeric_summary` (single columnar read, no pandas)."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.types as pat
+
+    dataset = ds.dataset(str(features_path), format="parquet", partitioning="hive")
+    cols = [
+        f.name
+        for f in dataset.schema
+        if f.name not in _SUMMARY_DROP_COLS
+        and (pat.is_integer(f.type) or pat.is_floating(f.type) or pat.is_boolean(f.type))
+    ]
+    if not cols:
+        return {"n_rows": int(dataset.count_rows()), "n_numeric_cols": 0, "digest": stable_hash_dict({})}
+
+    table = dataset.to_table(columns=cols)
+    def rounded(scalar: Any) -> float | None:
+        v = scalar.as_py()  # None for empty / all-null columns
+        return None if v is None else float(round(v, 12))
+
+    means: dict[str, float | None] = {}
+    stds: dict[str, float | None] = {}
+    for c in cols:
+        col = table.column(c)
+        if pat.is_boolean(col.type):
+            col = pc.cast(col, pa.int64())
+        means[c] = rounded(pc.mean(col))
+        stds[c] = rounded(pc.stddev(col, ddof=0))
+
+    return {
+        "n_rows": int(table.num_rows),
+        "n_numeric_cols": len(cols),
+        "digest": stable_hash_dict({"means": means, "stds": stds}),
+    }
+
+
 def _features_numeric_summary(features_path: Path) -> dict[str, Any]:
     """Small, stable numeric summary for features parquet (digest only)."""
     df = pd.read_parquet(features_path)
 
     # Drop obvious identifier columns if present.
-    drop = [
-        "run_id",
-        "event_id",
-        "event_ts",
-        "user_id",
-        "ip_hash",
-        "device_fingerprint_hash",
-        "session_id",
-        "metadata_json",
-        "country",
-    ]
-    for c in drop:
+    for c in _SUMMARY_DROP_COLS:
         if c in df.columns:
             df = df.drop(columns=[c])
 
@@ -158,7 +290,7 @@ def _parse_baselines_metrics(metrics_path: Path) -> dict[str, Any]:
     return out
 
 
-def build_signature(*, repo_root: Path, run_id: str) -> dict[str, Any]:
+def build_signature(*, repo_root: Path, run_id: str, mode: str = "full", workers: int | None = None) -> dict[str, Any]:
     runs_dir = repo_root / "runs"
     run_dir = run_dir_for(runs_dir, run_id)
 
@@ -174,6 +306,68 @@ def build_signature(*, repo_root: Path, run_id: str) -> dict[str, Any]:
     features_login = _must_exist(run_dir / "features" / "login_attempt" / "features.parquet", "features login_attempt")
     metrics_login = _must_exist(run_dir / "models" / "login_attempt" / "baselines" / "metrics.json", "baselines metrics")
 
+    if mode not in ("full", "fast"):
+        raise ValueError(f"Unknown signature mode: {mode!r} (expected 'full' or 'fast')")
+
+    if mode == "fast":
+        hashes = {
+            name: _fast_artifact_hash(
+                manifest=manifest,
+                artifact_key=key,
+                parquet_path=path,
+                drop_cols=drop,
+                workers=workers,
+            )
+            for name, key, path, drop in (
+                ("raw_login_attempt", "raw/login_attempt", raw_login, ["run_id"]),
+                ("raw_checkout_attempt", "raw/checkout_attempt", raw_checkout, ["run_id"]),
+                ("features_login_attempt", "features/login_attempt/features", features_login, ["run_id"]),
+            )
+        }
+        features_summary = _features_numeric_summary_arrow(features_login)
+    else:
+        hashes, features_summary = _full_hashes(raw_login, raw_checkout, features_login, sort_keys)
+    baselines = _parse_baselines_metrics(metrics_login)
+
+    digest_payload = {
+        "schema_version": manifest.get("schema_version"),
+        "timezone": manifest.get("timezone"),
+        "seed": manifest.get("seed"),
+        "config_hash": manifest.get("config_hash"),
+        "hashes_digest": stable_hash_dict(hashes),
+        "features_digest": features_summary.get("digest"),
+        "baselines_digest": stable_hash_dict(baselines),
+    }
+    if mode != "full":
+        # Keep full-mode digests identical to signatures written before modes existed.
+        digest_payload["signature_mode"] = mode
+
+    signature = {
+        "run_id": "<NORMALIZED>",
+        "actual_run_id": "<NORMALIZED>",
+        "signature_mode": mode,
+        "schema_version": manifest.get("schema_version"),
+        "timezone": manifest.get("timezone"),
+        "seed": manifest.get("seed"),
+        "config_hash": manifest.get("config_hash"),
+        "code": manifest.get("code", {}),
+        "hashes": hashes,
+        "hashes_digest": stable_hash_dict(hashes),
+        "features_digest": features_summary.get("digest"),
+        "baselines": baselines,
+        "baselines_digest": stable_hash_dict(baselines),
+        "signature_digest": stable_hash_dict(digest_payload),
+    }
+
+    return signature
+
+
+def _full_hashes(
+    raw_login: Path,
+    raw_checkout: Path,
+    features_login: Path,
+    sort_keys: list[str],
+) -> tuple[dict[str, str], dict[str, Any]]:
     hashes = {
         "raw_login_attempt": _norm_parquet_hash(
             parquet_path=raw_login,
@@ -195,45 +389,18 @@ def build_signature(*, repo_root: Path, run_id: str) -> dict[str, Any]:
         ),
     }
 
-    features_summary = _features_numeric_summary(features_login)
-    baselines = _parse_baselines_metrics(metrics_login)
-
-    signature = {
-        "run_id": "<NORMALIZED>",
-        "actual_run_id": "<NORMALIZED>",
-        "schema_version": manifest.get("schema_version"),
-        "timezone": manifest.get("timezone"),
-        "seed": manifest.get("seed"),
-        "config_hash": manifest.get("config_hash"),
-        "code": manifest.get("code", {}),
-        "hashes": hashes,
-        "hashes_digest": stable_hash_dict(hashes),
-        "features_digest": features_summary.get("digest"),
-        "baselines": baselines,
-        "baselines_digest": stable_hash_dict(baselines),
-        "signature_digest": stable_hash_dict(
-            {
-                "schema_version": manifest.get("schema_version"),
-                "timezone": manifest.get("timezone"),
-                "seed": manifest.get("seed"),
-                "config_hash": manifest.get("config_hash"),
-                "hashes_digest": stable_hash_dict(hashes),
-                "features_digest": features_summary.get("digest"),
-                "baselines_digest": stable_hash_dict(baselines),
-            }
-        ),
-    }
-
-    return signature
+    return hashes, _features_numeric_summary(features_login)
 
 
 @app.command()
 def main(
     run_id: str = typer.Option(..., "--run-id", help="Run id under runs/<run_id>"),
     out: Path = typer.Option(..., "--out", help="Output JSON path"),
+    mode: str = typer.Option("full", "--mode", help="full (pandas canonical hashes) | fast (manifest hashes + parallel row-group hashes + Arrow summary)"),
+    workers: int = typer.Option(0, "--workers", help="Row-group hashing threads for --mode fast (0 = auto)"),
 ) -> None:
     repo_root = Path(__file__).resolve().parents[3]
-    sig = build_signature(repo_root=repo_root, run_id=run_id)
+    sig = build_signature(repo_root=repo_root, run_id=run_id, mode=mode, workers=workers or None)
     out.parent.mkdir(parents=True, exist_ok=True)
     out.write_text(json.dumps(sig, indent=2, sort_keys=True) + "\n", encoding="utf-8")
     typer.echo(json.dumps(sig, indent=2, sort_keys=True))
@@ -1,48 +1,135 @@
 from __future__ import annotations
 
+import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Optional
 from datetime import datetime, timezone
 
 from ..config import AppConfig
-from ..io.paths import run_dir as run_dir_for
-from .summarize import write_ui_summary, build_ui_summary
+from ..utils.perf import profiled
+from .summarize import load_or_build_ui_summary
+
+# Rows per page of the run overview table (shards are only loaded for opened runs).
+PAGE_SIZE = 20
+# Runs rendered as full cards on open when the bundle is this small (single-run share bundles).
+AUTO_OPEN_MAX = 5
 
 
 def _now_utc_short() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+def _shard_name(run_id: str) -> str:
+    # Run ids are user-provided; hash them for a file-name-safe, stable shard name.
+    return hashlib.sha1(run_id.encode("utf-8")).hexdigest()[:16] + ".js"
+
+
+def _headline(summary: dict[str, Any]) -> dict[str, Any]:
+    """PR-AUC per label x model for the overview table (index stays small)."""
+    labels = ((summary.get("baselines") or {}).get("login_attempt") or {}).get("labels") or {}
+    out: dict[str, Any] = {}
+    for lab, by_model in labels.items():
+        for model, entry in (by_model or {}).items():
+            if not isinstance(entry, dict):
+                continue
+            if entry.get("status") != "ok":
+                out.setdefault(lab, {})[model] = {"status": entry.get("status") or "missing"}
+                continue
+            out.setdefault(lab, {})[model] = {
+                "status": "ok",
+                "user_holdout": (entry.get("user_holdout") or {}).get("pr_auc"),
+                "time_eval": (entry.get("time_eval") or {}).get("pr_auc"),
+            }
+    return out
+
+
+def _write_if_changed(path: Path, text: str) -> None:
+    # Unchanged shards keep their mtime, so share exports can reuse them.
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return
+    except OSError:
+        pass
+    path.write_text(text, encoding="utf-8")
+
+
+@profiled("export_ui_bundle")
 def export_ui_bundle(
     cfg: AppConfig,
     *,
     run_ids: list[str],
     out_dir: Path,
     force: bool = False,
+    refresh_summaries: Optional[bool] = None,
 ) -> Path:
-    """Export a self-contained static HTML bundle for up to 5 run_ids.
+    """Export a self-contained static HTML bundle for any number of run_ids.
+
+    Layout:
+    - index.html / app.js / style.css: the viewer (no data inside).
+    - data/index.js: run list with headline PR-AUCs (one small file, loaded up front).
+    - data/runs/<hash>.js: one compact shard per run (its ui_summary.json), loaded
+      on demand when the run is opened.
 
-    Design goals:
-    - Shareable: open index.html directly (no server, no CORS fetch).
-    - Stakeholder-friendly: headline tables, low jargon.
+    Data files are JSON wrapped in a JS assignment/callback so the bundle still opens
+    from file:// (no server, no CORS fetch). Each run's runs/<run_id>/ui/ui_summary.json
+    is reused when present; `refresh_summaries` (default: `force`) rebuilds them.
     """
-    run_ids = [r.strip() for r in run_ids if r.strip()]
+    run_ids = list(dict.fromkeys(r.strip() for r in run_ids if r.strip()))
     if not run_ids:
         raise ValueError("No run_ids provided.")
-    if len(run_ids) > 5:
-        raise ValueError("UI v1 supports at most 5 run_ids (nmax=5).")
+    if refresh_summaries is None:
+        refresh_summaries = force
 
     out_dir.mkdir(parents=True, exist_ok=True)
     index_path = out_dir / "index.html"
     app_path = out_dir / "app.js"
     css_path = out_dir / "style.css"
-
-    # Build summaries (write into runs/<run_id>/ui first, then embed)
-    summaries: list[dict[str, Any]] = []
-    for rid in run_ids:
-        write_ui_summary(cfg, run_id=rid, force=force)
-        summaries.append(build_ui_summary(cfg, run_id=rid))
+    shard_dir = out_dir / "data" / "runs"
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    # Summaries: reuse runs/<run_id>/ui/ui_summary.json (built once if missing).
+    with ThreadPoolExecutor(max_workers=min(8, len(run_ids))) as pool:
+        summaries = list(pool.map(lambda rid: load_or_build_ui_summary(cfg, run_id=rid, force=bool(refresh_summaries)), run_ids))
+
+    index_runs: list[dict[str, Any]] = []
+    for rid, summary in zip(run_ids, summaries):
+        name = _shard_name(rid)
+        _write_if_changed(
+            shard_dir / name,
+            # The shard names the run it was written for: a reused summary may carry another run_id.
+            "window.__RUN_SHARD__("
+            + json.dumps(rid)
+            + ","
+            + json.dumps(summary, sort_keys=True, separators=(",", ":"))
+            + ");\n",
+        )
+        index_runs.append(
+            {
+                "run_id": rid,
+                "shard": f"data/runs/{name}",
+                "generated_at_utc": summary.get("generated_at_utc"),
+                "n_notes": len(summary.get("notes") or []),
+                "headline": _headline(summary),
+            }
+        )
+    keep = {Path(r["shard"]).name for r in index_runs}
+    for stale in shard_dir.glob("*.js"):
+        if stale.name not in keep:
+            stale.unlink()
+
+    index = {
+        "schema_version": 2,
+        "generated_at_utc": _now_utc_short(),
+        "page_size": PAGE_SIZE,
+        "auto_open_max": AUTO_OPEN_MAX,
+        "runs": index_runs,
+    }
+    _write_if_changed(
+        out_dir / "data" / "index.js",
+        "window.__RUN_INDEX__ = " + json.dumps(index, sort_keys=True, separators=(",", ":")) + ";\n",
+    )
 
     # Static assets (minimal)
     index_html = f"""<!doctype html>
@@ -57,7 +144,7 @@ def export_ui_bundle(
   <header class="top">
     <div class="wrap">
       <div class="title">Inkswarm DetectLab — MVP Results Viewer</div>
-      <div class="subtitle">Stakeholder-friendly comparison of up to 5 runs — <b>user_holdout</b> = generalization to new users (primary), <b>time_eval</b> = time drift check (secondary).</div>
+      <div class="subtitle">Stakeholder-friendly comparison of {len(run_ids)} run(s) — <b>user_holdout</b> = generalization to new users (primary), <b>time_eval</b> = time drift check (secondary).</div>
       <div class="meta">Generated: {_now_utc_short()}</div>
     </div>
   </header>
@@ -94,6 +181,13 @@ def export_ui_bundle(
   <div><b>User Holdout</b> is the primary evaluation (generalization). <b>Time Eval</b> is the drift check.</div>
 </section>
 
+<section class="card" id="runs">
+  <h2>Runs</h2>
+  <div class="small">Headline PR-AUC per label and model. Open a run for thresholds, recall and diagnostics.</div>
+  <div id="runs-table"></div>
+  <div class="pager" id="pager"></div>
+</section>
+
 <div id="content"></div>
 
     <section class="foot">
@@ -107,6 +201,7 @@ def export_ui_bundle(
     </section>
   </main>
 
+  <script src="data/index.js"></script>
   <script src="app.js"></script>
 </body>
 </html>
@@ -147,184 +242,319 @@ code{background:#0f1626; border:1px solid var(--line); padding:2px 6px; border-r
 .mini{width:100%;border-collapse:collapse;margin-top:8px}
 .mini th,.mini td{border-bottom:1px solid var(--line);padding:6px 8px;text-align:left;font-size:12px}
 .warn{color:#fbbf24;font-weight:600}
+.runs-table tr.sel td{background:rgba(122,162,255,0.08)}
+.runs-table td:first-child{white-space:nowrap}
+button{background:var(--panel); border:1px solid var(--line); color:var(--text); padding:6px 10px; border-radius:8px; cursor:pointer}
+button:disabled{opacity:0.4; cursor:default}
+.pager{display:flex; gap:10px; align-items:center; margin-top:10px}
 """.strip() + "\n"
 
-    # app.js embeds all data to avoid fetch/CORS issues on file://
-    data = {"schema_version": 1, "generated_at_utc": _now_utc_short(), "runs": summaries}
-    app_js = f"""/* Inkswarm DetectLab — MVP Results Viewer (static) */
-window.__RUN_DATA__ = {json.dumps(data, indent=2)};
-(function() {{
+    # app.js is static: data comes from data/index.js and per-run shards (script tags work on file://)
+    app_js = APP_JS
+
+    # Write outputs
+    index_path.write_text(index_html, encoding="utf-8")
+    css_path.write_text(css, encoding="utf-8")
+    app_path.write_text(app_js, encoding="utf-8")
+
+    # Add small readme
+    (out_dir/"README.txt").write_text(
+        "Inkswarm DetectLab — MVP Results Viewer\n\n"
+        "Open index.html in a browser.\n"
+        "This bundle is self-contained (no server required).\n"
+        "Run data lives in data/index.js and data/runs/*.js (one shard per run, loaded on demand).\n",
+        encoding="utf-8"
+    )
+
+    return out_dir
+
+
+APP_JS = r"""/* Inkswarm DetectLab — MVP Results Viewer (static, lazy per-run shards) */
+(function() {
   const $ = (id) => document.getElementById(id);
   const content = $("content");
+  const runsTable = $("runs-table");
+  const pager = $("pager");
   const metricSel = $("metric");
   const detailSel = $("detail");
   const gotoSel = $("goto");
 
-  function fmt(x) {{
+  const INDEX = window.__RUN_INDEX__ || {runs: []};
+  const runs = INDEX.runs || [];
+  const pageSize = INDEX.page_size || 20;
+  const byId = {};
+  runs.forEach((e) => { byId[e.run_id] = e; });
+
+  const shards = {};   // run_id -> loaded ui summary (or {__error})
+  const pending = {};  // run_id -> callbacks waiting for the shard
+  let opened = runs.length <= (INDEX.auto_open_max || 5) ? runs.map((e) => e.run_id) : [];
+  let page = 0;
+
+  const SHARD_TIMEOUT_MS = 15000;
+
+  function settle(rid, summary) {
+    const cbs = pending[rid];
+    if (!cbs) {
+      // Late arrival after a timeout: keep the real data for the next render.
+      if (!shards[rid] || shards[rid].__error) shards[rid] = summary;
+      return;
+    }
+    delete pending[rid];
+    shards[rid] = summary;
+    cbs.forEach((cb) => cb());
+  }
+
+  // Shards call this when their <script> finishes loading, with the run id they were written for.
+  window.__RUN_SHARD__ = function(rid, summary) {
+    if (byId[rid] !== undefined) settle(rid, summary);
+  };
+
+  function loadShard(rid, cb) {
+    if (shards[rid]) return cb();
+    if (pending[rid]) { pending[rid].push(cb); return; }
+    pending[rid] = [cb];
+    const src = byId[rid].shard;
+    const fail = (why) => {
+      if (pending[rid]) settle(rid, {run_id: rid, __error: `${why} ${src}`});
+    };
+    const s = document.createElement("script");
+    s.src = src;
+    s.onerror = () => fail("could not load");
+    setTimeout(() => fail("timed out loading"), SHARD_TIMEOUT_MS);
+    document.head.appendChild(s);
+  }
+
+  const esc = (s) => String(s)
+    .replace(/&/g, "&amp;")
+    .replace(/"/g, "&quot;")
+    .replace(/</g, "&lt;")
+    .replace(/>/g, "&gt;");
+
+  function fmt(x) {
     if (x === null || x === undefined) return "—";
     if (typeof x === "number") return x.toFixed(4);
     return String(x);
-  }}
+  }
 
-  function pickCell(entry, metricKey, detail) {{
-    if (!entry || entry.status !== "ok") {{
+  function pickCell(entry, metricKey, detail) {
+    if (!entry || entry.status !== "ok") {
       const err = entry && entry.error ? entry.error : "missing";
-      return `<span class="fail">failed</span><div class="small">${{err}}</div>`;
-    }}
-    const split = entry[metricKey] || {{}};
-    if (detail === "summary") {{
+      return `<span class="fail">failed</span><div class="small">${err}</div>`;
+    }
+    const split = entry[metricKey] || {};
+    if (detail === "summary") {
       return `
-        <div><span class="badge">PR-AUC</span> <b>${{fmt(split.pr_auc)}}</b></div>
-        <div class="small">Recall @ train thr: <b>${{fmt(split.recall)}}</b> (FPR=${{fmt(split.fpr)}})</div>
+        <div><span class="badge">PR-AUC</span> <b>${fmt(split.pr_auc)}</b></div>
+        <div class="small">Recall @ train thr: <b>${fmt(split.recall)}</b> (FPR=${fmt(split.fpr)})</div>
       `;
-    }}
+    }
     return `
-      <div><span class="badge">PR-AUC</span> <b>${{fmt(split.pr_auc)}}</b></div>
-      <div class="small">Threshold used: <code>${{fmt(split.threshold_used ?? entry.train?.threshold_for_fpr)}}</code></div>
-      <div class="small">Recall: <b>${{fmt(split.recall)}}</b> • Precision: <b>${{fmt(split.precision)}}</b> • FPR: <b>${{fmt(split.fpr)}}</b></div>
-      <div class="small">ROC-AUC: <b>${{fmt(split.roc_auc)}}</b></div>
+      <div><span class="badge">PR-AUC</span> <b>${fmt(split.pr_auc)}</b></div>
+      <div class="small">Threshold used: <code>${fmt(split.threshold_used ?? entry.train?.threshold_for_fpr)}</code></div>
+      <div class="small">Recall: <b>${fmt(split.recall)}</b> • Precision: <b>${fmt(split.precision)}</b> • FPR: <b>${fmt(split.fpr)}</b></div>
+      <div class="small">ROC-AUC: <b>${fmt(split.roc_auc)}</b></div>
     `;
-  }}
-
-  function render() {{
+  }
+
+  // Overview columns: every label x model seen in the index.
+  const columns = [];
+  (function() {
+    const seen = {};
+    runs.forEach((e) => {
+      Object.keys(e.headline || {}).sort().forEach((lab) => {
+        Object.keys(e.headline[lab] || {}).sort().forEach((model) => {
+          const k = `${lab}\u0000${model}`;
+          if (!seen[k]) { seen[k] = 1; columns.push([lab, model]); }
+        });
+      });
+    });
+  })();
+
+  function renderOverview() {
     const metricKey = metricSel.value;
-    const detail = detailSel.value;
-    const runs = (window.__RUN_DATA__ && window.__RUN_DATA__.runs) || [];
-if (gotoSel && !gotoSel.dataset.ready) {{
-  const esc = (s) => String(s)
-    .replace(/&/g, "&amp;")
-    .replace(/"/g, "&quot;")
-    .replace(/</g, "&lt;")
-    .replace(/>/g, "&gt;");
-  const opts = ['<option value="" selected>Select a run…</option>']
-    .concat(runs.map((r) => {{
-      const v = r.run_id || "";
-      const safe = esc(v);
-      return `<option value="${{safe}}">${{safe}}</option>`;
-    }}));
-  gotoSel.innerHTML = opts.join("");
-  gotoSel.addEventListener("change", () => {{
-    const v = gotoSel.value;
-    if (!v) return;
-    const a = encodeURIComponent(v);
-    const el = document.getElementById(`run-${{a}}`);
-    if (el) el.scrollIntoView({{behavior: "smooth", block: "start"}});
-  }});
-  gotoSel.dataset.ready = "1";
-}}
-
-    content.innerHTML = "";
-
-    runs.forEach((r) => {{
-      const base = r.baselines && r.baselines.login_attempt;
-      const labels = base && base.labels ? base.labels : {{}};
-      const target = base && base.target_fpr;
-      const env = base && base.meta && base.meta.env ? base.meta.env : null;
-      const sig = r.signature || null;
-
-      const noteBits = [];
-      if (target !== null && target !== undefined) noteBits.push(`<span class="pill">Target FPR: <b>${{fmt(target)}}</b></span>`);
-      if (env && env.python) noteBits.push(`<span class="pill">Python: <b>${{env.python.split(" ")[0]}}</b></span>`);
-      if (env && env.platform) noteBits.push(`<span class="pill">Platform: <b>${{env.platform}}</b></span>`);if (sig && sig.config_hash) {{
-  noteBits.push(`<span class="pill" title="${{sig.config_hash}}">Config: <b>${{sig.config_hash.slice(0,8)}}</b></span>`);
-}} else {{
-  noteBits.push(`<span class="pill missing">Config: <b>—</b></span>`);
-}}
-if (sig && sig.github_sha) {{
-  noteBits.push(`<span class="pill" title="${{sig.github_sha}}">Code: <b>${{sig.github_sha.slice(0,8)}}</b></span>`);
-}} else {{
-  noteBits.push(`<span class="pill missing">Code: <b>(no git)</b></span>`);
-}}
-
-      const card = document.createElement("section");
-      card.className = "card";
-      card.innerHTML = `
-        <h2 id="run-${{encodeURIComponent(r.run_id || '')}}">Run: <code>${{r.run_id}}</code></h2>
-        <div class="small">Generated: ${{r.generated_at_utc || "—"}} • Timezone: ${{r.timezone || "—"}}</div>
-        <div class="kv">${{noteBits.join("")}}</div>
-      `;
-
-      const tbl = document.createElement("table");
-      const head = document.createElement("thead");
-      head.innerHTML = `<tr><th>Label</th><th>logreg</th><th>rf</th></tr>`;
-      tbl.appendChild(head);
+    const nPages = Math.max(1, Math.ceil(runs.length / pageSize));
+    page = Math.min(page, nPages - 1);
+    const rows = runs.slice(page * pageSize, (page + 1) * pageSize);
+
+    let html = `<table class="mini runs-table"><thead><tr><th>Run</th>`;
+    columns.forEach(([lab, model]) => { html += `<th>${esc(lab)}<br/><code>${esc(model)}</code></th>`; });
+    html += `<th></th></tr></thead><tbody>`;
+    rows.forEach((e) => {
+      const isOpen = opened.indexOf(e.run_id) >= 0;
+      html += `<tr class="${isOpen ? "sel" : ""}"><td><code>${esc(e.run_id)}</code>${e.n_notes ? ` <span class="warn" title="notes">!</span>` : ""}</td>`;
+      columns.forEach(([lab, model]) => {
+        const h = ((e.headline || {})[lab] || {})[model];
+        if (!h) html += `<td>—</td>`;
+        else if (h.status !== "ok") html += `<td><span class="fail">${esc(h.status)}</span></td>`;
+        else html += `<td>${fmt(h[metricKey])}</td>`;
+      });
+      html += `<td><button data-run="${esc(e.run_id)}">${isOpen ? "Close" : "Open"}</button></td></tr>`;
+    });
+    html += `</tbody></table>`;
+    runsTable.innerHTML = html;
+    runsTable.querySelectorAll("button[data-run]").forEach((b) => {
+      b.addEventListener("click", () => toggle(b.dataset.run));
+    });
+
+    pager.innerHTML = nPages > 1
+      ? `<button id="prev" ${page === 0 ? "disabled" : ""}>Prev</button><span class="small">Page ${page + 1} / ${nPages} • ${runs.length} runs</span><button id="next" ${page >= nPages - 1 ? "disabled" : ""}>Next</button>`
+      : `<span class="small">${runs.length} run(s)</span>`;
+    const prev = $("prev"), next = $("next");
+    if (prev) prev.addEventListener("click", () => { page -= 1; renderOverview(); });
+    if (next) next.addEventListener("click", () => { page += 1; renderOverview(); });
+  }
+
+  function runCard(r, metricKey, detail) {
+    const card = document.createElement("section");
+    card.className = "card";
+    if (r.__error) {
+      card.innerHTML = `<h2 id="run-${encodeURIComponent(r.run_id)}">Run: <code>${esc(r.run_id)}</code></h2><div class="fail">${esc(r.__error)}</div>`;
+      return card;
+    }
+    const base = r.baselines && r.baselines.login_attempt;
+    const labels = base && base.labels ? base.labels : {};
+    const target = base && base.target_fpr;
+    const env = base && base.meta && base.meta.env ? base.meta.env : null;
+    const sig = r.signature || null;
+
+    const noteBits = [];
+    if (target !== null && target !== undefined) noteBits.push(`<span class="pill">Target FPR: <b>${fmt(target)}</b></span>`);
+    if (env && env.python) noteBits.push(`<span class="pill">Python: <b>${env.python.split(" ")[0]}</b></span>`);
+    if (env && env.platform) noteBits.push(`<span class="pill">Platform: <b>${env.platform}</b></span>`);
+    if (sig && sig.config_hash) {
+      noteBits.push(`<span class="pill" title="${sig.config_hash}">Config: <b>${sig.config_hash.slice(0,8)}</b></span>`);
+    } else {
+      noteBits.push(`<span class="pill missing">Config: <b>—</b></span>`);
+    }
+    if (sig && sig.github_sha) {
+      noteBits.push(`<span class="pill" title="${sig.github_sha}">Code: <b>${sig.github_sha.slice(0,8)}</b></span>`);
+    } else {
+      noteBits.push(`<span class="pill missing">Code: <b>(no git)</b></span>`);
+    }
+
+    card.innerHTML = `
+      <h2 id="run-${encodeURIComponent(r.run_id || '')}">Run: <code>${r.run_id}</code></h2>
+      <div class="small">Generated: ${r.generated_at_utc || "—"} • Timezone: ${r.timezone || "—"}</div>
+      <div class="kv">${noteBits.join("")}</div>
+    `;
 
-      const body = document.createElement("tbody");
-      const labelNames = Object.keys(labels).sort();
-      if (labelNames.length === 0) {{
+    const tbl = document.createElement("table");
+    const head = document.createElement("thead");
+    head.innerHTML = `<tr><th>Label</th><th>logreg</th><th>rf</th></tr>`;
+    tbl.appendChild(head);
+
+    const body = document.createElement("tbody");
+    const labelNames = Object.keys(labels).sort();
+    if (labelNames.length === 0) {
+      const tr = document.createElement("tr");
+      tr.innerHTML = `<td colspan="3"><span class="fail">No baselines found</span><div class="small">Run may be pre-baselines or baselines failed.</div></td>`;
+      body.appendChild(tr);
+    } else {
+      labelNames.forEach((lab) => {
+        const byModel = labels[lab] || {};
         const tr = document.createElement("tr");
-        tr.innerHTML = `<td colspan="3"><span class="fail">No baselines found</span><div class="small">Run may be pre-baselines or baselines failed.</div></td>`;
+        tr.innerHTML = `
+          <td><b>${lab}</b></td>
+          <td>${pickCell(byModel.logreg, metricKey, detail)}</td>
+          <td>${pickCell(byModel.rf, metricKey, detail)}</td>
+        `;
         body.appendChild(tr);
-      }} else {{
-        labelNames.forEach((lab) => {{
-          const byModel = labels[lab] || {{}};
-          const tr = document.createElement("tr");
-          tr.innerHTML = `
-            <td><b>${{lab}}</b></td>
-            <td>${{pickCell(byModel.logreg, metricKey, detail)}}</td>
-            <td>${{pickCell(byModel.rf, metricKey, detail)}}</td>
-          `;
-          body.appendChild(tr);
-        }});
-      }}
-      tbl.appendChild(body);
-      card.appendChild(tbl);
-
-
-      // Diagnostics (Slices + Stability)
-      const ev = r.eval && r.eval.login_attempt ? r.eval.login_attempt : null;
-      if (ev) {{
-        const diag = document.createElement("div");
-        diag.className = "panel";
-        let html = `<h3>Diagnostics</h3>`;
-        if (ev.stability_summary && ev.stability_summary.rows && ev.stability_summary.rows.length) {{
-          const rows = ev.stability_summary.rows.slice(0);
-          html += `<div class="small">Primary truth split: <b>${{ev.stability_summary.primary_split || "user_holdout"}}</b></div>`;
-          html += `<table class="mini"><thead><tr><th>Label</th><th>Model</th><th>Holdout PR-AUC</th><th>Holdout Recall@thr</th><th>Time Recall@thr</th><th>ΔRecall (Hold-Time)</th></tr></thead><tbody>`;
-          rows.forEach((rr) => {{
-            html += `<tr><td><code>${{rr.label}}</code></td><td><code>${{rr.model}}</code></td><td>${{fmt(rr.holdout_pr_auc)}}</td><td>${{fmt(rr.holdout_recall)}}</td><td>${{fmt(rr.time_recall)}}</td><td>${{fmt(rr.delta_recall_hold_minus_time)}}</td></tr>`;
-          }});
-          html += `</tbody></table>`;
-          html += `<div class="small">For deeper breakdowns, see the slice report: <code>${{(ev.slices_report || "reports/eval_slices_login_attempt.md")}}</code></div>`;
-        }} else {{
-          html += `<div class="small"><span class="warn">Diagnostics not found</span> — run may have skipped evaluation or artifacts are missing.</div>`;
-        }}
-        if (ev.stability_report) {{
-          html += `<div class="small">Stability report path: <code>${{ev.stability_report}}</code></div>`;
-        }}
-        diag.innerHTML = html;
-        card.appendChild(diag);
-      }}
-
-      // Notes
-      if (r.notes && r.notes.length) {{
-        const n = document.createElement("div");
-        n.className = "small";
-        n.style.marginTop = "10px";
-        n.innerHTML = `<b>Notes:</b><ul>${{r.notes.map(x => `<li>${{x}}</li>`).join("")}}</ul>`;
-        card.appendChild(n);
-      }}
-
-      content.appendChild(card);
-    }});
-  }}
+      });
+    }
+    tbl.appendChild(body);
+    card.appendChild(tbl);
+
+    // Diagnostics (Slices + Stability)
+    const ev = r.eval && r.eval.login_attempt ? r.eval.login_attempt : null;
+    if (ev) {
+      const diag = document.createElement("div");
+      diag.className = "panel";
+      let html = `<h3>Diagnostics</h3>`;
+      if (ev.stability_summary && ev.stability_summary.rows && ev.stability_summary.rows.length) {
+        const rows = ev.stability_summary.rows.slice(0);
+        html += `<div class="small">Primary truth split: <b>${ev.stability_summary.primary_split || "user_holdout"}</b></div>`;
+        html += `<table class="mini"><thead><tr><th>Label</th><th>Model</th><th>Holdout PR-AUC</th><th>Holdout Recall@thr</th><th>Time Recall@thr</th><th>ΔRecall (Hold-Time)</th></tr></thead><tbody>`;
+        rows.forEach((rr) => {
+          html += `<tr><td><code>${rr.label}</code></td><td><code>${rr.model}</code></td><td>${fmt(rr.holdout_pr_auc)}</td><td>${fmt(rr.holdout_recall)}</td><td>${fmt(rr.time_recall)}</td><td>${fmt(rr.delta_recall_hold_minus_time)}</td></tr>`;
+        });
+        html += `</tbody></table>`;
+        html += `<div class="small">For deeper breakdowns, see the slice report: <code>${(ev.slices_report || "reports/eval_slices_login_attempt.md")}</code></div>`;
+      } else {
+        html += `<div class="small"><span class="warn">Diagnostics not found</span> — run may have skipped evaluation or artifacts are missing.</div>`;
+      }
+      if (ev.stability_report) {
+        html += `<div class="small">Stability report path: <code>${ev.stability_report}</code></div>`;
+      }
+      diag.innerHTML = html;
+      card.appendChild(diag);
+    }
+
+    // Notes
+    if (r.notes && r.notes.length) {
+      const n = document.createElement("div");
+      n.className = "small";
+      n.style.marginTop = "10px";
+      n.innerHTML = `<b>Notes:</b><ul>${r.notes.map(x => `<li>${x}</li>`).join("")}</ul>`;
+      card.appendChild(n);
+    }
+    return card;
+  }
+
+  function renderCards(scrollTo) {
+    const metricKey = metricSel.value;
+    const detail = detailSel.value;
+    content.innerHTML = "";
+    opened.forEach((rid) => {
+      if (!shards[rid]) {
+        const wait = document.createElement("section");
+        wait.className = "card small";
+        wait.textContent = `Loading ${rid}…`;
+        content.appendChild(wait);
+        loadShard(rid, () => scheduleCards(scrollTo));
+        return;
+      }
+      content.appendChild(runCard(shards[rid], metricKey, detail));
+    });
+    if (scrollTo && shards[scrollTo]) {
+      const el = document.getElementById(`run-${encodeURIComponent(scrollTo)}`);
+      if (el) el.scrollIntoView({behavior: "smooth", block: "start"});
+    }
+  }
+
+  // Several shards may finish together: re-render once for all of them.
+  let cardsQueued = false;
+  function scheduleCards(scrollTo) {
+    if (cardsQueued) return;
+    cardsQueued = true;
+    setTimeout(() => { cardsQueued = false; renderCards(scrollTo); }, 0);
+  }
+
+  function toggle(rid) {
+    const i = opened.indexOf(rid);
+    if (i >= 0) opened.splice(i, 1); else opened.push(rid);
+    renderOverview();
+    renderCards(i >= 0 ? null : rid);
+  }
+
+  gotoSel.innerHTML = ['<option value="" selected>Select a run…</option>']
+    .concat(runs.map((e) => `<option value="${esc(e.run_id)}">${esc(e.run_id)}</option>`))
+    .join("");
+  gotoSel.addEventListener("change", () => {
+    const v = gotoSel.value;
+    if (!v || !byId[v]) return;
+    page = Math.floor(runs.indexOf(byId[v]) / pageSize);
+    if (opened.indexOf(v) < 0) opened.push(v);
+    renderOverview();
+    renderCards(v);
+  });
+
+  function render() {
+    renderOverview();
+    renderCards(null);
+  }
 
   metricSel.addEventListener("change", render);
   detailSel.addEventListener("change", render);
   render();
-}})();
+})();
 """
-    # Write outputs
-    index_path.write_text(index_html, encoding="utf-8")
-    css_path.write_text(css, encoding="utf-8")
-    app_path.write_text(app_js, encoding="utf-8")
-
-    # Add small readme
-    (out_dir/"README.txt").write_text(
-        "Inkswarm DetectLab — MVP Results Viewer\n\n"
-        "Open index.html in a browser.\n"
-        "This bundle is self-contained (no server required).\n",
-        encoding="utf-8"
-    )
-
-    return out_dir
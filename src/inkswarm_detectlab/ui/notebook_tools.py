@@ -4,11 +4,13 @@ These helpers are stdlib-only and geared toward quick iteration:
 - locate a run folder by run_id
 - print common artifact paths
 - tail log files for step visibility
+- query the run index (runs/.run_index.sqlite) across runs
 """
 
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any, Optional
 
 
 def find_run_dir(root: str | Path, run_id: str) -> Path:
@@ -57,3 +59,27 @@ def tail_text(path: str | Path, n_lines: int = 200) -> str:
         return "\n".join(lines[-n_lines:])
     except Exception as e:  # pragma: no cover
         return f"<error reading {p}: {e}>"
+
+
+def _runs_dir_for(root: str | Path) -> Path:
+    root_p = Path(root)
+    return root_p / "runs" if (root_p / "runs").is_dir() else root_p
+
+
+def best_runs(
+    root: str | Path,
+    *,
+    metric: str = "recall",
+    model: str = "rf",
+    split: str = "user_holdout",
+    label: Optional[str] = None,
+    last_n: Optional[int] = 100,
+    limit: int = 10,
+) -> list[dict[str, Any]]:
+    """Top runs by one metric from the run index (root = project root or runs dir).
+
+    Example: best_runs(".", metric="recall", model="rf", split="user_holdout", last_n=100)
+    """
+    from ..io.run_index import best_runs as _best_runs
+
+    return _best_runs(_runs_dir_for(root), metric=metric, model=model, split=split, label=label, last_n=last_n, limit=limit)
@@ -9,7 +9,13 @@ Notebook step wrappers therefore need a consistent way to decide:
 - or should we compute (possibly forcing overwrites)?
 
 This module provides a manifest-first policy:
-- prefer reusing when manifest["steps"][<step_name>] matches current config_hash AND expected outputs exist
+- up-to-date check (Make/Bazel-style): each step declares its inputs in STEP_INPUTS
+  (the config subtrees it reads + upstream manifest artifact content hashes). When
+  manifest["steps"][<step_name>] recorded an input fingerprint, the step is reused
+  exactly when the fingerprint still matches and outputs exist, and recomputed
+  (overwriting stale outputs) when it does not.
+- otherwise (older step records): reuse when the step record matches the current
+  config_hash AND expected outputs exist
 - fall back to disk existence checks when manifest is missing or incomplete
 """
 
@@ -19,9 +25,88 @@ from typing import Any, Dict, Optional, Tuple
 
 from ..io.manifest import read_manifest
 from ..io.paths import manifest_path
+from ..utils.hashing import stable_hash_dict
 from .step_contract import ReuseDecision
 
 
+@dataclass(frozen=True)
+class StepInputSpec:
+    """Declared inputs of a step: dotted config paths + upstream manifest artifact keys."""
+
+    config: Tuple[str, ...]
+    artifacts: Tuple[str, ...] = ()
+
+
+_DATASET_LOGIN = tuple(f"dataset/login_attempt/{s}" for s in ("train", "time_eval", "user_holdout"))
+_BASELINE_ARTIFACTS = tuple(f"models/login_attempt/baselines/{k}" for k in ("metrics", "report", "scores"))
+_EVAL_ARTIFACTS = tuple(
+    f"reports/eval_{kind}_login_attempt{sfx}" for kind in ("slices", "stability") for sfx in ("", "_json")
+)
+
+STEP_INPUTS: Dict[str, StepInputSpec] = {
+    "dataset": StepInputSpec(config=("run.schema_version", "run.timezone", "run.seed", "synthetic", "dataset")),
+    "features": StepInputSpec(
+        config=(
+            "run.schema_version",
+            "run.timezone",
+            "run.seed",
+            "dataset.build.canonical_sort_keys",
+            "features.login_attempt",
+            "features.dtype_policy",
+            "features.unique_counts",
+        ),
+        artifacts=("raw/login_attempt", "raw/checkout_attempt") + _DATASET_LOGIN,
+    ),
+    "baselines": StepInputSpec(
+        config=("run.seed", "baselines.login_attempt", "features.dtype_policy"),
+        artifacts=("features/login_attempt/features",),
+    ),
+    "eval": StepInputSpec(
+        config=("baselines.login_attempt.models", "baselines.login_attempt.target_fpr"),
+        artifacts=("features/login_attempt/features",) + _BASELINE_ARTIFACTS,
+    ),
+    "export": StepInputSpec(config=("run.timezone",), artifacts=_BASELINE_ARTIFACTS + _EVAL_ARTIFACTS),
+}
+
+
+def _config_value(cfg: Any, dotted: str) -> Any:
+    cur = cfg
+    for part in dotted.split("."):
+        cur = cur.get(part) if isinstance(cur, dict) else getattr(cur, part, None)
+        if cur is None:
+            return None
+    dump = getattr(cur, "model_dump", None)
+    return dump(mode="json") if callable(dump) else cur
+
+
+def step_input_fingerprint(*, run_dir: Path, cfg: Any, step_name: str) -> Dict[str, Any]:
+    """Fingerprint of a step's declared inputs (see STEP_INPUTS).
+
+    - config: sha256 per declared config subtree (so unrelated config edits do not count)
+    - artifacts: manifest["artifacts"][key]["content_hash"] per upstream artifact (None if absent)
+    - digest: sha256 over both
+    """
+    spec = STEP_INPUTS[step_name]
+    mpath = manifest_path(Path(run_dir))
+    try:
+        manifest = read_manifest(mpath) if mpath.exists() else {}
+    except Exception:  # noqa: BLE001
+        manifest = {}
+    arts = manifest.get("artifacts") if isinstance(manifest.get("artifacts"), dict) else {}
+
+    config = {k: stable_hash_dict({"value": _config_value(cfg, k)}) for k in spec.config}
+    artifacts = {k: (arts.get(k) or {}).get("content_hash") if isinstance(arts.get(k), dict) else None for k in spec.artifacts}
+    return {"digest": stable_hash_dict({"config": config, "artifacts": artifacts}), "config": config, "artifacts": artifacts}
+
+
+def _changed_inputs(prev: Dict[str, Any], cur: Dict[str, Any]) -> list[str]:
+    changed: list[str] = []
+    for kind, label in (("config", "config:"), ("artifacts", "")):
+        p, c = prev.get(kind) or {}, cur.get(kind) or {}
+        changed += [f"{label}{k}" for k in sorted(set(p) | set(c)) if p.get(k) != c.get(k)]
+    return changed
+
+
 def _outputs_exist(expected: Dict[str, Path]) -> Tuple[bool, list[str]]:
     missing: list[str] = []
     for k, p in expected.items():
@@ -52,11 +137,15 @@ def decide_reuse(
     expected_outputs: Dict[str, Path],
     reuse_if_exists: bool,
     force: bool,
+    current_inputs_fingerprint: Optional[Dict[str, Any]] = None,
 ) -> ReuseDecision:
     """Return a ReuseDecision describing compute vs reuse vs skipped.
 
     NOTE:
-    - This does not inspect the *contents* of artifacts; only presence + fingerprint match.
+    - With `current_inputs_fingerprint` (see `step_input_fingerprint`) and a step record that
+      carries one, the decision is an up-to-date check: reuse iff the fingerprints match and
+      outputs exist; otherwise compute with `stale=True` when outputs exist (callers overwrite).
+    - Without fingerprints this only checks presence + whole-config hash match.
     - Wrappers may still choose to do additional checks (e.g., model discovery).
     """
     if force:
@@ -93,6 +182,31 @@ def decide_reuse(
         manifest = {}
 
     step = _get_manifest_step(manifest, step_name)
+    prev_fp = (step.get("inputs") or {}).get("fingerprint") if step and isinstance(step.get("inputs"), dict) else None
+    if current_inputs_fingerprint and isinstance(prev_fp, dict) and prev_fp.get("digest"):
+        if prev_fp["digest"] == current_inputs_fingerprint.get("digest"):
+            if ok_outputs:
+                return ReuseDecision(
+                    mode="reuse",
+                    reason="Up to date: declared inputs (config subtrees + upstream content hashes) unchanged.",
+                    used_manifest=True,
+                    forced=False,
+                )
+            return ReuseDecision(
+                mode="compute",
+                reason=f"Missing outputs on disk: {', '.join(missing)}",
+                used_manifest=True,
+                forced=False,
+            )
+        changed = _changed_inputs(prev_fp, current_inputs_fingerprint)
+        return ReuseDecision(
+            mode="compute",
+            reason=f"Inputs changed since last run: {', '.join(changed) or 'fingerprint'}.",
+            used_manifest=True,
+            forced=False,
+            stale=ok_outputs,
+        )
+
     if step and isinstance(step.get("inputs"), dict):
         prev_hash = step["inputs"].get("config_hash")
         if prev_hash == current_config_hash and ok_outputs:
@@ -27,6 +27,8 @@ class ReuseDecision:
     reason: str
     used_manifest: bool = False
     forced: bool = False
+    # compute over existing outputs whose inputs changed (wrappers must overwrite)
+    stale: bool = False
 
 
 @dataclass(frozen=True)
@@ -36,6 +38,8 @@ class StepInputs:
     config_hash: str
     params: Dict[str, Any] = field(default_factory=dict)
     toggles: Dict[str, Any] = field(default_factory=dict)
+    # declared-input fingerprint (reuse_policy.step_input_fingerprint); drives up-to-date checks
+    fingerprint: Dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass(frozen=True)
@@ -81,7 +81,7 @@ from ..mvp.handover import write_mvp_handover
 from ..reports.exec_summary import write_exec_summary
 
 from .steps import StepRecorder
-from .reuse_policy import decide_reuse
+from .reuse_policy import decide_reuse, step_input_fingerprint
 
 from .step_contract import (
     StepResult,
@@ -95,7 +95,14 @@ from .step_contract import (
 
 
 
-def _mk_inputs(cfg_path: Path, cfg: Any, run_id: str, params: Dict[str, Any] | None = None, toggles: Dict[str, Any] | None = None) -> StepInputs:
+def _mk_inputs(
+    cfg_path: Path,
+    cfg: Any,
+    run_id: str,
+    params: Dict[str, Any] | None = None,
+    toggles: Dict[str, Any] | None = None,
+    fingerprint: Dict[str, Any] | None = None,
+) -> StepInputs:
     cfg_hash, _ = _config_fingerprint(cfg)
     return StepInputs(
         cfg_path=str(cfg_path),
@@ -103,6 +110,7 @@ def _mk_inputs(cfg_path: Path, cfg: Any, run_id: str, params: Dict[str, Any] | N
         config_hash=cfg_hash,
         params=params or {},
         toggles=toggles or {},
+        fingerprint=fingerprint or {},
     )
 
 
@@ -223,6 +231,7 @@ def step_dataset(
         run_id,
         params={"event": "login_attempt"},
         toggles={"reuse_if_exists": reuse_if_exists, "force": force},
+        fingerprint=step_input_fingerprint(run_dir=rdir, cfg=cfg, step_name="dataset"),
     )
 
     raw_login = raw_table_basepath(rdir, "login_attempt").with_suffix(".parquet")
@@ -247,7 +256,9 @@ def step_dataset(
         expected_outputs={k: Path(v) for k, v in expected.items()},
         reuse_if_exists=reuse_if_exists,
         force=force,
+        current_inputs_fingerprint=inputs.fingerprint,
     )
+    redo = force or dec.stale
     if dec.mode == "reuse":
         step = StepResult(
             name="dataset",
@@ -268,7 +279,7 @@ def step_dataset(
     step = StepResult(
         name="dataset",
         status="ok",
-        decision=ReuseDecision(mode="compute", reason="Generated raw+dataset artifacts via pipeline.run_all(...).", used_manifest=dec.used_manifest, forced=force),
+        decision=ReuseDecision(mode="compute", reason="Generated raw+dataset artifacts via pipeline.run_all(...).", used_manifest=dec.used_manifest, forced=redo, stale=dec.stale),
         inputs=inputs,
         outputs=_artifact_map({k: Path(v) for k, v in expected.items()}),
     )
@@ -320,6 +331,7 @@ def step_features(
             "use_cache": use_cache_final,
             "write_cache": write_cache_final,
         },
+        fingerprint=step_input_fingerprint(run_dir=rdir, cfg=cfg, step_name="features"),
     )
 
     feat_path = (rdir / "features" / "login_attempt" / "features").with_suffix(".parquet")
@@ -332,7 +344,9 @@ def step_features(
         expected_outputs={k: Path(v) for k, v in expected.items()},
         reuse_if_exists=reuse_if_exists,
         force=force,
+        current_inputs_fingerprint=inputs.fingerprint,
     )
+    redo = force or dec.stale
     if dec.mode == "reuse":
         step = StepResult(
             name="features",
@@ -347,7 +361,7 @@ def step_features(
     # Attempt shared-cache restore before compute (only makes sense when outputs are missing)
     cache_hit = False
     cache_key = None
-    if use_cache and not force:
+    if use_cache and not redo:
         cache_info = try_restore_feature_artifacts(cfg, rdir, force_rebuild=False)
         cache_hit = bool(getattr(cache_info, "is_hit", False))
         cache_key = getattr(cache_info, "cache_key", None)
@@ -366,9 +380,9 @@ def step_features(
     # Compute features
     if rec:
         with rec.step("build_features", details={"run_id": run_id, "force": force, "use_cache": use_cache}):
-            build_login_features_for_run(cfg, run_id=run_id, force=force)
+            build_login_features_for_run(cfg, run_id=run_id, force=redo)
     else:
-        build_login_features_for_run(cfg, run_id=run_id, force=force)
+        build_login_features_for_run(cfg, run_id=run_id, force=redo)
 
     if write_cache and use_cache:
         save_feature_artifacts_to_cache(cfg, rdir)
@@ -376,7 +390,7 @@ def step_features(
     step = StepResult(
         name="features",
         status="ok",
-        decision=ReuseDecision(mode="compute", reason="Built features via features.runner.build_login_features_for_run(...).", used_manifest=dec.used_manifest, forced=force),
+        decision=ReuseDecision(mode="compute", reason="Built features via features.runner.build_login_features_for_run(...).", used_manifest=dec.used_manifest, forced=redo, stale=dec.stale),
         inputs=inputs,
         outputs=_artifact_map(expected),
         summary={"cache_hit": cache_hit, "cache_key": cache_key},
@@ -412,6 +426,7 @@ def step_baselines(
         run_id,
         params={"event": "login_attempt"},
         toggles={"reuse_if_exists": reuse_if_exists, "force": force},
+        fingerprint=step_input_fingerprint(run_dir=rdir, cfg=cfg, step_name="baselines"),
     )
 
     out_dir = rdir / "models" / "login_attempt" / "baselines"
@@ -425,7 +440,9 @@ def step_baselines(
         expected_outputs={k: Path(v) for k, v in expected.items()},
         reuse_if_exists=reuse_if_exists,
         force=force,
+        current_inputs_fingerprint=inputs.fingerprint,
     )
+    redo = force or dec.stale
 
     present, metrics_path0 = _baselines_present(rdir)
     if dec.mode == "reuse" and present:
@@ -448,13 +465,13 @@ def step_baselines(
 
     # If manifest/disk suggest reuse but baseline presence check failed, compute instead.
     if dec.mode == "reuse" and not present:
-        dec = ReuseDecision(mode="compute", reason="Baseline presence check failed (metrics and at least one .joblib required).", used_manifest=dec.used_manifest, forced=force)
+        dec = ReuseDecision(mode="compute", reason="Baseline presence check failed (metrics and at least one .joblib required).", used_manifest=dec.used_manifest, forced=redo, stale=dec.stale)
 
     if rec:
         with rec.step("train_baselines", details={"run_id": run_id, "force": force}):
-            run_login_baselines_for_run(cfg, run_id=run_id, force=force, cfg_path=cfg_path)
+            run_login_baselines_for_run(cfg, run_id=run_id, force=redo, cfg_path=cfg_path)
     else:
-        run_login_baselines_for_run(cfg, run_id=run_id, force=force, cfg_path=cfg_path)
+        run_login_baselines_for_run(cfg, run_id=run_id, force=redo, cfg_path=cfg_path)
 
     present2, metrics_path2 = _baselines_present(rdir)
     status = "ok" if present2 else "partial"
@@ -468,7 +485,7 @@ def step_baselines(
     step = StepResult(
         name="baselines",
         status=status,
-        decision=ReuseDecision(mode="compute", reason="Trained baselines via models.runner.run_login_baselines_for_run(...).", used_manifest=dec.used_manifest, forced=force),
+        decision=ReuseDecision(mode="compute", reason="Trained baselines via models.runner.run_login_baselines_for_run(...).", used_manifest=dec.used_manifest, forced=redo, stale=dec.stale),
         inputs=inputs,
         outputs=_artifact_map(expected),
         summary=summary2,
@@ -508,6 +525,7 @@ def step_eval(
         run_id,
         params={"event": "login_attempt"},
         toggles={"reuse_if_exists": reuse_if_exists, "force": force},
+        fingerprint=step_input_fingerprint(run_dir=rdir, cfg=cfg, step_name="eval"),
     )
 
     out_reports = rdir / "reports"
@@ -526,7 +544,9 @@ def step_eval(
         expected_outputs={k: Path(v) for k, v in expected.items()},
         reuse_if_exists=reuse_if_exists,
         force=force,
+        current_inputs_fingerprint=inputs.fingerprint,
     )
+    redo = force or dec.stale
     if dec.mode == "reuse" and _eval_present(rdir):
         step = StepResult(
             name="eval",
@@ -540,9 +560,9 @@ def step_eval(
 
     if rec:
         with rec.step("eval", details={"run_id": run_id, "force": force}):
-            out = run_login_eval_for_run(cfg, run_id=run_id, force=force)
+            out = run_login_eval_for_run(cfg, run_id=run_id, force=redo)
     else:
-        out = run_login_eval_for_run(cfg, run_id=run_id, force=force)
+        out = run_login_eval_for_run(cfg, run_id=run_id, force=redo)
 
     status = getattr(out, "status", "ok") if out is not None else "partial"
     notes = list(getattr(out, "notes", []) or []) if out is not None else ["Eval returned no outputs (unexpected)."]
@@ -550,7 +570,7 @@ def step_eval(
     step = StepResult(
         name="eval",
         status=str(status),
-        decision=ReuseDecision(mode="compute", reason="Ran eval via eval.runner.run_login_eval_for_run(...).", used_manifest=dec.used_manifest, forced=force),
+        decision=ReuseDecision(mode="compute", reason="Ran eval via eval.runner.run_login_eval_for_run(...).", used_manifest=dec.used_manifest, forced=redo, stale=dec.stale),
         inputs=inputs,
         outputs=_artifact_map(expected),
         notes=notes,
@@ -587,6 +607,7 @@ def step_export(
         run_id,
         params={},
         toggles={"reuse_if_exists": reuse_if_exists, "force": force},
+        fingerprint=step_input_fingerprint(run_dir=rdir, cfg=cfg, step_name="export"),
     )
 
     share_dir = rdir / "share"
@@ -606,7 +627,9 @@ def step_export(
         expected_outputs={k: Path(v) for k, v in expected.items()},
         reuse_if_exists=reuse_if_exists,
         force=force,
+        current_inputs_fingerprint=inputs.fingerprint,
     )
+    redo = force or dec.stale
     if dec.mode == "reuse" and _share_present(rdir):
         step = StepResult(
             name="export",
@@ -620,7 +643,7 @@ def step_export(
 
     def _do() -> None:
         # 5A) UI summary (used as input to handover)
-        ui_summary_path = write_ui_summary(cfg, run_id=run_id, force=force)
+        ui_summary_path = write_ui_summary(cfg, run_id=run_id, force=redo)
         try:
             summary: dict[str, Any] = _read_json(ui_summary_path)
         except Exception as e:  # noqa: BLE001
@@ -641,7 +664,7 @@ def step_export(
         # 5C) UI bundle (writes into runs/<run_id>/share/reports/...)
         ui_out_dir = (rdir / "share" / "reports")
         ui_out_dir.mkdir(parents=True, exist_ok=True)
-        ui_bundle_dir = export_ui_bundle(cfg, run_ids=[run_id], out_dir=ui_out_dir, force=force)
+        ui_bundle_dir = export_ui_bundle(cfg, run_ids=[run_id], out_dir=ui_out_dir, force=redo, refresh_summaries=False)
         summary["artifacts"]["ui_bundle_dir"] = str(ui_bundle_dir)
 
         # 5D) Handover markdown (runs/<run_id>/reports/mvp_handover.md)
@@ -654,7 +677,7 @@ def step_export(
 
         # 5E) Evidence bundle (optional) — best-effort, never fails the step
         try:
-            export_evidence_bundle(run_dir=rdir, force=force)
+            export_evidence_bundle(run_dir=rdir, force=redo)
         except TypeError:
             export_evidence_bundle(run_dir=rdir)
         except Exception:  # noqa: BLE001
@@ -670,7 +693,7 @@ def step_export(
     step = StepResult(
         name="export",
         status="ok",
-        decision=ReuseDecision(mode="compute", reason="Exported share bundle via ui.* + share.evidence.* helpers.", used_manifest=dec.used_manifest, forced=force),
+        decision=ReuseDecision(mode="compute", reason="Exported share bundle via ui.* + share.evidence.* helpers.", used_manifest=dec.used_manifest, forced=redo, stale=dec.stale),
         inputs=inputs,
         outputs=_artifact_map(expected),
     )
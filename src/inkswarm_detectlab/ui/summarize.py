@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from dataclasses import dataclass
 from pathlib import Path
@@ -9,6 +10,7 @@ from datetime import datetime, timezone
 from ..config import AppConfig
 from ..io.paths import run_dir as run_dir_for
 from ..io.manifest import read_manifest
+from ..utils.perf import profiled, stage_note
 
 
 UI_SCHEMA_VERSION = 1
@@ -22,16 +24,7 @@ def _read_json(path: Path) -> dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def build_ui_summary(cfg: AppConfig, *, run_id: str) -> dict[str, Any]:
-    """Build a stable UI summary for a given run.
-
-    This is intentionally lightweight:
-    - Reads run manifest (if present)
-    - Reads baseline metrics/report for login_attempt (if present)
-
-    It does NOT read raw/dataset/features tables (keeps it fast + avoids parquet deps for UI generation).
-    """
-    rdir = run_dir_for(cfg.paths.runs_dir, run_id)
+def _manifest_section(rdir: Path, cfg_timezone: Any) -> dict[str, Any]:
     mpath = rdir / "manifest.json"
     manifest: dict[str, Any] = {}
     if mpath.exists():
@@ -41,30 +34,25 @@ def build_ui_summary(cfg: AppConfig, *, run_id: str) -> dict[str, Any]:
             # keep best-effort; UI should still render even if manifest is damaged
             manifest = {}
 
-    out: dict[str, Any] = {
-        "schema_version": UI_SCHEMA_VERSION,
-        "generated_at_utc": _now_utc_iso(),
-        "run_id": run_id,
-        "timezone": manifest.get("timezone", getattr(cfg, "timezone", None)),
-        "signature": {},
-        "artifacts": {},
-        "baselines": {},
-        "eval": {},
-        "notes": [],
+    # Run signature (helps compare runs without reading logs)
+    return {
+        "timezone": manifest.get("timezone", cfg_timezone),
+        "signature": {
+            "config_hash": manifest.get("config_hash"),
+            "github_sha": (manifest.get("code") or {}).get("github_sha"),
+            "seed": manifest.get("seed"),
+            "schema_version": manifest.get("schema_version"),
+        },
     }
 
 
-    # Run signature (helps compare runs without reading logs)
-    out["signature"] = {
-        "config_hash": manifest.get("config_hash"),
-        "github_sha": (manifest.get("code") or {}).get("github_sha"),
-        "seed": manifest.get("seed"),
-        "schema_version": manifest.get("schema_version"),
-    }
+def _baselines_section(rdir: Path) -> dict[str, Any]:
     # Baselines (login_attempt)
+    out: dict[str, Any] = {"baselines": {}, "artifacts": {}, "notes": []}
     metrics_path = rdir / "models" / "login_attempt" / "baselines" / "metrics.json"
     report_path = rdir / "models" / "login_attempt" / "baselines" / "report.md"
     user_report_path = rdir / "reports" / "baselines_login_attempt.md"
+    scores_path = rdir / "models" / "login_attempt" / "baselines" / "scores.parquet"
     log_path = rdir / "logs" / "baselines.log"
     if metrics_path.exists():
         try:
@@ -78,6 +66,7 @@ def build_ui_summary(cfg: AppConfig, *, run_id: str) -> dict[str, Any]:
                     "metrics_json": str(metrics_path),
                     "report_md": str(user_report_path) if user_report_path.exists() else (str(report_path) if report_path.exists() else None),
                     "baselines_log": str(log_path) if log_path.exists() else None,
+                    "scores_parquet": str(scores_path) if scores_path.exists() else None,
                 },
             }
             out["artifacts"]["baseline_report_md"] = str(user_report_path) if user_report_path.exists() else (str(report_path) if report_path.exists() else None)
@@ -87,9 +76,12 @@ def build_ui_summary(cfg: AppConfig, *, run_id: str) -> dict[str, Any]:
             out["notes"].append(f"Failed to read baselines metrics: {e}")
     else:
         out["notes"].append("Baselines metrics not found (run may be pre-baselines or baselines failed).")
+    return out
 
 
+def _eval_section(rdir: Path) -> dict[str, Any]:
     # Eval diagnostics (login_attempt) — derived from on-disk reports (no parquet read here)
+    out: dict[str, Any] = {"eval": {}, "notes": []}
     slices_md = rdir / "reports" / "eval_slices_login_attempt.md"
     stab_md = rdir / "reports" / "eval_stability_login_attempt.md"
     stab_json = rdir / "reports" / "eval_stability_login_attempt.json"
@@ -125,24 +117,210 @@ def build_ui_summary(cfg: AppConfig, *, run_id: str) -> dict[str, Any]:
                 }
             except Exception as e:
                 out["notes"].append(f"Failed to read eval stability JSON: {e}")
+    return out
 
+
+def _run_summary_section(rdir: Path) -> dict[str, Any]:
     # Summary report (optional)
     summary_path = rdir / "reports" / "summary.md"
-    if summary_path.exists():
-        out["artifacts"]["run_summary_md"] = str(summary_path)
+    return {"artifacts": {"run_summary_md": str(summary_path)} if summary_path.exists() else {}}
+
+
+# Section name -> run-relative input files. Files whose content the section reads are
+# fingerprinted by content; the rest only by existence.
+_SECTION_INPUTS: dict[str, dict[str, list[str]]] = {
+    "manifest": {"content": ["manifest.json"], "exists": []},
+    "baselines": {
+        "content": ["models/login_attempt/baselines/metrics.json"],
+        "exists": [
+            "models/login_attempt/baselines/report.md",
+            "reports/baselines_login_attempt.md",
+            "models/login_attempt/baselines/scores.parquet",
+            "logs/baselines.log",
+        ],
+    },
+    "eval": {
+        "content": ["reports/eval_stability_login_attempt.json"],
+        "exists": ["reports/eval_slices_login_attempt.md", "reports/eval_stability_login_attempt.md"],
+    },
+    "run_summary": {"content": [], "exists": ["reports/summary.md"]},
+}
+
+UI_SUMMARY_MEMO_NAME = ".ui_summary_memo.json"
+_MEMO_VERSION = 1
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _fingerprint(path: Path, *, content: bool, prev: Optional[dict[str, Any]]) -> dict[str, Any]:
+    """Input fingerprint: existence, plus (size, mtime_ns, sha256) for content inputs.
+
+    The sha256 is only recomputed when size/mtime changed, so a rewrite with identical
+    bytes (re-run, copy) still counts as unchanged.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return {"exists": False}
+    if not content:
+        return {"exists": True}
+    fp: dict[str, Any] = {"exists": True, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if prev and prev.get("size") == st.st_size and prev.get("mtime_ns") == st.st_mtime_ns and prev.get("sha256"):
+        fp["sha256"] = prev["sha256"]
+    else:
+        fp["sha256"] = _sha256_file(path)
+    return fp
+
+
+def _same_inputs(a: dict[str, Any], b: dict[str, Any]) -> bool:
+    if a.keys() != b.keys():
+        return False
+    return all(a[k].get("exists") == b[k].get("exists") and a[k].get("sha256") == b[k].get("sha256") for k in a)
+
+
+# Parsed memos keyed by memo path -> ((size, mtime_ns), memo); saves re-parsing in long sessions.
+_MEMO_CACHE: dict[str, tuple[tuple[int, int], dict[str, Any]]] = {}
+
+
+def _load_memo(path: Path, rdir: Path) -> dict[str, Any]:
+    try:
+        st = path.stat()
+        key = (st.st_size, st.st_mtime_ns)
+        hit = _MEMO_CACHE.get(str(path))
+        if hit is not None and hit[0] == key:
+            memo = hit[1]
+        else:
+            memo = _read_json(path)
+            _MEMO_CACHE[str(path)] = (key, memo)
+    except (OSError, ValueError):
+        return {}
+    if memo.get("version") != _MEMO_VERSION or memo.get("run_dir") != str(rdir):
+        return {}
+    return memo
 
+
+def build_ui_summary(cfg: AppConfig, *, run_id: str, incremental: bool = True) -> dict[str, Any]:
+    """Build a stable UI summary for a given run.
+
+    This is intentionally lightweight:
+    - Reads run manifest (if present)
+    - Reads baseline metrics/report for login_attempt (if present)
+
+    It does NOT read raw/dataset/features tables (keeps it fast + avoids parquet deps for UI generation).
+
+    With `incremental` (default), each section (manifest, baselines, eval, run summary)
+    is memoized in runs/<run_id>/ui/.ui_summary_memo.json against fingerprints of its
+    input files; only sections whose inputs changed are rebuilt. `generated_at_utc`
+    is kept when nothing changed, so an unchanged run yields an identical summary.
+    Reused sections share structure with an in-process memo cache: treat the
+    returned dict as read-only (copy before mutating).
+    """
+    rdir = run_dir_for(cfg.paths.runs_dir, run_id)
+    memo_path = rdir / "ui" / UI_SUMMARY_MEMO_NAME
+    memo = _load_memo(memo_path, rdir) if incremental else {}
+    prev_sections: dict[str, Any] = memo.get("sections", {})
+    cfg_timezone = getattr(cfg, "timezone", None)
+
+    builders = {
+        "manifest": lambda: _manifest_section(rdir, cfg_timezone),
+        "baselines": lambda: _baselines_section(rdir),
+        "eval": lambda: _eval_section(rdir),
+        "run_summary": lambda: _run_summary_section(rdir),
+    }
+    sections: dict[str, Any] = {}
+    rebuilt: list[str] = []
+    for name, spec in _SECTION_INPUTS.items():
+        prev = prev_sections.get(name) or {}
+        prev_inputs = prev.get("inputs") or {}
+        inputs = {
+            rel: _fingerprint(rdir / rel, content=kind == "content", prev=prev_inputs.get(rel))
+            for kind in ("content", "exists")
+            for rel in spec[kind]
+        }
+        params = {"cfg_timezone": cfg_timezone} if name == "manifest" else {}
+        if prev and prev.get("params") == params and _same_inputs(inputs, prev_inputs):
+            value = prev["value"]
+        else:
+            value = builders[name]()
+            rebuilt.append(name)
+        sections[name] = {"inputs": inputs, "params": params, "value": value}
+
+    generated = memo.get("generated_at_utc") if (memo and not rebuilt) else None
+    out: dict[str, Any] = {
+        "schema_version": UI_SCHEMA_VERSION,
+        "generated_at_utc": generated or _now_utc_iso(),
+        "run_id": run_id,
+        "timezone": sections["manifest"]["value"]["timezone"],
+        "signature": sections["manifest"]["value"]["signature"],
+        "artifacts": {**sections["baselines"]["value"]["artifacts"], **sections["run_summary"]["value"]["artifacts"]},
+        "baselines": sections["baselines"]["value"]["baselines"],
+        "eval": sections["eval"]["value"]["eval"],
+        "notes": sections["baselines"]["value"]["notes"] + sections["eval"]["value"]["notes"],
+    }
+
+    if incremental and (rebuilt or memo.get("sections") != sections):
+        new_memo = {
+            "version": _MEMO_VERSION,
+            "run_dir": str(rdir),
+            "generated_at_utc": out["generated_at_utc"],
+            "rebuilt": rebuilt,
+            "sections": sections,
+        }
+        try:
+            memo_path.parent.mkdir(parents=True, exist_ok=True)
+            memo_path.write_text(json.dumps(new_memo, sort_keys=True) + "\n", encoding="utf-8")
+            _MEMO_CACHE.pop(str(memo_path), None)
+        except OSError:
+            pass  # memo is an optimization only (e.g. read-only runs dir)
     return out
 
 
+def _ui_summary_path(cfg: AppConfig, run_id: str) -> Path:
+    return run_dir_for(cfg.paths.runs_dir, run_id) / "ui" / "ui_summary.json"
+
+
+def _write_ui_summary_payload(out_path: Path, payload: dict[str, Any]) -> None:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    text = json.dumps(payload, indent=2, sort_keys=True) + "\n"
+    try:
+        if out_path.read_text(encoding="utf-8") == text:
+            return  # unchanged: keep mtime so downstream stat caches stay valid
+    except OSError:
+        pass
+    out_path.write_text(text, encoding="utf-8")
+
+
+@profiled("write_ui_summary")
 def write_ui_summary(cfg: AppConfig, *, run_id: str, force: bool = False) -> Path:
     """Write runs/<run_id>/ui/ui_summary.json"""
-    rdir = run_dir_for(cfg.paths.runs_dir, run_id)
-    ui_dir = rdir / "ui"
-    ui_dir.mkdir(parents=True, exist_ok=True)
-    out_path = ui_dir / "ui_summary.json"
+    out_path = _ui_summary_path(cfg, run_id)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    stage_note(run_dir=out_path.parent.parent)
     if out_path.exists() and not force:
         return out_path
 
     payload = build_ui_summary(cfg, run_id=run_id)
-    out_path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
-    return out_path
\ No newline at end of file
+    _write_ui_summary_payload(out_path, payload)
+    return out_path
+
+
+def load_or_build_ui_summary(cfg: AppConfig, *, run_id: str, force: bool = False) -> dict[str, Any]:
+    """Return runs/<run_id>/ui/ui_summary.json, building (and writing) it only if needed.
+
+    The existing file is reused unless `force` is set or it cannot be parsed.
+    """
+    out_path = _ui_summary_path(cfg, run_id)
+    if out_path.exists() and not force:
+        try:
+            return _read_json(out_path)
+        except (OSError, ValueError):
+            pass
+    payload = build_ui_summary(cfg, run_id=run_id)
+    _write_ui_summary_payload(out_path, payload)
+    return payload
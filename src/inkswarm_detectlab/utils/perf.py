@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+"""Per-stage performance telemetry (stdlib only).
+
+Stage entry points are wrapped in `perf_stage(...)` (or decorated with `@profiled`).
+Each stage records wall time, CPU time, peak RSS, bytes read/written and rows in/out;
+stages opened inside another stage become its children. When a top-level stage
+finishes, its record tree is merged into `runs/<run_id>/logs/perf.json` (latest
+record per stage name).
+
+Notes on the numbers:
+- cpu_s, bytes_* and peak RSS are process-wide counters (`time.process_time`,
+  /proc/self/io rchar/wchar, getrusage ru_maxrss). Stages that overlap in time (the
+  MVP stage graph runs independent stages concurrently) see each other's activity.
+- peak_rss_mb is the process high-water mark at stage end; rss_growth_mb is how much
+  that mark rose during the stage.
+- bytes_* are None where /proc/self/io is unavailable (macOS/Windows).
+
+Profiling is opt-in (`detectlab --profile ...`, `set_profiler`, or env
+DETECTLAB_PROFILE=cprofile|pyinstrument): each top-level stage then also writes
+`logs/profile/<stage>.prof` + `.txt` (cProfile) or `.html` + `.txt` (pyinstrument).
+"""
+
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+PERF_FILE_NAME = "perf.json"
+PROFILERS = ("cprofile", "pyinstrument")
+_SCHEMA_VERSION = 1
+
+_STACK: ContextVar[Tuple["PerfStage", ...]] = ContextVar("detectlab_perf_stack", default=())
+_WRITE_LOCK = threading.Lock()
+_profiler: Optional[str] = None
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def set_profiler(mode: Optional[str]) -> None:
+    """Enable per-stage profiling ("cprofile" | "pyinstrument") or disable it (None)."""
+    global _profiler
+    if mode is not None and mode not in PROFILERS:
+        raise ValueError(f"Unknown profiler {mode!r}; expected one of {PROFILERS}")
+    _profiler = mode
+
+
+def profiler_mode() -> Optional[str]:
+    if _profiler is not None:
+        return _profiler
+    env = os.getenv("DETECTLAB_PROFILE", "").strip().lower()
+    if env in ("1", "true", "yes", "on"):
+        return "cprofile"
+    return env if env in PROFILERS else None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _io_bytes() -> Tuple[Optional[int], Optional[int]]:
+    try:
+        text = Path("/proc/self/io").read_text()
+    except OSError:
+        return None, None
+    vals = dict(line.split(": ", 1) for line in text.splitlines() if ": " in line)
+    try:
+        return int(vals["rchar"]), int(vals["wchar"])
+    except (KeyError, ValueError):
+        return None, None
+
+
+def _delta(end: Optional[int], start: Optional[int]) -> Optional[int]:
+    return None if end is None or start is None else end - start
+
+
+@dataclass
+class PerfStage:
+    name: str
+    run_dir: Optional[Path] = None
+    started_at_utc: str = ""
+    status: str = "running"
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    rss_growth_mb: Optional[float] = None
+    bytes_read: Optional[int] = None
+    bytes_written: Optional[int] = None
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    error: Optional[str] = None
+    profile: Optional[str] = None
+    children: List["PerfStage"] = field(default_factory=list)
+
+    def note(self, *, run_dir: Optional[Path] = None, rows_in: Optional[int] = None, rows_out: Optional[int] = None) -> None:
+        """Attach the run dir and/or add row counts (accumulates across calls)."""
+        if run_dir is not None:
+            self.run_dir = Path(run_dir)
+        if rows_in is not None:
+            self.rows_in = (self.rows_in or 0) + int(rows_in)
+        if rows_out is not None:
+            self.rows_out = (self.rows_out or 0) + int(rows_out)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "status": self.status,
+            "started_at_utc": self.started_at_utc,
+            "wall_s": round(self.wall_s, 4),
+            "cpu_s": round(self.cpu_s, 4),
+            "peak_rss_mb": None if self.peak_rss_mb is None else round(self.peak_rss_mb, 1),
+            "rss_growth_mb": None if self.rss_growth_mb is None else round(self.rss_growth_mb, 1),
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "error": self.error,
+            "profile": self.profile,
+            "children": [c.to_json() for c in self.children],
+        }
+
+
+def current_stage() -> Optional[PerfStage]:
+    stack = _STACK.get()
+    return stack[-1] if stack else None
+
+
+def stage_note(*, run_dir: Optional[Path] = None, rows_in: Optional[int] = None, rows_out: Optional[int] = None) -> None:
+    """Annotate the innermost active stage (no-op outside a stage)."""
+    st = current_stage()
+    if st is not None:
+        st.note(run_dir=run_dir, rows_in=rows_in, rows_out=rows_out)
+
+
+def perf_path(run_dir: Path) -> Path:
+    return Path(run_dir) / "logs" / PERF_FILE_NAME
+
+
+def read_perf(run_dir: Path) -> Dict[str, Any]:
+    p = perf_path(run_dir)
+    if not p.exists():
+        return {"schema_version": _SCHEMA_VERSION, "stages": []}
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+def _record(run_dir: Path, stage: PerfStage) -> None:
+    p = perf_path(run_dir)
+    with _WRITE_LOCK:
+        try:
+            payload = read_perf(run_dir)
+        except (OSError, ValueError):
+            payload = {"schema_version": _SCHEMA_VERSION, "stages": []}
+        stages = [s for s in payload.get("stages", []) if s.get("name") != stage.name]
+        stages.append(stage.to_json())
+        payload = {"schema_version": _SCHEMA_VERSION, "stages": stages}
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(f"{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, p)
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "stage"
+
+
+class _Profiler:
+    def __init__(self, mode: str) -> None:
+        self.mode = mode
+        self._impl: Any = None
+        if mode == "pyinstrument":
+            try:
+                from pyinstrument import Profiler  # optional dependency
+            except ImportError:
+                logger.warning("pyinstrument is not installed; falling back to cProfile")
+                self.mode = "cprofile"
+            else:
+                self._impl = Profiler()
+        if self.mode == "cprofile":
+            self._impl = cProfile.Profile()
+
+    def start(self) -> bool:
+        try:
+            if self.mode == "cprofile":
+                self._impl.enable()
+            else:
+                self._impl.start()
+            return True
+        except (RuntimeError, ValueError) as e:  # another profiler is active (e.g. a concurrent stage)
+            logger.warning("profiling skipped: %s", e)
+            return False
+
+    def stop(self) -> None:
+        if self.mode == "cprofile":
+            self._impl.disable()
+        else:
+            self._impl.stop()
+
+    def stop_and_write(self, out_base: Path) -> Path:
+        self.stop()
+        out_base.parent.mkdir(parents=True, exist_ok=True)
+        if self.mode == "cprofile":
+            self._impl.dump_stats(str(out_base.with_suffix(".prof")))
+            buf = io.StringIO()
+            pstats.Stats(self._impl, stream=buf).sort_stats("cumulative").print_stats(40)
+            out_base.with_suffix(".txt").write_text(buf.getvalue(), encoding="utf-8")
+            return out_base.with_suffix(".prof")
+        out_base.with_suffix(".html").write_text(self._impl.output_html(), encoding="utf-8")
+        out_base.with_suffix(".txt").write_text(self._impl.output_text(), encoding="utf-8")
+        return out_base.with_suffix(".html")
+
+
+@contextmanager
+def perf_stage(name: str, *, run_dir: Optional[Path] = None) -> Iterator[PerfStage]:
+    """Measure a stage; nested calls become sub-stages of the enclosing one."""
+    parent = current_stage()
+    st = PerfStage(name=name, run_dir=Path(run_dir) if run_dir is not None else None)
+    st.started_at_utc = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    token = _STACK.set(_STACK.get() + (st,))
+
+    mode = profiler_mode() if parent is None else None
+    prof = _Profiler(mode) if mode else None
+    if prof is not None and not prof.start():
+        prof = None
+
+    rss0 = _peak_rss_mb()
+    read0, written0 = _io_bytes()
+    cpu0 = time.process_time()
+    t0 = time.perf_counter()
+    try:
+        yield st
+        st.status = "ok"
+    except BaseException as e:
+        st.status = "fail"
+        st.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        st.wall_s = time.perf_counter() - t0
+        st.cpu_s = time.process_time() - cpu0
+        read1, written1 = _io_bytes()
+        st.bytes_read, st.bytes_written = _delta(read1, read0), _delta(written1, written0)
+        st.peak_rss_mb = _peak_rss_mb()
+        st.rss_growth_mb = None if st.peak_rss_mb is None or rss0 is None else st.peak_rss_mb - rss0
+        _STACK.reset(token)
+
+        if st.run_dir is None:
+            st.run_dir = next((c.run_dir for c in st.children if c.run_dir is not None), None)
+        if parent is not None:
+            parent.children.append(st)
+            if parent.run_dir is None:
+                parent.run_dir = st.run_dir
+        elif st.run_dir is not None:
+            try:
+                if prof is not None:
+                    st.profile = str(prof.stop_and_write(st.run_dir / "logs" / "profile" / _safe_name(name)).relative_to(st.run_dir))
+                    prof = None
+                _record(st.run_dir, st)
+            except Exception as e:  # noqa: BLE001 - telemetry never fails a stage
+                logger.warning("perf telemetry write failed for %s: %s", name, e)
+        if prof is not None:
+            prof.stop()  # no run dir to write into
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    """Decorator form of `perf_stage` for pipeline entry points."""
+
+    def deco(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with perf_stage(name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return deco
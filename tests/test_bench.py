@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from inkswarm_detectlab import cli
+from inkswarm_detectlab.bench import compare_results, run_benchmarks
+from inkswarm_detectlab.bench.data import synthetic_login_frame
+from inkswarm_detectlab.bench.e2e import _bench_config
+from inkswarm_detectlab.config import load_config
+
+
+def test_synthetic_frames_are_deterministic_and_sized() -> None:
+    a = synthetic_login_frame(500, 20, seed=3)
+    pd.testing.assert_frame_equal(a, synthetic_login_frame(500, 20, seed=3))
+    assert len(a) == 500 and a["user_id"].nunique() <= 20
+    assert a["event_ts"].is_monotonic_increasing and a["event_id"].is_unique
+
+
+def test_run_benchmarks_grid_budget_and_scaling() -> None:
+    payload = run_benchmarks(
+        ["rolling_sum_by_time", "sliding_unique_counts"], rows=[300, 600], entities=[5, 1000], repeat=1, memory=True
+    )
+    by_case = {(r["benchmark"], r["rows"], r["entities"]): r for r in payload["results"]}
+    assert len(by_case) == 8
+    ok = by_case[("sliding_unique_counts", 600, 5)]
+    assert ok["status"] == "ok" and ok["rows_per_s"] > 0 and ok["peak_traced_mb"] is not None and len(ok["times_s"]) == 1
+    assert by_case[("rolling_sum_by_time", 300, 1000)]["reason"] == "entities exceed rows"
+    curves = {(c["benchmark"], c["entities"]): c for c in payload["scaling"]}
+    assert [p["rows"] for p in curves[("rolling_sum_by_time", 5)]["points"]] == [300, 600]
+    assert curves[("rolling_sum_by_time", 5)]["time_vs_rows_exponent"] is not None
+
+    tight = run_benchmarks(["rolling_sum_by_time"], rows=[300, 600], entities=[5], repeat=1, budget_s=0.0, memory=False)
+    assert [r["status"] for r in tight["results"]] == ["ok", "skipped"]
+
+
+def test_bench_cli_writes_json(tmp_path: Path) -> None:
+    out = tmp_path / "bench.json"
+    result = CliRunner().invoke(
+        cli.app,
+        ["bench", "-b", "build_login_features", "--rows", "400", "--entities", "10", "--repeat", "1", "--no-memory", "--out", str(out)],
+    )
+    assert result.exit_code == 0, result.stdout
+    payload = json.loads(out.read_text(encoding="utf-8"))
+    assert payload["suite"] == "kernels" and payload["environment"]["pandas"] == pd.__version__
+    assert payload["results"][0]["status"] == "ok"
+
+    bad = CliRunner().invoke(cli.app, ["bench", "-b", "nope", "--out", str(out)])
+    assert bad.exit_code != 0
+
+    # Gate against a baseline that was 10x faster -> exit 1.
+    for r in payload["results"]:
+        r["median_s"] /= 10
+    base = tmp_path / "baseline.json"
+    base.write_text(json.dumps(payload), encoding="utf-8")
+    gated = CliRunner().invoke(
+        cli.app,
+        ["bench", "-b", "build_login_features", "--rows", "400", "--entities", "10", "--repeat", "1", "--no-memory",
+         "--out", str(out), "--baseline", str(base)],
+    )
+    assert gated.exit_code == 1 and "REGRESSION - build_login_features@rows=400,entities=10 time_s" in gated.stdout
+
+
+def test_compare_results_tolerance_and_floors() -> None:
+    def e2e(features_s: float, features_growth: float) -> dict:
+        rss = 250.0 + features_growth
+        return {
+            "suite": "e2e",
+            "config_hash": "h",
+            "total_wall_s": 10.0 + features_s,
+            "peak_rss_mb": rss,
+            "stages": {
+                "features(login)": {"status": "ok", "wall_s": features_s, "peak_rss_mb": rss, "rss_growth_mb": features_growth},
+                # later stages inherit the process high-water mark but grow nothing themselves
+                "handover": {"status": "ok", "wall_s": 0.01, "peak_rss_mb": rss, "rss_growth_mb": 0.0},
+            },
+        }
+
+    base = e2e(4.0, 150.0)
+    assert compare_results(e2e(4.8, 150.0), base, tolerance=0.25).ok
+    cmp = compare_results(e2e(6.0, 350.0), base, tolerance=0.25)
+    assert {(r.key, r.metric) for r in cmp.regressions} == {
+        ("features(login)", "time_s"), ("features(login)", "mem_mb"), ("total", "mem_mb")
+    }
+    # 0.01s -> 0.05s is x5 but under the 0.5s floor
+    noisy = e2e(4.0, 150.0)
+    noisy["stages"]["handover"]["wall_s"] = 0.05
+    assert compare_results(noisy, base).ok
+
+    with pytest.raises(ValueError):
+        compare_results(base, {"suite": "kernels", "results": []})
+
+
+def test_e2e_bench_config_is_loadable_and_cold(tmp_path: Path) -> None:
+    runs_dir = tmp_path / "runs"
+    runs_dir.mkdir()
+    path, config_hash = _bench_config(Path("configs/skynet_smoke.yaml"), runs_dir)
+    cfg = load_config(path)
+    assert Path(cfg.paths.runs_dir) == runs_dir
+    assert cfg.features.use_cache is False and cfg.features.write_cache is False
+    assert cfg.run.stage_workers == 1
+    assert _bench_config(Path("configs/skynet_smoke.yaml"), runs_dir)[1] == config_hash
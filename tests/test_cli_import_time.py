@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import inkswarm_detectlab
+
+HEAVY = ("pandas", "numpy", "sklearn", "scipy", "pyarrow", "joblib")
+# Cumulative import time of all top-level imports, as reported by -X importtime.
+# Heavy stacks alone cost 1-3 s; light commands need ~0.1-0.3 s. Generous for slow CI.
+BUDGET_S = 1.0
+
+
+def _importtime(args: list[str], cwd: Path) -> tuple[float, set[str]]:
+    src = str(Path(inkswarm_detectlab.__file__).resolve().parents[1])
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in (src, os.environ.get("PYTHONPATH", "")) if p)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "inkswarm_detectlab", *args],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr[-2000:]
+    total_us, modules = 0, set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        modules.add(name.strip())
+        if not name.startswith("  "):  # top-level import (nested ones are indented further)
+            total_us += int(cumulative)
+    return total_us / 1e6, modules
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--help"],
+        ["schemas", "list"],
+        ["cache", "list", "--cache-dir", "cache_root"],
+        ["runs", "list", "--runs-dir", "runs_root"],
+    ],
+)
+def test_light_commands_skip_heavy_imports(tmp_path: Path, args: list[str]) -> None:
+    seconds, modules = _importtime(args, tmp_path)
+    assert not [m for m in HEAVY if m in modules], f"{args} imported heavy modules"
+    assert seconds < BUDGET_S, f"{args} import time {seconds:.2f}s exceeds budget {BUDGET_S}s"
@@ -8,7 +8,7 @@ import pytest
 pytest.importorskip('pyarrow')
 
 from inkswarm_detectlab.config import load_config
-from inkswarm_detectlab.pipeline import run_all
+from inkswarm_detectlab.pipeline import _write_summary, run_all
 from inkswarm_detectlab.io.paths import manifest_path
 from inkswarm_detectlab.io.manifest import read_manifest
 
@@ -139,3 +139,17 @@ def test_d0002_leakage_and_sanity(tmp_path: Path):
     assert holdout_users_c
     assert holdout_users_c.isdisjoint(set(ct["user_id"].astype(str)))
     assert holdout_users_c.isdisjoint(set(ce["user_id"].astype(str)))
+
+    # --- Summary stats persisted once; summary.md renders without raw tables ---
+    stats = m["summary_stats"]
+    assert stats["login_attempt_rows"] == len(login) and stats["checkout_attempt_rows"] == len(checkout)
+    assert stats["labels"]["attack_prevalence"] == pytest.approx(attack_rate)
+    assert stats["checkout_adverse_rate"] == pytest.approx(adverse_rate)
+    assert stats["unique_users"] == login["user_id"].astype(str).nunique()
+
+    login_path.unlink()
+    checkout_path.unlink()
+    _write_summary(rdir, m)
+    text = (rdir / "reports" / "summary.md").read_text(encoding="utf-8")
+    assert f"- login_attempt rows: {len(login):,}" in text
+    assert f"- holdout users: {len(holdout_users):,} (" in text
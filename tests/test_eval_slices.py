@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import average_precision_score
+
+from inkswarm_detectlab.eval.slices import build_slice_index, compute_slice_metrics
+
+
+def test_batched_slice_metrics_match_per_slice_masking() -> None:
+    rng = np.random.default_rng(3)
+    n = 2000
+    df = pd.DataFrame(
+        {
+            "a": rng.random(n) < 0.3,
+            "b": rng.random(n) < 0.5,  # overlaps with "a"
+            "c": rng.integers(0, 3, size=n),
+        }
+    )
+    defs = [
+        ("All", pd.Series(True, index=df.index)),
+        ("a", df["a"]),
+        ("b", df["b"]),
+        ("not b", ~df["b"]),
+        ("c=0", df["c"] == 0),
+        ("c=1", df["c"] == 1),
+        ("empty", pd.Series(False, index=df.index)),
+    ]
+    y = (rng.random(n) < 0.1).astype(int)
+    s = np.round(rng.random(n), 2)  # ties
+    thr = 0.7
+
+    index = build_slice_index(defs)
+    got = compute_slice_metrics(index, y, s, thr)
+
+    assert "empty" not in got
+    for name, mask in defs:
+        m = mask.to_numpy()
+        if not m.any():
+            continue
+        yy, ss = y[m], s[m]
+        pred = ss >= thr
+        fp = int((pred & (yy == 0)).sum())
+        tp = int((pred & (yy == 1)).sum())
+        tn = int((~pred & (yy == 0)).sum())
+        fn = int((~pred & (yy == 1)).sum())
+        sm = got[name]
+        assert sm["rows"] == int(m.sum())
+        assert sm["positives"] == int(yy.sum())
+        assert sm["at_train_threshold"]["fpr"] == (fp / (fp + tn) if (fp + tn) else 0.0)
+        assert sm["at_train_threshold"]["recall"] == (tp / (tp + fn) if (tp + fn) else 0.0)
+        assert sm["at_train_threshold"]["precision"] == (tp / (tp + fp) if (tp + fp) else 0.0)
+        expected_ap = float(average_precision_score(yy, ss)) if len(np.unique(yy)) > 1 else 0.0
+        assert abs(sm["pr_auc"] - expected_ap) < 1e-12
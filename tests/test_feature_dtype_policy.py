@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from sklearn.impute import SimpleImputer
+from sklearn.metrics import average_precision_score
+from sklearn.preprocessing import StandardScaler
+
+from inkswarm_detectlab.config import AppConfig
+from inkswarm_detectlab.features.builder import build_login_features, feature_dtype_kind
+from inkswarm_detectlab.models.runner import _fit_logreg, _select_X_y
+
+COMPACT = {"counts": "int32", "rates": "float32", "sums": "float32"}
+LEGACY = {"counts": "float64", "rates": "float64", "sums": "float64"}
+
+
+def _login_frame(n: int = 3000, seed: int = 5) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ts = pd.Timestamp("2025-01-01", tz="UTC") + pd.to_timedelta(np.sort(rng.integers(0, 14 * 86400, size=n)), unit="s")
+    return pd.DataFrame(
+        {
+            "event_id": [f"e{i:05d}" for i in range(n)],
+            "event_ts": ts,
+            "user_id": [f"u{i}" for i in rng.integers(0, 150, size=n)],
+            "ip_hash": [f"ip{i}" for i in rng.integers(0, 60, size=n)],
+            "device_fingerprint_hash": [f"d{i}" for i in rng.integers(0, 90, size=n)],
+            "login_result": rng.choice(["success", "failure", "challenge", "lockout"], p=[0.7, 0.2, 0.07, 0.03], size=n),
+            "support_contacted": rng.random(n) < 0.05,
+            "support_cost_usd": np.round(rng.gamma(2.0, 3.0, size=n), 2),
+            "support_wait_seconds": rng.integers(0, 900, size=n).astype(float),
+            "support_handle_seconds": rng.integers(0, 1800, size=n).astype(float),
+        }
+    )
+
+
+def _build(policy: dict[str, str]) -> tuple[pd.DataFrame, list[str]]:
+    return build_login_features(
+        _login_frame(),
+        windows=["1h", "24h"],
+        entities=["user", "ip", "device"],
+        strict_past_only=True,
+        include_support=True,
+        dtype_policy=policy,
+    )
+
+
+def test_dtype_policy_casts_by_kind_without_changing_values() -> None:
+    legacy, cols = _build(LEGACY)
+    compact, cols_c = _build(COMPACT)
+    assert cols == cols_c
+
+    for c in cols:
+        kind = feature_dtype_kind(c)
+        assert legacy[c].dtype == np.float64
+        expected = np.dtype(COMPACT[kind]) if kind else np.dtype(np.float64)
+        assert compact[c].dtype == expected, c
+        ref = legacy[c].to_numpy()
+        if kind == "counts":
+            assert np.array_equal(compact[c].to_numpy(), np.rint(ref).astype(np.int32))
+        else:
+            np.testing.assert_allclose(compact[c].to_numpy(dtype=np.float64), ref, rtol=1e-6, atol=1e-6)
+
+
+def test_float32_matrix_metric_drift_within_tolerance() -> None:
+    legacy, cols = _build(LEGACY)
+    compact, _ = _build(COMPACT)
+    rng = np.random.default_rng(9)
+    logit = 0.4 * legacy["user_24h__failure_cnt"] - 2.0 * legacy["ip_1h__success_rate"] - 1.0
+    label = (rng.random(len(legacy)) < 1.0 / (1.0 + np.exp(-logit))).astype(int)
+
+    cfg = AppConfig()
+    ap = {}
+    for name, df in (("legacy", legacy), ("compact", compact)):
+        X, _ = _select_X_y(df[["event_id", "user_id"] + cols])
+        assert X.dtypes.unique().tolist() == [np.dtype(np.float32 if name == "compact" else np.float64)]
+        imputer = SimpleImputer(strategy="median")
+        scaler = StandardScaler()
+        Xs = scaler.fit_transform(imputer.fit_transform(X))
+        assert Xs.dtype == X.dtypes.iloc[0]  # no upcast copy in the preprocessing chain
+        model = _fit_logreg(cfg, Xs, label, imputer=imputer, scaler=scaler)
+        ap[name] = average_precision_score(label, model.predict_proba(X)[:, 1])
+
+    assert abs(ap["legacy"] - ap["compact"]) < 1e-3
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from inkswarm_detectlab.bench.data import synthetic_login_frame
+from inkswarm_detectlab.features.builder import build_feature_set, build_login_features, compile_feature_plan
+from inkswarm_detectlab.features.catalog import checkout_feature_set, login_feature_set
+from inkswarm_detectlab.features.spec import AggregateSpec, EntitySpec, FeatureSetSpec, FeatureSpec, RowFilter
+
+
+def test_plan_fuses_one_pass_per_entity() -> None:
+    df = synthetic_login_frame(50, 5, seed=1)
+    plan = compile_feature_plan(
+        login_feature_set(include_support=True),
+        windows=["1h", "24h"], entities=["user", "ip"], strict_past_only=True, columns=df.columns,
+    )
+    assert [p.entity for p in plan.passes] == ["user", "ip"]
+    # attempts, 4 outcomes, support contacts and 3 support sums share one prefix sum.
+    assert all(len(p.sources) == 9 for p in plan.passes)
+    assert plan.feature_columns[:2] == ["user_1h__attempt_cnt", "user_1h__success_cnt"]
+    assert "user_24h__uniq_device_fingerprint_hash_cnt" in plan.feature_columns
+    assert len(plan.feature_columns) == len(set(plan.feature_columns)) == 2 * 2 * 15
+    assert plan.explain()[0].startswith("user (user_id): 1 sort, 1 prefix sum over 9 sources, 2 window sums, 4 unique")
+
+    inclusive = compile_feature_plan(
+        checkout_feature_set(), windows=["1h"], entities=["user"], strict_past_only=False, columns=["user_id", "checkout_result"]
+    )
+    names = inclusive.feature_columns
+    assert "user_1h__adverse_cnt" in names and not any("uniq" in c or "payment" in c for c in names)
+    with pytest.raises(ValueError):
+        compile_feature_plan(checkout_feature_set(), windows=["1h"], entities=["merchant"], strict_past_only=True, columns=[])
+
+
+def test_custom_feature_set_matches_brute_force() -> None:
+    ts = pd.to_datetime(["2024-01-01 00:00", "2024-01-01 00:30", "2024-01-01 00:30", "2024-01-01 01:10", "2024-01-01 03:00"])
+    df = pd.DataFrame(
+        {
+            "event_ts": ts,
+            "user_id": ["a", "a", "b", "a", "a"],
+            "result": ["ok", "bad", "ok", "bad", "ok"],
+            "amount": [1.0, 2.0, 4.0, 8.0, 16.0],
+            "ip": ["x", "y", "x", "y", "z"],
+        }
+    )
+    fs = FeatureSetSpec(
+        event_type="demo",
+        entities=[EntitySpec(name="user", group_key="user_id", distinct=["ip"])],
+        aggregates=[
+            AggregateSpec(name="n", agg="count"),
+            AggregateSpec(name="bad_amount_sum", agg="sum", column="amount", where=RowFilter(column="result", values=["bad"])),
+            AggregateSpec(name="bad_amount_mean", agg="ratio", numerator="bad_amount_sum", denominator="n"),
+            AggregateSpec(name="uniq_{column}_cnt", agg="nunique"),
+            AggregateSpec(name="n_again", agg="count", windows=["2h"]),
+            AggregateSpec(name="skipped_sum", agg="sum", column="missing"),
+        ],
+    )
+    out, cols = build_feature_set(df, fs, windows=["1h", "2h"], entities=["user"], strict_past_only=True)
+    assert cols == [
+        "user_1h__n", "user_1h__bad_amount_sum", "user_1h__bad_amount_mean", "user_1h__uniq_ip_cnt",
+        "user_2h__n", "user_2h__bad_amount_sum", "user_2h__bad_amount_mean", "user_2h__uniq_ip_cnt", "user_2h__n_again",
+    ]
+    assert out["user_1h__n"].tolist() == [0, 1, 0, 1, 0]
+    assert out["user_1h__bad_amount_sum"].tolist() == [0, 0, 0, 2, 0]
+    assert out["user_1h__bad_amount_mean"].tolist() == [0, 0, 0, 2, 0]
+    assert out["user_2h__bad_amount_mean"].tolist() == [0, 0, 0, 1, 8]
+    assert out["user_2h__uniq_ip_cnt"].tolist() == [0, 1, 0, 2, 1]
+    assert np.array_equal(out["user_2h__n_again"], out["user_2h__n"])
+
+
+def test_feature_set_is_recorded_in_spec() -> None:
+    fs = login_feature_set(include_support=False)
+    spec = FeatureSpec(windows=["1h"], entities=["user"], feature_set=fs)
+    restored = FeatureSpec.model_validate(spec.to_json())
+    assert restored.feature_set == fs
+    assert not any(a.name.startswith("support") for a in fs.aggregates)
+
+    df = synthetic_login_frame(300, 10, seed=2)
+    _, cols = build_login_features(df, windows=["1h"], entities=["user"], strict_past_only=True, include_support=False)
+    plan = compile_feature_plan(fs, windows=["1h"], entities=["user"], strict_past_only=True, columns=df.columns)
+    assert cols == plan.feature_columns
+
+
+def test_decayed_features_share_one_scan() -> None:
+    ts = pd.to_datetime(["2024-01-01 00:00", "2024-01-01 01:00", "2024-01-01 01:00", "2024-01-01 03:00"])
+    df = pd.DataFrame(
+        {
+            "event_id": ["e1", "e2", "e3", "e4"],
+            "event_ts": ts,
+            "user_id": ["a", "a", "a", "a"],
+            "login_result": ["failure", "success", "failure", "success"],
+        }
+    )
+    out, cols = build_login_features(
+        df, windows=["1h"], entities=["user"], strict_past_only=True, include_support=False, half_lives=["1h", "2h"],
+        dtype_policy={"counts": "int32", "rates": "float32", "sums": "float32"},
+    )
+    assert "user_ewm1h__attempt_dcnt" in cols and "user_ewm2h__success_rate" in cols
+    assert not any(c.startswith("user_ewm") and "uniq" in c for c in cols)
+    # Same-timestamp rows do not see each other; at 03:00 the 01:00 pair has decayed by 2 half-lives.
+    assert out["user_ewm1h__attempt_dcnt"].tolist() == pytest.approx([0.0, 0.5, 0.5, 0.125 + 0.5])
+    assert out["user_ewm1h__failure_dcnt"].tolist() == pytest.approx([0.0, 0.5, 0.5, 0.125 + 0.25])
+    assert out["user_ewm1h__success_rate"].tolist() == pytest.approx([0.0, 0.0, 0.0, 0.25 / 0.625])
+    assert out["user_ewm1h__attempt_dcnt"].dtype == np.float32  # decayed counts are stored as sums
+
+    plan = compile_feature_plan(
+        login_feature_set(include_support=False), windows=["1h"], entities=["user"], strict_past_only=True,
+        columns=df.columns, half_lives=["1h", "2h", "1d"],
+    )
+    assert "1 decayed scan over 3 half-lives" in plan.explain()[0]
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from inkswarm_detectlab import cli, kernels
+from inkswarm_detectlab.bench.data import synthetic_login_frame
+from inkswarm_detectlab.features.builder import (
+    _rolling_sum_by_time,
+    _rolling_unique_count_strict,
+    build_login_features,
+    describe_unique_counts,
+)
+
+BACKENDS = [
+    "numpy",
+    pytest.param("numba", marks=pytest.mark.skipif(not kernels.NUMBA_AVAILABLE, reason="numba not installed")),
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    kernels.set_kernel_backend(request.param)
+    yield request.param
+    kernels.set_kernel_backend(None)
+
+
+def _grouped(rng: np.random.Generator, n: int, groups: int) -> tuple[np.ndarray, np.ndarray]:
+    """Group codes ascending, timestamps ascending (with ties) within each group."""
+    g = np.sort(rng.integers(0, groups, n)).astype(np.int64)
+    ts = np.zeros(n, dtype=np.int64)
+    for c in np.unique(g):
+        m = g == c
+        ts[m] = np.sort(rng.integers(0, 20, m.sum()))
+    return g, ts
+
+
+def test_kernels_match_brute_force(backend: str) -> None:
+    rng = np.random.default_rng(7)
+    for _ in range(40):
+        n, w = int(rng.integers(0, 40)), int(rng.integers(1, 8))
+        g, ts = _grouped(rng, n, 4)
+        vals = rng.normal(size=(n, 2))
+        codes = rng.integers(0, 4, n)
+        pos_idx = np.arange(n)
+        for include_current in (False, True):
+            got = kernels.window_sums(g, ts, vals, w, include_current=include_current)
+            for i in range(n):
+                upto = pos_idx <= i if include_current else ts < ts[i]
+                assert np.allclose(got[i], vals[(g == g[i]) & (ts >= ts[i] - w) & upto].sum(axis=0))
+            decayed = kernels.decayed_sums(g, ts, vals, [w, 3 * w], include_current=include_current)
+            for i in range(n):
+                seen = (g == g[i]) & (pos_idx <= i if include_current else ts < ts[i])
+                for j, hl in enumerate([w, 3 * w]):
+                    weights = 2.0 ** (-(ts[i] - ts[seen]) / hl)
+                    assert np.allclose(decayed[i, j], (vals[seen] * weights[:, None]).sum(axis=0))
+
+        uniq = kernels.sliding_unique_counts(g, ts, codes, w)
+        for i in range(n):
+            assert uniq[i] == len(set(codes[(g == g[i]) & (ts > ts[i] - w) & (ts < ts[i])]))
+
+        og, ots = _grouped(rng, int(rng.integers(0, 30)), 5)
+        ovals = rng.normal(size=(len(og), 3))
+        cross = kernels.cross_window_sums(g, ts, og, ots, ovals, w)
+        for i in range(n):
+            assert np.allclose(cross[i], ovals[(og == g[i]) & (ots >= ts[i] - w) & (ots < ts[i])].sum(axis=0))
+
+
+@pytest.mark.skipif(not kernels.NUMBA_AVAILABLE, reason="numba not installed")
+def test_backends_are_bit_identical() -> None:
+    rng = np.random.default_rng(11)
+    g, ts = _grouped(rng, 5_000, 50)
+    og, ots = _grouped(rng, 3_000, 60)
+    vals, ovals = rng.normal(size=(5_000, 3)), rng.lognormal(size=(3_000, 2))
+    codes = rng.integers(0, 30, 5_000)
+    s = np.sort(rng.integers(0, 200, 5_000).astype(float))[::-1]
+    calls = [
+        lambda: kernels.prefix_sums(vals),
+        lambda: kernels.window_sums(g, ts, vals, 5, include_current=False),
+        lambda: kernels.window_sums(g, ts, vals, 5, include_current=True),
+        lambda: kernels.sliding_unique_counts(g, ts, codes, 5),
+        lambda: kernels.cross_window_sums(g, ts, og, ots, ovals, 5),
+        lambda: kernels.decayed_sums(g, ts, vals, [2, 30], include_current=False),
+        lambda: kernels.sweep_runs(s, g % 2 == 0, g % 2 == 1),
+    ]
+    for call in calls:
+        results = {}
+        for name in kernels.BACKENDS:
+            kernels.set_kernel_backend(name)
+            out = call()
+            results[name] = out if isinstance(out, tuple) else (out,)
+        kernels.set_kernel_backend(None)
+        for a, b in zip(results["numba"], results["numpy"]):
+            assert a.dtype == b.dtype and np.array_equal(a, b)
+
+
+@pytest.mark.skipif(not kernels.NUMBA_AVAILABLE, reason="numba not installed")
+def test_parallel_unique_counts_match_serial() -> None:
+    rng = np.random.default_rng(5)
+    for n, groups in [(0, 1), (7, 3), (20_000, 5_000), (20_000, 2)]:
+        g, ts = rng.integers(0, groups, n), rng.integers(0, 10**6, n)
+        order = np.lexsort((ts, g))
+        g, ts, v = g[order], ts[order], rng.integers(0, 40, n)
+        bounds = kernels._group_chunks(g, 16)
+        assert bounds[0] == 0 and bounds[-1] == n
+        assert all(g[b] != g[b - 1] for b in bounds[1:-1])  # never splits a group
+        serial = kernels.sliding_unique_counts(g, ts, v, 5_000, parallel=False)
+        assert np.array_equal(kernels.sliding_unique_counts(g, ts, v, 5_000, parallel=True), serial)
+
+
+def test_hll_unique_counts_within_error_bound(backend: str) -> None:
+    rng = np.random.default_rng(3)
+    g, ts = _grouped(rng, 3_000, 3)
+    ts = ts * 1_000 + np.arange(3_000) % 1_000  # spread timestamps so windows hold hundreds of values
+    order = np.lexsort((ts, g))
+    g, ts, v = g[order], ts[order], rng.integers(0, 2_000, 3_000)
+    exact = kernels.sliding_unique_counts(g, ts, v, 8_000)
+    approx = kernels.sliding_unique_counts_hll(g, ts, v, 8_000, precision=10)
+    big = exact >= 100
+    assert big.sum() > 1_000
+    rel = np.abs(approx[big] - exact[big]) / exact[big]
+    bound = kernels.hll_relative_error(10)
+    assert rel.mean() < 2 * bound and rel.max() < 6 * bound
+    assert np.abs(approx[exact <= 5] - exact[exact <= 5]).max() <= 1  # linear counting regime
+    with pytest.raises(ValueError):
+        kernels.sliding_unique_counts_hll(g, ts, v, 8_000, precision=3)
+
+
+@pytest.mark.skipif(not kernels.NUMBA_AVAILABLE, reason="numba not installed")
+def test_hll_backends_agree() -> None:
+    rng = np.random.default_rng(4)
+    g, ts = _grouped(rng, 2_000, 4)
+    v = rng.integers(0, 300, 2_000)
+    results = []
+    for name in kernels.BACKENDS:
+        kernels.set_kernel_backend(name)
+        results.append(kernels.sliding_unique_counts_hll(g, ts, v, 6, precision=8))
+    kernels.set_kernel_backend(None)
+    assert np.array_equal(*results)
+
+
+def test_hll_mode_in_builder_and_spec() -> None:
+    df = synthetic_login_frame(2_000, 20, seed=5)
+    uc = {"mode": "hll", "hll_precision": 10, "hll_min_window": "24h"}
+    exact, cols = build_login_features(df, windows=["1h", "24h"], entities=["user"], strict_past_only=True, include_support=False)
+    approx, approx_cols = build_login_features(
+        df, windows=["1h", "24h"], entities=["user"], strict_past_only=True, include_support=False, unique_counts=uc
+    )
+    assert cols == approx_cols
+    pd.testing.assert_series_equal(exact["user_1h__uniq_ip_hash_cnt"], approx["user_1h__uniq_ip_hash_cnt"])
+    a, e = approx["user_24h__uniq_ip_hash_cnt"].to_numpy(float), exact["user_24h__uniq_ip_hash_cnt"].to_numpy(float)
+    assert np.abs(a - e).max() <= max(1.0, 0.1 * e.max())
+
+    spec = describe_unique_counts(uc, ["1h", "24h", "7d"])
+    assert spec["approx_windows"] == ["24h", "7d"] and spec["relative_std_error"] == pytest.approx(1.04 / 32)
+    assert describe_unique_counts(None, ["7d"]) == {"mode": "exact"}
+
+
+@pytest.mark.parametrize("unit", ["ns", "s"])
+def test_builder_rolling_features_align_with_pandas(backend: str, unit: str) -> None:
+    # Interleaved groups: the rolling result must come back in frame order, not group order.
+    ts = pd.to_datetime(["2024-01-01 00:00", "2024-01-01 00:10", "2024-01-01 00:10", "2024-01-01 00:20", "2024-01-01 02:00"])
+    df = pd.DataFrame(
+        {
+            "event_ts": ts.as_unit(unit),
+            "user_id": ["a", "b", "a", "b", "a"],
+            "ip": ["x", "y", "z", "y", "x"],
+            "v": [1.0, 10.0, 100.0, 1000.0, 10000.0],
+        }
+    )
+    strict = _rolling_sum_by_time(df, group_key="user_id", value_col="v", window="1h", strict_past_only=True)
+    assert strict.tolist() == [0.0, 0.0, 1.0, 10.0, 0.0]
+    inclusive = _rolling_sum_by_time(df, group_key="user_id", value_col="v", window="1h", strict_past_only=False)
+    assert inclusive.tolist() == [1.0, 10.0, 101.0, 1010.0, 10000.0]
+    uniq = _rolling_unique_count_strict(df, group_key="user_id", value_key="ip", window_td=pd.Timedelta("3h"))
+    assert uniq.tolist() == [0, 0, 1, 1, 2]
+
+
+def test_warmup_cli() -> None:
+    result = CliRunner().invoke(cli.app, ["warmup"])
+    assert result.exit_code == 0, result.stdout
+    if kernels.NUMBA_AVAILABLE:
+        assert "sliding_unique_counts" in result.stdout
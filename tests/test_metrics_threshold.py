@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import numpy as np
+
+from inkswarm_detectlab.models.metrics import (
+    ThresholdResult,
+    choose_threshold_for_fpr,
+    choose_thresholds_for_fprs,
+    top_thresholds_for_fpr,
+)
+
+
+def _ref_candidates(y_true: np.ndarray, scores: np.ndarray, target_fpr: float) -> list[ThresholdResult]:
+    """Reference: the original O(n x unique) loop over descending unique thresholds."""
+    y = y_true.astype(int)
+    s = scores.astype(float)
+    neg = y == 0
+    pos = y == 1
+    n_neg = int(neg.sum())
+    n_pos = int(pos.sum())
+    out = []
+    for thr in np.unique(s)[::-1]:
+        preds = s >= thr
+        fp = int((preds & neg).sum())
+        tp = int((preds & pos).sum())
+        fpr = fp / n_neg
+        if fpr <= target_fpr + 1e-12:
+            recall = tp / n_pos if n_pos else 0.0
+            precision = (tp / int(preds.sum())) if int(preds.sum()) else 0.0
+            out.append(ThresholdResult(float(thr), float(fpr), float(recall), float(precision)))
+    return out
+
+
+def _ref_choose(y_true: np.ndarray, scores: np.ndarray, target_fpr: float) -> ThresholdResult:
+    best = None
+    for cand in _ref_candidates(y_true, scores, target_fpr):
+        if best is None or cand.fpr > best.fpr + 1e-12:
+            best = cand
+    return best or ThresholdResult(float("inf"), 0.0, 0.0, 0.0)
+
+
+def _ref_top(y_true: np.ndarray, scores: np.ndarray, target_fpr: float, k: int) -> list[ThresholdResult]:
+    cands = _ref_candidates(y_true, scores, target_fpr)
+    cands.sort(key=lambda r: (r.recall, r.fpr, r.precision), reverse=True)
+    return cands[: max(1, k)]
+
+
+def _same(a: ThresholdResult, b: ThresholdResult) -> bool:
+    return (a.threshold == b.threshold or (np.isnan(a.threshold) and np.isnan(b.threshold))) and (
+        (a.fpr, a.recall, a.precision) == (b.fpr, b.recall, b.precision)
+    )
+
+
+def test_threshold_sweep_matches_reference_loop() -> None:
+    rng = np.random.default_rng(7)
+    for trial in range(40):
+        n = int(rng.integers(1, 400))
+        y = (rng.random(n) < rng.uniform(0.02, 0.5)).astype(int)
+        if trial % 3 == 0:
+            s = rng.integers(0, 6, size=n).astype(float)  # heavy ties
+        else:
+            s = rng.random(n)
+        if trial % 7 == 0:
+            s[rng.random(n) < 0.1] = np.nan
+        if int((y == 0).sum()) == 0:
+            continue
+        for target in (0.0, 0.01, 0.05, 0.3, 1.0):
+            assert _same(choose_threshold_for_fpr(y, s, target), _ref_choose(y, s, target))
+            got = top_thresholds_for_fpr(y, s, target, k=3)
+            ref = _ref_top(y, s, target, 3)
+            assert len(got) == len(ref)
+            assert all(_same(a, b) for a, b in zip(got, ref))
+
+
+def test_batched_thresholds_match_single_calls() -> None:
+    rng = np.random.default_rng(11)
+    y = (rng.random(5000) < 0.05).astype(int)
+    s = rng.random(5000)
+    targets = [0.05, 0.001, 0.01, 0.2]
+    batched = choose_thresholds_for_fprs(y, s, targets)
+    assert batched == [choose_threshold_for_fpr(y, s, t) for t in targets]
+
+
+def test_threshold_degenerate_no_negatives() -> None:
+    y = np.ones(5, dtype=int)
+    s = np.linspace(0, 1, 5)
+    assert choose_threshold_for_fpr(y, s, 0.01).threshold == float("inf")
+    assert top_thresholds_for_fpr(y, s, 0.01)[0].threshold == float("inf")
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from inkswarm_detectlab.utils.perf import perf_stage, profiled, read_perf, set_profiler, stage_note
+
+
+@profiled("entry")
+def _entry(run_dir: Path, n: int) -> int:
+    stage_note(run_dir=run_dir, rows_in=n)
+    with perf_stage("inner"):
+        stage_note(rows_out=n // 2)
+        stage_note(rows_out=n // 2)
+    return n
+
+
+def test_nested_stages_record_into_run_perf_json(tmp_path: Path) -> None:
+    run_dir = tmp_path / "RUN_X"
+    with perf_stage("outer"):
+        _entry(run_dir, 10)
+
+    stages = read_perf(run_dir)["stages"]
+    assert [s["name"] for s in stages] == ["outer"]  # run dir propagates up from the entry point
+    entry = stages[0]["children"][0]
+    assert entry["name"] == "entry" and entry["rows_in"] == 10 and entry["status"] == "ok"
+    assert entry["children"][0]["rows_out"] == 10
+    assert entry["wall_s"] >= entry["children"][0]["wall_s"] >= 0
+
+    # Re-running a stage replaces its record; other stages are kept.
+    _entry(run_dir, 4)
+    with pytest.raises(RuntimeError):
+        with perf_stage("boom", run_dir=run_dir):
+            raise RuntimeError("x")
+    stages = {s["name"]: s for s in read_perf(run_dir)["stages"]}
+    assert set(stages) == {"outer", "entry", "boom"}
+    assert stages["entry"]["rows_in"] == 4
+    assert stages["boom"]["status"] == "fail" and stages["boom"]["error"] == "RuntimeError: x"
+
+
+def test_profile_written_per_top_level_stage(tmp_path: Path) -> None:
+    set_profiler("cprofile")
+    try:
+        _entry(tmp_path, 1)
+    finally:
+        set_profiler(None)
+    rec = read_perf(tmp_path)["stages"][0]
+    assert rec["profile"] == "logs/profile/entry.prof"
+    assert (tmp_path / "logs" / "profile" / "entry.txt").read_text(encoding="utf-8").strip()
+    with pytest.raises(ValueError):
+        set_profiler("perf")
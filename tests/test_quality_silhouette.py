@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import silhouette_samples, silhouette_score
+
+from inkswarm_detectlab.quality.cluster import compute_cluster_quality
+from inkswarm_detectlab.quality.silhouette import (
+    choose_silhouette_mode,
+    silhouette_centroid,
+    silhouette_exact,
+    silhouette_sampled,
+)
+
+
+def _blobs(n: int, k: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, k, size=n)
+    centers = rng.normal(scale=4.0, size=(k, 5))
+    X = centers[labels] + rng.normal(size=(n, 5))
+    return X, labels
+
+
+def test_blocked_exact_matches_sklearn() -> None:
+    X, labels = _blobs(700, 4, seed=1)
+    labels[0] = 4  # singleton cluster -> s = 0 by convention
+    ref = float(silhouette_score(X, labels))
+    for budget in (0.01, 512):  # tiny budget forces one-row blocks
+        got = silhouette_exact(X, labels, memory_budget_mb=budget)
+        assert abs(got.value - ref) < 1e-9
+        assert got.mode == "exact" and got.n_evaluated == len(labels)
+
+
+def test_sampled_ci_covers_exact_value() -> None:
+    X, labels = _blobs(6000, 5, seed=2)
+    exact = float(silhouette_samples(X, labels).mean())
+    est = silhouette_sampled(X, labels, sample_rows=800, random_state=0)
+    assert est.mode == "sampled"
+    assert est.ci_low <= exact <= est.ci_high
+    assert est.ci_high - est.ci_low < 0.05
+
+
+def test_centroid_mode_and_auto_selection() -> None:
+    X, labels = _blobs(3000, 3, seed=3)
+    est = silhouette_centroid(X, labels, memory_budget_mb=0.01)
+    assert est.mode == "centroid"
+    assert 0.0 < est.value <= 1.0
+    assert est.value >= float(silhouette_score(X, labels)) - 0.05
+
+    assert choose_silhouette_mode(10_000, 10) == "exact"
+    assert choose_silhouette_mode(200_000, 10, memory_budget_mb=512) == "sampled"
+    assert choose_silhouette_mode(200_000, 1000, memory_budget_mb=512) == "centroid"
+    assert choose_silhouette_mode(5_000_000, 10) == "centroid"
+
+
+def test_compute_cluster_quality_records_mode() -> None:
+    X, labels = _blobs(500, 3, seed=4)
+    df = pd.DataFrame(X, columns=[f"f{i}" for i in range(X.shape[1])])
+    df["cluster"] = labels
+    res = compute_cluster_quality(df, silhouette_mode="sampled")
+    assert res.silhouette["mode"] == "sampled"
+    assert "silhouette_ci95_low" in res.metrics
+    assert "silhouette_mode=sampled" in res.notes
+
+    res = compute_cluster_quality(df)
+    assert res.silhouette["mode"] == "exact"
+    assert abs(res.metrics["silhouette"] - float(silhouette_score(X, labels))) < 1e-9
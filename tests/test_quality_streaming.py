@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from inkswarm_detectlab.quality.cluster import compute_cluster_quality
+from inkswarm_detectlab.quality.silhouette import silhouette_centroid
+from inkswarm_detectlab.quality.streaming import compute_cluster_quality_streaming
+
+
+def _frame(n: int = 4000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    cluster = rng.choice(["a", "b", "c", "d"], size=n)
+    centers = {"a": 0.0, "b": 3.0, "c": -2.0, "d": 6.0}
+    base = np.array([centers[c] for c in cluster])
+    df = pd.DataFrame(
+        {
+            # large common offset: sum-of-squares accumulators would lose precision here
+            "f0": 1e6 + base + rng.normal(size=n),
+            "f1": base * 0.5 + rng.normal(size=n),
+            "f2": rng.integers(0, 5, size=n).astype("int32"),
+            "cluster": cluster,
+            "label": np.where(rng.random(n) < 0.8, cluster, "x"),
+        }
+    )
+    df.loc[5, "cluster"] = None
+    df.loc[7, "f1"] = np.nan
+    return df
+
+
+def test_streaming_matches_in_memory(tmp_path: Path) -> None:
+    df = _frame()
+    path = tmp_path / "t.parquet"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=512)
+
+    ref = compute_cluster_quality(df, label_col="label", feature_cols=["f0", "f1", "f2"])
+    got = compute_cluster_quality_streaming(path, label_col="label", feature_cols=["f0", "f1", "f2"], batch_rows=300)
+
+    assert (got.n_rows, got.n_clusters, got.n_features) == (ref.n_rows, ref.n_clusters, ref.n_features)
+    for k in ("calinski_harabasz", "ari", "nmi"):
+        assert abs(got.metrics[k] - ref.metrics[k]) <= 1e-7 * max(1.0, abs(ref.metrics[k])), k
+    assert "dropped_rows_missing_cluster=1" in got.notes
+    assert "dropped_rows_nonfinite_features=1" in got.notes
+
+    clean = df.dropna(subset=["cluster", "f1"])
+    X = clean[["f0", "f1", "f2"]].to_numpy(dtype=float)
+    _, codes = np.unique(clean["cluster"].to_numpy(), return_inverse=True)
+
+    # Davies-Bouldin with direct differences (sklearn's dot-product distances lose
+    # ~1e-5 to the 1e6 offset; the streaming version does not).
+    cents = np.stack([X[codes == c].mean(axis=0) for c in range(4)])
+    intra = np.array([np.linalg.norm(X[codes == c] - cents[c], axis=1).mean() for c in range(4)])
+    cdist = np.linalg.norm(cents[:, None] - cents[None, :], axis=2)
+    np.fill_diagonal(cdist, np.inf)
+    db = float(np.mean(np.max((intra[:, None] + intra[None, :]) / cdist, axis=1)))
+    assert abs(got.metrics["davies_bouldin"] - db) < 1e-9
+    assert abs(got.metrics["davies_bouldin"] - ref.metrics["davies_bouldin"]) < 1e-3
+    assert got.silhouette["mode"] == "centroid"
+    assert abs(got.metrics["silhouette"] - silhouette_centroid(X, codes).value) < 1e-9
+
+
+def test_streaming_reads_partitioned_directory(tmp_path: Path) -> None:
+    df = _frame(seed=1)
+    df["split"] = np.where(np.arange(len(df)) % 3 == 0, "train", "time_eval")
+    root = tmp_path / "features.parquet"
+    df.to_parquet(root, index=False, partition_cols=["split"])
+
+    got = compute_cluster_quality_streaming(root)
+    assert got.n_features == 3  # numeric columns only; cluster/label/split are not features
+    assert got.metrics["calinski_harabasz"] > 0
+
+
+def test_streaming_ignores_null_labels(tmp_path: Path) -> None:
+    from sklearn.metrics import adjusted_rand_score, normalized_mutual_info_score
+
+    df = _frame(seed=2).dropna(subset=["cluster", "f1"]).reset_index(drop=True)
+    df["label"] = df["label"].where(np.arange(len(df)) % 4 != 0, None)
+    path = tmp_path / "t.parquet"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=512)
+
+    got = compute_cluster_quality_streaming(path, label_col="label", feature_cols=["f0", "f1", "f2"], batch_rows=300)
+    labeled = df[df["label"].notna()]
+    assert abs(got.metrics["ari"] - adjusted_rand_score(labeled["label"], labeled["cluster"])) < 1e-9
+    assert abs(got.metrics["nmi"] - normalized_mutual_info_score(labeled["label"], labeled["cluster"])) < 1e-9
+
+
+def test_should_stream_excludes_cluster_column(tmp_path: Path) -> None:
+    from inkswarm_detectlab.quality.streaming import should_stream
+
+    df = pd.DataFrame({"f0": np.arange(1000.0), "seg": np.arange(1000) % 3})
+    path = tmp_path / "t.parquet"
+    df.to_parquet(path, index=False)
+    budget = 1000 * 1.5 * 8 / 1e6  # between one and two numeric columns
+    assert should_stream(path, memory_budget_mb=budget)
+    assert not should_stream(path, memory_budget_mb=budget, cluster_col="seg")
+
+
+def test_cli_flags_in_memory_options_when_streaming(tmp_path: Path) -> None:
+    from typer.testing import CliRunner
+
+    from inkswarm_detectlab import cli
+
+    path = tmp_path / "t.parquet"
+    _frame(n=500).to_parquet(path, index=False)
+    base = ["quality", "cluster", "--data", str(path), "--out", str(tmp_path / "q"), "--feature-col", "f0"]
+
+    res = CliRunner().invoke(cli.app, [*base, "--streaming", "--silhouette-mode", "exact"])
+    assert res.exit_code != 0 and "--in-memory" in res.output
+
+    # auto-selected streaming (tiny budget): warns and proceeds
+    res = CliRunner().invoke(cli.app, [*base, "--memory-budget-mb", "0.001", "--sample-n", "100"])
+    assert res.exit_code == 0, res.output
+    assert "WARNING: --sample-n has no effect when streaming" in res.stderr
+    assert "silhouette_mode=centroid" in (tmp_path / "q" / "cluster_quality.json").read_text(encoding="utf-8")
+
+    res = CliRunner().invoke(cli.app, [*base, "--streaming", "--silhouette-mode", "centroid"])
+    assert res.exit_code == 0 and "WARNING" not in res.stderr
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import shutil
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from inkswarm_detectlab.tools.rr_signature import build_signature
+from inkswarm_detectlab.utils.hashing import stable_hash_df
+
+
+def _write_run(root: Path, run_id: str, *, bump: float = 0.0) -> None:
+    rdir = root / "runs" / run_id
+    rng = np.random.default_rng(0)
+    n = 400
+    ts = pd.date_range("2025-01-01", periods=n, freq="min", tz="UTC")
+    login = pd.DataFrame(
+        {
+            "run_id": run_id,
+            "event_id": [f"e{i:04d}" for i in range(n)],
+            "event_ts": ts,
+            "user_id": [f"u{i % 17}" for i in range(n)],
+            "login_result": rng.choice(["success", "failure"], size=n),
+        }
+    )
+    checkout = login.iloc[:50].copy()
+    (rdir / "raw").mkdir(parents=True)
+    login.to_parquet(rdir / "raw" / "login_attempt.parquet", index=False, row_group_size=64)
+    checkout.to_parquet(rdir / "raw" / "checkout_attempt.parquet", index=False)
+
+    feats = login.drop(columns=["run_id", "login_result"]).assign(
+        user_1h__attempt_cnt=rng.integers(0, 5, size=n).astype("int32"),
+        user_1h__failure_rate=rng.random(n).astype("float32") + np.float32(bump),
+        is_fraud=rng.random(n) < 0.1,
+        split=np.where(np.arange(n) % 4 == 0, "time_eval", "train"),
+    )
+    fdir = rdir / "features" / "login_attempt"
+    fdir.mkdir(parents=True)
+    feats.to_parquet(fdir / "features.parquet", index=False, partition_cols=["split"])
+
+    mdir = rdir / "models" / "login_attempt" / "baselines"
+    mdir.mkdir(parents=True)
+    (mdir / "metrics.json").write_text(json.dumps({"labels": {"is_fraud": {"rf": {"status": "ok", "time_eval": {"pr_auc": 0.5}}}}}))
+
+    manifest = {
+        "schema_version": 1,
+        "seed": 7,
+        "artifacts": {
+            "features/login_attempt/features": {
+                "content_hash": stable_hash_df(feats, sort_keys=["event_ts", "user_id", "event_id"], column_order=list(feats.columns)),
+            },
+        },
+    }
+    (rdir / "manifest.json").write_text(json.dumps(manifest))
+
+
+def test_fast_signature_is_run_id_invariant_and_detects_changes(tmp_path: Path) -> None:
+    _write_run(tmp_path, "RUN_A")
+    _write_run(tmp_path, "RUN_B")
+    _write_run(tmp_path, "RUN_C", bump=0.5)
+
+    a = build_signature(repo_root=tmp_path, run_id="RUN_A", mode="fast", workers=4)
+    b = build_signature(repo_root=tmp_path, run_id="RUN_B", mode="fast", workers=1)
+    c = build_signature(repo_root=tmp_path, run_id="RUN_C", mode="fast")
+
+    # raw tables carry run_id -> row-group hashes; features reuse the manifest hash
+    assert a["hashes"]["raw_login_attempt"].startswith("rowgroups:")
+    assert a["hashes"]["features_login_attempt"].startswith("manifest:")
+    assert a["signature_digest"] == b["signature_digest"]
+    assert a["features_digest"] != c["features_digest"]
+    assert a["signature_digest"] != c["signature_digest"]
+
+    full = build_signature(repo_root=tmp_path, run_id="RUN_A")
+    assert full["signature_mode"] == "full"
+    assert full["signature_digest"] != a["signature_digest"]
+    assert full["signature_digest"] == build_signature(repo_root=tmp_path, run_id="RUN_B")["signature_digest"]
+
+
+def test_fast_row_group_hash_ignores_part_file_names(tmp_path: Path) -> None:
+    _write_run(tmp_path, "RUN_A")
+    _write_run(tmp_path, "RUN_B")
+    for run_id in ("RUN_A", "RUN_B"):
+        # Without a manifest hash the partitioned features table is hashed per row group.
+        mpath = tmp_path / "runs" / run_id / "manifest.json"
+        m = json.loads(mpath.read_text())
+        m["artifacts"] = {}
+        mpath.write_text(json.dumps(m))
+    part = next((tmp_path / "runs" / "RUN_B" / "features" / "login_attempt" / "features.parquet" / "split=train").glob("*.parquet"))
+    shutil.move(part, part.with_name(f"{uuid.uuid4().hex}-0.parquet"))
+
+    a = build_signature(repo_root=tmp_path, run_id="RUN_A", mode="fast")
+    b = build_signature(repo_root=tmp_path, run_id="RUN_B", mode="fast")
+    assert a["hashes"]["features_login_attempt"].startswith("rowgroups:")
+    assert a["hashes"] == b["hashes"]
+
+
+def test_arrow_numeric_summary_tolerates_empty_columns(tmp_path: Path) -> None:
+    from inkswarm_detectlab.tools.rr_signature import _features_numeric_summary_arrow
+
+    path = tmp_path / "features.parquet"
+    pd.DataFrame({"x": [1.0, 2.0], "empty": pd.Series([None, None], dtype="float64")}).to_parquet(path, index=False)
+    summary = _features_numeric_summary_arrow(path)
+    assert summary["n_rows"] == 2 and summary["n_numeric_cols"] == 2
+
+    pd.DataFrame({"x": pd.Series([], dtype="float64")}).to_parquet(path, index=False)
+    assert _features_numeric_summary_arrow(path)["n_rows"] == 0
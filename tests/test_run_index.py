@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from inkswarm_detectlab import cli
+from inkswarm_detectlab.io.manifest import write_manifest
+from inkswarm_detectlab.io.run_index import best_runs, list_indexed_runs, rebuild_run_index, run_index_path
+from inkswarm_detectlab.utils.hashing import stable_hash_dict
+
+
+def _write_run(runs_dir: Path, run_id: str, rf_recall: float) -> Path:
+    rdir = runs_dir / run_id
+    bdir = rdir / "models" / "login_attempt" / "baselines"
+    bdir.mkdir(parents=True)
+    metrics = {
+        "labels": {
+            "is_fraud": {
+                "rf": {"status": "ok", "user_holdout": {"recall": rf_recall, "pr_auc": 0.3}, "time_eval": {"recall": 0.1}},
+                "logreg": {"status": "fail", "error": "boom"},
+            }
+        }
+    }
+    (bdir / "metrics.json").write_text(json.dumps(metrics), encoding="utf-8")
+    write_manifest(
+        rdir / "manifest.json",
+        {
+            "run_id": run_id,
+            "config_hash": f"cfg-{run_id}",
+            "artifacts": {
+                "models/login_attempt/baselines/metrics": {
+                    "path": f"{run_id}/models/login_attempt/baselines/metrics.json",
+                    "format": "json",
+                    "content_hash": stable_hash_dict(metrics),
+                }
+            },
+            "steps": {"baselines": {"status": "ok"}},
+        },
+    )
+    return rdir
+
+
+def test_write_manifest_updates_index_and_queries(tmp_path: Path) -> None:
+    runs_dir = tmp_path / "runs"
+    for i, recall in enumerate([0.2, 0.9, 0.5, 0.7]):
+        _write_run(runs_dir, f"RUN_{i:04d}", recall)
+    assert run_index_path(runs_dir).exists()
+
+    top = best_runs(runs_dir, metric="recall", model="rf", split="user_holdout", last_n=100)
+    assert [r["run_id"] for r in top] == ["RUN_0001", "RUN_0003", "RUN_0002", "RUN_0000"]
+    assert top[0]["value"] == 0.9 and top[0]["config_hash"] == "cfg-RUN_0001"
+    assert best_runs(runs_dir, model="logreg") == []  # failed fits are not indexed
+
+    # last_n restricts to the most recently indexed runs
+    assert [r["run_id"] for r in best_runs(runs_dir, last_n=2)] == ["RUN_0003", "RUN_0002"]
+
+    runs = list_indexed_runs(runs_dir)
+    assert runs[0]["run_id"] == "RUN_0003" and runs[0]["steps"] == {"baselines": "ok"}
+
+    # A manifest rewrite with an unchanged metrics hash does not re-read metrics.json.
+    mpath = runs_dir / "RUN_0001" / "models" / "login_attempt" / "baselines" / "metrics.json"
+    mpath.write_text("not json", encoding="utf-8")
+    manifest = json.loads((runs_dir / "RUN_0001" / "manifest.json").read_text(encoding="utf-8"))
+    write_manifest(runs_dir / "RUN_0001", manifest)
+    assert best_runs(runs_dir, limit=1)[0]["run_id"] == "RUN_0001"
+
+    shutil.rmtree(runs_dir / "RUN_0001")
+    shutil.rmtree(runs_dir / "RUN_0003")
+    assert rebuild_run_index(runs_dir) == 2
+    assert [r["run_id"] for r in best_runs(runs_dir)] == ["RUN_0002", "RUN_0000"]
+
+
+def test_runs_best_cli(tmp_path: Path) -> None:
+    runs_dir = tmp_path / "runs"
+    _write_run(runs_dir, "RUN_A", 0.4)
+    _write_run(runs_dir, "RUN_B", 0.6)
+
+    result = CliRunner().invoke(cli.app, ["runs", "best", "--runs-dir", str(runs_dir), "--metric", "recall", "--last", "100"])
+    assert result.exit_code == 0, result.stdout
+    lines = result.stdout.strip().splitlines()
+    assert lines[1].startswith("RUN_B\tis_fraud\t0.6000")
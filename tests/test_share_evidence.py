@@ -19,6 +19,7 @@ def test_export_evidence_bundle_creates_manifest(tmp_path: Path) -> None:
 
     (run_dir / "logs").mkdir(parents=True, exist_ok=True)
     (run_dir / "logs" / "baselines.log").write_text("[baselines] ok\n", encoding="utf-8")
+    (run_dir / "logs" / "perf.json").write_text("{}", encoding="utf-8")
 
     (run_dir / "ui").mkdir(parents=True, exist_ok=True)
     (run_dir / "ui" / "ui_summary.json").write_text("{}", encoding="utf-8")
@@ -41,5 +42,110 @@ def test_export_evidence_bundle_creates_manifest(tmp_path: Path) -> None:
     assert "ui_bundle/index.html" in paths
     assert "reports/summary.md" in paths
     assert "logs/baselines.log" in paths
+    # perf.json is rewritten by concurrently running stages: never shipped
+    assert "logs/perf.json" not in paths
     assert "meta/manifest.json" in paths
     assert "meta/ui_summary.json" in paths
+
+
+def test_reexport_hardlinks_unchanged_files_and_recopies_changed(tmp_path: Path) -> None:
+    import hashlib
+    import os
+
+    run_dir = tmp_path / "runs" / "R0002"
+    (run_dir / "reports").mkdir(parents=True)
+    (run_dir / "reports" / "summary.md").write_text("# Summary\n", encoding="utf-8")
+    (run_dir / "reports" / "big.bin").write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+    (run_dir / "models" / "login_attempt").mkdir(parents=True)
+    (run_dir / "models" / "login_attempt" / "metrics.json").write_text("{}", encoding="utf-8")
+
+    share = export_evidence_bundle(run_dir=run_dir, force=True, workers=4)
+    first_ino = (share / "reports" / "big.bin").stat().st_ino
+
+    (run_dir / "reports" / "summary.md").write_text("# Summary v2\n", encoding="utf-8")
+    share = export_evidence_bundle(run_dir=run_dir, force=True, workers=1)
+
+    # unchanged file is reused (hardlink of the previous export), changed file is recopied
+    assert (share / "reports" / "big.bin").stat().st_ino == first_ino
+    assert (share / "reports" / "summary.md").read_text(encoding="utf-8") == "# Summary v2\n"
+    assert not (share / ".prev_export").exists()
+
+    payload = json.loads((share / "evidence_manifest.json").read_text(encoding="utf-8"))
+    paths = [f["path"] for f in payload["files"]]
+    assert paths == sorted(paths)
+    assert "reports/models/login_attempt/metrics.json" in paths
+    for f in payload["files"]:
+        data = (share / f["path"]).read_bytes()
+        assert f["sha256"] == hashlib.sha256(data).hexdigest()
+        assert f["bytes"] == len(data)
+
+
+def test_share_zip_is_deterministic_and_dedups(tmp_path: Path) -> None:
+    import hashlib
+    import os
+    import zipfile
+
+    from inkswarm_detectlab.share.zipper import write_share_zip
+
+    run_dir = tmp_path / "runs" / "R0003"
+    (run_dir / "reports").mkdir(parents=True)
+    (run_dir / "reports" / "summary.md").write_text("# Summary\n" * 50, encoding="utf-8")
+    (run_dir / "reports" / "scores.parquet").write_bytes(os.urandom(2048))
+    (run_dir / "reports" / "noise.bin").write_bytes(os.urandom(3000))
+    model = os.urandom(4096) + b"\0" * 8192
+    for sub in ("login_attempt", "login_attempt/baselines"):
+        (run_dir / "models" / sub).mkdir(parents=True, exist_ok=True)
+        (run_dir / "models" / sub / "rf.joblib").write_bytes(model)
+    (run_dir / "manifest.json").write_text("{\"schema_version\": 1}\n", encoding="utf-8")
+
+    a = write_share_zip(run_dir=run_dir, out_path=tmp_path / "a.zip", workers=4, dedup=False)
+    b = write_share_zip(run_dir=run_dir, out_path=tmp_path / "b.zip", workers=1, dedup=False)
+    assert a.path.read_bytes() == b.path.read_bytes()
+    # spool files and the .part file are cleaned up
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.zip", "b.zip", "runs"]
+
+    with zipfile.ZipFile(a.path) as z:
+        assert z.testzip() is None
+        assert z.getinfo("reports/scores.parquet").compress_type == zipfile.ZIP_STORED
+        assert z.getinfo("reports/summary.md").compress_type == zipfile.ZIP_DEFLATED
+        # incompressible: deflated, then stored as-is
+        assert z.getinfo("reports/noise.bin").compress_type == zipfile.ZIP_STORED
+        manifest = json.loads(z.read("evidence_manifest.json"))
+        for f in manifest["files"]:
+            assert hashlib.sha256(z.read(f["path"])).hexdigest() == f["sha256"]
+
+    d = write_share_zip(run_dir=run_dir, out_path=tmp_path / "d.zip")  # dedup is the default
+    assert d.deduplicated == 1 and d.bytes_out < a.bytes_out
+    with zipfile.ZipFile(d.path) as z:
+        aliases = json.loads(z.read("share_aliases.json"))["aliases"]
+        assert aliases == {"reports/models/login_attempt/rf.joblib": "reports/models/login_attempt/baselines/rf.joblib"}
+        assert "reports/models/login_attempt/rf.joblib" not in z.namelist()
+
+
+def test_share_zip_writes_zip64_records_past_zip32_limits(tmp_path: Path, monkeypatch) -> None:
+    import hashlib
+    import os
+    import zipfile
+
+    from inkswarm_detectlab.share import zipper
+
+    run_dir = tmp_path / "runs" / "R0004"
+    (run_dir / "reports").mkdir(parents=True)
+    for i in range(4):
+        (run_dir / "reports" / f"part{i}.md").write_text(f"# Part {i}\n" * 400, encoding="utf-8")
+    (run_dir / "reports" / "blob.bin").write_bytes(os.urandom(3000))
+
+    plain = zipper.write_share_zip(run_dir=run_dir, out_path=tmp_path / "plain.zip")
+    assert b"PK\x06\x06" not in plain.path.read_bytes()
+
+    # Shrink the limits so sizes, offsets and the entry count all overflow.
+    monkeypatch.setattr(zipper, "_ZIP32_MAX", 1024)
+    monkeypatch.setattr(zipper, "_ZIP32_MAX_ENTRIES", 3)
+    big = zipper.write_share_zip(run_dir=run_dir, out_path=tmp_path / "big.zip")
+    raw = big.path.read_bytes()
+    assert b"PK\x06\x06" in raw and b"PK\x06\x07" in raw
+    with zipfile.ZipFile(big.path) as z, zipfile.ZipFile(plain.path) as p:
+        assert z.testzip() is None
+        assert z.namelist() == p.namelist()
+        for name in z.namelist():
+            assert hashlib.sha256(z.read(name)).digest() == hashlib.sha256(p.read(name)).digest()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from inkswarm_detectlab.config import load_config
+from inkswarm_detectlab.mvp.dag import Stage, run_stages, validate_stages
+from inkswarm_detectlab.mvp.orchestrator import mvp_stages
+
+
+def test_independent_stages_overlap_and_results_are_declaration_ordered() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+    seen = {}
+
+    def _slow(name: str, delay: float):
+        def fn(_):
+            barrier.wait()  # deadlocks (-> BrokenBarrierError) unless both branches run at once
+            time.sleep(delay)
+            return name
+
+        return fn
+
+    stages = [
+        Stage("root", lambda _: "root", outputs=("a",)),
+        Stage("slow_left", _slow("left", 0.2), deps=("root",), inputs=("a",), outputs=("b",)),
+        Stage("fast_right", _slow("right", 0.0), deps=("root",), inputs=("a",), outputs=("c",)),
+        Stage("join", lambda up: seen.setdefault("up", list(up)), deps=("slow_left", "fast_right")),
+    ]
+    run = run_stages(stages, workers=4)
+
+    assert [r.status for r in run.results.values()] == ["ok"] * 4
+    assert list(run.results) == ["root", "slow_left", "fast_right", "join"]
+    assert seen["up"] == ["root", "slow_left", "fast_right"]
+
+
+def test_failures_are_best_effort_unless_required() -> None:
+    def boom(_):
+        raise RuntimeError("boom")
+
+    stages = [
+        Stage("a", lambda _: 1),
+        Stage("b", boom, deps=("a",)),
+        Stage("c", lambda up: up["b"].status, deps=("b",), message=lambda v: f"upstream {v}"),
+        Stage("extra", lambda _: 1, deps=("a",), record=False),
+    ]
+    run = run_stages(stages, workers=2)
+    assert run.aborted_by is None
+    assert run.steps(stages) == [
+        {"name": "a", "status": "ok"},
+        {"name": "b", "status": "fail", "message": "boom"},
+        {"name": "c", "status": "ok", "message": "upstream fail"},
+    ]
+
+    required = [Stage("a", boom, required=True), Stage("b", lambda _: 1, deps=("a",)), Stage("c", lambda _: 1)]
+    run = run_stages(required, workers=1)
+    assert run.aborted_by == "a"
+    assert run.steps(required) == [{"name": "a", "status": "fail", "message": "boom"}]
+
+
+def test_validate_rejects_races_and_unknown_deps() -> None:
+    with pytest.raises(ValueError, match="may run concurrently"):
+        validate_stages([Stage("x", lambda _: 0, outputs=("reports/summary.md",)), Stage("y", lambda _: 0, inputs=("reports/*.md",))])
+    with pytest.raises(ValueError, match="not declared before"):
+        validate_stages([Stage("x", lambda _: 0, deps=("y",)), Stage("y", lambda _: 0)])
+    # ordered stages may share paths
+    validate_stages([Stage("x", lambda _: 0, outputs=("manifest.json",)), Stage("y", lambda _: 0, deps=("x",), outputs=("manifest.json",))])
+
+
+@pytest.mark.parametrize("cache_hit", [False, True])
+def test_mvp_stage_graph_is_race_free(tmp_path: Path, cache_hit: bool) -> None:
+    cfg_path = Path("configs/skynet_smoke.yaml")
+    cfg = load_config(cfg_path)
+    stages = mvp_stages(
+        cfg, cfg_path=cfg_path, run_id="RUN_X", rdir=tmp_path / "RUN_X", force=False, cache_hit=cache_hit, summary={"steps": []}
+    )
+    anc = validate_stages(stages)
+    names = [s.name for s in stages]
+    assert ("skynet+dataset" in names) is not cache_hit
+    assert names[-1] == "evidence_bundle" and anc["evidence_bundle"] >= {"handover", "exec_summary", "ui_export"}
+    # the shared-cache copy overlaps model training
+    if not cache_hit:
+        assert "feature_cache" not in anc["baselines(login)"] and "baselines(login)" not in anc["feature_cache"]
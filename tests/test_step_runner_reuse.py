@@ -1,3 +1,4 @@
+import json
 from types import SimpleNamespace
 from pathlib import Path
 
@@ -56,3 +57,57 @@ def test_step_runner_reuse_path(tmp_path, monkeypatch):
 
     eval_result = step_runner.step_eval(cfg, run_id=run_dir.name, rec=rec)
     assert eval_result.status == "skipped"
+
+
+def _seed_baseline_run(run_dir: Path, features_hash: str) -> None:
+    from inkswarm_detectlab.io.manifest import write_manifest
+
+    bdir = run_dir / "models" / "login_attempt" / "baselines"
+    bdir.mkdir(parents=True, exist_ok=True)
+    (bdir / "metrics.json").write_text("{}")
+    (bdir / "model.joblib").write_text("x")
+    manifest_file = run_dir / "manifest.json"
+    manifest = json.loads(manifest_file.read_text()) if manifest_file.exists() else {"run_id": run_dir.name}
+    manifest.setdefault("artifacts", {})["features/login_attempt/features"] = {"content_hash": features_hash}
+    write_manifest(manifest_file, manifest)
+
+
+def test_baselines_rerun_exactly_when_declared_inputs_change(tmp_path, monkeypatch):
+    from inkswarm_detectlab.config import load_config
+
+    cfg = load_config(Path("configs/skynet_smoke.yaml"))
+    cfg.paths.runs_dir = tmp_path
+    run_dir = tmp_path / "RUN_FP_0001"
+    _seed_baseline_run(run_dir, "h1")
+
+    calls = []
+    monkeypatch.setattr(step_runner, "run_login_baselines_for_run", lambda cfg, **kw: calls.append(kw["force"]))
+
+    first = step_runner.step_baselines(cfg, run_id=run_dir.name)
+    assert first.status == "skipped"  # legacy record-less reuse; records the fingerprint
+    assert step_runner.step_baselines(cfg, run_id=run_dir.name).decision.reason.startswith("Up to date")
+
+    # Config outside the declared subtrees (report/UI/timezone) does not invalidate baselines.
+    cfg.run.timezone = "UTC"
+    cfg.features.login_attempt.windows = ["1h"]
+    assert step_runner.step_baselines(cfg, run_id=run_dir.name).status == "skipped"
+    assert calls == []
+
+    # New feature content -> rerun, overwriting existing outputs.
+    _seed_baseline_run(run_dir, "h2")
+    res = step_runner.step_baselines(cfg, run_id=run_dir.name)
+    assert res.status == "ok" and res.decision.stale and calls == [True]
+    assert step_runner.step_baselines(cfg, run_id=run_dir.name).status == "skipped"
+
+    cfg.baselines.login_attempt.rf.n_estimators += 1
+    dec = step_runner.decide_reuse(
+        run_dir=run_dir,
+        step_name="baselines",
+        current_config_hash="unused",
+        expected_outputs={"metrics_json": run_dir / "models" / "login_attempt" / "baselines" / "metrics.json"},
+        reuse_if_exists=True,
+        force=False,
+        current_inputs_fingerprint=step_runner.step_input_fingerprint(run_dir=run_dir, cfg=cfg, step_name="baselines"),
+    )
+    assert dec.mode == "compute" and dec.stale
+    assert "config:baselines.login_attempt" in dec.reason and "features/login_attempt/features" not in dec.reason
@@ -55,24 +55,91 @@ def test_export_ui_bundle(tmp_path: Path) -> None:
     assert (out_dir / "index.html").exists()
     html = (out_dir / "index.html").read_text(encoding="utf-8")
     assert "MVP Results Viewer" in html
-    js = (out_dir / "app.js").read_text(encoding="utf-8")
-    assert "RUN_A" in js and "RUN_B" in js
+    index = (out_dir / "data" / "index.js").read_text(encoding="utf-8")
+    assert "RUN_A" in index and "RUN_B" in index
+    shards = sorted((out_dir / "data" / "runs").glob("*.js"))
+    assert len(shards) == 2
+    assert any(p.read_text(encoding="utf-8").startswith('window.__RUN_SHARD__("RUN_A",{') for p in shards)
 
 
-def test_export_ui_bundle_max5(tmp_path: Path) -> None:
+def test_export_ui_bundle_many_runs_reuses_summaries(tmp_path: Path) -> None:
     runs_dir = tmp_path / "runs"
     runs_dir.mkdir()
-    for i in range(6):
-        r = runs_dir / f"R{i}"
+    run_ids = [f"R{i:02d}" for i in range(60)]
+    for rid in run_ids:
+        r = runs_dir / rid
         r.mkdir()
         _write_dummy_metrics(r)
 
+    # An existing ui_summary.json is used as-is (not rebuilt) unless forced.
+    (runs_dir / "R07" / "ui").mkdir()
+    (runs_dir / "R07" / "ui" / "ui_summary.json").write_text(
+        json.dumps({"run_id": "R07", "notes": ["precomputed"], "baselines": {}}), encoding="utf-8"
+    )
+
     cfg_path = tmp_path / "cfg.yaml"
-    cfg_path.write_text("paths:\n  runs_dir: runs\n", encoding="utf-8")
+    cfg_path.write_text(f"paths:\n  runs_dir: {runs_dir.as_posix()}\n", encoding="utf-8")
+    cfg = load_config(cfg_path)
+
+    out_dir = tmp_path / "out"
+    export_ui_bundle(cfg, run_ids=run_ids, out_dir=out_dir)
+
+    index_js = (out_dir / "data" / "index.js").read_text(encoding="utf-8")
+    index = json.loads(index_js[index_js.index("=") + 1 :].strip().rstrip(";"))
+    assert [r["run_id"] for r in index["runs"]] == run_ids
+    assert index["runs"][0]["headline"]["is_fraud"]["rf"]["user_holdout"] == 0.38
+    assert len(list((out_dir / "data" / "runs").glob("*.js"))) == 60
+    assert all((runs_dir / rid / "ui" / "ui_summary.json").exists() for rid in run_ids)
+
+    r07 = next(r for r in index["runs"] if r["run_id"] == "R07")
+    assert "precomputed" in (out_dir / r07["shard"]).read_text(encoding="utf-8")
+    assert "window.__RUN_DATA__" not in (out_dir / "app.js").read_text(encoding="utf-8")
+
+    # Re-export with fewer runs drops stale shards.
+    export_ui_bundle(cfg, run_ids=run_ids[:3], out_dir=out_dir, force=True)
+    assert len(list((out_dir / "data" / "runs").glob("*.js"))) == 3
+
+
+def test_build_ui_summary_is_incremental(tmp_path: Path) -> None:
+    import os
+
+    from inkswarm_detectlab.ui.summarize import UI_SUMMARY_MEMO_NAME, build_ui_summary
+
+    runs_dir = tmp_path / "runs"
+    rdir = runs_dir / "RUN_A"
+    rdir.mkdir(parents=True)
+    _write_dummy_metrics(rdir)
+    cfg_path = tmp_path / "cfg.yaml"
+    cfg_path.write_text(f"paths:\n  runs_dir: {runs_dir.as_posix()}\n", encoding="utf-8")
     cfg = load_config(cfg_path)
+    memo_path = rdir / "ui" / UI_SUMMARY_MEMO_NAME
+
+    def rebuilt() -> list[str]:
+        return json.loads(memo_path.read_text(encoding="utf-8"))["rebuilt"]
+
+    first = build_ui_summary(cfg, run_id="RUN_A")
+    assert sorted(rebuilt()) == ["baselines", "eval", "manifest", "run_summary"]
+
+    again = build_ui_summary(cfg, run_id="RUN_A")
+    assert again == first and sorted(rebuilt()) == ["baselines", "eval", "manifest", "run_summary"]  # memo not rewritten
+
+    # Same bytes, new mtime: content hash says unchanged.
+    metrics = rdir / "models" / "login_attempt" / "baselines" / "metrics.json"
+    metrics.write_bytes(metrics.read_bytes())
+    os.utime(metrics, ns=(1, 1))
+    assert build_ui_summary(cfg, run_id="RUN_A") == first
+    assert rebuilt() == []
+
+    payload = json.loads(metrics.read_text(encoding="utf-8"))
+    payload["target_fpr"] = 0.02
+    metrics.write_text(json.dumps(payload), encoding="utf-8")
+    changed = build_ui_summary(cfg, run_id="RUN_A")
+    assert rebuilt() == ["baselines"]
+    assert changed["baselines"]["login_attempt"]["target_fpr"] == 0.02
 
-    try:
-        export_ui_bundle(cfg, run_ids=[f"R{i}" for i in range(6)], out_dir=tmp_path / "out", force=True)
-        assert False, "Expected ValueError for >5 runs"
-    except ValueError:
-        assert True
+    (rdir / "reports").mkdir()
+    (rdir / "reports" / "eval_slices_login_attempt.md").write_text("# slices\n", encoding="utf-8")
+    out = build_ui_summary(cfg, run_id="RUN_A")
+    assert rebuilt() == ["eval"]
+    assert out["eval"]["login_attempt"]["slices_report"].endswith("eval_slices_login_attempt.md")
+    assert out == build_ui_summary(cfg, run_id="RUN_A", incremental=False) | {"generated_at_utc": out["generated_at_utc"]}